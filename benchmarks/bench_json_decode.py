@@ -0,0 +1,108 @@
+"""
+Benchmark de los decodificadores JSON sobre respuestas realistas de Datadis.
+
+Compara los decodificadores de :mod:`datadis_python.utils.json_backend` (``json``,
+``orjson`` y ``msgspec``, según estén instalados) sobre una curva de carga horaria
+anual (``get-consumption-data-v2``) y una respuesta de suministros
+(``get-supplies-v2``), ambas en bytes como llegan por la red.
+
+Uso (con el paquete instalado, por ejemplo con ``poetry install``)::
+
+    python benchmarks/bench_json_decode.py
+    python benchmarks/bench_json_decode.py --rows 35040 --repeat 7
+
+:author: TacoronteRiveroCristian
+"""
+
+import argparse
+import json
+import timeit
+from typing import Dict
+
+from datadis_python.utils import json_backend
+
+
+def build_consumption_body(rows: int) -> bytes:
+    """Genera el cuerpo de una curva de carga horaria con autoconsumo."""
+    time_curve = [
+        {
+            "cups": "ES0031607515707001RC0F",
+            "date": f"2024/{(index // 720) % 12 + 1:02d}/{(index // 24) % 28 + 1:02d}",
+            "time": f"{index % 24 + 1:02d}:00",
+            "consumptionKWh": round(0.1 + (index % 17) * 0.05, 3),
+            "obtainMethod": "Real" if index % 11 else "Estimada",
+            "surplusEnergyKWh": round((index % 5) * 0.021, 3),
+            "generationEnergyKWh": round((index % 7) * 0.033, 3),
+            "selfConsumptionEnergyKWh": round((index % 3) * 0.012, 3),
+        }
+        for index in range(rows)
+    ]
+    body = {"timeCurve": time_curve, "distributorError": []}
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def build_supplies_body(count: int) -> bytes:
+    """Genera el cuerpo de una respuesta de suministros."""
+    supplies = [
+        {
+            "address": f"CALLE JOSÉ MARTÍNEZ {index}, 3º IZQ",
+            "cups": f"ES{index:018d}AB0F",
+            "postalCode": "29001",
+            "province": "MÁLAGA",
+            "municipality": "MÁLAGA",
+            "distributor": "E-DISTRIBUCIÓN REDES DIGITALES S.L.U.",
+            "validDateFrom": "2023/01/01",
+            "validDateTo": "",
+            "pointType": 5,
+            "distributorCode": "2",
+        }
+        for index in range(count)
+    ]
+    body = {"supplies": supplies, "distributorError": []}
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def available_backends() -> Dict[str, str]:
+    """Decodificadores instalados en el entorno actual."""
+    installed = {}
+    # La biblioteca estándar primero: es la referencia de las mejoras
+    for name in reversed(json_backend.JSON_BACKENDS):
+        try:
+            installed[name] = json_backend.set_json_backend(name)
+        except ImportError:
+            continue
+    json_backend.set_json_backend(None)
+    return installed
+
+
+def main() -> None:
+    """Ejecuta el benchmark e imprime los resultados."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=17520)
+    parser.add_argument("--supplies", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = {
+        f"timeCurve ({args.rows} filas)": build_consumption_body(args.rows),
+        f"supplies ({args.supplies} suministros)": build_supplies_body(args.supplies),
+    }
+    backends = available_backends()
+
+    for label, body in payloads.items():
+        print(f"{label}, {len(body) / 1024 / 1024:.1f} MiB:")
+        baseline = None
+        for name in backends:
+            json_backend.set_json_backend(name)
+            elapsed = min(
+                timeit.repeat(
+                    lambda: json_backend.loads(body), number=1, repeat=args.repeat
+                )
+            )
+            baseline = baseline or elapsed
+            print(f"  {name:<8} {elapsed * 1000:8.1f} ms  x{baseline / elapsed:.1f}")
+    json_backend.set_json_backend(None)
+
+
+if __name__ == "__main__":
+    main()
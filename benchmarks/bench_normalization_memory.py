@@ -0,0 +1,91 @@
+"""
+Benchmark de memoria de la etapa de normalización sobre una curva de carga anual.
+
+Decodifica una respuesta sintética de ``get-consumption-data-v2`` con ~17.500 filas
+horarias y mide con :mod:`tracemalloc` la memoria pico adicional de la normalización
+en sus variantes: copia completa, esquema de campos de texto e in-place.
+
+Uso (con el paquete instalado, por ejemplo con ``poetry install``)::
+
+    python benchmarks/bench_normalization_memory.py
+    python benchmarks/bench_normalization_memory.py --rows 35040
+
+:author: TacoronteRiveroCristian
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from datadis_python.utils.text_utils import (
+    clear_intern_table,
+    normalize_api_response,
+    text_fields_for_endpoint,
+)
+
+CONSUMPTION_ENDPOINT = "/get-consumption-data-v2"
+
+
+def build_consumption_body(rows: int) -> str:
+    """Genera el cuerpo JSON de una curva de carga horaria."""
+    time_curve = [
+        {
+            "cups": "ES0031607515707001RC0F",
+            "date": f"2024/{(index // 720) % 12 + 1:02d}/{(index // 24) % 28 + 1:02d}",
+            "time": f"{index % 24 + 1:02d}:00",
+            "consumptionKWh": round(0.1 + (index % 17) * 0.05, 3),
+            "obtainMethod": "Real",
+            "surplusEnergyKWh": 0.0,
+            "generationEnergyKWh": 0.0,
+            "selfConsumptionEnergyKWh": 0.0,
+        }
+        for index in range(rows)
+    ]
+    return json.dumps({"timeCurve": time_curve, "distributorError": []})
+
+
+def measure(body: str, normalize: Callable[[Dict[str, Any]], Any]) -> tuple:
+    """
+    Mide tiempo y memoria pico de ``normalize`` sobre un JSON recién decodificado.
+
+    :return: Tupla ``(segundos, bytes_pico)``
+    """
+    clear_intern_table()
+    decoded = json.loads(body)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = normalize(decoded)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result, decoded
+    return elapsed, peak
+
+
+def main() -> None:
+    """Ejecuta el benchmark e imprime los resultados."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=17520)
+    args = parser.parse_args()
+
+    body = build_consumption_body(args.rows)
+    text_fields = text_fields_for_endpoint(CONSUMPTION_ENDPOINT)
+    variants = {
+        "copia completa": lambda data: normalize_api_response(data),
+        "esquema": lambda data: normalize_api_response(data, text_fields),
+        "esquema + in-place": lambda data: normalize_api_response(
+            data, text_fields, in_place=True
+        ),
+        "completa + in-place": lambda data: normalize_api_response(data, in_place=True),
+    }
+
+    print(f"Normalización de timeCurve con {args.rows} filas:")
+    for name, normalize in variants.items():
+        elapsed, peak = measure(body, normalize)
+        print(f"  {name:<22} {elapsed * 1000:8.1f} ms  pico {peak / 1024:10.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
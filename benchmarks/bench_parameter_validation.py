@@ -0,0 +1,90 @@
+"""
+Benchmark de la preparación de parámetros de petición (CUPS, distribuidor y fechas).
+
+Construye ``N`` juegos de parámetros como los que preparan los clientes antes de
+cada petición (``convert_cups_parameter``, ``convert_distributor_code_parameter`` y
+``convert_date_range_to_api_format``) sobre una cartera sintética de suministros,
+con y sin una instantánea común de la fecha actual (:func:`validation_now`).
+
+Uso (con el paquete instalado, por ejemplo con ``poetry install``)::
+
+    python benchmarks/bench_parameter_validation.py
+    python benchmarks/bench_parameter_validation.py --requests 500000
+
+:author: TacoronteRiveroCristian
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import List, Tuple
+
+from datadis_python.utils.type_converters import (
+    convert_cups_parameter,
+    convert_date_range_to_api_format,
+    convert_distributor_code_parameter,
+)
+from datadis_python.utils.validators import validation_now
+
+
+def build_requests(count: int, portfolio: int) -> List[Tuple[str, int, str, str]]:
+    """Genera ``count`` peticiones mensuales sobre ``portfolio`` suministros."""
+    today = datetime.now()
+    months = [
+        f"{(today.year * 12 + today.month - 1 - offset) // 12}/"
+        f"{(today.year * 12 + today.month - 1 - offset) % 12 + 1:02d}"
+        for offset in range(12)
+    ]
+    return [
+        (
+            f"es{index % portfolio:018d}ab0f",
+            index % 8 + 1,
+            months[index % 12],
+            months[index % 12 // 2],
+        )
+        for index in range(count)
+    ]
+
+
+def build_params(requests: List[Tuple[str, int, str, str]]) -> list:
+    """Convierte y valida los parámetros de todas las peticiones."""
+    params = []
+    for cups, distributor_code, date_from, date_to in requests:
+        date_from, date_to = convert_date_range_to_api_format(
+            date_from, date_to, "monthly"
+        )
+        params.append(
+            {
+                "cups": convert_cups_parameter(cups),
+                "distributorCode": convert_distributor_code_parameter(distributor_code),
+                "startDate": date_from,
+                "endDate": date_to,
+            }
+        )
+    return params
+
+
+def main() -> None:
+    """Ejecuta el benchmark e imprime los resultados."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--portfolio", type=int, default=500)
+    args = parser.parse_args()
+
+    requests = build_requests(args.requests, args.portfolio)
+    print(f"{args.requests} juegos de parámetros ({args.portfolio} suministros):")
+
+    start = time.perf_counter()
+    build_params(requests)
+    elapsed = time.perf_counter() - start
+    print(f"  sin instantánea:        {elapsed * 1000:8.1f} ms")
+
+    start = time.perf_counter()
+    with validation_now():
+        build_params(requests)
+    elapsed = time.perf_counter() - start
+    print(f"  con validation_now():   {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
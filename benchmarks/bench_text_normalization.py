@@ -0,0 +1,141 @@
+"""
+Micro-benchmark de la normalización de texto sobre respuestas de suministros.
+
+Compara :func:`datadis_python.utils.text_utils.normalize_text` con la implementación
+anterior (NFD + ASCII + reemplazos en cada cadena) sobre un payload sintético de
+``get-supplies-v2``, tanto cadena a cadena como a través de
+:func:`normalize_api_response`.
+
+Uso (con el paquete instalado, por ejemplo con ``poetry install``)::
+
+    python benchmarks/bench_text_normalization.py
+    python benchmarks/bench_text_normalization.py --supplies 20000 --repeat 7
+
+:author: TacoronteRiveroCristian
+"""
+
+import argparse
+import random
+import timeit
+import unicodedata
+from typing import Any, Dict, List
+
+from datadis_python.utils import text_utils
+
+MUNICIPALITIES = [
+    "MADRID",
+    "MÁLAGA",
+    "CÁDIZ",
+    "A CORUÑA",
+    "LLEIDA",
+    "CASTELLÓ DE LA PLANA",
+    "SANTA CRUZ DE TENERIFE",
+    "LAS PALMAS DE GRAN CANARIA",
+    "LOGROÑO",
+    "ÁVILA",
+]
+DISTRIBUTORS = [
+    "E-DISTRIBUCIÓN REDES DIGITALES S.L.U.",
+    "UFD DISTRIBUCION ELECTRICIDAD S.A.",
+    "I-DE REDES ELÉCTRICAS INTELIGENTES",
+    "EDISTRIBUCIÃ\x93N",
+]
+
+
+def legacy_normalize_text(text: str) -> str:
+    """Implementación anterior de ``normalize_text``, como referencia."""
+    if not isinstance(text, str):
+        return text
+    try:
+        if "Ã" in text:
+            text = text.encode("latin-1").decode("utf-8")
+    except (UnicodeError, UnicodeDecodeError):
+        pass
+    normalized = unicodedata.normalize("NFD", text)
+    ascii_text = normalized.encode("ascii", "ignore").decode("ascii")
+    for char, replacement in {"Ñ": "N", "ñ": "n", "Ç": "C", "ç": "c"}.items():
+        ascii_text = ascii_text.replace(char, replacement)
+    return ascii_text
+
+
+def build_supplies_payload(count: int) -> Dict[str, Any]:
+    """Genera una respuesta sintética de ``get-supplies-v2``."""
+    rng = random.Random(42)
+    supplies: List[Dict[str, Any]] = []
+    for index in range(count):
+        municipality = rng.choice(MUNICIPALITIES)
+        floor = rng.choice(["", "ÁTICO", "BAJO"])
+        supplies.append(
+            {
+                "address": f"CALLE EJEMPLO {index} {floor}",
+                "cups": f"ES{index:018d}AB0F",
+                "postalCode": f"{rng.randint(1000, 52999):05d}",
+                "province": municipality,
+                "municipality": municipality,
+                "distributor": rng.choice(DISTRIBUTORS),
+                "validDateFrom": "2023/01/01",
+                "validDateTo": "",
+                "pointType": rng.randint(1, 5),
+                "distributorCode": str(rng.randint(1, 8)),
+            }
+        )
+    return {"supplies": supplies, "distributorError": []}
+
+
+def collect_strings(payload: Dict[str, Any]) -> List[str]:
+    """Devuelve todas las cadenas del payload."""
+    return [
+        value
+        for supply in payload["supplies"]
+        for value in supply.values()
+        if isinstance(value, str)
+    ]
+
+
+def best_of(stmt, repeat: int) -> float:
+    """Mejor tiempo (segundos) de ``repeat`` ejecuciones de ``stmt``."""
+    return min(timeit.repeat(stmt, number=1, repeat=repeat))
+
+
+def main() -> None:
+    """Ejecuta el benchmark e imprime los resultados."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--supplies", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = build_supplies_payload(args.supplies)
+    strings = collect_strings(payload)
+    current_normalize_text = text_utils.normalize_text
+
+    legacy = best_of(lambda: [legacy_normalize_text(s) for s in strings], args.repeat)
+    current = best_of(lambda: [current_normalize_text(s) for s in strings], args.repeat)
+    count = len(strings)
+    print(f"normalize_text sobre {count} cadenas:")
+    print(f"  anterior: {legacy * 1000:8.1f} ms  ({count / legacy:,.0f} cad/s)")
+    print(f"  actual:   {current * 1000:8.1f} ms  ({count / current:,.0f} cad/s)")
+    print(f"  mejora:   x{legacy / current:.1f}")
+
+    def full_response() -> None:
+        text_utils.normalize_api_response(payload)
+
+    text_utils.normalize_text = legacy_normalize_text
+    try:
+        legacy = best_of(full_response, args.repeat)
+    finally:
+        text_utils.normalize_text = current_normalize_text
+    current = best_of(full_response, args.repeat)
+    print(f"normalize_api_response (SuppliesResponse, {args.supplies} suministros):")
+    print(f"  anterior: {legacy * 1000:8.1f} ms")
+    print(f"  actual:   {current * 1000:8.1f} ms")
+    print(f"  mejora:   x{legacy / current:.1f}")
+
+    text_fields = text_utils.text_fields_for_endpoint("/get-supplies-v2")
+    schema = best_of(
+        lambda: text_utils.normalize_api_response(payload, text_fields), args.repeat
+    )
+    print(f"  con esquema de campos de texto: {schema * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
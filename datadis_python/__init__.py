@@ -5,6 +5,8 @@ Un SDK modular para interactuar con la API oficial de Datadis.
 Soporta tanto API v1 (respuestas raw) como v2 (respuestas tipadas).
 """
 
+import logging
+
 __version__ = "0.1.3"
 
 # Cliente legacy (compatibilidad hacia atrás)
@@ -27,6 +29,9 @@ from .models import (
     SupplyData,
 )
 
+# Registro desactivado por defecto: la aplicación decide si habilitarlo
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 __all__ = [
     # Clientes
     "DatadisClient",  # Cliente unificado (v1 + v2)
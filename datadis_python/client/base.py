@@ -6,7 +6,7 @@ Este módulo define una clase abstracta que sirve como base para los clientes de
 
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
 
 from ..exceptions import APIError, AuthenticationError, DatadisError
 from ..utils.constants import (
@@ -19,6 +19,8 @@ from ..utils.constants import (
 )
 from ..utils.http import HTTPClient
 
+T = TypeVar("T")
+
 
 class BaseDatadisClient(ABC):
     """
@@ -135,6 +137,44 @@ class BaseDatadisClient(ABC):
         :raises AuthenticationError: Si fallan las credenciales
         :raises APIError: Si ocurre un error en la API
         """
+        return self._authenticated(
+            self.http_client.make_request, method, endpoint, data, params
+        )
+
+    def _make_authenticated_raw_request(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> bytes:
+        """
+        Realiza una petición ``GET`` autenticada sin decodificar la respuesta.
+
+        :param endpoint: Endpoint de la API
+        :type endpoint: str
+        :param params: Parámetros de query string
+        :type params: Optional[Dict[str, Any]]
+        :return: Cuerpo de la respuesta sin decodificar
+        :rtype: bytes
+        :raises AuthenticationError: Si fallan las credenciales
+        :raises APIError: Si ocurre un error en la API
+        """
+        return self._authenticated(
+            self.http_client.make_raw_request, "GET", endpoint, None, params
+        )
+
+    def _authenticated(
+        self,
+        send: Callable[..., T],
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]],
+    ) -> T:
+        """
+        Envía una petición con ``send`` renovando el token una vez si caduca.
+
+        Solo las peticiones ``GET`` se reintentan ante errores de red: un ``POST``
+        que agota el tiempo puede haberse procesado y repetirlo lo duplicaría.
+        """
+        retry = method.upper() == "GET"
         self.ensure_authenticated()
 
         # Construir URL completa
@@ -144,16 +184,12 @@ class BaseDatadisClient(ABC):
             url = f"{self.api_base}{endpoint}"
 
         try:
-            return self.http_client.make_request(
-                method=method, url=url, data=data, params=params
-            )
+            return send(method=method, url=url, data=data, params=params, retry=retry)
         except AuthenticationError:
             # Token expirado, intentar renovar una vez
             self.token = None
             self.ensure_authenticated()
-            return self.http_client.make_request(
-                method=method, url=url, data=data, params=params
-            )
+            return send(method=method, url=url, data=data, params=params, retry=retry)
 
     def close(self) -> None:
         """
@@ -4,6 +4,7 @@ Cliente actualizado para la API de Datadis (versión corregida).
 Este módulo proporciona un cliente para interactuar con la API de Datadis.
 """
 
+import logging
 import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
@@ -29,6 +30,7 @@ from ..utils.constants import (
     DEFAULT_TIMEOUT,
     MAX_RETRIES,
 )
+from ..utils.events import emit
 from ..utils.validators import (
     validate_date_range,
     validate_distributor_code,
@@ -36,6 +38,8 @@ from ..utils.validators import (
     validate_point_type,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class DatadisClient:
     """
@@ -174,8 +178,12 @@ class DatadisClient:
                     # Rate limiting - esperar más tiempo progresivamente
                     if attempt < self.retries:
                         wait_time = min(30, (2**attempt) * 2)  # Máximo 30 segundos
-                        print(
-                            f"Rate limit alcanzado. Esperando {wait_time} segundos..."
+                        emit(
+                            logger,
+                            logging.WARNING,
+                            "request.rate_limited",
+                            "Rate limit alcanzado. Esperando %(wait)s segundos...",
+                            wait=wait_time,
                         )
                         time.sleep(wait_time)
                         continue
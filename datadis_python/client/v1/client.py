@@ -4,9 +4,11 @@ Cliente Datadis API v1 - Respuestas raw para máxima compatibilidad.
 Este módulo proporciona un cliente para interactuar con la versión 1 de la API de Datadis.
 """
 
+import logging
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from ...utils.constants import API_V1_ENDPOINTS
+from ...utils.events import emit
 from ..base import BaseDatadisClient
 
 if TYPE_CHECKING:
@@ -16,6 +18,8 @@ if TYPE_CHECKING:
     from ...models.max_power import MaxPowerData
     from ...models.supply import SupplyData
 
+logger = logging.getLogger(__name__)
+
 
 class DatadisClientV1(BaseDatadisClient):
     """
@@ -74,7 +78,13 @@ class DatadisClientV1(BaseDatadisClient):
                 validated_supplies.append(validated_supply)
             except Exception as e:
                 # Log del error pero continúa procesando
-                print(f"Error validando suministro: {e}")
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "supplies.validation_error",
+                    "Error validando suministro: %(error)s",
+                    error=str(e),
+                )
                 continue
 
         return validated_supplies
@@ -117,7 +127,13 @@ class DatadisClientV1(BaseDatadisClient):
                 validated_distributors.append(validated_distributor)
             except Exception as e:
                 # Log del error pero continúa procesando
-                print(f"Error validando distribuidor: {e}")
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "distributors.validation_error",
+                    "Error validando distribuidor: %(error)s",
+                    error=str(e),
+                )
                 continue
 
         return validated_distributors
@@ -163,7 +179,13 @@ class DatadisClientV1(BaseDatadisClient):
                 validated_contracts.append(validated_contract)
             except Exception as e:
                 # Log del error pero continúa procesando
-                print(f"Error validando contrato: {e}")
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "contract.validation_error",
+                    "Error validando contrato: %(error)s",
+                    error=str(e),
+                )
                 continue
 
         return validated_contracts
@@ -232,7 +254,13 @@ class DatadisClientV1(BaseDatadisClient):
                 validated_consumption.append(validated_consumption_item)
             except Exception as e:
                 # Log del error pero continúa procesando
-                print(f"Error validando consumo: {e}")
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "consumption.validation_error",
+                    "Error validando consumo: %(error)s",
+                    error=str(e),
+                )
                 continue
 
         return validated_consumption
@@ -291,7 +319,13 @@ class DatadisClientV1(BaseDatadisClient):
                 validated_max_power.append(validated_max_power_item)
             except Exception as e:
                 # Log del error pero continúa procesando
-                print(f"Error validando potencia máxima: {e}")
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "max_power.validation_error",
+                    "Error validando potencia máxima: %(error)s",
+                    error=str(e),
+                )
                 continue
 
         return validated_max_power
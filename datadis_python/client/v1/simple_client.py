@@ -1,5 +1,6 @@
 """Cliente V1 simplificado para Datadis."""
 
+import logging
 import time
 from datetime import date, datetime
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
@@ -20,7 +21,11 @@ from ...utils.constants import (
     DATADIS_API_BASE,
     DATADIS_BASE_URL,
 )
-from ...utils.text_utils import normalize_api_response
+from ...utils.events import emit, response_size
+from ...utils.http import decode_json_body
+from ...utils.text_utils import normalize_api_response, text_fields_for_endpoint
+
+logger = logging.getLogger(__name__)
 
 
 class SimpleDatadisClientV1:
@@ -153,7 +158,7 @@ class SimpleDatadisClientV1:
            - Documentación oficial: ``POST /nikola-auth/tokens/login``
            - Los tokens son válidos por tiempo limitado y se renuevan automáticamente
         """
-        print("Autenticando con Datadis...")
+        emit(logger, logging.DEBUG, "auth.start", "Autenticando con Datadis...")
 
         headers = {
             "Content-Type": "application/x-www-form-urlencoded",
@@ -179,7 +184,7 @@ class SimpleDatadisClientV1:
                     )
                 self.token = token
                 self.session.headers["Authorization"] = f"Bearer {self.token}"
-                print("Autenticación exitosa")
+                emit(logger, logging.INFO, "auth.success", "Autenticación exitosa")
                 return True
             else:
                 raise AuthenticationError(
@@ -236,8 +241,14 @@ class SimpleDatadisClientV1:
 
         for attempt in range(self.retries + 1):
             try:
-                print(
-                    f"Petición a {endpoint} (intento {attempt + 1}/{self.retries + 1})..."
+                emit(
+                    logger,
+                    logging.DEBUG,
+                    "request.start",
+                    "Petición a %(endpoint)s (intento %(attempt)d/%(attempts)d)...",
+                    endpoint=endpoint,
+                    attempt=attempt + 1,
+                    attempts=self.retries + 1,
                 )
 
                 response = self.session.get(
@@ -245,13 +256,31 @@ class SimpleDatadisClientV1:
                 )
 
                 if response.status_code == 200:
-                    print(f"Respuesta exitosa ({len(response.text)} chars)")
-                    json_response = response.json()
-                    # Normalizar texto para evitar problemas de caracteres especiales
-                    return normalize_api_response(json_response)
+                    emit(
+                        logger,
+                        logging.DEBUG,
+                        "request.success",
+                        "Respuesta exitosa de %(endpoint)s (%(bytes)s bytes)",
+                        endpoint=endpoint,
+                        bytes=response_size(response),
+                    )
+                    json_response, repaired = decode_json_body(response)
+                    # Normalizar solo los campos de texto libre de este endpoint,
+                    # sobre el propio JSON recién decodificado (sin copias)
+                    return normalize_api_response(
+                        json_response,
+                        text_fields_for_endpoint(endpoint),
+                        in_place=True,
+                        repair_encoding=not repaired,
+                    )
                 elif response.status_code == 401:
                     # Token expirado, renovar
-                    print("Token expirado, renovando...")
+                    emit(
+                        logger,
+                        logging.INFO,
+                        "auth.token_expired",
+                        "Token expirado, renovando...",
+                    )
                     self.token = None
                     if self.authenticate():
                         continue
@@ -269,8 +298,14 @@ class SimpleDatadisClientV1:
             except requests.Timeout:
                 if attempt < self.retries:
                     wait_time = min(30, (2**attempt) * 5)
-                    print(
-                        f"Timeout. Esperando {wait_time}s antes del siguiente intento..."
+                    emit(
+                        logger,
+                        logging.WARNING,
+                        "request.timeout",
+                        "Timeout en %(endpoint)s. Esperando %(wait)ss antes del "
+                        "siguiente intento...",
+                        endpoint=endpoint,
+                        wait=wait_time,
                     )
                     time.sleep(wait_time)
                 else:
@@ -281,7 +316,16 @@ class SimpleDatadisClientV1:
                 # Solo reintentar errores de red/conexión, no errores de aplicación
                 if attempt < self.retries:
                     wait_time = (2**attempt) * 2
-                    print(f"Error: {e}. Reintentando en {wait_time}s...")
+                    emit(
+                        logger,
+                        logging.WARNING,
+                        "request.retry",
+                        "Error en %(endpoint)s: %(error)s. Reintentando en "
+                        "%(wait)ss...",
+                        endpoint=endpoint,
+                        error=str(e),
+                        wait=wait_time,
+                    )
                     time.sleep(wait_time)
                 else:
                     raise DatadisError(
@@ -362,7 +406,12 @@ class SimpleDatadisClientV1:
            - Para obtener detalles del contrato: :meth:`get_contract_detail`
            - Lista completa de códigos de distribuidor en la documentación de la API
         """
-        print("Obteniendo lista de suministros...")
+        emit(
+            logger,
+            logging.INFO,
+            "supplies.request",
+            "Obteniendo lista de suministros...",
+        )
 
         # Construir parámetros de query
         params = {}
@@ -385,7 +434,12 @@ class SimpleDatadisClientV1:
         elif isinstance(response, dict) and "supplies" in response:
             raw_supplies = response["supplies"]
         else:
-            print("Respuesta inesperada de la API")
+            emit(
+                logger,
+                logging.WARNING,
+                "supplies.unexpected_response",
+                "Respuesta inesperada de la API",
+            )
             return []
 
         # Validar datos con Pydantic
@@ -397,11 +451,23 @@ class SimpleDatadisClientV1:
                 validated_supply = SupplyData(**supply_data)
                 validated_supplies.append(validated_supply)
             except Exception as e:
-                print(f"Error validando suministro: {e}")
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "supplies.validation_error",
+                    "Error validando suministro: %(error)s",
+                    error=str(e),
+                )
                 # Continúa con el siguiente sin fallar completamente
                 continue
 
-        print(f"{len(validated_supplies)} suministros validados")
+        emit(
+            logger,
+            logging.INFO,
+            "supplies.validated",
+            "%(count)d suministros validados",
+            count=len(validated_supplies),
+        )
         return validated_supplies
 
     def get_distributors(self) -> List["DistributorData"]:
@@ -460,7 +526,12 @@ class SimpleDatadisClientV1:
            Solo se devuelven distribuidores donde el usuario tiene suministros activos.
            Si no hay suministros registrados, la lista estará vacía.
         """
-        print("Obteniendo distribuidores...")
+        emit(
+            logger,
+            logging.INFO,
+            "distributors.request",
+            "Obteniendo distribuidores...",
+        )
         response = self._make_authenticated_request(API_V1_ENDPOINTS["distributors"])
 
         # Manejar diferentes estructuras de respuesta
@@ -480,11 +551,23 @@ class SimpleDatadisClientV1:
                 validated_distributor = DistributorData(**distributor_data)
                 validated_distributors.append(validated_distributor)
             except Exception as e:
-                print(f"Error validando distribuidor: {e}")
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "distributors.validation_error",
+                    "Error validando distribuidor: %(error)s",
+                    error=str(e),
+                )
                 # Continúa con el siguiente sin fallar completamente
                 continue
 
-        print(f"{len(validated_distributors)} distribuidores validados")
+        emit(
+            logger,
+            logging.INFO,
+            "distributors.validated",
+            "%(count)d distribuidores validados",
+            count=len(validated_distributors),
+        )
         return validated_distributors
 
     def get_contract_detail(
@@ -581,7 +664,13 @@ class SimpleDatadisClientV1:
             distributor_code
         )
 
-        print(f"Obteniendo contrato para {cups_converted}...")
+        emit(
+            logger,
+            logging.INFO,
+            "contract.request",
+            "Obteniendo contrato para %(cups)s...",
+            cups=cups_converted,
+        )
 
         params = {"cups": cups_converted, "distributorCode": distributor_code_converted}
         response = self._make_authenticated_request(
@@ -605,11 +694,23 @@ class SimpleDatadisClientV1:
                 validated_contract = ContractData(**contract_data)
                 validated_contracts.append(validated_contract)
             except Exception as e:
-                print(f"Error validando contrato: {e}")
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "contract.validation_error",
+                    "Error validando contrato: %(error)s",
+                    error=str(e),
+                )
                 # Continúa con el siguiente sin fallar completamente
                 continue
 
-        print(f"{len(validated_contracts)} contratos validados")
+        emit(
+            logger,
+            logging.INFO,
+            "contract.validated",
+            "%(count)d contratos validados",
+            count=len(validated_contracts),
+        )
         return validated_contracts
 
     def get_consumption(
@@ -762,8 +863,14 @@ class SimpleDatadisClientV1:
         measurement_type_converted = convert_number_to_string(measurement_type)
         point_type_converted = convert_optional_number_to_string(point_type)
 
-        print(
-            f"Obteniendo consumo para {cups_converted} ({date_from_converted} - {date_to_converted})..."
+        emit(
+            logger,
+            logging.INFO,
+            "consumption.request",
+            "Obteniendo consumo para %(cups)s (%(date_from)s - %(date_to)s)...",
+            cups=cups_converted,
+            date_from=date_from_converted,
+            date_to=date_to_converted,
         )
 
         params = {
@@ -797,11 +904,23 @@ class SimpleDatadisClientV1:
                 validated_consumption_item = ConsumptionData(**consumption_data)
                 validated_consumption.append(validated_consumption_item)
             except Exception as e:
-                print(f"Error validando consumo: {e}")
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "consumption.validation_error",
+                    "Error validando consumo: %(error)s",
+                    error=str(e),
+                )
                 # Continúa con el siguiente sin fallar completamente
                 continue
 
-        print(f"{len(validated_consumption)} registros de consumo validados")
+        emit(
+            logger,
+            logging.INFO,
+            "consumption.validated",
+            "%(count)d registros de consumo validados",
+            count=len(validated_consumption),
+        )
         return validated_consumption
 
     def get_max_power(
@@ -931,8 +1050,15 @@ class SimpleDatadisClientV1:
             date_from, date_to, "monthly"
         )
 
-        print(
-            f"Obteniendo potencia máxima para {cups_converted} ({date_from_converted} - {date_to_converted})..."
+        emit(
+            logger,
+            logging.INFO,
+            "max_power.request",
+            "Obteniendo potencia máxima para %(cups)s (%(date_from)s - "
+            "%(date_to)s)...",
+            cups=cups_converted,
+            date_from=date_from_converted,
+            date_to=date_to_converted,
         )
 
         params = {
@@ -962,11 +1088,23 @@ class SimpleDatadisClientV1:
                 validated_max_power_item = MaxPowerData(**max_power_data)
                 validated_max_power.append(validated_max_power_item)
             except Exception as e:
-                print(f"Error validando potencia máxima: {e}")
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "max_power.validation_error",
+                    "Error validando potencia máxima: %(error)s",
+                    error=str(e),
+                )
                 # Continúa con el siguiente sin fallar completamente
                 continue
 
-        print(f"{len(validated_max_power)} registros de potencia máxima validados")
+        emit(
+            logger,
+            logging.INFO,
+            "max_power.validated",
+            "%(count)d registros de potencia máxima validados",
+            count=len(validated_max_power),
+        )
         return validated_max_power
 
     def close(self):
@@ -0,0 +1,131 @@
+"""
+Gestión de autorizaciones para los clientes V2 de Datadis.
+
+Este módulo define :class:`AuthorizationRequestsMixin`, que añade a los clientes
+V2 los endpoints de :data:`~datadis_python.utils.constants.AUTHORIZATION_ENDPOINTS`:
+
+- :meth:`~AuthorizationRequestsMixin.list_authorizations`: autorizaciones vigentes.
+- :meth:`~AuthorizationRequestsMixin.new_authorization`: solicita una autorización.
+- :meth:`~AuthorizationRequestsMixin.cancel_authorization`: la cancela.
+
+Para consultar las autorizaciones desde trabajos masivos sin repetir la petición,
+véase :class:`~datadis_python.jobs.AuthorizationRegistry`.
+
+Example:
+    Solicitar una autorización y comprobar las vigentes::
+
+        client.new_authorization("12345678A", cups=["ES0031607515707001RC0F"])
+        for authorization in client.list_authorizations().authorizations:
+            print(authorization.nif, authorization.cups or "todos los CUPS")
+
+:author: TacoronteRiveroCristian
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
+
+from ...exceptions import ValidationError
+from ...utils.constants import AUTHORIZATION_ENDPOINTS
+from ...utils.validators import validate_cups
+
+if TYPE_CHECKING:
+    from ...models.authorization import AuthorizationsResponse
+
+
+def _authorization_body(
+    nif: str,
+    cups: Optional[Iterable[str]],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Cuerpo JSON de una petición de alta o cancelación.
+
+    :raises ValidationError: Si el NIF está vacío o algún CUPS no es válido
+    """
+    nif = (nif or "").strip().upper()
+    if not nif:
+        raise ValidationError("El NIF de la autorización no puede estar vacío")
+    body: Dict[str, Any] = {"nif": nif}
+    if cups:
+        body["cups"] = [validate_cups(code) for code in cups]
+    if start_date is not None:
+        body["startDate"] = start_date
+    if end_date is not None:
+        body["endDate"] = end_date
+    return body
+
+
+class AuthorizationRequestsMixin:
+    """
+    Endpoints de autorizaciones de los clientes V2.
+
+    Las altas y cancelaciones se envían como ``POST`` con un cuerpo JSON
+    (``nif``, ``cups``, ``startDate``, ``endDate``) y devuelven la respuesta de la
+    API sin modificar.
+    """
+
+    def _authorization_request(
+        self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Petición autenticada a un endpoint de autorizaciones."""
+        raise NotImplementedError
+
+    def list_authorizations(self) -> "AuthorizationsResponse":
+        """
+        Obtiene las autorizaciones vigentes de la cuenta.
+
+        :return: Autorizaciones validadas
+        :rtype: AuthorizationsResponse
+        """
+        from ...models.authorization import AuthorizationsResponse
+
+        response = self._authorization_request(
+            "GET", AUTHORIZATION_ENDPOINTS["list_authorization"]
+        )
+        return AuthorizationsResponse.from_api(response)
+
+    def new_authorization(
+        self,
+        nif: str,
+        cups: Optional[Iterable[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Any:
+        """
+        Solicita una autorización para consultar los suministros de un NIF.
+
+        :param nif: NIF del titular que concede la autorización
+        :type nif: str
+        :param cups: CUPS concretos (``None``: todos los del NIF)
+        :type cups: Optional[Iterable[str]]
+        :param start_date: Inicio de la autorización (``YYYY/MM/DD``)
+        :type start_date: Optional[str]
+        :param end_date: Fin de la autorización (``YYYY/MM/DD``)
+        :type end_date: Optional[str]
+        :return: Respuesta de la API
+        :raises ValidationError: Si el NIF está vacío o algún CUPS no es válido
+        """
+        return self._authorization_request(
+            "POST",
+            AUTHORIZATION_ENDPOINTS["new_authorization"],
+            _authorization_body(nif, cups, start_date, end_date),
+        )
+
+    def cancel_authorization(
+        self, nif: str, cups: Optional[Iterable[str]] = None
+    ) -> Any:
+        """
+        Cancela la autorización de un NIF.
+
+        :param nif: NIF del titular
+        :type nif: str
+        :param cups: CUPS concretos (``None``: toda la autorización)
+        :type cups: Optional[Iterable[str]]
+        :return: Respuesta de la API
+        :raises ValidationError: Si el NIF está vacío o algún CUPS no es válido
+        """
+        return self._authorization_request(
+            "POST",
+            AUTHORIZATION_ENDPOINTS["cancel_authorization"],
+            _authorization_body(nif, cups),
+        )
@@ -0,0 +1,476 @@
+"""
+Consultas masivas para los clientes V2 de Datadis.
+
+Este módulo define :class:`BulkRequestsMixin`, que añade a los clientes V2 las
+variantes ``*_many`` de las consultas por suministro (consumo, potencia máxima,
+contrato y energía reactiva). Cada variante acepta un iterable de peticiones y
+devuelve un flujo de :class:`~datadis_python.utils.concurrency.BulkResult`.
+
+Cada petición puede expresarse como:
+
+- Un objeto :class:`~datadis_python.models.supply.SupplyData` (o cualquier objeto
+  con ``cups`` y ``distributor_code``). En consumo se usa también su ``point_type``.
+- Una tupla ``(cups, distributor_code)``, ``(cups, distributor_code, (desde, hasta))``
+  o ``(cups, distributor_code, desde, hasta)``.
+- Un diccionario con los argumentos del método individual (``cups``,
+  ``distributor_code``, ``date_from``...). Se aceptan también los nombres de la API
+  (``distributorCode``, ``pointType``), como en las respuestas de ``get_supplies``.
+
+Las fechas que no indique la petición se toman de ``date_from``/``date_to`` del
+método ``*_many``. Los suministros de ``get_supplies_for_nifs`` se consultan con
+su ``source_nif`` como ``authorized_nif``, salvo que se indique otro NIF.
+
+Las variantes ``*_for_nifs`` repiten una consulta de cuenta (suministros,
+distribuidoras) para cada NIF autorizado y fusionan las respuestas en una sola,
+indicando el NIF de origen de cada suministro y de cada error.
+
+:author: TacoronteRiveroCristian
+"""
+
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+    cast,
+)
+
+from ...exceptions import ValidationError
+from ...utils.concurrency import (
+    AdaptiveConcurrency,
+    BulkResult,
+    bulk_request_kwargs,
+    run_bulk,
+)
+from ...utils.rate_limit import RateLimiter
+from ...utils.validators import validation_now
+
+if TYPE_CHECKING:
+    from ...models.reactive import ReactiveData
+    from ...models.responses import (
+        ConsumptionResponse,
+        ContractResponse,
+        DistributorsResponse,
+        MaxPowerResponse,
+        SuppliesResponse,
+    )
+
+
+def _tag_errors(errors: Iterable[Any], nif: str) -> List[Any]:
+    """Copia los ``DistributorError`` de una respuesta con su NIF de origen."""
+    return [error.model_copy(update={"source_nif": nif}) for error in errors]
+
+
+class BulkRequestsMixin:
+    """
+    Variantes ``*_many`` de las consultas por suministro de los clientes V2.
+
+    Las peticiones se reparten entre ``max_workers`` hilos con un máximo de
+    ``per_distributor_limit`` peticiones simultáneas por distribuidora. El cliente
+    se autentica una sola vez antes de empezar y todas las peticiones del lote se
+    validan contra el mismo instante (:func:`validation_now`).
+
+    Con ``per_distributor_limit=AdaptiveConcurrency()`` el límite de cada
+    distribuidora se adapta a su respuesta: crece mientras responde bien y se reduce
+    ante timeouts, HTTP 429/5xx o ``distributorError``.
+
+    Los errores no interrumpen el lote: cada :class:`BulkResult` contiene el
+    resultado o la excepción de su petición.
+    """
+
+    def _authenticate_once(self) -> None:
+        """Autentica el cliente antes de repartir las peticiones entre hilos."""
+        raise NotImplementedError
+
+    def _run_many(
+        self,
+        method: Callable[..., Any],
+        requests: Iterable[Any],
+        with_range: bool,
+        date_from: Any,
+        date_to: Any,
+        max_workers: int,
+        per_distributor_limit: Union[int, AdaptiveConcurrency, None],
+        ordered: bool,
+        executor: Optional[Executor] = None,
+        with_point_type: bool = False,
+        **extra: Any,
+    ) -> Iterator[BulkResult]:
+        """
+        Ejecuta un método individual sobre cada petición de un lote.
+
+        :param method: Método individual del cliente (``self.get_consumption``...)
+        :param requests: Peticiones del lote
+        :param with_range: Si el método necesita rango de fechas
+        :param date_from: Fecha inicial por defecto
+        :param date_to: Fecha final por defecto
+        :param max_workers: Número máximo de peticiones simultáneas
+        :param per_distributor_limit: Máximo de peticiones simultáneas por
+                                     distribuidora
+        :param ordered: Resultados en orden de entrada (``True``) o según se completan
+        :param executor: Ejecutor compartido (``None``: pool propio del lote)
+        :param with_point_type: Si el método acepta ``point_type``
+        :param extra: Argumentos comunes a todas las peticiones (los que indique
+                     una petición en diccionario prevalecen; ``authorized_nif``
+                     prevalece sobre el ``source_nif`` de la petición)
+        :return: Iterador de :class:`BulkResult`
+        """
+        self._authenticate_once()
+        snapshot = datetime.now()
+
+        def to_kwargs(item: Any) -> Dict[str, Any]:
+            return bulk_request_kwargs(
+                item,
+                with_range,
+                date_from,
+                date_to,
+                with_point_type,
+                extra.get("authorized_nif"),
+            )
+
+        def call(item: Any) -> Any:
+            with validation_now(snapshot):
+                return method(**{**extra, **to_kwargs(item)})
+
+        return run_bulk(
+            call,
+            requests,
+            key=lambda item: str(bulk_request_kwargs(item, False)["distributor_code"]),
+            max_workers=max_workers,
+            per_key_limit=per_distributor_limit,
+            ordered=ordered,
+            executor=executor,
+        )
+
+    def _run_for_nifs(
+        self,
+        method: Callable[..., Any],
+        nifs: Iterable[str],
+        max_workers: int,
+        rate_limiter: Optional[RateLimiter],
+        executor: Optional[Executor],
+        **extra: Any,
+    ) -> Iterator[BulkResult]:
+        """
+        Ejecuta una consulta de cuenta una vez por NIF autorizado.
+
+        :param method: Método individual con parámetro ``authorized_nif``
+        :param nifs: NIF autorizados (los repetidos se consultan una sola vez)
+        :param max_workers: Número máximo de peticiones simultáneas
+        :param rate_limiter: Limitador compartido con otros lotes o pipelines
+        :param executor: Ejecutor compartido (``None``: pool propio del lote)
+        :param extra: Argumentos comunes a todas las peticiones
+        :return: Iterador de :class:`BulkResult` en el orden de los NIF
+        """
+        self._authenticate_once()
+
+        def call(nif: str) -> Any:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            return method(authorized_nif=nif, **extra)
+
+        return run_bulk(
+            call,
+            list(dict.fromkeys(nifs)),
+            max_workers=max_workers,
+            executor=executor,
+        )
+
+    def get_supplies_for_nifs(
+        self,
+        nifs: Iterable[str],
+        distributor_code: Optional[str] = None,
+        max_workers: int = 8,
+        rate_limiter: Optional[RateLimiter] = None,
+        executor: Optional[Executor] = None,
+    ) -> "SuppliesResponse":
+        """
+        Obtiene los suministros de muchos NIF autorizados en paralelo.
+
+        Cada suministro y cada ``DistributorError`` de la respuesta fusionada llevan
+        en ``source_nif`` el NIF con el que se obtuvieron. Un CUPS que aparece en
+        varios NIF se conserva una sola vez, con el primero de ``nifs`` en
+        ``source_nif``; ``nifs_by_cups`` registra todos los NIF que lo devolvieron.
+        Los NIF cuya consulta falla no interrumpen el resto: su error se describe
+        en ``nif_errors``.
+
+        Estas consultas no aplican ningún límite de frecuencia por defecto: sin
+        ``rate_limiter`` solo las limita ``max_workers``. Quien las lance debe pasar
+        el mismo :class:`RateLimiter` que usen sus demás lotes o pipelines para
+        repartir entre todos un único presupuesto de peticiones.
+
+        :param nifs: NIF autorizados
+        :type nifs: Iterable[str]
+        :param distributor_code: Código de distribuidora común a todas las consultas
+        :type distributor_code: Optional[str]
+        :param max_workers: Número máximo de peticiones simultáneas
+        :type max_workers: int
+        :param rate_limiter: Limitador compartido con otros lotes o pipelines
+                            (``None``: sin límite de frecuencia)
+        :type rate_limiter: Optional[RateLimiter]
+        :param executor: Ejecutor compartido donde lanzar las peticiones (``None``:
+                        pool propio del lote)
+        :type executor: Optional[Executor]
+        :return: Suministros de todos los NIF
+        :rtype: SuppliesResponse
+
+        Example:
+            Inventario de todas las autorizaciones::
+
+                inventory = client.get_supplies_for_nifs(authorized_nifs)
+                for supply in inventory.supplies:
+                    print(supply.source_nif, supply.cups)
+                for nif, error in inventory.nif_errors.items():
+                    print(f"{nif}: {error}")
+        """
+        from ...models.responses import SuppliesResponse
+
+        merged = SuppliesResponse()
+        for item in self._run_for_nifs(
+            self.get_supplies,  # type: ignore[attr-defined]
+            nifs,
+            max_workers,
+            rate_limiter,
+            executor,
+            distributor_code=distributor_code,
+        ):
+            if not item.ok:
+                merged.nif_errors[item.request] = str(item.error)
+                continue
+            response = cast("SuppliesResponse", item.result)
+            for supply in response.supplies:
+                source_nifs = merged.nifs_by_cups.setdefault(supply.cups, [])
+                if not source_nifs:
+                    merged.supplies.append(
+                        supply.model_copy(update={"source_nif": item.request})
+                    )
+                if item.request not in source_nifs:
+                    source_nifs.append(item.request)
+            merged.distributor_error.extend(
+                _tag_errors(response.distributor_error, item.request)
+            )
+            merged.rejected_records.extend(response.rejected_records)
+        return merged
+
+    def get_distributors_for_nifs(
+        self,
+        nifs: Iterable[str],
+        max_workers: int = 8,
+        rate_limiter: Optional[RateLimiter] = None,
+        executor: Optional[Executor] = None,
+    ) -> "DistributorsResponse":
+        """
+        Obtiene las distribuidoras con suministros de muchos NIF autorizados.
+
+        ``dist_existence_user["distributorCodes"]`` contiene la unión de los códigos
+        y ``distributor_codes_by_nif`` los de cada NIF, útil para consultar después
+        solo las distribuidoras de cada uno. Los errores por distribuidora llevan su
+        NIF en ``source_nif`` y los NIF cuya consulta falla se describen en
+        ``nif_errors``.
+
+        Acepta las mismas opciones que :meth:`get_supplies_for_nifs`; tampoco
+        aplica límite de frecuencia si no se pasa ``rate_limiter``.
+
+        :return: Distribuidoras de todos los NIF
+        :rtype: DistributorsResponse
+        """
+        from ...models.responses import DistributorsResponse
+
+        merged = DistributorsResponse(distExistenceUser={"distributorCodes": []})
+        all_codes = set()
+        for item in self._run_for_nifs(
+            self.get_distributors,  # type: ignore[attr-defined]
+            nifs,
+            max_workers,
+            rate_limiter,
+            executor,
+        ):
+            if not item.ok:
+                merged.nif_errors[item.request] = str(item.error)
+                continue
+            response = cast("DistributorsResponse", item.result)
+            codes = [
+                str(code)
+                for code in response.dist_existence_user.get("distributorCodes", [])
+            ]
+            merged.distributor_codes_by_nif[item.request] = codes
+            all_codes.update(codes)
+            merged.distributor_error.extend(
+                _tag_errors(response.distributor_error, item.request)
+            )
+        merged.dist_existence_user["distributorCodes"] = sorted(all_codes)
+        return merged
+
+    def get_consumption_many(
+        self,
+        requests: Iterable[Any],
+        date_from: Any = None,
+        date_to: Any = None,
+        measurement_type: Any = 0,
+        authorized_nif: Optional[str] = None,
+        max_workers: int = 8,
+        per_distributor_limit: Union[int, AdaptiveConcurrency, None] = 4,
+        ordered: bool = True,
+        executor: Optional[Executor] = None,
+    ) -> Iterator["BulkResult[Any, ConsumptionResponse]"]:
+        """
+        Obtiene los datos de consumo de muchos suministros en paralelo.
+
+        :param requests: ``SupplyData``, tuplas ``(cups, distribuidora[, rango])`` o
+                        diccionarios con los argumentos de :meth:`get_consumption`
+        :type requests: Iterable[Any]
+        :param date_from: Fecha inicial para las peticiones que no la indiquen
+        :param date_to: Fecha final para las peticiones que no la indiquen
+        :param measurement_type: Tipo de medida común a todas las peticiones
+        :param authorized_nif: NIF autorizado común a todas las peticiones
+        :type authorized_nif: Optional[str]
+        :param max_workers: Número máximo de peticiones simultáneas
+        :type max_workers: int
+        :param per_distributor_limit: Máximo de peticiones simultáneas por
+                                     distribuidora, un :class:`AdaptiveConcurrency`
+                                     que lo ajusta según la respuesta de cada una,
+                                     o ``None`` para no limitar
+        :type per_distributor_limit: Union[int, AdaptiveConcurrency, None]
+        :param ordered: ``True`` para recibir los resultados en el orden de entrada,
+                       ``False`` para recibirlos según se completan
+        :type ordered: bool
+        :param executor: Ejecutor compartido donde lanzar las peticiones, por ejemplo
+                        ``scheduler.lane(cliente, PRIORITY_BATCH)`` de un
+                        :class:`~datadis_python.jobs.FairScheduler` (``None``: pool
+                        propio del lote)
+        :type executor: Optional[Executor]
+        :return: Un :class:`BulkResult` por petición con su ``ConsumptionResponse``
+                o su error
+        :rtype: Iterator[BulkResult]
+
+        Example:
+            Consumo de todos los suministros de la cuenta::
+
+                supplies = client.get_supplies().supplies
+                for item in client.get_consumption_many(
+                    supplies, date_from="2024/01", date_to="2024/12"
+                ):
+                    if item.ok:
+                        print(item.request.cups, len(item.result.time_curve))
+                    else:
+                        print(item.request.cups, item.error)
+        """
+        return self._run_many(
+            self.get_consumption,  # type: ignore[attr-defined]
+            requests,
+            True,
+            date_from,
+            date_to,
+            max_workers,
+            per_distributor_limit,
+            ordered,
+            executor,
+            with_point_type=True,
+            measurement_type=measurement_type,
+            authorized_nif=authorized_nif,
+        )
+
+    def get_max_power_many(
+        self,
+        requests: Iterable[Any],
+        date_from: Any = None,
+        date_to: Any = None,
+        authorized_nif: Optional[str] = None,
+        max_workers: int = 8,
+        per_distributor_limit: Union[int, AdaptiveConcurrency, None] = 4,
+        ordered: bool = True,
+        executor: Optional[Executor] = None,
+    ) -> Iterator["BulkResult[Any, MaxPowerResponse]"]:
+        """
+        Obtiene la potencia máxima de muchos suministros en paralelo.
+
+        Acepta las mismas peticiones y opciones que :meth:`get_consumption_many`.
+
+        :return: Un :class:`BulkResult` por petición con su ``MaxPowerResponse``
+                o su error
+        :rtype: Iterator[BulkResult]
+        """
+        return self._run_many(
+            self.get_max_power,  # type: ignore[attr-defined]
+            requests,
+            True,
+            date_from,
+            date_to,
+            max_workers,
+            per_distributor_limit,
+            ordered,
+            executor,
+            authorized_nif=authorized_nif,
+        )
+
+    def get_contract_detail_many(
+        self,
+        requests: Iterable[Any],
+        authorized_nif: Optional[str] = None,
+        max_workers: int = 8,
+        per_distributor_limit: Union[int, AdaptiveConcurrency, None] = 4,
+        ordered: bool = True,
+        executor: Optional[Executor] = None,
+    ) -> Iterator["BulkResult[Any, ContractResponse]"]:
+        """
+        Obtiene el detalle del contrato de muchos suministros en paralelo.
+
+        Las peticiones solo necesitan ``cups`` y ``distributor_code``; si incluyen un
+        rango de fechas se ignora.
+
+        :return: Un :class:`BulkResult` por petición con su ``ContractResponse``
+                o su error
+        :rtype: Iterator[BulkResult]
+        """
+        return self._run_many(
+            self.get_contract_detail,  # type: ignore[attr-defined]
+            requests,
+            False,
+            None,
+            None,
+            max_workers,
+            per_distributor_limit,
+            ordered,
+            executor,
+            authorized_nif=authorized_nif,
+        )
+
+    def get_reactive_data_many(
+        self,
+        requests: Iterable[Any],
+        date_from: Any = None,
+        date_to: Any = None,
+        authorized_nif: Optional[str] = None,
+        max_workers: int = 8,
+        per_distributor_limit: Union[int, AdaptiveConcurrency, None] = 4,
+        ordered: bool = True,
+        executor: Optional[Executor] = None,
+    ) -> Iterator["BulkResult[Any, List[ReactiveData]]"]:
+        """
+        Obtiene la energía reactiva de muchos suministros en paralelo.
+
+        Acepta las mismas peticiones y opciones que :meth:`get_consumption_many`.
+
+        :return: Un :class:`BulkResult` por petición con su lista de
+                ``ReactiveData`` o su error
+        :rtype: Iterator[BulkResult]
+        """
+        return self._run_many(
+            self.get_reactive_data,  # type: ignore[attr-defined]
+            requests,
+            True,
+            date_from,
+            date_to,
+            max_workers,
+            per_distributor_limit,
+            ordered,
+            executor,
+            authorized_nif=authorized_nif,
+        )
@@ -4,9 +4,17 @@ Cliente Datadis API v2 - Devuelve datos raw exactamente como los proporciona la
 Este módulo proporciona un cliente para la versión 2 de la API de Datadis.
 """
 
+import logging
+from functools import partial
 from typing import TYPE_CHECKING, List, Optional
 
+from ...utils.chunking import (
+    merge_chunk_responses,
+    merge_reactive_responses,
+    request_month_range,
+)
 from ...utils.constants import API_V2_ENDPOINTS
+from ...utils.events import emit
 from ...utils.validators import (
     validate_date_range,
     validate_distributor_code,
@@ -14,12 +22,12 @@ from ...utils.validators import (
     validate_point_type,
 )
 from ..base import BaseDatadisClient
+from .authorization import AuthorizationRequestsMixin
+from .bulk import BulkRequestsMixin
+from .streaming import StreamingRequestsMixin
 
 if TYPE_CHECKING:
-    from ...models.consumption import ConsumptionData
-    from ...models.contract import ContractData
     from ...models.distributor import DistributorData
-    from ...models.max_power import MaxPowerData
     from ...models.reactive import ReactiveData
     from ...models.responses import (
         ConsumptionResponse,
@@ -28,10 +36,16 @@ if TYPE_CHECKING:
         MaxPowerResponse,
         SuppliesResponse,
     )
-    from ...models.supply import SupplyData
+
+logger = logging.getLogger(__name__)
 
 
-class DatadisClientV2(BaseDatadisClient):
+class DatadisClientV2(
+    AuthorizationRequestsMixin,
+    BulkRequestsMixin,
+    StreamingRequestsMixin,
+    BaseDatadisClient,
+):
     """
     Cliente para API v2 de Datadis.
 
@@ -49,8 +63,107 @@ class DatadisClientV2(BaseDatadisClient):
     :type timeout: int
     :param retries: Número de reintentos automáticos.
     :type retries: int
+
+    Si algún registro de la respuesta no supera la validación, se conservan los
+    registros válidos y los descartados se informan en ``rejected_records``. Para
+    recuperar el comportamiento anterior (respuesta vacía) asigne
+    ``client.salvage_invalid_records = False``.
+
+    Las consultas por rango de meses (consumo, potencia máxima y energía reactiva)
+    pueden dividirse en bloques asignando ``client.chunk_months``: los bloques se
+    descargan en paralelo (hasta ``client.max_workers``), solo se reintentan los que
+    fallan y las respuestas se fusionan sin duplicados.
+
+    Las variantes ``*_many`` (:class:`BulkRequestsMixin`) consultan muchos
+    suministros en paralelo con límite de peticiones por distribuidora.
+    Las variantes ``*_for_nifs`` repiten las consultas de suministros y
+    distribuidoras para muchos NIF autorizados y fusionan las respuestas.
+    Las autorizaciones se gestionan con :class:`AuthorizationRequestsMixin`.
+    Los generadores ``iter_*``/``aiter_*`` (:class:`StreamingRequestsMixin`)
+    entregan los registros de rangos largos bloque a bloque según se descargan.
     """
 
+    #: Conservar los registros válidos cuando alguno falla la validación
+    salvage_invalid_records: bool = True
+
+    #: Meses por bloque en consultas de rangos largos (``None``: una sola petición)
+    chunk_months: Optional[int] = None
+
+    #: Número máximo de bloques descargados a la vez
+    max_workers: int = 4
+
+    def _authenticate_once(self) -> None:
+        """Autentica una sola vez antes de repartir peticiones entre hilos."""
+        self.ensure_authenticated()
+
+    def _request_raw(self, endpoint: str, params: dict) -> bytes:
+        """Cuerpo sin decodificar de una consulta (ver :mod:`datadis_python.jobs`)."""
+        return self._make_authenticated_raw_request(endpoint, params)
+
+    def _authorization_request(
+        self, method: str, endpoint: str, data: Optional[dict] = None
+    ):
+        """Petición a un endpoint de autorizaciones (ver :mod:`.authorization`)."""
+        return self.make_authenticated_request(method, endpoint, data=data)
+
+    def _request_month_range(self, endpoint: str, params: dict, merge):
+        """
+        Realiza una consulta por rango de meses, en bloques si ``chunk_months`` lo pide.
+
+        :param endpoint: Endpoint relativo de la API V2
+        :type endpoint: str
+        :param params: Parámetros de la consulta con ``startDate`` y ``endDate``
+        :type params: dict
+        :param merge: Función que fusiona las respuestas de los bloques
+        :return: Respuesta de la API (fusionada si se dividió en bloques)
+        """
+        if self.chunk_months:
+            # Autenticar una sola vez antes de repartir los bloques entre hilos
+            self.ensure_authenticated()
+
+        return request_month_range(
+            lambda chunk_params: self.make_authenticated_request(
+                "GET", endpoint, params=chunk_params
+            ),
+            params,
+            merge,
+            self.chunk_months,
+            self.max_workers,
+        )
+
+    def _salvage_response(
+        self, response_model, response: dict, records_field: str, record_model
+    ):
+        """
+        Intenta rescatar los registros válidos de una respuesta que no pasó la validación.
+
+        :param response_model: Modelo de respuesta (``ConsumptionResponse``, etc.)
+        :param response: Respuesta de la API ya normalizada
+        :type response: dict
+        :param records_field: Nombre Python del campo con la lista de registros
+        :type records_field: str
+        :param record_model: Modelo de cada registro
+        :return: Respuesta con los registros válidos, o ``None`` si no se puede rescatar
+        """
+        if not self.salvage_invalid_records:
+            return None
+
+        from ...models.responses import salvage_response
+
+        try:
+            return salvage_response(
+                response_model, response, records_field, record_model
+            )
+        except Exception as e:
+            emit(
+                logger,
+                logging.WARNING,
+                "validation.salvage_failed",
+                "No se pudo rescatar la respuesta: %(error)s",
+                error=str(e),
+            )
+            return None
+
     def get_supplies(
         self,
         authorized_nif: Optional[str] = None,
@@ -82,12 +195,24 @@ class DatadisClientV2(BaseDatadisClient):
 
         # Validar respuesta completa con Pydantic
         from ...models.responses import SuppliesResponse
+        from ...models.supply import SupplyData
 
         try:
             validated_response = SuppliesResponse(**response)
             return validated_response
         except Exception as e:
-            print(f"Error validando respuesta de suministros: {e}")
+            emit(
+                logger,
+                logging.WARNING,
+                "supplies.validation_error",
+                "Error validando respuesta de suministros: %(error)s",
+                error=str(e),
+            )
+            salvaged = self._salvage_response(
+                SuppliesResponse, response, "supplies", SupplyData
+            )
+            if salvaged is not None:
+                return salvaged
             # Devolver respuesta vacía pero válida
             return SuppliesResponse(supplies=[], distributorError=[])
 
@@ -125,7 +250,13 @@ class DatadisClientV2(BaseDatadisClient):
             validated_response = DistributorsResponse(**response)
             return validated_response
         except Exception as e:
-            print(f"Error validando respuesta de distribuidores: {e}")
+            emit(
+                logger,
+                logging.WARNING,
+                "distributors.validation_error",
+                "Error validando respuesta de distribuidores: %(error)s",
+                error=str(e),
+            )
             # Devolver respuesta vacía pero válida
             return DistributorsResponse(
                 distExistenceUser={"distributorCodes": []}, distributorError=[]
@@ -162,13 +293,25 @@ class DatadisClientV2(BaseDatadisClient):
             response = {"contract": [], "distributorError": []}
 
         # Validar respuesta completa con Pydantic
+        from ...models.contract import ContractData
         from ...models.responses import ContractResponse
 
         try:
             validated_response = ContractResponse(**response)
             return validated_response
         except Exception as e:
-            print(f"Error validando respuesta de contrato: {e}")
+            emit(
+                logger,
+                logging.WARNING,
+                "contract.validation_error",
+                "Error validando respuesta de contrato: %(error)s",
+                error=str(e),
+            )
+            salvaged = self._salvage_response(
+                ContractResponse, response, "contract", ContractData
+            )
+            if salvaged is not None:
+                return salvaged
             # Devolver respuesta vacía pero válida
             return ContractResponse(contract=[], distributorError=[])
 
@@ -220,8 +363,10 @@ class DatadisClientV2(BaseDatadisClient):
         if authorized_nif is not None:
             params["authorizedNif"] = authorized_nif
 
-        response = self.make_authenticated_request(
-            "GET", API_V2_ENDPOINTS["consumption"], params=params
+        response = self._request_month_range(
+            API_V2_ENDPOINTS["consumption"],
+            params,
+            partial(merge_chunk_responses, records_key="timeCurve"),
         )
 
         # Asegurar estructura de respuesta válida
@@ -229,13 +374,25 @@ class DatadisClientV2(BaseDatadisClient):
             response = {"timeCurve": [], "distributorError": []}
 
         # Validar respuesta completa con Pydantic
+        from ...models.consumption import ConsumptionData
         from ...models.responses import ConsumptionResponse
 
         try:
             validated_response = ConsumptionResponse(**response)
             return validated_response
         except Exception as e:
-            print(f"Error validando respuesta de consumo: {e}")
+            emit(
+                logger,
+                logging.WARNING,
+                "consumption.validation_error",
+                "Error validando respuesta de consumo: %(error)s",
+                error=str(e),
+            )
+            salvaged = self._salvage_response(
+                ConsumptionResponse, response, "time_curve", ConsumptionData
+            )
+            if salvaged is not None:
+                return salvaged
             # Devolver respuesta vacía pero válida
             return ConsumptionResponse(timeCurve=[], distributorError=[])
 
@@ -276,8 +433,10 @@ class DatadisClientV2(BaseDatadisClient):
         if authorized_nif is not None:
             params["authorizedNif"] = authorized_nif
 
-        response = self.make_authenticated_request(
-            "GET", API_V2_ENDPOINTS["max_power"], params=params
+        response = self._request_month_range(
+            API_V2_ENDPOINTS["max_power"],
+            params,
+            partial(merge_chunk_responses, records_key="maxPower"),
         )
 
         # Asegurar estructura de respuesta válida
@@ -285,13 +444,25 @@ class DatadisClientV2(BaseDatadisClient):
             response = {"maxPower": [], "distributorError": []}
 
         # Validar respuesta completa con Pydantic
+        from ...models.max_power import MaxPowerData
         from ...models.responses import MaxPowerResponse
 
         try:
             validated_response = MaxPowerResponse(**response)
             return validated_response
         except Exception as e:
-            print(f"Error validando respuesta de potencia máxima: {e}")
+            emit(
+                logger,
+                logging.WARNING,
+                "max_power.validation_error",
+                "Error validando respuesta de potencia máxima: %(error)s",
+                error=str(e),
+            )
+            salvaged = self._salvage_response(
+                MaxPowerResponse, response, "max_power", MaxPowerData
+            )
+            if salvaged is not None:
+                return salvaged
             # Devolver respuesta vacía pero válida
             return MaxPowerResponse(maxPower=[], distributorError=[])
 
@@ -332,8 +503,8 @@ class DatadisClientV2(BaseDatadisClient):
         if authorized_nif is not None:
             params["authorizedNif"] = authorized_nif
 
-        response = self.make_authenticated_request(
-            "GET", API_V2_ENDPOINTS["reactive_data"], params=params
+        response = self._request_month_range(
+            API_V2_ENDPOINTS["reactive_data"], params, merge_reactive_responses
         )
 
         # Asegurar estructura de respuesta válida
@@ -354,7 +525,28 @@ class DatadisClientV2(BaseDatadisClient):
                 validated_reactive_item = ReactiveData(**reactive_data)
                 validated_reactive_data.append(validated_reactive_item)
             except Exception as e:
-                print(f"Error validando datos de energía reactiva: {e}")
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "reactive_energy.validation_error",
+                    "Error validando datos de energía reactiva: %(error)s",
+                    error=str(e),
+                )
+                if self.salvage_invalid_records:
+                    from ...models.reactive import salvage_reactive_data
+
+                    try:
+                        validated_reactive_data.append(
+                            salvage_reactive_data(reactive_data)
+                        )
+                    except Exception as salvage_error:
+                        emit(
+                            logger,
+                            logging.WARNING,
+                            "validation.salvage_failed",
+                            "No se pudo rescatar la respuesta: %(error)s",
+                            error=str(salvage_error),
+                        )
                 continue
 
         return validated_reactive_data
@@ -4,17 +4,16 @@ Cliente V2 simplificado y robusto para Datadis.
 Este módulo proporciona un cliente simplificado para la versión 2 de la API de Datadis.
 """
 
+import logging
 import time
 from datetime import date, datetime
-from typing import TYPE_CHECKING, List, Optional, Union
+from functools import partial
+from typing import TYPE_CHECKING, Callable, List, Optional, TypeVar, Union
 
 import requests
 
 if TYPE_CHECKING:
-    from ...models.consumption import ConsumptionData
-    from ...models.contract import ContractData
     from ...models.distributor import DistributorData
-    from ...models.max_power import MaxPowerData
     from ...models.reactive import ReactiveData
     from ...models.responses import (
         ConsumptionResponse,
@@ -23,16 +22,22 @@ if TYPE_CHECKING:
         MaxPowerResponse,
         SuppliesResponse,
     )
-    from ...models.supply import SupplyData
 
 from ...exceptions import APIError, AuthenticationError, DatadisError
+from ...utils.chunking import (
+    merge_chunk_responses,
+    merge_reactive_responses,
+    request_month_range,
+)
 from ...utils.constants import (
     API_V2_ENDPOINTS,
     AUTH_ENDPOINTS,
     DATADIS_API_BASE,
     DATADIS_BASE_URL,
 )
-from ...utils.text_utils import normalize_api_response
+from ...utils.events import emit, response_size
+from ...utils.http import decode_json_body
+from ...utils.text_utils import normalize_api_response, text_fields_for_endpoint
 from ...utils.type_converters import (
     convert_cups_parameter,
     convert_date_range_to_api_format,
@@ -41,9 +46,18 @@ from ...utils.type_converters import (
     convert_optional_number_to_string,
 )
 from ...utils.validators import validate_measurement_type, validate_point_type
+from .authorization import AuthorizationRequestsMixin
+from .bulk import BulkRequestsMixin
+from .streaming import StreamingRequestsMixin
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 
-class SimpleDatadisClientV2:
+class SimpleDatadisClientV2(
+    AuthorizationRequestsMixin, BulkRequestsMixin, StreamingRequestsMixin
+):
     """
     Cliente simplificado para la API V2 de Datadis con manejo mejorado de errores.
 
@@ -127,6 +141,34 @@ class SimpleDatadisClientV2:
     :param retries: Número de reintentos automáticos en caso de fallos de red o timeouts.
                    3 intentos por defecto
     :type retries: int
+    :param salvage_invalid_records: Si es ``True`` (por defecto), cuando algún registro de
+                                   la respuesta no supera la validación se conservan los
+                                   registros válidos y los descartados se informan en
+                                   ``rejected_records``. Si es ``False``, se devuelve una
+                                   respuesta vacía (comportamiento anterior)
+    :type salvage_invalid_records: bool
+    :param chunk_months: Si se indica, las consultas por rango de meses
+                        (``get_consumption``, ``get_max_power`` y
+                        ``get_reactive_data``) más largas se dividen en bloques de
+                        este número de meses, que se descargan en paralelo y se
+                        fusionan. Solo se reintentan los bloques que fallan.
+                        ``None`` (por defecto) hace una única petición
+    :type chunk_months: Optional[int]
+    :param max_workers: Número máximo de bloques descargados a la vez
+    :type max_workers: int
+
+    Para carteras con muchos suministros, ``get_consumption_many``,
+    ``get_max_power_many``, ``get_contract_detail_many`` y ``get_reactive_data_many``
+    ejecutan las consultas en paralelo con límite por distribuidora y devuelven un
+    resultado o error por suministro (ver :class:`BulkRequestsMixin`).
+    ``get_supplies_for_nifs`` y ``get_distributors_for_nifs`` consultan en paralelo
+    muchos NIF autorizados y fusionan las respuestas indicando el NIF de origen.
+    ``list_authorizations``, ``new_authorization`` y ``cancel_authorization``
+    gestionan las autorizaciones (ver :class:`AuthorizationRequestsMixin`).
+
+    ``iter_consumption``, ``iter_max_power`` e ``iter_reactive_data`` (y sus
+    versiones asíncronas ``aiter_*``) entregan los registros bloque a bloque según
+    se descargan, con memoria acotada (ver :class:`StreamingRequestsMixin`).
 
     :raises AuthenticationError: Si las credenciales proporcionadas son inválidas
     :raises DatadisError: Si ocurren errores de conexión o de la API
@@ -141,7 +183,14 @@ class SimpleDatadisClientV2:
     """
 
     def __init__(
-        self, username: str, password: str, timeout: int = 120, retries: int = 3
+        self,
+        username: str,
+        password: str,
+        timeout: int = 120,
+        retries: int = 3,
+        salvage_invalid_records: bool = True,
+        chunk_months: Optional[int] = None,
+        max_workers: int = 4,
     ):
         """
         Inicializa el cliente simplificado V2.
@@ -154,11 +203,21 @@ class SimpleDatadisClientV2:
         :type timeout: int
         :param retries: Número de reintentos
         :type retries: int
+        :param salvage_invalid_records: Conservar los registros válidos cuando alguno
+                                       falla la validación
+        :type salvage_invalid_records: bool
+        :param chunk_months: Meses por bloque en consultas de rangos largos
+        :type chunk_months: Optional[int]
+        :param max_workers: Bloques descargados en paralelo
+        :type max_workers: int
         """
         self.username = username
         self.password = password
         self.timeout = timeout
         self.retries = retries
+        self.salvage_invalid_records = salvage_invalid_records
+        self.chunk_months = chunk_months
+        self.max_workers = max_workers
         self.token: Optional[str] = None
         self.session = requests.Session()
 
@@ -224,7 +283,7 @@ class SimpleDatadisClientV2:
            El token obtenido se almacena automáticamente en ``self.token`` y se añade
            a los headers de la sesión HTTP como ``Authorization: Bearer <token>``.
         """
-        print("Autenticando con Datadis...")
+        emit(logger, logging.DEBUG, "auth.start", "Autenticando con Datadis...")
 
         headers = {
             "Content-Type": "application/x-www-form-urlencoded",
@@ -250,7 +309,7 @@ class SimpleDatadisClientV2:
                     )
                 self.token = token
                 self.session.headers["Authorization"] = f"Bearer {self.token}"
-                print("Autenticación exitosa")
+                emit(logger, logging.INFO, "auth.success", "Autenticación exitosa")
                 return True
             else:
                 raise AuthenticationError(
@@ -263,7 +322,11 @@ class SimpleDatadisClientV2:
             raise AuthenticationError(f"Error en autenticación: {e}")
 
     def _make_authenticated_request(
-        self, endpoint: str, params: Optional[dict] = None
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        method: str = "GET",
+        data: Optional[dict] = None,
     ) -> dict:
         """
         Realiza peticiones HTTP autenticadas optimizadas para la API V2 de Datadis.
@@ -281,7 +344,7 @@ class SimpleDatadisClientV2:
 
         Flujo de operación V2:
             1. Verifica token válido → autentica automáticamente si es necesario
-            2. Realiza petición HTTP GET al endpoint V2 especificado
+            2. Realiza la petición HTTP (GET por defecto) al endpoint especificado
             3. Maneja códigos de respuesta (200: éxito, 401: renovar token, otros: error)
             4. **Normaliza respuesta** para caracteres especiales (específico de Datadis)
             5. **Garantiza estructura dict** compatible con modelos de respuesta V2
@@ -289,7 +352,8 @@ class SimpleDatadisClientV2:
 
         Estrategia de reintentos (idéntica a V1):
             - Errores HTTP 4xx/5xx: No se reintentan (propagación inmediata)
-            - Timeouts y errores de red: Reintentos hasta ``self.retries`` veces
+            - Timeouts y errores de red: Reintentos hasta ``self.retries`` veces (solo
+              en ``GET``; un ``POST`` no se repite para no duplicar su efecto)
             - Backoff exponencial: 2s → 4s → 8s... (máximo 30s para timeouts)
             - Error 401: Renovación automática de token + reintento de la petición
 
@@ -297,6 +361,10 @@ class SimpleDatadisClientV2:
         :type endpoint: str
         :param params: Parámetros de query string para la petición HTTP
         :type params: Optional[dict]
+        :param method: Método HTTP (``GET`` o ``POST``)
+        :type method: str
+        :param data: Cuerpo JSON de las peticiones ``POST``
+        :type data: Optional[dict]
         :return: Respuesta JSON como dict, garantizando estructura compatible con V2.
                 Siempre incluye claves esperadas por los modelos de respuesta
         :rtype: dict
@@ -311,36 +379,108 @@ class SimpleDatadisClientV2:
         .. versionchanged:: 2.0
            Garantiza respuestas dict y manejo mejorado de estructuras V2
         """
+
+        def decode(response: requests.Response) -> dict:
+            json_response, repaired = decode_json_body(response)
+            # Normalizar solo los campos de texto libre de este endpoint,
+            # sobre el propio JSON recién decodificado (sin copias)
+            normalized_response = normalize_api_response(
+                json_response,
+                text_fields_for_endpoint(endpoint),
+                in_place=True,
+                repair_encoding=not repaired,
+            )
+            # Asegurar que siempre devolvemos un dict (V2 API debería devolver dicts)
+            if isinstance(normalized_response, dict):
+                return normalized_response
+            else:
+                # Si por alguna razón es una lista, envolver en dict
+                return {"data": normalized_response}
+
+        return self._send_authenticated(endpoint, params, decode, method, data)
+
+    def _send_authenticated(
+        self,
+        endpoint: str,
+        params: Optional[dict],
+        handle: Callable[[requests.Response], T],
+        method: str = "GET",
+        data: Optional[dict] = None,
+    ) -> T:
+        """
+        Envía una petición autenticada con reintentos y procesa la respuesta 200.
+
+        Implementa el flujo descrito en :meth:`_make_authenticated_request`.
+        ``handle`` recibe la respuesta correcta y se ejecuta dentro del bucle de
+        reintentos, de modo que sus errores se tratan igual que los de red. Solo
+        las peticiones ``GET`` se reintentan ante timeouts y errores de red: un
+        ``POST`` que agota el tiempo puede haberse procesado y repetirlo lo
+        duplicaría.
+
+        :param endpoint: Endpoint relativo de la API V2
+        :type endpoint: str
+        :param params: Parámetros de query string
+        :type params: Optional[dict]
+        :param handle: Función que convierte la respuesta correcta en el resultado
+        :type handle: Callable[[requests.Response], T]
+        :param method: Método HTTP (``GET`` o ``POST``)
+        :type method: str
+        :param data: Cuerpo JSON de las peticiones ``POST``
+        :type data: Optional[dict]
+        :return: Resultado de ``handle``
+        :raises AuthenticationError: Si no se puede autenticar o renovar el token
+        :raises APIError: Si la API devuelve un error HTTP
+        :raises DatadisError: Si se agotan los reintentos
+        """
         if not self.token:
             if not self.authenticate():
                 raise AuthenticationError("No se pudo autenticar")
 
         url = f"{DATADIS_API_BASE}{endpoint}"
 
+        # Los reintentos por timeout o error de red solo son seguros en GET. Un
+        # POST solo usa las iteraciones restantes para reenviarse tras renovar un
+        # token caducado (401), que no cuenta como un intento más
+        retries = self.retries if method == "GET" else 0
         for attempt in range(self.retries + 1):
             try:
-                print(
-                    f"Petición a {endpoint} (intento {attempt + 1}/{self.retries + 1})..."
+                emit(
+                    logger,
+                    logging.DEBUG,
+                    "request.start",
+                    "Petición a %(endpoint)s (intento %(attempt)d/%(attempts)d)...",
+                    endpoint=endpoint,
+                    attempt=min(attempt, retries) + 1,
+                    attempts=retries + 1,
                 )
 
-                response = self.session.get(
-                    url=url, params=params, timeout=self.timeout
-                )
+                if method == "GET":
+                    response = self.session.get(
+                        url=url, params=params, timeout=self.timeout
+                    )
+                else:
+                    response = self.session.request(
+                        method, url=url, params=params, json=data, timeout=self.timeout
+                    )
 
                 if response.status_code == 200:
-                    print(f"Respuesta exitosa ({len(response.text)} chars)")
-                    json_response = response.json()
-                    # Normalizar texto para evitar problemas de caracteres especiales
-                    normalized_response = normalize_api_response(json_response)
-                    # Asegurar que siempre devolvemos un dict (V2 API debería devolver dicts)
-                    if isinstance(normalized_response, dict):
-                        return normalized_response
-                    else:
-                        # Si por alguna razón es una lista, envolver en dict
-                        return {"data": normalized_response}
+                    emit(
+                        logger,
+                        logging.DEBUG,
+                        "request.success",
+                        "Respuesta exitosa de %(endpoint)s (%(bytes)s bytes)",
+                        endpoint=endpoint,
+                        bytes=response_size(response),
+                    )
+                    return handle(response)
                 elif response.status_code == 401:
                     # Token expirado, renovar
-                    print("Token expirado, renovando...")
+                    emit(
+                        logger,
+                        logging.INFO,
+                        "auth.token_expired",
+                        "Token expirado, renovando...",
+                    )
                     self.token = None
                     if self.authenticate():
                         continue
@@ -356,29 +496,166 @@ class SimpleDatadisClientV2:
                 # Los errores HTTP (4xx, 5xx) no deben ser reintentados, propagarlos directamente
                 raise
             except requests.Timeout:
-                if attempt < self.retries:
+                if attempt < retries:
                     wait_time = min(30, (2**attempt) * 5)
-                    print(
-                        f"Timeout. Esperando {wait_time}s antes del siguiente intento..."
+                    emit(
+                        logger,
+                        logging.WARNING,
+                        "request.timeout",
+                        "Timeout en %(endpoint)s. Esperando %(wait)ss antes del "
+                        "siguiente intento...",
+                        endpoint=endpoint,
+                        wait=wait_time,
                     )
                     time.sleep(wait_time)
                 else:
                     raise DatadisError(
-                        f"Timeout después de {self.retries + 1} intentos. La API de Datadis puede estar lenta."
+                        f"Timeout después de {attempt + 1} intentos. La API de Datadis puede estar lenta."
                     )
             except Exception as e:
                 # Solo reintentar errores de red/conexión, no errores de aplicación
-                if attempt < self.retries:
+                if attempt < retries:
                     wait_time = (2**attempt) * 2
-                    print(f"Error: {e}. Reintentando en {wait_time}s...")
+                    emit(
+                        logger,
+                        logging.WARNING,
+                        "request.retry",
+                        "Error en %(endpoint)s: %(error)s. Reintentando en "
+                        "%(wait)ss...",
+                        endpoint=endpoint,
+                        error=str(e),
+                        wait=wait_time,
+                    )
                     time.sleep(wait_time)
                 else:
-                    raise DatadisError(
-                        f"Error después de {self.retries + 1} intentos: {e}"
-                    )
+                    raise DatadisError(f"Error después de {attempt + 1} intentos: {e}")
 
         raise DatadisError("Se agotaron todos los reintentos")
 
+    def _authenticate_once(self) -> None:
+        """Autentica una sola vez antes de repartir peticiones entre hilos."""
+        if not self.token and not self.authenticate():
+            raise AuthenticationError("No se pudo autenticar")
+
+    def _request_raw(self, endpoint: str, params: dict) -> bytes:
+        """Cuerpo sin decodificar de una consulta (ver :mod:`datadis_python.jobs`)."""
+        return self._send_authenticated(
+            endpoint, params, lambda response: response.content
+        )
+
+    def _authorization_request(
+        self, method: str, endpoint: str, data: Optional[dict] = None
+    ) -> dict:
+        """Petición a un endpoint de autorizaciones (ver :mod:`.authorization`)."""
+        return self._make_authenticated_request(endpoint, method=method, data=data)
+
+    def _request_month_range(self, endpoint: str, params: dict, merge) -> dict:
+        """
+        Realiza una consulta por rango de meses, en bloques si ``chunk_months`` lo pide.
+
+        :param endpoint: Endpoint relativo de la API V2
+        :type endpoint: str
+        :param params: Parámetros de la consulta con ``startDate`` y ``endDate``
+        :type params: dict
+        :param merge: Función que fusiona las respuestas de los bloques
+        :return: Respuesta de la API (fusionada si se dividió en bloques)
+        :rtype: dict
+        """
+        if self.chunk_months and not self.token:
+            # Autenticar una sola vez antes de repartir los bloques entre hilos
+            if not self.authenticate():
+                raise AuthenticationError("No se pudo autenticar")
+
+        return request_month_range(
+            lambda chunk_params: self._make_authenticated_request(
+                endpoint, chunk_params
+            ),
+            params,
+            merge,
+            self.chunk_months,
+            self.max_workers,
+        )
+
+    def _salvage_response(
+        self, response_model, response: dict, records_field: str, record_model
+    ):
+        """
+        Intenta rescatar los registros válidos de una respuesta que no pasó la validación.
+
+        :param response_model: Modelo de respuesta (``ConsumptionResponse``, etc.)
+        :param response: Respuesta de la API ya normalizada
+        :type response: dict
+        :param records_field: Nombre Python del campo con la lista de registros
+        :type records_field: str
+        :param record_model: Modelo de cada registro
+        :return: Respuesta con los registros válidos, o ``None`` si el modo de rescate
+                está desactivado o la respuesta no se puede rescatar
+        """
+        if not self.salvage_invalid_records:
+            return None
+
+        from ...models.responses import salvage_response
+
+        try:
+            salvaged = salvage_response(
+                response_model, response, records_field, record_model
+            )
+        except Exception as e:
+            emit(
+                logger,
+                logging.WARNING,
+                "validation.salvage_failed",
+                "No se pudo rescatar la respuesta: %(error)s",
+                error=str(e),
+            )
+            return None
+
+        emit(
+            logger,
+            logging.WARNING,
+            "validation.salvaged",
+            "Modo rescate: %(valid)d registros válidos, %(rejected)d descartados",
+            valid=len(getattr(salvaged, records_field)),
+            rejected=len(salvaged.rejected_records),
+        )
+        return salvaged
+
+    def _salvage_reactive_data(self, reactive_data: dict):
+        """
+        Intenta rescatar los períodos válidos de una respuesta de energía reactiva.
+
+        :param reactive_data: Respuesta de la API con la clave ``reactiveEnergy``
+        :type reactive_data: dict
+        :return: ``ReactiveData`` con los períodos válidos, o ``None`` si el modo de
+                rescate está desactivado o la respuesta no se puede rescatar
+        """
+        if not self.salvage_invalid_records:
+            return None
+
+        from ...models.reactive import salvage_reactive_data
+
+        try:
+            salvaged = salvage_reactive_data(reactive_data)
+        except Exception as e:
+            emit(
+                logger,
+                logging.WARNING,
+                "validation.salvage_failed",
+                "No se pudo rescatar la respuesta: %(error)s",
+                error=str(e),
+            )
+            return None
+
+        emit(
+            logger,
+            logging.WARNING,
+            "validation.salvaged",
+            "Modo rescate: %(valid)d períodos válidos, %(rejected)d descartados",
+            valid=len(salvaged.reactive_energy.energy),
+            rejected=len(salvaged.rejected_records),
+        )
+        return salvaged
+
     def get_supplies(
         self,
         authorized_nif: Optional[str] = None,
@@ -479,7 +756,12 @@ class SimpleDatadisClientV2:
            A diferencia de V1, esta operación puede tener éxito parcial: obtener
            suministros de algunos distribuidores aunque otros fallen.
         """
-        print("Obteniendo lista de suministros...")
+        emit(
+            logger,
+            logging.INFO,
+            "supplies.request",
+            "Obteniendo lista de suministros...",
+        )
 
         # Construir parámetros de query con validación
         params = {}
@@ -500,17 +782,39 @@ class SimpleDatadisClientV2:
 
         # Validar respuesta completa con Pydantic
         from ...models.responses import SuppliesResponse
+        from ...models.supply import SupplyData
 
         try:
             validated_response = SuppliesResponse(**response)
-            print(f"{len(validated_response.supplies)} suministros validados")
+            emit(
+                logger,
+                logging.INFO,
+                "supplies.validated",
+                "%(count)d suministros validados",
+                count=len(validated_response.supplies),
+            )
             if validated_response.distributor_error:
-                print(
-                    f"Advertencia: {len(validated_response.distributor_error)} errores de distribuidor"
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "supplies.distributor_error",
+                    "Advertencia: %(count)d errores de distribuidor",
+                    count=len(validated_response.distributor_error),
                 )
             return validated_response
         except Exception as e:
-            print(f"Error validando respuesta de suministros: {e}")
+            emit(
+                logger,
+                logging.WARNING,
+                "supplies.validation_error",
+                "Error validando respuesta de suministros: %(error)s",
+                error=str(e),
+            )
+            salvaged = self._salvage_response(
+                SuppliesResponse, response, "supplies", SupplyData
+            )
+            if salvaged is not None:
+                return salvaged
             # Devolver respuesta vacía pero válida
             return SuppliesResponse(supplies=[], distributorError=[])
 
@@ -614,7 +918,12 @@ class SimpleDatadisClientV2:
            Solo se devuelven códigos de distribuidores donde el usuario (o NIF autorizado)
            tiene suministros activos. La lista puede estar vacía si no hay suministros.
         """
-        print("Obteniendo distribuidores...")
+        emit(
+            logger,
+            logging.INFO,
+            "distributors.request",
+            "Obteniendo distribuidores...",
+        )
 
         params = {}
         if authorized_nif is not None:
@@ -639,14 +948,30 @@ class SimpleDatadisClientV2:
             distributor_codes = validated_response.dist_existence_user.get(
                 "distributorCodes", []
             )
-            print(f"{len(distributor_codes)} distribuidores validados")
+            emit(
+                logger,
+                logging.INFO,
+                "distributors.validated",
+                "%(count)d distribuidores validados",
+                count=len(distributor_codes),
+            )
             if validated_response.distributor_error:
-                print(
-                    f"Advertencia: {len(validated_response.distributor_error)} errores de distribuidor"
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "distributors.distributor_error",
+                    "Advertencia: %(count)d errores de distribuidor",
+                    count=len(validated_response.distributor_error),
                 )
             return validated_response
         except Exception as e:
-            print(f"Error validando respuesta de distribuidores: {e}")
+            emit(
+                logger,
+                logging.WARNING,
+                "distributors.validation_error",
+                "Error validando respuesta de distribuidores: %(error)s",
+                error=str(e),
+            )
             # Devolver respuesta vacía pero válida
             return DistributorsResponse(
                 distExistenceUser={"distributorCodes": []}, distributorError=[]
@@ -773,7 +1098,13 @@ class SimpleDatadisClientV2:
            El CUPS debe ser exactamente de 22 caracteres alfanuméricos.
            La V2 incluye validación mejorada y mensajes de error más descriptivos.
         """
-        print(f"Obteniendo contrato para {cups}...")
+        emit(
+            logger,
+            logging.INFO,
+            "contract.request",
+            "Obteniendo contrato para %(cups)s...",
+            cups=cups,
+        )
 
         # Convertir parámetros usando los conversores
         cups = convert_cups_parameter(cups)
@@ -792,18 +1123,40 @@ class SimpleDatadisClientV2:
             response = {"contract": [], "distributorError": []}
 
         # Validar respuesta completa con Pydantic
+        from ...models.contract import ContractData
         from ...models.responses import ContractResponse
 
         try:
             validated_response = ContractResponse(**response)
-            print(f"{len(validated_response.contract)} contratos validados")
+            emit(
+                logger,
+                logging.INFO,
+                "contract.validated",
+                "%(count)d contratos validados",
+                count=len(validated_response.contract),
+            )
             if validated_response.distributor_error:
-                print(
-                    f"Advertencia: {len(validated_response.distributor_error)} errores de distribuidor"
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "contract.distributor_error",
+                    "Advertencia: %(count)d errores de distribuidor",
+                    count=len(validated_response.distributor_error),
                 )
             return validated_response
         except Exception as e:
-            print(f"Error validando respuesta de contrato: {e}")
+            emit(
+                logger,
+                logging.WARNING,
+                "contract.validation_error",
+                "Error validando respuesta de contrato: %(error)s",
+                error=str(e),
+            )
+            salvaged = self._salvage_response(
+                ContractResponse, response, "contract", ContractData
+            )
+            if salvaged is not None:
+                return salvaged
             # Devolver respuesta vacía pero válida
             return ContractResponse(contract=[], distributorError=[])
 
@@ -962,7 +1315,15 @@ class SimpleDatadisClientV2:
            Los datos cuarto-horarios siguen teniendo las mismas limitaciones que en V1:
            solo disponibles para tipos de punto 1, 2, y 3 en E-distribución.
         """
-        print(f"Obteniendo consumo para {cups} ({date_from} - {date_to})...")
+        emit(
+            logger,
+            logging.INFO,
+            "consumption.request",
+            "Obteniendo consumo para %(cups)s (%(date_from)s - %(date_to)s)...",
+            cups=cups,
+            date_from=date_from,
+            date_to=date_to,
+        )
 
         # Convertir parámetros usando los conversores
         cups = convert_cups_parameter(cups)
@@ -992,8 +1353,10 @@ class SimpleDatadisClientV2:
         if authorized_nif is not None:
             params["authorizedNif"] = authorized_nif
 
-        response = self._make_authenticated_request(
-            API_V2_ENDPOINTS["consumption"], params
+        response = self._request_month_range(
+            API_V2_ENDPOINTS["consumption"],
+            params,
+            partial(merge_chunk_responses, records_key="timeCurve"),
         )
 
         # Asegurar estructura de respuesta válida
@@ -1001,20 +1364,40 @@ class SimpleDatadisClientV2:
             response = {"timeCurve": [], "distributorError": []}
 
         # Validar respuesta completa con Pydantic
+        from ...models.consumption import ConsumptionData
         from ...models.responses import ConsumptionResponse
 
         try:
             validated_response = ConsumptionResponse(**response)
-            print(
-                f"{len(validated_response.time_curve)} registros de consumo validados"
+            emit(
+                logger,
+                logging.INFO,
+                "consumption.validated",
+                "%(count)d registros de consumo validados",
+                count=len(validated_response.time_curve),
             )
             if validated_response.distributor_error:
-                print(
-                    f"Advertencia: {len(validated_response.distributor_error)} errores de distribuidor"
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "consumption.distributor_error",
+                    "Advertencia: %(count)d errores de distribuidor",
+                    count=len(validated_response.distributor_error),
                 )
             return validated_response
         except Exception as e:
-            print(f"Error validando respuesta de consumo: {e}")
+            emit(
+                logger,
+                logging.WARNING,
+                "consumption.validation_error",
+                "Error validando respuesta de consumo: %(error)s",
+                error=str(e),
+            )
+            salvaged = self._salvage_response(
+                ConsumptionResponse, response, "time_curve", ConsumptionData
+            )
+            if salvaged is not None:
+                return salvaged
             # Devolver respuesta vacía pero válida
             return ConsumptionResponse(timeCurve=[], distributorError=[])
 
@@ -1173,7 +1556,16 @@ class SimpleDatadisClientV2:
            Las potencias se devuelven en Vatios (W) como en V1. Para obtener
            kilovatios (kW) divida el valor entre 1000.
         """
-        print(f"Obteniendo potencia máxima para {cups} ({date_from} - {date_to})...")
+        emit(
+            logger,
+            logging.INFO,
+            "max_power.request",
+            "Obteniendo potencia máxima para %(cups)s (%(date_from)s - "
+            "%(date_to)s)...",
+            cups=cups,
+            date_from=date_from,
+            date_to=date_to,
+        )
 
         # Convertir parámetros usando los conversores
         cups = convert_cups_parameter(cups)
@@ -1191,8 +1583,10 @@ class SimpleDatadisClientV2:
         if authorized_nif is not None:
             params["authorizedNif"] = authorized_nif
 
-        response = self._make_authenticated_request(
-            API_V2_ENDPOINTS["max_power"], params
+        response = self._request_month_range(
+            API_V2_ENDPOINTS["max_power"],
+            params,
+            partial(merge_chunk_responses, records_key="maxPower"),
         )
 
         # Asegurar estructura de respuesta válida
@@ -1200,20 +1594,40 @@ class SimpleDatadisClientV2:
             response = {"maxPower": [], "distributorError": []}
 
         # Validar respuesta completa con Pydantic
+        from ...models.max_power import MaxPowerData
         from ...models.responses import MaxPowerResponse
 
         try:
             validated_response = MaxPowerResponse(**response)
-            print(
-                f"{len(validated_response.max_power)} registros de potencia máxima validados"
+            emit(
+                logger,
+                logging.INFO,
+                "max_power.validated",
+                "%(count)d registros de potencia máxima validados",
+                count=len(validated_response.max_power),
             )
             if validated_response.distributor_error:
-                print(
-                    f"Advertencia: {len(validated_response.distributor_error)} errores de distribuidor"
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "max_power.distributor_error",
+                    "Advertencia: %(count)d errores de distribuidor",
+                    count=len(validated_response.distributor_error),
                 )
             return validated_response
         except Exception as e:
-            print(f"Error validando respuesta de potencia máxima: {e}")
+            emit(
+                logger,
+                logging.WARNING,
+                "max_power.validation_error",
+                "Error validando respuesta de potencia máxima: %(error)s",
+                error=str(e),
+            )
+            salvaged = self._salvage_response(
+                MaxPowerResponse, response, "max_power", MaxPowerData
+            )
+            if salvaged is not None:
+                return salvaged
             # Devolver respuesta vacía pero válida
             return MaxPowerResponse(maxPower=[], distributorError=[])
 
@@ -1377,7 +1791,16 @@ class SimpleDatadisClientV2:
            La energía reactiva puede generar penalizaciones en la factura eléctrica.
            Use estos datos para optimizar el factor de potencia de su instalación.
         """
-        print(f"Obteniendo energía reactiva para {cups} ({date_from} - {date_to})...")
+        emit(
+            logger,
+            logging.INFO,
+            "reactive_energy.request",
+            "Obteniendo energía reactiva para %(cups)s (%(date_from)s - "
+            "%(date_to)s)...",
+            cups=cups,
+            date_from=date_from,
+            date_to=date_to,
+        )
 
         # Convertir parámetros usando los conversores
         cups = convert_cups_parameter(cups)
@@ -1395,8 +1818,8 @@ class SimpleDatadisClientV2:
         if authorized_nif is not None:
             params["authorizedNif"] = authorized_nif
 
-        response = self._make_authenticated_request(
-            API_V2_ENDPOINTS["reactive_data"], params
+        response = self._request_month_range(
+            API_V2_ENDPOINTS["reactive_data"], params, merge_reactive_responses
         )
 
         # Asegurar estructura de respuesta válida
@@ -1417,10 +1840,25 @@ class SimpleDatadisClientV2:
                 validated_reactive_item = ReactiveData(**reactive_data)
                 validated_reactive_data.append(validated_reactive_item)
             except Exception as e:
-                print(f"Error validando datos de energía reactiva: {e}")
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "reactive_energy.validation_error",
+                    "Error validando datos de energía reactiva: %(error)s",
+                    error=str(e),
+                )
+                salvaged_item = self._salvage_reactive_data(reactive_data)
+                if salvaged_item is not None:
+                    validated_reactive_data.append(salvaged_item)
                 continue
 
-        print(f"{len(validated_reactive_data)} registros de energía reactiva validados")
+        emit(
+            logger,
+            logging.INFO,
+            "reactive_energy.validated",
+            "%(count)d registros de energía reactiva validados",
+            count=len(validated_reactive_data),
+        )
         return validated_reactive_data
 
     def close(self):
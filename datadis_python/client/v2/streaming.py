@@ -0,0 +1,263 @@
+"""
+Consultas en streaming para los clientes V2 de Datadis.
+
+Este módulo define :class:`StreamingRequestsMixin`, que añade a los clientes V2
+generadores que entregan los registros de una consulta por rango de meses a medida
+que se descarga cada bloque, en lugar de esperar a la respuesta completa:
+
+- ``iter_consumption``, ``iter_max_power`` e ``iter_reactive_data`` (síncronos).
+- ``aiter_consumption``, ``aiter_max_power`` y ``aiter_reactive_data``
+  (asíncronos, para ``async for``).
+
+Los bloques siguientes se descargan en segundo plano mientras el consumidor procesa
+el actual y solo se mantienen en memoria los bloques descargados por adelantado
+(``max_workers``).
+
+Example:
+    Escribir la curva de carga de dos años sin cargarla entera en memoria::
+
+        for batch in client.iter_consumption(
+            cups, "2", "2023/01", "2024/12", batches=True
+        ):
+            writer.write_rows(batch)
+
+:author: TacoronteRiveroCristian
+"""
+
+import asyncio
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from ...utils.chunking import iter_chunks, iterate_async, split_month_range
+from ...utils.type_converters import convert_date_range_to_api_format
+
+if TYPE_CHECKING:
+    from ...models.consumption import ConsumptionData
+    from ...models.max_power import MaxPowerData
+    from ...models.reactive import ReactiveData
+
+#: Campos que identifican un registro validado al deduplicar entre bloques.
+_RECORD_IDENTITY = {
+    "consumption": ("cups", "date", "time"),
+    "max_power": ("cups", "date", "time", "period"),
+}
+
+
+def _identity(record: Any, fields: Sequence[str]) -> tuple:
+    """Clave de deduplicación de un registro validado."""
+    return tuple(getattr(record, name, None) for name in fields)
+
+
+def _stream_records(
+    chunks: Iterator[List[Any]], identity_fields: Sequence[str], batches: bool
+) -> Iterator[Any]:
+    """
+    Entrega los registros de cada bloque descartando los repetidos en los límites.
+
+    Solo se recuerdan las claves del bloque anterior, por lo que la memoria no
+    crece con la longitud del rango.
+    """
+    previous: set = set()
+    for records in chunks:
+        current = {_identity(record, identity_fields) for record in records}
+        if previous:
+            records = [
+                record
+                for record in records
+                if _identity(record, identity_fields) not in previous
+            ]
+        previous = current
+        if batches:
+            if records:
+                yield records
+        else:
+            yield from records
+
+
+class StreamingRequestsMixin:
+    """
+    Generadores ``iter_*``/``aiter_*`` de las consultas por rango de meses (V2).
+
+    Cada consulta se divide en bloques de ``chunk_months`` meses (1 por defecto)
+    que se piden con el método individual del cliente, de modo que la validación,
+    el rescate de registros y los eventos son los mismos que en ``get_*``.
+    """
+
+    def _authenticate_once(self) -> None:
+        """Autentica el cliente antes de repartir peticiones entre hilos."""
+        raise NotImplementedError
+
+    def _iter_month_chunks(
+        self,
+        fetch: Callable[[str, str], Any],
+        date_from: Any,
+        date_to: Any,
+        chunk_months: int,
+        max_workers: int,
+    ) -> Iterator[Any]:
+        """
+        Divide el rango en bloques y devuelve el resultado de cada uno según llega.
+
+        :param fetch: Función ``fetch(desde, hasta)`` que consulta un bloque
+        :param date_from: Fecha inicial (mensual)
+        :param date_to: Fecha final (mensual)
+        :param chunk_months: Meses por bloque
+        :param max_workers: Bloques descargados por adelantado
+        :return: Iterador con el resultado de ``fetch`` para cada bloque
+        """
+        start, end = convert_date_range_to_api_format(date_from, date_to, "monthly")
+        ranges = split_month_range(start, end, chunk_months)
+        self._authenticate_once()
+        return iter_chunks(fetch, ranges, max_workers)
+
+    def iter_consumption(
+        self,
+        cups: str,
+        distributor_code: Union[str, int],
+        date_from: Any,
+        date_to: Any,
+        measurement_type: Any = 0,
+        point_type: Optional[Any] = None,
+        authorized_nif: Optional[str] = None,
+        chunk_months: int = 1,
+        max_workers: int = 2,
+        batches: bool = False,
+    ) -> Iterator[Union["ConsumptionData", List["ConsumptionData"]]]:
+        """
+        Genera los registros de consumo a medida que se descarga cada bloque.
+
+        Acepta los mismos parámetros que ``get_consumption``. Los registros se
+        entregan en orden cronológico y sin duplicados en los límites entre bloques.
+
+        :param chunk_months: Meses por bloque
+        :type chunk_months: int
+        :param max_workers: Bloques descargados por adelantado mientras se consume
+                           el actual (cota de memoria)
+        :type max_workers: int
+        :param batches: ``True`` para entregar una lista de registros por bloque en
+                       lugar de registro a registro
+        :type batches: bool
+        :return: Registros ``ConsumptionData`` (o listas, si ``batches=True``)
+        :raises ValidationError: Si los parámetros no son válidos
+        :raises DatadisError: Si un bloque no se puede obtener
+        """
+
+        def fetch(start: str, end: str) -> List[Any]:
+            return self.get_consumption(  # type: ignore[attr-defined]
+                cups,
+                distributor_code,
+                start,
+                end,
+                measurement_type=measurement_type,
+                point_type=point_type,
+                authorized_nif=authorized_nif,
+            ).time_curve
+
+        chunks = self._iter_month_chunks(
+            fetch, date_from, date_to, chunk_months, max_workers
+        )
+        return _stream_records(chunks, _RECORD_IDENTITY["consumption"], batches)
+
+    def iter_max_power(
+        self,
+        cups: str,
+        distributor_code: str,
+        date_from: Any,
+        date_to: Any,
+        authorized_nif: Optional[str] = None,
+        chunk_months: int = 1,
+        max_workers: int = 2,
+        batches: bool = False,
+    ) -> Iterator[Union["MaxPowerData", List["MaxPowerData"]]]:
+        """
+        Genera los registros de potencia máxima a medida que se descarga cada bloque.
+
+        Acepta los mismos parámetros que ``get_max_power`` y las mismas opciones
+        que :meth:`iter_consumption`.
+
+        :return: Registros ``MaxPowerData`` (o listas, si ``batches=True``)
+        :raises ValidationError: Si los parámetros no son válidos
+        :raises DatadisError: Si un bloque no se puede obtener
+        """
+
+        def fetch(start: str, end: str) -> List[Any]:
+            return self.get_max_power(  # type: ignore[attr-defined]
+                cups, distributor_code, start, end, authorized_nif=authorized_nif
+            ).max_power
+
+        chunks = self._iter_month_chunks(
+            fetch, date_from, date_to, chunk_months, max_workers
+        )
+        return _stream_records(chunks, _RECORD_IDENTITY["max_power"], batches)
+
+    def iter_reactive_data(
+        self,
+        cups: str,
+        distributor_code: str,
+        date_from: Any,
+        date_to: Any,
+        authorized_nif: Optional[str] = None,
+        chunk_months: int = 1,
+        max_workers: int = 2,
+    ) -> Iterator["ReactiveData"]:
+        """
+        Genera los datos de energía reactiva de cada bloque según se descarga.
+
+        Cada elemento es un ``ReactiveData`` con los períodos de su bloque.
+
+        :return: Un ``ReactiveData`` por bloque con datos
+        :raises ValidationError: Si los parámetros no son válidos
+        :raises DatadisError: Si un bloque no se puede obtener
+        """
+
+        def fetch(start: str, end: str) -> List[Any]:
+            return self.get_reactive_data(  # type: ignore[attr-defined]
+                cups, distributor_code, start, end, authorized_nif=authorized_nif
+            )
+
+        chunks = self._iter_month_chunks(
+            fetch, date_from, date_to, chunk_months, max_workers
+        )
+        return (item for block in chunks for item in block)
+
+    async def _aiterate(
+        self, factory: Callable[..., Iterator[Any]], *args: Any, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """Crea el generador síncrono en un hilo y lo recorre con ``async for``."""
+        loop = asyncio.get_running_loop()
+        # La validación y la autenticación también son bloqueantes
+        iterator = await loop.run_in_executor(None, partial(factory, *args, **kwargs))
+        async for item in iterate_async(iterator):
+            yield item
+
+    def aiter_consumption(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[Union["ConsumptionData", List["ConsumptionData"]]]:
+        """
+        Versión asíncrona de :meth:`iter_consumption` para ``async for``.
+
+        Las descargas se ejecutan en hilos y no bloquean el bucle de eventos.
+        """
+        return self._aiterate(self.iter_consumption, *args, **kwargs)
+
+    def aiter_max_power(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[Union["MaxPowerData", List["MaxPowerData"]]]:
+        """Versión asíncrona de :meth:`iter_max_power` para ``async for``."""
+        return self._aiterate(self.iter_max_power, *args, **kwargs)
+
+    def aiter_reactive_data(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator["ReactiveData"]:
+        """Versión asíncrona de :meth:`iter_reactive_data` para ``async for``."""
+        return self._aiterate(self.iter_reactive_data, *args, **kwargs)
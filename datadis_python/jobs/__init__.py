@@ -0,0 +1,132 @@
+"""
+Componentes para trabajos de sincronización y descarga masiva con Datadis.
+
+:author: TacoronteRiveroCristian
+"""
+
+from .authorizations import AuthorizationRegistry
+from .decoding import (
+    DECODE_OUTPUTS,
+    DecodedResponse,
+    ProcessDecoder,
+    decode_response,
+)
+from .journal import (
+    TASK_DONE,
+    TASK_FAILED,
+    TASK_PENDING,
+    TASK_RUNNING,
+    JobJournal,
+    JobRunner,
+    TaskRecord,
+)
+from .pipeline import (
+    PORTFOLIO_CURVE_STAGES,
+    Pipeline,
+    StageResult,
+    build_portfolio_pipeline,
+    crawl_portfolio,
+)
+from .planner import (
+    BACKFILL_DATASETS,
+    BackfillRequest,
+    CoverageIndex,
+    MonthIntervals,
+    plan_backfill,
+)
+from .scheduler import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_NORMAL,
+    FairScheduler,
+    SchedulerLane,
+)
+from .snapshots import (
+    SUPPLY_DIFF_FIELDS,
+    JsonSnapshotStore,
+    MemorySnapshotStore,
+    SuppliesDiff,
+    SupplyChange,
+    SupplySnapshotStore,
+    diff_supplies,
+)
+from .watermarks import (
+    IncrementalSync,
+    JsonWatermarkStore,
+    MemoryWatermarkStore,
+    SyncResult,
+    WatermarkKey,
+    WatermarkStore,
+)
+from .work_queue import (
+    QUEUE_STATES,
+    TASK_LEASED,
+    LeasedTask,
+    QueueWorker,
+    RedisWorkQueue,
+    SQLiteWorkQueue,
+    WorkQueue,
+    crawl_task_handler,
+    enqueue_plan,
+)
+
+__all__ = [
+    # Registro de autorizaciones
+    "AuthorizationRegistry",
+    # Decodificación en un pool de procesos
+    "DECODE_OUTPUTS",
+    "DecodedResponse",
+    "ProcessDecoder",
+    "decode_response",
+    # Diario de tareas reanudables
+    "JobJournal",
+    "JobRunner",
+    "TaskRecord",
+    "TASK_DONE",
+    "TASK_FAILED",
+    "TASK_PENDING",
+    "TASK_RUNNING",
+    # Planificación de backfills
+    "BACKFILL_DATASETS",
+    "BackfillRequest",
+    "CoverageIndex",
+    "MonthIntervals",
+    "plan_backfill",
+    # Pipeline de etapas concurrentes
+    "PORTFOLIO_CURVE_STAGES",
+    "Pipeline",
+    "StageResult",
+    "build_portfolio_pipeline",
+    "crawl_portfolio",
+    # Planificador con prioridades y reparto justo
+    "FairScheduler",
+    "SchedulerLane",
+    "PRIORITY_BATCH",
+    "PRIORITY_INTERACTIVE",
+    "PRIORITY_NORMAL",
+    # Instantáneas de suministros
+    "SUPPLY_DIFF_FIELDS",
+    "JsonSnapshotStore",
+    "MemorySnapshotStore",
+    "SuppliesDiff",
+    "SupplyChange",
+    "SupplySnapshotStore",
+    "diff_supplies",
+    # Sincronización incremental
+    "IncrementalSync",
+    "JsonWatermarkStore",
+    "MemoryWatermarkStore",
+    "SyncResult",
+    "WatermarkKey",
+    "WatermarkStore",
+    # Colas de trabajo distribuidas
+    "WorkQueue",
+    "SQLiteWorkQueue",
+    "RedisWorkQueue",
+    "LeasedTask",
+    "QueueWorker",
+    "QUEUE_STATES",
+    "TASK_LEASED",
+    "crawl_task_handler",
+    "enqueue_plan",
+]
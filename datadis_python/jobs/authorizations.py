@@ -0,0 +1,210 @@
+"""
+Registro en caché de las autorizaciones vigentes.
+
+Un trabajo masivo sobre cientos de NIF autorizados no debe descubrir por ensayo y
+error qué pares ``(NIF, CUPS)`` siguen autorizados: cada intento fallido es una
+petición de datos perdida. :class:`AuthorizationRegistry` consulta
+``list_authorizations`` una vez, guarda el resultado durante ``ttl`` segundos y
+responde desde memoria a :meth:`~AuthorizationRegistry.is_authorized`, de modo
+que los lotes pueden descartar los pares no autorizados antes de lanzar ninguna
+petición.
+
+Si una renovación falla se conserva el listado anterior y se emite el evento
+``authorizations.refresh_failed``; la siguiente renovación se intenta al cabo de
+otros ``ttl`` segundos.
+
+El NIF de cada elemento se decide como en los métodos ``*_many``: el
+``authorized_nif`` de una petición en diccionario, el NIF común indicado o el
+``source_nif`` del suministro, en ese orden. Así, lo que conserva
+:meth:`~AuthorizationRegistry.filter` se consulta después con el mismo NIF con
+el que se comprobó.
+
+Example:
+    Inventario y curvas solo de lo autorizado (cada suministro se consulta con
+    el NIF que lo devolvió)::
+
+        registry = AuthorizationRegistry(client, ttl=3600)
+
+        inventory = client.get_supplies_for_nifs(registry.nifs())
+        supplies = registry.filter(inventory.supplies)
+        for item in client.get_consumption_many(supplies, "2024/01", "2024/12"):
+            ...
+
+:author: TacoronteRiveroCristian
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from ..exceptions import ValidationError
+from ..utils.events import emit
+
+logger = logging.getLogger(__name__)
+
+
+def _nif_and_cups(item: Any, nif: Optional[str]) -> Tuple[Optional[str], Any]:
+    """NIF con el que se consultará un suministro o petición, y su CUPS."""
+    if isinstance(item, (tuple, list)):
+        return nif, item[0]
+    if isinstance(item, Mapping):
+        if item.get("authorized_nif") is not None:
+            return item["authorized_nif"], item.get("cups")
+        return nif or item.get("source_nif", item.get("sourceNif")), item.get("cups")
+    return nif or getattr(item, "source_nif", None), getattr(item, "cups", None)
+
+
+class AuthorizationRegistry:
+    """
+    Autorizaciones vigentes de la cuenta, renovadas cada ``ttl`` segundos.
+
+    Es seguro compartir un registro entre hilos. El listado se descarga con la
+    primera consulta.
+
+    :param client: Cliente V2 con ``list_authorizations()``
+    :param ttl: Segundos durante los que se reutiliza el listado
+    :type ttl: float
+    :param clock: Reloj monotónico (configurable para tests)
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Inicializa el registro sin descargar el listado.
+
+        :raises ValidationError: Si ``ttl`` no es positivo
+        """
+        if ttl <= 0:
+            raise ValidationError(f"ttl debe ser positivo. Recibido: {ttl}")
+        self.client = client
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._authorizations: Optional[List[Any]] = None
+        self._loaded_at = 0.0
+
+    def refresh(self) -> List[Any]:
+        """
+        Descarga de nuevo el listado de autorizaciones.
+
+        :return: Autorizaciones vigentes (``AuthorizationData``)
+        :rtype: List[AuthorizationData]
+        :raises DatadisError: Si la consulta falla y no hay un listado anterior
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> List[Any]:
+        """Renueva el listado (con el cerrojo adquirido)."""
+        try:
+            authorizations = self.client.list_authorizations().authorizations
+        except Exception as e:
+            if self._authorizations is None:
+                raise
+            self._loaded_at = self.clock()
+            emit(
+                logger,
+                logging.WARNING,
+                "authorizations.refresh_failed",
+                "No se pudo renovar el listado de autorizaciones: %(error)s",
+                error=str(e),
+                kept=len(self._authorizations),
+            )
+            return self._authorizations
+        self._authorizations = list(authorizations)
+        self._loaded_at = self.clock()
+        emit(
+            logger,
+            logging.DEBUG,
+            "authorizations.refreshed",
+            "Listado de autorizaciones renovado (%(count)d)",
+            count=len(self._authorizations),
+        )
+        return self._authorizations
+
+    def invalidate(self) -> None:
+        """Fuerza la descarga del listado en la siguiente consulta."""
+        with self._lock:
+            self._loaded_at = float("-inf")
+
+    def authorizations(self) -> List[Any]:
+        """
+        Autorizaciones vigentes, renovando el listado si ha caducado.
+
+        :rtype: List[AuthorizationData]
+        """
+        with self._lock:
+            if (
+                self._authorizations is None
+                or self.clock() - self._loaded_at >= self.ttl
+            ):
+                return self._refresh()
+            return self._authorizations
+
+    def nifs(self) -> List[str]:
+        """
+        NIF con alguna autorización vigente, sin repetidos.
+
+        :rtype: List[str]
+        """
+        return list(dict.fromkeys(item.nif for item in self.authorizations()))
+
+    def is_authorized(self, nif: Optional[str], cups: Optional[str] = None) -> bool:
+        """
+        Indica si un par ``(NIF, CUPS)`` está autorizado.
+
+        Sin NIF se trata de un suministro de la propia cuenta, que siempre está
+        autorizado.
+
+        :param nif: NIF autorizado (``None``: la propia cuenta)
+        :type nif: Optional[str]
+        :param cups: Código CUPS (``None``: cualquier suministro del NIF)
+        :type cups: Optional[str]
+        :rtype: bool
+        """
+        if nif is None:
+            return True
+        nif = nif.strip().upper()
+        return any(
+            item.nif.upper() == nif and item.covers(cups)
+            for item in self.authorizations()
+        )
+
+    def filter(self, items: Iterable[Any], nif: Optional[str] = None) -> List[Any]:
+        """
+        Descarta los suministros o peticiones no autorizados.
+
+        :param items: ``SupplyData``, tuplas ``(cups, distribuidora, ...)`` o
+                     diccionarios, como en los métodos ``*_many``
+        :type items: Iterable[Any]
+        :param nif: NIF con el que se consultarán, el mismo que se pase como
+                   ``authorized_nif`` al método ``*_many`` (``None``: el
+                   ``source_nif`` de cada elemento o, si no lo tiene, la propia
+                   cuenta). El ``authorized_nif`` de un diccionario prevalece.
+        :type nif: Optional[str]
+        :return: Elementos autorizados, en el mismo orden
+        :rtype: List[Any]
+        """
+        kept = []
+        skipped = 0
+        for item in items:
+            if self.is_authorized(*_nif_and_cups(item, nif)):
+                kept.append(item)
+            else:
+                skipped += 1
+        if skipped:
+            emit(
+                logger,
+                logging.INFO,
+                "authorizations.skipped",
+                "Descartados %(skipped)d elementos sin autorización",
+                skipped=skipped,
+                kept=len(kept),
+            )
+        return kept
@@ -0,0 +1,464 @@
+"""
+Decodificación y validación de respuestas en un pool de procesos.
+
+Con muchos hilos descargando a la vez, el trabajo de CPU de cada respuesta
+(decodificar el JSON, :func:`~datadis_python.utils.text_utils.normalize_api_response`
+y la validación Pydantic) queda limitado por el GIL. :class:`ProcessDecoder` envía
+los bytes sin decodificar a un :class:`~concurrent.futures.ProcessPoolExecutor`, de
+modo que el análisis escala con los núcleos y los hilos de descarga solo esperan.
+
+Cada proceso devuelve un :class:`DecodedResponse` compacto, barato de serializar
+de vuelta al proceso principal, en uno de dos formatos:
+
+- ``"columns"``: un diccionario ``{columna: valores}`` con las mismas columnas que
+  ``to_columns()``. Las columnas numéricas sin valores nulos se empaquetan como
+  :class:`array.array`.
+- ``"records"``: una lista de filas :class:`ConsumptionRow`, :class:`MaxPowerRow`,
+  :class:`ReactiveRow` o :class:`SupplyRow` (*namedtuples*, sin ``__dict__``).
+
+Los registros que no superan la validación se descartan y se cuentan en
+``rejected_records``, como en el modo de rescate de los clientes.
+
+Example:
+    Consumo de una cartera con el análisis repartido entre procesos::
+
+        with ProcessDecoder(max_workers=8) as decoder:
+            for item in decoder.fetch_many(client, "consumption", supplies,
+                                           "2024/01", "2024/12", max_workers=32):
+                if item.ok:
+                    kwh = item.result.data["consumption_kwh"]
+
+    Como etapa de un :class:`~datadis_python.jobs.Pipeline` que recibe bytes::
+
+        def decode(content):
+            return [decoder.decode(content, "consumption")]
+
+        pipeline.add_stage("decode", decode, downstream=["store"], workers=8)
+
+:author: TacoronteRiveroCristian
+"""
+
+from array import array
+from collections import namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from ..exceptions import ValidationError
+from ..models.consumption import ConsumptionData
+from ..models.max_power import MaxPowerData
+from ..models.reactive import (
+    ReactiveData,
+    ReactiveEnergyPeriod,
+    salvage_reactive_data,
+)
+from ..models.responses import (
+    ConsumptionResponse,
+    MaxPowerResponse,
+    SuppliesResponse,
+    salvage_response,
+)
+from ..models.supply import SupplyData
+from ..utils import json_backend
+from ..utils.concurrency import (
+    AdaptiveConcurrency,
+    BulkResult,
+    bulk_request_kwargs,
+    run_bulk,
+)
+from ..utils.constants import API_V2_ENDPOINTS
+from ..utils.text_utils import (
+    normalize_api_response,
+    repair_double_encoded_utf8,
+    text_fields_for_endpoint,
+)
+from ..utils.validators import (
+    validate_date_range,
+    validate_distributor_code,
+    validate_measurement_type,
+    validate_point_type,
+)
+
+#: Formatos de salida de :func:`decode_response`.
+DECODE_OUTPUTS = ("columns", "records")
+
+#: Fila compacta de una curva de consumo.
+ConsumptionRow = namedtuple(  # type: ignore[misc]
+    "ConsumptionRow", list(ConsumptionData.model_fields), module=__name__
+)
+#: Fila compacta de potencia máxima.
+MaxPowerRow = namedtuple(  # type: ignore[misc]
+    "MaxPowerRow", list(MaxPowerData.model_fields), module=__name__
+)
+#: Fila compacta de un período de energía reactiva.
+ReactiveRow = namedtuple(  # type: ignore[misc]
+    "ReactiveRow", ["cups", *ReactiveEnergyPeriod.model_fields], module=__name__
+)
+#: Fila compacta de un suministro.
+SupplyRow = namedtuple(  # type: ignore[misc]
+    "SupplyRow", list(SupplyData.model_fields), module=__name__
+)
+
+#: Conjunto de datos -> (clave de ``API_V2_ENDPOINTS``, tipo de fila).
+_DATASETS: Dict[str, Tuple[str, Any]] = {
+    "consumption": ("consumption", ConsumptionRow),
+    "max_power": ("max_power", MaxPowerRow),
+    "reactive_data": ("reactive_data", ReactiveRow),
+    "supplies": ("supplies", SupplyRow),
+}
+
+#: Modelo, campo de registros y modelo de registro de las respuestas con lista.
+_RESPONSE_MODELS: Dict[str, Tuple[Type[BaseModel], str, Type[BaseModel]]] = {
+    "consumption": (ConsumptionResponse, "time_curve", ConsumptionData),
+    "max_power": (MaxPowerResponse, "max_power", MaxPowerData),
+    "supplies": (SuppliesResponse, "supplies", SupplyData),
+}
+
+#: Códigos de :class:`array.array` para las columnas numéricas.
+_ARRAY_CODES = {float: "d", int: "q"}
+
+
+class DecodedResponse(NamedTuple):
+    """
+    Resultado compacto de decodificar una respuesta en otro proceso.
+
+    :param dataset: Conjunto de datos (``"consumption"``, ``"max_power"``...)
+    :param output: Formato de ``data`` (``"columns"`` o ``"records"``)
+    :param data: Columnas ``{nombre: valores}`` o lista de filas
+    :param distributor_errors: Errores por distribuidora tal como los envía la API
+    :param rejected_records: Registros descartados por no superar la validación
+    """
+
+    dataset: str
+    output: str
+    data: Union[Dict[str, Any], List[Any]]
+    distributor_errors: List[Dict[str, Any]]
+    rejected_records: int
+
+    @property
+    def num_records(self) -> int:
+        """Número de registros válidos."""
+        if self.output == "records":
+            return len(self.data)
+        return len(next(iter(self.data.values()), ()))  # type: ignore[union-attr]
+
+
+def _check_dataset(dataset: str) -> None:
+    """Valida el nombre del conjunto de datos."""
+    if dataset not in _DATASETS:
+        raise ValidationError(
+            f"Conjunto de datos no soportado: {dataset!r}. "
+            f"Opciones: {', '.join(_DATASETS)}"
+        )
+
+
+def _check_output(output: str) -> None:
+    """Valida el formato de salida."""
+    if output not in DECODE_OUTPUTS:
+        raise ValidationError(
+            f"Formato de salida no soportado: {output!r}. "
+            f"Opciones: {', '.join(DECODE_OUTPUTS)}"
+        )
+
+
+def _compact(values: List[Any], python_type: Any) -> Any:
+    """Empaqueta una columna numérica sin nulos en un ``array``."""
+    code = _ARRAY_CODES.get(python_type)
+    if code is None or any(type(value) is not python_type for value in values):
+        return values
+    return array(code, values)
+
+
+def _validate(dataset: str, data: Dict[str, Any]) -> Any:
+    """Valida una respuesta como lo hacen los clientes, rescatando lo válido."""
+    if dataset == "reactive_data":
+        if not data.get("reactiveEnergy"):
+            return None
+        try:
+            return ReactiveData(**data)
+        except Exception:
+            try:
+                return salvage_reactive_data(data)
+            except Exception:
+                return None
+    response_model, records_field, record_model = _RESPONSE_MODELS[dataset]
+    try:
+        return response_model(**data)
+    except Exception:
+        try:
+            return salvage_response(response_model, data, records_field, record_model)
+        except Exception:
+            return None
+
+
+def decode_response(
+    content: bytes, dataset: str, output: str = "columns"
+) -> DecodedResponse:
+    """
+    Decodifica, normaliza y valida el cuerpo de una respuesta de la API V2.
+
+    Es una función de módulo para poder ejecutarse en un proceso hijo.
+
+    :param content: Cuerpo de la respuesta sin decodificar
+    :type content: bytes
+    :param dataset: ``"consumption"``, ``"max_power"``, ``"reactive_data"`` o
+                   ``"supplies"``
+    :type dataset: str
+    :param output: ``"columns"`` o ``"records"``
+    :type output: str
+    :return: Registros válidos en el formato pedido
+    :rtype: DecodedResponse
+    :raises ValidationError: Si el conjunto de datos o el formato no son válidos
+    :raises ValueError: Si el cuerpo no es JSON válido
+    """
+    _check_dataset(dataset)
+    _check_output(output)
+    endpoint, row_type = _DATASETS[dataset]
+    decoded = json_backend.loads(repair_double_encoded_utf8(bytes(content)))
+    data: Dict[str, Any] = {}
+    if isinstance(decoded, dict):
+        normalized = normalize_api_response(
+            decoded,
+            text_fields_for_endpoint(API_V2_ENDPOINTS[endpoint]),
+            in_place=True,
+            repair_encoding=False,
+        )
+        if isinstance(normalized, dict):
+            data = normalized
+
+    model = _validate(dataset, data)
+    if model is None:
+        columns: Dict[str, Any] = {name: [] for name in row_type._fields}
+        rejected = 0
+    else:
+        columns = model.to_columns()
+        rejected = len(model.rejected_records)
+
+    if output == "records":
+        result: Union[Dict[str, Any], List[Any]] = list(
+            map(row_type._make, zip(*columns.values()))
+        )
+    else:
+        schema = model._tabular_schema() if model is not None else {}
+        result = {
+            name: _compact(values, schema.get(name)) for name, values in columns.items()
+        }
+    return DecodedResponse(
+        dataset, output, result, list(data.get("distributorError") or []), rejected
+    )
+
+
+def _api_params(
+    dataset: str,
+    cups: str,
+    distributor_code: str,
+    date_from: str,
+    date_to: str,
+    measurement_type: Any = 0,
+    point_type: Optional[int] = None,
+    authorized_nif: Optional[str] = None,
+) -> Dict[str, str]:
+    """Parámetros de la API V2, validados como en los métodos ``get_*``."""
+    params = {
+        "cups": cups.upper().strip(),
+        "distributorCode": validate_distributor_code(distributor_code),
+    }
+    params["startDate"], params["endDate"] = validate_date_range(
+        date_from, date_to, "monthly"
+    )
+    if dataset == "consumption":
+        params["measurementType"] = str(validate_measurement_type(measurement_type))
+        if point_type is not None:
+            params["pointType"] = str(validate_point_type(point_type))
+    if authorized_nif is not None:
+        params["authorizedNif"] = authorized_nif
+    return params
+
+
+class ProcessDecoder:
+    """
+    Pool de procesos que decodifica y valida respuestas de la API V2.
+
+    El pool se crea con la primera respuesta y se cierra con :meth:`close` o al
+    salir del bloque ``with``.
+
+    :param max_workers: Número de procesos (``None``: uno por núcleo)
+    :type max_workers: Optional[int]
+    :param output: Formato de los resultados (``"columns"`` o ``"records"``)
+    :type output: str
+    :param mp_context: Contexto de :mod:`multiprocessing` (``fork``, ``spawn``...)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        output: str = "columns",
+        mp_context: Any = None,
+    ) -> None:
+        """
+        Inicializa el decodificador sin crear aún los procesos.
+
+        :raises ValidationError: Si ``max_workers`` o ``output`` no son válidos
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValidationError(
+                f"max_workers debe ser un entero positivo. Recibido: {max_workers}"
+            )
+        _check_output(output)
+        self.max_workers = max_workers
+        self.output = output
+        self.mp_context = mp_context
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        """Pool de procesos, creado la primera vez que se necesita."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=self.mp_context
+            )
+        return self._pool
+
+    def submit(self, content: bytes, dataset: str) -> "Future[DecodedResponse]":
+        """
+        Envía una respuesta al pool sin esperar el resultado.
+
+        :param content: Cuerpo de la respuesta sin decodificar
+        :type content: bytes
+        :param dataset: Conjunto de datos de la respuesta
+        :type dataset: str
+        :rtype: Future[DecodedResponse]
+        :raises ValidationError: Si el conjunto de datos no es válido
+        """
+        _check_dataset(dataset)
+        return self._executor().submit(decode_response, content, dataset, self.output)
+
+    def decode(self, content: bytes, dataset: str) -> DecodedResponse:
+        """
+        Decodifica una respuesta en el pool y espera el resultado.
+
+        El hilo que llama espera sin ocupar el GIL.
+
+        :rtype: DecodedResponse
+        """
+        return self.submit(content, dataset).result()
+
+    def map(
+        self, contents: Iterable[bytes], dataset: str, chunksize: int = 1
+    ) -> Iterator[DecodedResponse]:
+        """
+        Decodifica muchas respuestas del mismo conjunto de datos, en orden.
+
+        :param contents: Cuerpos sin decodificar
+        :type contents: Iterable[bytes]
+        :param dataset: Conjunto de datos de las respuestas
+        :type dataset: str
+        :param chunksize: Respuestas enviadas a la vez a cada proceso
+        :type chunksize: int
+        :rtype: Iterator[DecodedResponse]
+        """
+        _check_dataset(dataset)
+        contents = list(contents)
+        return self._executor().map(
+            decode_response,
+            contents,
+            [dataset] * len(contents),
+            [self.output] * len(contents),
+            chunksize=chunksize,
+        )
+
+    def fetch_many(
+        self,
+        client: Any,
+        dataset: str,
+        requests: Iterable[Any],
+        date_from: Any = None,
+        date_to: Any = None,
+        max_workers: int = 8,
+        per_distributor_limit: Union[int, AdaptiveConcurrency, None] = 4,
+        ordered: bool = True,
+        **options: Any,
+    ) -> Iterator["BulkResult[Any, DecodedResponse]"]:
+        """
+        Descarga en hilos y decodifica en procesos un lote de consultas.
+
+        Las peticiones tienen los mismos formatos que en
+        :meth:`~datadis_python.client.v2.bulk.BulkRequestsMixin.get_consumption_many`.
+        Cada consulta es una sola petición a la API (sin división en bloques).
+
+        :param client: Cliente V2 (:class:`DatadisClientV2` o
+                      :class:`SimpleDatadisClientV2`)
+        :param dataset: ``"consumption"``, ``"max_power"`` o ``"reactive_data"``
+        :type dataset: str
+        :param requests: ``SupplyData``, tuplas o diccionarios
+        :type requests: Iterable[Any]
+        :param date_from: Fecha inicial para las peticiones que no la indiquen
+        :param date_to: Fecha final para las peticiones que no la indiquen
+        :param max_workers: Hilos de descarga
+        :type max_workers: int
+        :param per_distributor_limit: Límite de peticiones simultáneas por
+                                     distribuidora, como en ``*_many``
+        :type per_distributor_limit: Union[int, AdaptiveConcurrency, None]
+        :param ordered: Resultados en orden de entrada o según se completan
+        :type ordered: bool
+        :param options: ``measurement_type`` y ``authorized_nif`` comunes a todas
+                       las peticiones
+        :return: Un :class:`BulkResult` por petición con su :class:`DecodedResponse`
+        :rtype: Iterator[BulkResult]
+        :raises ValidationError: Si el conjunto de datos no es una serie por CUPS
+        """
+        if dataset == "supplies":
+            raise ValidationError(
+                "fetch_many solo admite consultas por CUPS: "
+                "consumption, max_power o reactive_data"
+            )
+        _check_dataset(dataset)
+        endpoint = API_V2_ENDPOINTS[_DATASETS[dataset][0]]
+        with_point_type = dataset == "consumption"
+        client._authenticate_once()
+
+        def call(item: Any) -> DecodedResponse:
+            kwargs = bulk_request_kwargs(
+                item,
+                True,
+                date_from,
+                date_to,
+                with_point_type,
+                options.get("authorized_nif"),
+            )
+            params = _api_params(dataset, **{**options, **kwargs})
+            return self.decode(client._request_raw(endpoint, params), dataset)
+
+        return run_bulk(
+            call,
+            requests,
+            key=lambda item: str(bulk_request_kwargs(item, False)["distributor_code"]),
+            max_workers=max_workers,
+            per_key_limit=per_distributor_limit,
+            ordered=ordered,
+        )
+
+    def close(self) -> None:
+        """Cierra el pool de procesos."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "ProcessDecoder":
+        """Entrada del context manager."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Cierra el pool al salir del context manager."""
+        self.close()
@@ -0,0 +1,402 @@
+"""
+Diario SQLite de tareas para trabajos largos reanudables.
+
+Una descarga masiva (miles de CUPS) puede durar horas. :class:`JobJournal` guarda el
+estado de cada tarea en un fichero SQLite local (``pending``, ``running``,
+``done``, ``failed`` e intentos), confirmando cada transición al momento, y
+:class:`JobRunner` lo usa para ejecutar las tareas de forma que, si el proceso
+muere, la siguiente ejecución:
+
+- Omite las tareas ya completadas, sin gastar de nuevo cuota de Datadis.
+- Devuelve a ``pending`` las que quedaron a medias (``running``).
+- Continúa con las pendientes y las fallidas que aún tienen intentos.
+
+Example:
+    Backfill reanudable del consumo de una cartera::
+
+        journal = JobJournal("backfill.sqlite")
+        tasks = {
+            supply.cups: {
+                "cups": supply.cups,
+                "distributor_code": supply.distributor_code,
+                "date_from": "2023/01",
+                "date_to": "2023/12",
+            }
+            for supply in supplies
+        }
+
+        def handler(payload):
+            store(client.get_consumption(**payload))
+
+        JobRunner(journal, "backfill-2023", handler).run(tasks)
+
+:author: TacoronteRiveroCristian
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from ..exceptions import ValidationError
+from ..utils.chunking import is_retryable
+from ..utils.events import emit
+
+logger = logging.getLogger(__name__)
+
+#: Estados posibles de una tarea.
+TASK_PENDING = "pending"
+TASK_RUNNING = "running"
+TASK_DONE = "done"
+TASK_FAILED = "failed"
+TASK_STATES = (TASK_PENDING, TASK_RUNNING, TASK_DONE, TASK_FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    job TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job, task_id)
+);
+CREATE INDEX IF NOT EXISTS tasks_by_state ON tasks (job, state);
+"""
+
+
+@dataclass
+class TaskRecord:
+    """
+    Estado de una tarea en el diario.
+
+    :param task_id: Identificador de la tarea dentro del trabajo
+    :param payload: Datos de la tarea (serializables en JSON)
+    :param state: Estado (``pending``, ``running``, ``done`` o ``failed``)
+    :param attempts: Intentos realizados
+    :param error: Último error, si lo hubo
+    """
+
+    task_id: str
+    payload: Any
+    state: str
+    attempts: int
+    error: Optional[str] = None
+
+
+class JobJournal:
+    """
+    Diario persistente de tareas en SQLite.
+
+    Cada operación se confirma en su propia transacción, de modo que el fichero
+    refleja siempre el último estado conocido aunque el proceso termine de golpe.
+
+    :param path: Ruta del fichero SQLite (``":memory:"`` para pruebas)
+    :type path: str
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Abre (o crea) el diario.
+
+        :param path: Ruta del fichero SQLite
+        :type path: str
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def _execute(self, sql: str, parameters: Any = ()) -> int:
+        """Ejecuta una sentencia de modificación y devuelve las filas afectadas."""
+        with self._lock:
+            return self._connection.execute(sql, parameters).rowcount
+
+    def _query(self, sql: str, parameters: Any = ()) -> List[Any]:
+        """Ejecuta una consulta y devuelve todas sus filas."""
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def add_tasks(self, job: str, tasks: Mapping[str, Any]) -> int:
+        """
+        Registra tareas nuevas como ``pending``; las ya registradas no se tocan.
+
+        :param job: Nombre del trabajo
+        :type job: str
+        :param tasks: Diccionario ``{id_tarea: payload}``
+        :type tasks: Mapping[str, Any]
+        :return: Número de tareas nuevas
+        :rtype: int
+        """
+        now = time.time()
+        rows = [
+            (job, str(task_id), json.dumps(payload), TASK_PENDING, now)
+            for task_id, payload in tasks.items()
+        ]
+        with self._lock, self._connection:
+            # Una sola transacción: registrar miles de tareas no hace miles de fsync
+            self._connection.execute("BEGIN IMMEDIATE")
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO tasks (job, task_id, payload, state, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            return self._connection.total_changes - before
+
+    def recover(self, job: str) -> int:
+        """
+        Devuelve a ``pending`` las tareas que quedaron en ``running`` tras una caída.
+
+        :param job: Nombre del trabajo
+        :type job: str
+        :return: Número de tareas recuperadas
+        :rtype: int
+        """
+        return self._execute(
+            "UPDATE tasks SET state = ?, updated_at = ? WHERE job = ? AND state = ?",
+            (TASK_PENDING, time.time(), job, TASK_RUNNING),
+        )
+
+    def retry_failed(self, job: str) -> int:
+        """
+        Vuelve a poner en cola las tareas fallidas, con sus intentos a cero.
+
+        :param job: Nombre del trabajo
+        :type job: str
+        :return: Número de tareas reactivadas
+        :rtype: int
+        """
+        return self._execute(
+            "UPDATE tasks SET state = ?, attempts = 0, updated_at = ? "
+            "WHERE job = ? AND state = ?",
+            (TASK_PENDING, time.time(), job, TASK_FAILED),
+        )
+
+    def claim(self, job: str, limit: int) -> List[TaskRecord]:
+        """
+        Marca como ``running`` hasta ``limit`` tareas pendientes y las devuelve.
+
+        :param job: Nombre del trabajo
+        :type job: str
+        :param limit: Número máximo de tareas
+        :type limit: int
+        :return: Tareas reclamadas, con sus intentos ya incrementados
+        :rtype: List[TaskRecord]
+        """
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            rows = self._connection.execute(
+                "SELECT task_id, payload, attempts FROM tasks "
+                "WHERE job = ? AND state = ? ORDER BY rowid LIMIT ?",
+                (job, TASK_PENDING, limit),
+            ).fetchall()
+            self._connection.executemany(
+                "UPDATE tasks SET state = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE job = ? AND task_id = ?",
+                [(TASK_RUNNING, time.time(), job, row[0]) for row in rows],
+            )
+        return [
+            TaskRecord(task_id, json.loads(payload), TASK_RUNNING, attempts + 1)
+            for task_id, payload, attempts in rows
+        ]
+
+    def mark_done(self, job: str, task_id: str) -> None:
+        """
+        Marca una tarea como completada.
+
+        :param job: Nombre del trabajo
+        :type job: str
+        :param task_id: Identificador de la tarea
+        :type task_id: str
+        """
+        self._execute(
+            "UPDATE tasks SET state = ?, error = NULL, updated_at = ? "
+            "WHERE job = ? AND task_id = ?",
+            (TASK_DONE, time.time(), job, task_id),
+        )
+
+    def mark_failed(
+        self, job: str, task_id: str, error: str, retry: bool = False
+    ) -> None:
+        """
+        Registra el fallo de una tarea.
+
+        :param job: Nombre del trabajo
+        :type job: str
+        :param task_id: Identificador de la tarea
+        :type task_id: str
+        :param error: Descripción del error
+        :type error: str
+        :param retry: ``True`` para devolverla a ``pending`` en lugar de ``failed``
+        :type retry: bool
+        """
+        self._execute(
+            "UPDATE tasks SET state = ?, error = ?, updated_at = ? "
+            "WHERE job = ? AND task_id = ?",
+            (TASK_PENDING if retry else TASK_FAILED, error, time.time(), job, task_id),
+        )
+
+    def counts(self, job: str) -> Dict[str, int]:
+        """
+        Número de tareas de un trabajo en cada estado.
+
+        :param job: Nombre del trabajo
+        :type job: str
+        :return: Diccionario ``{estado: número}`` con todos los estados
+        :rtype: Dict[str, int]
+        """
+        rows = self._query(
+            "SELECT state, COUNT(*) FROM tasks WHERE job = ? GROUP BY state", (job,)
+        )
+        counts = dict.fromkeys(TASK_STATES, 0)
+        counts.update(rows)
+        return counts
+
+    def tasks(self, job: str, state: Optional[str] = None) -> List[TaskRecord]:
+        """
+        Tareas de un trabajo, opcionalmente filtradas por estado.
+
+        :param job: Nombre del trabajo
+        :type job: str
+        :param state: Estado por el que filtrar
+        :type state: Optional[str]
+        :return: Tareas en orden de registro
+        :rtype: List[TaskRecord]
+        """
+        sql = "SELECT task_id, payload, state, attempts, error FROM tasks WHERE job = ?"
+        parameters: List[Any] = [job]
+        if state is not None:
+            sql += " AND state = ?"
+            parameters.append(state)
+        rows = self._query(sql + " ORDER BY rowid", parameters)
+        return [
+            TaskRecord(task_id, json.loads(payload), task_state, attempts, error)
+            for task_id, payload, task_state, attempts, error in rows
+        ]
+
+    def close(self) -> None:
+        """Cierra la conexión con el fichero."""
+        self._connection.close()
+
+
+class JobRunner:
+    """
+    Ejecuta las tareas de un trabajo registrando cada transición en el diario.
+
+    Los fallos de red o timeout (:class:`~datadis_python.exceptions.DatadisError`
+    que no son errores de la API) vuelven a ``pending`` hasta agotar
+    ``max_attempts``; el resto de errores marcan la tarea como ``failed`` al
+    momento.
+
+    :param journal: Diario del trabajo
+    :type journal: JobJournal
+    :param job: Nombre del trabajo
+    :type job: str
+    :param handler: Función que ejecuta una tarea a partir de su payload
+    :type handler: Callable[[Any], Any]
+    :param max_workers: Tareas ejecutadas a la vez
+    :type max_workers: int
+    :param max_attempts: Intentos máximos por tarea
+    :type max_attempts: int
+    """
+
+    def __init__(
+        self,
+        journal: JobJournal,
+        job: str,
+        handler: Callable[[Any], Any],
+        max_workers: int = 4,
+        max_attempts: int = 3,
+    ) -> None:
+        """
+        Inicializa el ejecutor.
+
+        :raises ValidationError: Si ``max_workers`` o ``max_attempts`` no son
+                                positivos
+        """
+        if max_workers < 1 or max_attempts < 1:
+            raise ValidationError("max_workers y max_attempts deben ser positivos")
+        self.journal = journal
+        self.job = job
+        self.handler = handler
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+
+    def run(self, tasks: Optional[Mapping[str, Any]] = None) -> Dict[str, int]:
+        """
+        Ejecuta las tareas pendientes hasta completarlas o agotar sus intentos.
+
+        :param tasks: Tareas a registrar antes de empezar (``{id: payload}``); las
+                     ya registradas conservan su estado
+        :type tasks: Optional[Mapping[str, Any]]
+        :return: Número final de tareas en cada estado
+        :rtype: Dict[str, int]
+        """
+        if tasks:
+            self.journal.add_tasks(self.job, tasks)
+        recovered = self.journal.recover(self.job)
+        emit(
+            logger,
+            logging.INFO,
+            "job.start",
+            "Trabajo %(job)s: %(pending)d tareas pendientes, %(done)d completadas",
+            job=self.job,
+            recovered=recovered,
+            **self.journal.counts(self.job),
+        )
+
+        running: Dict[Future, Any] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                free = self.max_workers - len(running)
+                if free:
+                    for task in self.journal.claim(self.job, free):
+                        running[pool.submit(self.handler, task.payload)] = task
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._record(running.pop(future), future)
+
+        counts = self.journal.counts(self.job)
+        emit(
+            logger,
+            logging.INFO,
+            "job.finish",
+            "Trabajo %(job)s: %(done)d completadas, %(failed)d fallidas",
+            job=self.job,
+            **counts,
+        )
+        return counts
+
+    def _record(self, task: TaskRecord, future: Future) -> None:
+        """Registra en el diario el resultado de una tarea."""
+        error = future.exception()
+        if error is None:
+            self.journal.mark_done(self.job, task.task_id)
+            return
+        retry = is_retryable(error) and task.attempts < self.max_attempts
+        self.journal.mark_failed(self.job, task.task_id, str(error), retry=retry)
+        emit(
+            logger,
+            logging.WARNING,
+            "job.task_error",
+            "Tarea %(task_id)s del trabajo %(job)s falló (intento %(attempt)d): "
+            "%(error)s",
+            job=self.job,
+            task_id=task.task_id,
+            attempt=task.attempts,
+            retry=retry,
+            error=str(error),
+        )
@@ -0,0 +1,507 @@
+"""
+Pipeline concurrente de etapas conectadas por colas acotadas.
+
+Un rastreo de cartera encadena ``get_supplies`` → ``get_contract_detail`` por
+suministro → curvas (consumo, potencia máxima, reactiva) por contrato. Ejecutado
+etapa a etapa, cada una espera a que termine la anterior. :class:`Pipeline` modela
+el trabajo como un grafo dirigido acíclico (DAG) de etapas:
+
+- Cada etapa tiene sus propios hilos y una cola de entrada **acotada**: en cuanto
+  una etapa produce un elemento, la siguiente puede procesarlo, y si se satura la
+  anterior se frena (*backpressure*) en lugar de acumular memoria.
+- Todas las etapas comparten un :class:`~datadis_python.utils.rate_limit.RateLimiter`
+  opcional: cada llamada a una etapa consume un token.
+- Los resultados y errores se entregan a un *sink* como :class:`StageResult`. Un
+  error en un elemento no detiene el pipeline.
+
+:func:`crawl_portfolio` construye y ejecuta el DAG de rastreo de cartera. Con un
+almacén de instantáneas (``snapshots``) solo se piden contratos y curvas de los
+suministros añadidos o modificados desde la ejecución anterior.
+
+Example:
+    Rastrear la cartera de 2024 guardando cada respuesta de curva::
+
+        def sink(result):
+            if result.stage in PORTFOLIO_CURVE_STAGES and result.ok:
+                save(result.item, result.output)
+
+        stats = crawl_portfolio(
+            client, "2024/01", "2024/12", sink, rate_limiter=RateLimiter(5, 10)
+        )
+
+:author: TacoronteRiveroCristian
+"""
+
+import logging
+import queue
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..exceptions import ValidationError
+from ..utils.chunking import month_index, month_text
+from ..utils.events import emit
+from ..utils.rate_limit import RateLimiter
+from .snapshots import SuppliesDiff, SupplySnapshotStore, diff_supplies
+
+logger = logging.getLogger(__name__)
+
+#: Etapas de curvas del rastreo de cartera, en el orden en que se crean.
+PORTFOLIO_CURVE_STAGES = ("consumption", "max_power", "reactive")
+
+_DONE = object()
+
+
+@dataclass
+class StageResult:
+    """
+    Resultado de procesar un elemento en una etapa.
+
+    :param stage: Nombre de la etapa
+    :param item: Elemento de entrada
+    :param output: Salida producida (``None`` si hubo error)
+    :param error: Excepción producida (``None`` si tuvo éxito)
+    """
+
+    stage: str
+    item: Any
+    output: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """``True`` si la etapa procesó el elemento sin error."""
+        return self.error is None
+
+
+@dataclass
+class _Stage:
+    """Definición de una etapa del pipeline."""
+
+    name: str
+    func: Callable[[Any], Iterable[Any]]
+    downstream: Tuple[str, ...]
+    workers: int
+    queue_size: int
+
+
+class Pipeline:
+    """
+    DAG de etapas concurrentes conectadas por colas acotadas.
+
+    Cada etapa es una función ``func(elemento)`` que devuelve un iterable de
+    salidas; cada salida se entrega al *sink* y se encola en todas las etapas de
+    ``downstream``.
+
+    :param sink: Función que recibe cada :class:`StageResult`; las llamadas se
+                serializan, por lo que no necesita ser segura entre hilos
+    :type sink: Optional[Callable[[StageResult], None]]
+    :param rate_limiter: Limitador compartido por todas las etapas
+    :type rate_limiter: Optional[RateLimiter]
+    """
+
+    def __init__(
+        self,
+        sink: Optional[Callable[[StageResult], None]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        """Inicializa un pipeline sin etapas."""
+        self.sink = sink
+        self.rate_limiter = rate_limiter
+        self._stages: Dict[str, _Stage] = {}
+        self._sink_lock = threading.Lock()
+
+    def add_stage(
+        self,
+        name: str,
+        func: Callable[[Any], Iterable[Any]],
+        downstream: Sequence[str] = (),
+        workers: int = 1,
+        queue_size: int = 100,
+    ) -> "Pipeline":
+        """
+        Añade una etapa al pipeline.
+
+        :param name: Nombre único de la etapa
+        :type name: str
+        :param func: Función que procesa un elemento y devuelve sus salidas
+        :type func: Callable[[Any], Iterable[Any]]
+        :param downstream: Etapas que reciben las salidas
+        :type downstream: Sequence[str]
+        :param workers: Hilos de la etapa
+        :type workers: int
+        :param queue_size: Capacidad de la cola de entrada
+        :type queue_size: int
+        :return: El propio pipeline, para encadenar llamadas
+        :rtype: Pipeline
+        :raises ValidationError: Si el nombre está repetido o los tamaños no son
+                                positivos
+        """
+        if name in self._stages:
+            raise ValidationError(f"La etapa '{name}' ya existe")
+        if workers < 1 or queue_size < 1:
+            raise ValidationError(
+                f"workers y queue_size deben ser positivos en la etapa '{name}'"
+            )
+        self._stages[name] = _Stage(name, func, tuple(downstream), workers, queue_size)
+        return self
+
+    def _check_graph(self, entry: str) -> Dict[str, int]:
+        """
+        Comprueba que el grafo es un DAG válido y cuenta los productores de cada etapa.
+
+        :return: Número de productores de cada etapa (el de entrada cuenta con la
+                 propia alimentación del pipeline)
+        :raises ValidationError: Si hay etapas desconocidas o ciclos
+        """
+        if entry not in self._stages:
+            raise ValidationError(f"Etapa de entrada desconocida: {entry}")
+        producers = Counter({name: 0 for name in self._stages})
+        for stage in self._stages.values():
+            for target in stage.downstream:
+                if target not in self._stages:
+                    raise ValidationError(
+                        f"La etapa '{stage.name}' apunta a una etapa desconocida: "
+                        f"{target}"
+                    )
+                producers[target] += 1
+
+        # Ordenación topológica (Kahn) para detectar ciclos
+        pending = dict(producers)
+        ready = [name for name, count in pending.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for target in self._stages[name].downstream:
+                pending[target] -= 1
+                if pending[target] == 0:
+                    ready.append(target)
+        if visited != len(self._stages):
+            raise ValidationError("Las etapas del pipeline forman un ciclo")
+
+        producers[entry] += 1
+        return dict(producers)
+
+    def _report(self, result: StageResult) -> None:
+        """Entrega un resultado al sink sin dejar que sus errores paren la etapa."""
+        if self.sink is None:
+            return
+        try:
+            with self._sink_lock:
+                self.sink(result)
+        except Exception as e:
+            emit(
+                logger,
+                logging.ERROR,
+                "pipeline.sink_error",
+                "Error en el sink de la etapa %(stage)s: %(error)s",
+                stage=result.stage,
+                error=str(e),
+            )
+
+    def run(self, seeds: Iterable[Any], entry: str) -> Dict[str, Counter]:
+        """
+        Ejecuta el pipeline hasta procesar todos los elementos.
+
+        :param seeds: Elementos iniciales de la etapa de entrada
+        :type seeds: Iterable[Any]
+        :param entry: Nombre de la etapa de entrada
+        :type entry: str
+        :return: Contadores por etapa: ``processed``, ``failed`` y ``outputs``
+        :rtype: Dict[str, Counter]
+        :raises ValidationError: Si el grafo no es un DAG válido
+        """
+        producers = self._check_graph(entry)
+        queues: Dict[str, "queue.Queue[Any]"] = {
+            name: queue.Queue(maxsize=stage.queue_size)
+            for name, stage in self._stages.items()
+        }
+        stats: Dict[str, Counter] = {name: Counter() for name in self._stages}
+        remaining_producers = dict(producers)
+        remaining_workers = {
+            name: stage.workers for name, stage in self._stages.items()
+        }
+        lock = threading.Lock()
+
+        def producer_finished(name: str) -> None:
+            with lock:
+                remaining_producers[name] -= 1
+                finished = remaining_producers[name] == 0
+            if finished:
+                for _ in range(self._stages[name].workers):
+                    queues[name].put(_DONE)
+
+        def process(stage: _Stage, item: Any) -> None:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                outputs = list(stage.func(item))
+            except Exception as e:
+                with lock:
+                    stats[stage.name]["failed"] += 1
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "pipeline.item_error",
+                    "Error en la etapa %(stage)s: %(error)s",
+                    stage=stage.name,
+                    error=str(e),
+                )
+                self._report(StageResult(stage.name, item, error=e))
+                return
+            with lock:
+                stats[stage.name]["processed"] += 1
+                stats[stage.name]["outputs"] += len(outputs)
+            for output in outputs:
+                self._report(StageResult(stage.name, item, output=output))
+                for target in stage.downstream:
+                    queues[target].put(output)
+
+        def worker(stage: _Stage) -> None:
+            source = queues[stage.name]
+            while True:
+                item = source.get()
+                if item is _DONE:
+                    break
+                process(stage, item)
+            with lock:
+                remaining_workers[stage.name] -= 1
+                last = remaining_workers[stage.name] == 0
+            if last:
+                for target in stage.downstream:
+                    producer_finished(target)
+
+        threads: List[threading.Thread] = [
+            threading.Thread(
+                target=worker,
+                args=(stage,),
+                name=f"datadis-pipeline-{stage.name}-{index}",
+                daemon=True,
+            )
+            for stage in self._stages.values()
+            for index in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        # Las etapas sin productores no recibirán nunca elementos
+        for name, count in producers.items():
+            if count == 0:
+                remaining_producers[name] = 1
+                producer_finished(name)
+        for seed in seeds:
+            queues[entry].put(seed)
+        producer_finished(entry)
+
+        for thread in threads:
+            thread.join()
+        return stats
+
+
+def _contract_months(
+    contract: Any, date_from: str, date_to: str
+) -> Optional[Tuple[str, str]]:
+    """
+    Intersección del período de un contrato con el rango pedido, en meses.
+
+    :return: Rango ``(desde, hasta)`` o ``None`` si no se solapan
+    """
+    start = month_index(date_from)
+    end = month_index(date_to)
+    contract_start = getattr(contract, "start_date", None)
+    contract_end = getattr(contract, "end_date", None)
+    if contract_start:
+        start = max(start, month_index(contract_start[:7]))
+    if contract_end:
+        end = min(end, month_index(contract_end[:7]))
+    if start > end:
+        return None
+    return month_text(start), month_text(end)
+
+
+def build_portfolio_pipeline(
+    client: Any,
+    date_from: str,
+    date_to: str,
+    sink: Optional[Callable[[StageResult], None]] = None,
+    datasets: Sequence[str] = PORTFOLIO_CURVE_STAGES,
+    rate_limiter: Optional[RateLimiter] = None,
+    workers: int = 2,
+    queue_size: int = 100,
+    measurement_type: int = 0,
+    supply_filter: Optional[Callable[[Optional[str], Any], Iterable[Any]]] = None,
+) -> Pipeline:
+    """
+    Construye el DAG de rastreo de cartera.
+
+    Etapas:
+
+    - ``supplies``: recibe un NIF autorizado (o ``None``) y produce cada
+      ``SupplyData`` (o los que devuelva ``supply_filter``).
+    - ``contracts``: recibe un ``SupplyData`` y produce ``(suministro, contrato,
+      (desde, hasta))`` por cada contrato que se solapa con el rango pedido.
+    - ``consumption``, ``max_power`` y ``reactive``: reciben la tupla anterior y
+      producen la respuesta del cliente para el período del contrato.
+
+    :param client: Cliente V2 (``SimpleDatadisClientV2`` o ``DatadisClientV2``)
+    :param date_from: Primer mes del rango (``YYYY/MM``)
+    :type date_from: str
+    :param date_to: Último mes del rango (``YYYY/MM``)
+    :type date_to: str
+    :param sink: Función que recibe cada :class:`StageResult`
+    :param datasets: Etapas de curvas a incluir (subconjunto de
+                    :data:`PORTFOLIO_CURVE_STAGES`)
+    :type datasets: Sequence[str]
+    :param rate_limiter: Limitador compartido por todas las etapas
+    :type rate_limiter: Optional[RateLimiter]
+    :param workers: Hilos por etapa
+    :type workers: int
+    :param queue_size: Capacidad de la cola de cada etapa
+    :type queue_size: int
+    :param measurement_type: Tipo de medida del consumo
+    :type measurement_type: int
+    :param supply_filter: Función ``(nif, SuppliesResponse)`` que devuelve los
+                         suministros que pasan a la etapa de contratos
+    :return: Pipeline listo para :meth:`Pipeline.run` con entrada ``"supplies"``
+    :rtype: Pipeline
+    :raises ValidationError: Si algún conjunto de datos no es válido
+    """
+    unknown = set(datasets) - set(PORTFOLIO_CURVE_STAGES)
+    if unknown:
+        raise ValidationError(
+            f"Conjuntos de datos no válidos: {', '.join(sorted(unknown))}. "
+            f"Valores válidos: {', '.join(PORTFOLIO_CURVE_STAGES)}"
+        )
+
+    def supplies(authorized_nif: Optional[str]) -> Iterable[Any]:
+        response = client.get_supplies(authorized_nif=authorized_nif)
+        if supply_filter is not None:
+            return supply_filter(authorized_nif, response)
+        return response.supplies
+
+    def contracts(supply: Any) -> Iterable[Any]:
+        response = client.get_contract_detail(supply.cups, supply.distributor_code)
+        for contract in response.contract:
+            months = _contract_months(contract, date_from, date_to)
+            if months is not None:
+                yield supply, contract, months
+
+    def consumption(task: Tuple[Any, Any, Tuple[str, str]]) -> List[Any]:
+        supply, _, (start, end) = task
+        return [
+            client.get_consumption(
+                supply.cups,
+                supply.distributor_code,
+                start,
+                end,
+                measurement_type=measurement_type,
+                point_type=supply.point_type,
+            )
+        ]
+
+    def max_power(task: Tuple[Any, Any, Tuple[str, str]]) -> List[Any]:
+        supply, _, (start, end) = task
+        return [client.get_max_power(supply.cups, supply.distributor_code, start, end)]
+
+    def reactive(task: Tuple[Any, Any, Tuple[str, str]]) -> List[Any]:
+        supply, _, (start, end) = task
+        return [
+            client.get_reactive_data(supply.cups, supply.distributor_code, start, end)
+        ]
+
+    curve_stages = {
+        "consumption": consumption,
+        "max_power": max_power,
+        "reactive": reactive,
+    }
+    pipeline = Pipeline(sink=sink, rate_limiter=rate_limiter)
+    pipeline.add_stage("supplies", supplies, ["contracts"], 1, queue_size)
+    pipeline.add_stage("contracts", contracts, list(datasets), workers, queue_size)
+    for name in datasets:
+        pipeline.add_stage(name, curve_stages[name], (), workers, queue_size)
+    return pipeline
+
+
+def crawl_portfolio(
+    client: Any,
+    date_from: str,
+    date_to: str,
+    sink: Callable[[StageResult], None],
+    authorized_nifs: Iterable[Optional[str]] = (None,),
+    snapshots: Optional[SupplySnapshotStore] = None,
+    **options: Any,
+) -> Dict[str, Counter]:
+    """
+    Rastrea la cartera completa: suministros, contratos y curvas, de forma solapada.
+
+    Los contratos y curvas de los primeros suministros se piden mientras los
+    siguientes aún se están descubriendo.
+
+    Con ``snapshots``, los suministros de cada NIF se comparan con su instantánea
+    anterior (nombre: el NIF, o ``""`` para la propia cuenta) y solo los añadidos
+    o modificados pasan a las etapas de contratos y curvas. Las instantáneas se
+    guardan al terminar; los suministros cuyo contrato o curvas fallaron conservan
+    su versión anterior para reintentarse en la siguiente ejecución.
+
+    :param client: Cliente V2 (``SimpleDatadisClientV2`` o ``DatadisClientV2``)
+    :param date_from: Primer mes del rango (``YYYY/MM``)
+    :type date_from: str
+    :param date_to: Último mes del rango (``YYYY/MM``)
+    :type date_to: str
+    :param sink: Función que recibe cada :class:`StageResult`
+    :type sink: Callable[[StageResult], None]
+    :param authorized_nifs: NIFs cuyos suministros se rastrean (``None`` para los
+                           del propio usuario)
+    :type authorized_nifs: Iterable[Optional[str]]
+    :param snapshots: Almacén de instantáneas de suministros
+    :type snapshots: Optional[SupplySnapshotStore]
+    :param options: Opciones de :func:`build_portfolio_pipeline`
+    :return: Contadores por etapa (ver :meth:`Pipeline.run`)
+    :rtype: Dict[str, Counter]
+    """
+    if snapshots is None:
+        pipeline = build_portfolio_pipeline(client, date_from, date_to, sink, **options)
+        return pipeline.run(authorized_nifs, "supplies")
+
+    diffs: Dict[str, SuppliesDiff] = {}
+    failed = set()
+
+    def changed_supplies(authorized_nif: Optional[str], response: Any) -> List[Any]:
+        name = authorized_nif or ""
+        diff = diff_supplies(snapshots.load(name), response)
+        diffs[name] = diff
+        emit(
+            logger,
+            logging.INFO,
+            "snapshots.diff",
+            "Suministros de %(name)r: %(added)d nuevos, %(changed)d modificados, "
+            "%(removed)d eliminados",
+            name=name,
+            added=len(diff.added),
+            changed=len(diff.changed),
+            removed=len(diff.removed),
+            unchanged=diff.unchanged,
+            unavailable=len(diff.unavailable),
+        )
+        return diff.refetch()
+
+    def tracking_sink(result: StageResult) -> None:
+        if not result.ok and result.stage != "supplies":
+            supply = result.item if result.stage == "contracts" else result.item[0]
+            failed.add(supply.cups)
+        sink(result)
+
+    pipeline = build_portfolio_pipeline(
+        client,
+        date_from,
+        date_to,
+        tracking_sink,
+        supply_filter=changed_supplies,
+        **options,
+    )
+    stats = pipeline.run(authorized_nifs, "supplies")
+    for name, diff in diffs.items():
+        snapshots.save(name, diff.snapshot(failed))
+    return stats
@@ -0,0 +1,289 @@
+"""
+Planificación de backfills según la cobertura ya almacenada.
+
+Antes de un backfill interesa saber exactamente qué celdas
+``(CUPS, mes, conjunto de datos)`` faltan en local. :class:`CoverageIndex`
+mantiene, por CUPS y conjunto de datos, un índice de intervalos de meses ya
+almacenados (:class:`MonthIntervals`, listas ordenadas y disjuntas con búsqueda
+binaria) y :func:`plan_backfill` calcula el conjunto mínimo de peticiones que
+cubre los huecos:
+
+- Los meses ausentes contiguos se agrupan en una sola petición, hasta
+  ``max_months`` meses por petición.
+- Nunca se piden meses ya cubiertos.
+
+Example:
+    Planificar y ejecutar el backfill de 2023::
+
+        index = CoverageIndex()
+        index.add(cups, "consumption", "2023/01", "2023/06")  # ya almacenado
+
+        plan = plan_backfill(index, supplies, "2023/01", "2023/12")
+        requests = [r.as_kwargs() for r in plan if r.dataset == "consumption"]
+        for item in client.get_consumption_many(requests):
+            ...
+
+:author: TacoronteRiveroCristian
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from ..exceptions import ValidationError
+from ..utils.chunking import month_index, month_text, split_month_range
+
+#: Conjuntos de datos que planifica :func:`plan_backfill` por defecto.
+BACKFILL_DATASETS = ("consumption", "max_power")
+
+
+class MonthIntervals:
+    """
+    Conjunto de meses representado como intervalos ordenados y disjuntos.
+
+    Los meses son índices absolutos (``año * 12 + mes - 1``). Los intervalos
+    adyacentes o solapados se fusionan al añadirlos, y las consultas usan búsqueda
+    binaria sobre los inicios.
+    """
+
+    def __init__(self) -> None:
+        """Inicializa un conjunto vacío."""
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+
+    def __len__(self) -> int:
+        """Número de intervalos disjuntos."""
+        return len(self._starts)
+
+    def intervals(self) -> List[Tuple[int, int]]:
+        """
+        Intervalos almacenados, ambos extremos inclusive.
+
+        :rtype: List[Tuple[int, int]]
+        """
+        return list(zip(self._starts, self._ends))
+
+    def add(self, start: int, end: int) -> None:
+        """
+        Añade el intervalo ``[start, end]`` fusionándolo con sus vecinos.
+
+        :param start: Primer mes
+        :type start: int
+        :param end: Último mes (inclusive)
+        :type end: int
+        """
+        if start > end:
+            return
+        # Intervalos que solapan o tocan [start, end]
+        first = bisect_left(self._ends, start - 1)
+        last = bisect_right(self._starts, end + 1)
+        if first < last:
+            start = min(start, self._starts[first])
+            end = max(end, self._ends[last - 1])
+        self._starts[first:last] = [start]
+        self._ends[first:last] = [end]
+
+    def contains(self, month: int) -> bool:
+        """
+        Indica si un mes está cubierto.
+
+        :param month: Mes
+        :type month: int
+        :rtype: bool
+        """
+        position = bisect_right(self._starts, month) - 1
+        return position >= 0 and self._ends[position] >= month
+
+    def gaps(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        Intervalos de ``[start, end]`` que no están cubiertos.
+
+        :param start: Primer mes
+        :type start: int
+        :param end: Último mes (inclusive)
+        :type end: int
+        :return: Huecos ordenados, ambos extremos inclusive
+        :rtype: List[Tuple[int, int]]
+        """
+        missing = []
+        cursor = start
+        position = max(bisect_right(self._starts, start) - 1, 0)
+        while cursor <= end and position < len(self._starts):
+            covered_start = self._starts[position]
+            covered_end = self._ends[position]
+            if covered_start > end:
+                break
+            if covered_end >= cursor:
+                if covered_start > cursor:
+                    missing.append((cursor, covered_start - 1))
+                cursor = covered_end + 1
+            position += 1
+        if cursor <= end:
+            missing.append((cursor, end))
+        return missing
+
+
+class BackfillRequest(NamedTuple):
+    """
+    Petición planificada para cubrir un hueco.
+
+    :param cups: Código CUPS
+    :param distributor_code: Código de la distribuidora
+    :param dataset: Conjunto de datos (``"consumption"`` o ``"max_power"``)
+    :param date_from: Primer mes (``YYYY/MM``)
+    :param date_to: Último mes (``YYYY/MM``)
+    """
+
+    cups: str
+    distributor_code: str
+    dataset: str
+    date_from: str
+    date_to: str
+
+    @property
+    def task_id(self) -> str:
+        """Identificador estable, útil como tarea de :class:`JobJournal`."""
+        return f"{self.dataset}:{self.cups}:{self.date_from}-{self.date_to}"
+
+    def as_kwargs(self) -> Dict[str, str]:
+        """
+        Argumentos del método del cliente (``get_consumption``, ``get_max_power``).
+
+        El diccionario es serializable en JSON y se acepta también como petición
+        de los métodos ``*_many``.
+
+        :rtype: Dict[str, str]
+        """
+        return {
+            "cups": self.cups,
+            "distributor_code": self.distributor_code,
+            "date_from": self.date_from,
+            "date_to": self.date_to,
+        }
+
+
+class CoverageIndex:
+    """Índice de la cobertura almacenada por ``(CUPS, conjunto de datos)``."""
+
+    def __init__(self) -> None:
+        """Inicializa un índice vacío."""
+        self._series: Dict[Tuple[str, str], MonthIntervals] = {}
+
+    def _intervals(self, cups: str, dataset: str) -> MonthIntervals:
+        """Intervalos de una serie, creándolos si no existen."""
+        key = (cups, dataset)
+        if key not in self._series:
+            self._series[key] = MonthIntervals()
+        return self._series[key]
+
+    def add(self, cups: str, dataset: str, date_from: str, date_to: str) -> None:
+        """
+        Marca como almacenados los meses de un rango.
+
+        :param cups: Código CUPS
+        :type cups: str
+        :param dataset: Conjunto de datos
+        :type dataset: str
+        :param date_from: Primer mes (``YYYY/MM``)
+        :type date_from: str
+        :param date_to: Último mes (``YYYY/MM``)
+        :type date_to: str
+        """
+        self._intervals(cups, dataset).add(
+            month_index(date_from[:7]), month_index(date_to[:7])
+        )
+
+    def add_records(self, cups: str, dataset: str, records: Iterable[Any]) -> None:
+        """
+        Marca como almacenados los meses con algún registro.
+
+        :param cups: Código CUPS
+        :type cups: str
+        :param dataset: Conjunto de datos
+        :type dataset: str
+        :param records: Registros con atributo ``date`` (``YYYY/MM/DD``)
+        :type records: Iterable[Any]
+        """
+        intervals = self._intervals(cups, dataset)
+        for month in {record.date[:7] for record in records}:
+            index = month_index(month)
+            intervals.add(index, index)
+
+    def is_covered(self, cups: str, dataset: str, month: str) -> bool:
+        """
+        Indica si un mes de una serie está almacenado.
+
+        :param month: Mes (``YYYY/MM``)
+        :type month: str
+        :rtype: bool
+        """
+        intervals = self._series.get((cups, dataset))
+        return intervals is not None and intervals.contains(month_index(month[:7]))
+
+    def missing(
+        self, cups: str, dataset: str, date_from: str, date_to: str
+    ) -> List[Tuple[str, str]]:
+        """
+        Rangos de meses de ``[date_from, date_to]`` que faltan en una serie.
+
+        :return: Huecos ``(desde, hasta)`` en formato ``YYYY/MM``
+        :rtype: List[Tuple[str, str]]
+        """
+        start = month_index(date_from[:7])
+        end = month_index(date_to[:7])
+        intervals = self._series.get((cups, dataset))
+        gaps = intervals.gaps(start, end) if intervals else [(start, end)]
+        return [(month_text(first), month_text(last)) for first, last in gaps]
+
+
+def _supply_identity(supply: Any) -> Tuple[str, str]:
+    """``(cups, distribuidora)`` de un ``SupplyData``, tupla o diccionario."""
+    if isinstance(supply, (tuple, list)):
+        return str(supply[0]), str(supply[1])
+    if isinstance(supply, dict):
+        code = supply.get("distributor_code", supply.get("distributorCode"))
+        return str(supply["cups"]), str(code)
+    return str(supply.cups), str(supply.distributor_code)
+
+
+def plan_backfill(
+    index: CoverageIndex,
+    supplies: Iterable[Any],
+    date_from: str,
+    date_to: str,
+    datasets: Sequence[str] = BACKFILL_DATASETS,
+    max_months: int = 12,
+) -> List[BackfillRequest]:
+    """
+    Calcula las peticiones mínimas para cubrir los huecos de un rango.
+
+    :param index: Cobertura almacenada
+    :type index: CoverageIndex
+    :param supplies: ``SupplyData``, tuplas ``(cups, distribuidora)`` o
+                    diccionarios
+    :type supplies: Iterable[Any]
+    :param date_from: Primer mes del rango (``YYYY/MM``)
+    :type date_from: str
+    :param date_to: Último mes del rango (``YYYY/MM``)
+    :type date_to: str
+    :param datasets: Conjuntos de datos a planificar
+    :type datasets: Sequence[str]
+    :param max_months: Meses máximos por petición
+    :type max_months: int
+    :return: Peticiones ordenadas por suministro, conjunto de datos y fecha
+    :rtype: List[BackfillRequest]
+    :raises ValidationError: Si ``max_months`` no es positivo
+    """
+    if max_months < 1:
+        raise ValidationError(
+            f"max_months debe ser un entero positivo. Recibido: {max_months}"
+        )
+    plan: List[BackfillRequest] = []
+    for supply in supplies:
+        cups, distributor_code = _supply_identity(supply)
+        for dataset in datasets:
+            for gap_from, gap_to in index.missing(cups, dataset, date_from, date_to):
+                plan.extend(
+                    BackfillRequest(cups, distributor_code, dataset, first, last)
+                    for first, last in split_month_range(gap_from, gap_to, max_months)
+                )
+    return plan
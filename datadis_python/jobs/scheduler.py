@@ -0,0 +1,352 @@
+"""
+Planificador de peticiones con prioridades y reparto justo entre clientes.
+
+Un backfill nocturno de miles de CUPS no debe retrasar una consulta urgente de otro
+cliente. :class:`FairScheduler` es un ejecutor compartido (compatible con
+:class:`concurrent.futures.Executor`) que decide qué tarea atiende cada hilo:
+
+- **Prioridades**: siempre se atiende primero el nivel más urgente con tareas en
+  cola (:data:`PRIORITY_INTERACTIVE`, :data:`PRIORITY_NORMAL`,
+  :data:`PRIORITY_BATCH`).
+- **Reparto justo ponderado**: dentro de un nivel, los clientes (cuentas, NIF...)
+  se turnan en proporción a su peso (*stride scheduling*). Un cliente que llega a
+  la cola no acumula crédito por el tiempo que estuvo inactivo.
+- **Protección frente a inanición**: una tarea que lleva más de ``max_wait``
+  segundos en cola se atiende antes que cualquier otra, sea cual sea su prioridad.
+
+Cada :meth:`FairScheduler.lane` devuelve un ejecutor ligado a un cliente y una
+prioridad, que puede pasarse como ``executor`` a
+:func:`~datadis_python.utils.concurrency.run_bulk` y a los métodos ``*_many``.
+Las tareas ya en ejecución no se interrumpen: una petición interactiva espera
+como mucho a que quede libre el siguiente hilo.
+
+Example:
+    Backfill en segundo plano y consultas interactivas sobre los mismos hilos::
+
+        scheduler = FairScheduler(max_workers=8, weights={"acme": 2})
+
+        batch = scheduler.lane("acme", PRIORITY_BATCH)
+        results = client.get_consumption_many(supplies, "2023/01", "2023/12",
+                                              executor=batch)
+
+        urgent = scheduler.lane("beta", PRIORITY_INTERACTIVE)
+        response = urgent.submit(client.get_consumption, cups, "2",
+                                 "2024/01", "2024/01").result()
+
+:author: TacoronteRiveroCristian
+"""
+
+import contextvars
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from ..exceptions import ValidationError
+from ..utils.events import emit
+
+logger = logging.getLogger(__name__)
+
+#: Peticiones que un usuario espera en el momento.
+PRIORITY_INTERACTIVE = 0
+#: Prioridad por defecto.
+PRIORITY_NORMAL = 1
+#: Descargas masivas en segundo plano.
+PRIORITY_BATCH = 2
+
+
+@dataclass
+class _Task:
+    """Tarea en cola del planificador."""
+
+    future: Future
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    context: contextvars.Context
+    enqueued: float
+    sequence: int
+
+
+class SchedulerLane(Executor):
+    """
+    Ejecutor ligado a un cliente y una prioridad de un :class:`FairScheduler`.
+
+    :param scheduler: Planificador compartido
+    :type scheduler: FairScheduler
+    :param customer: Cliente al que se cargan las tareas
+    :param priority: Prioridad de las tareas (menor es más urgente)
+    :type priority: int
+    """
+
+    def __init__(
+        self, scheduler: "FairScheduler", customer: Hashable, priority: int
+    ) -> None:
+        """Inicializa el carril."""
+        self.scheduler = scheduler
+        self.customer = customer
+        self.priority = priority
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """
+        Encola ``fn(*args, **kwargs)`` con el cliente y la prioridad del carril.
+
+        :return: Future con el resultado de la llamada
+        :rtype: Future
+        """
+        return self.scheduler._enqueue(self.customer, self.priority, fn, args, kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """No hace nada: los hilos pertenecen al planificador compartido."""
+
+
+class FairScheduler(Executor):
+    """
+    Ejecutor compartido con prioridades, reparto justo y protección de inanición.
+
+    Los hilos se crean con la primera tarea. :meth:`submit` encola en el carril por
+    defecto (cliente ``None``, :data:`PRIORITY_NORMAL`).
+
+    :param max_workers: Número de hilos
+    :type max_workers: int
+    :param weights: Peso de cada cliente (por defecto 1)
+    :type weights: Optional[Mapping[Hashable, float]]
+    :param max_wait: Segundos en cola a partir de los cuales una tarea se atiende
+                    antes que cualquier otra (``None``: sin protección)
+    :type max_wait: Optional[float]
+    :param clock: Reloj monotónico (configurable para tests)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        weights: Optional[Mapping[Hashable, float]] = None,
+        max_wait: Optional[float] = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Inicializa el planificador sin hilos ni tareas.
+
+        :raises ValidationError: Si ``max_workers``, los pesos o ``max_wait`` no son
+                                positivos
+        """
+        if max_workers < 1:
+            raise ValidationError(
+                f"max_workers debe ser un entero positivo. Recibido: {max_workers}"
+            )
+        if max_wait is not None and max_wait <= 0:
+            raise ValidationError(f"max_wait debe ser positivo. Recibido: {max_wait}")
+        self.max_workers = max_workers
+        self.max_wait = max_wait
+        self.clock = clock
+        self._weights: Dict[Hashable, float] = {}
+        for customer, weight in (weights or {}).items():
+            self.set_weight(customer, weight)
+        self._condition = threading.Condition()
+        self._queues: Dict[int, Dict[Hashable, Deque[_Task]]] = {}
+        self._passes: Dict[Tuple[int, Hashable], float] = {}
+        self._virtual_time: Dict[int, float] = {}
+        self._sequence = itertools.count()
+        self._pending = 0
+        # Hilos sin tarea asignada (esperando o recién creados)
+        self._idle = 0
+        self._threads: List[threading.Thread] = []
+        self._shutdown = False
+
+    def set_weight(self, customer: Hashable, weight: float) -> None:
+        """
+        Cambia el peso de un cliente; afecta a las siguientes tareas que atienda.
+
+        :param customer: Cliente
+        :param weight: Peso relativo (un cliente con peso 2 recibe el doble de turnos
+                      que uno con peso 1 en el mismo nivel de prioridad)
+        :type weight: float
+        :raises ValidationError: Si el peso no es positivo
+        """
+        if weight <= 0:
+            raise ValidationError(
+                f"El peso de {customer!r} debe ser positivo. Recibido: {weight}"
+            )
+        self._weights[customer] = float(weight)
+
+    def lane(
+        self, customer: Hashable = None, priority: int = PRIORITY_NORMAL
+    ) -> SchedulerLane:
+        """
+        Ejecutor que encola sus tareas con un cliente y una prioridad.
+
+        :param customer: Cliente (cuenta, NIF...)
+        :param priority: Prioridad (menor es más urgente)
+        :type priority: int
+        :rtype: SchedulerLane
+        """
+        return SchedulerLane(self, customer, priority)
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """
+        Encola ``fn(*args, **kwargs)`` en el carril por defecto.
+
+        :return: Future con el resultado de la llamada
+        :rtype: Future
+        """
+        return self._enqueue(None, PRIORITY_NORMAL, fn, args, kwargs)
+
+    def pending(self) -> int:
+        """
+        Número de tareas en cola (sin contar las que están en ejecución).
+
+        :rtype: int
+        """
+        with self._condition:
+            return self._pending
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Detiene el planificador cuando se vacía la cola.
+
+        :param wait: Esperar a que terminen los hilos
+        :type wait: bool
+        :param cancel_futures: Cancelar las tareas que aún no han empezado
+        :type cancel_futures: bool
+        """
+        with self._condition:
+            self._shutdown = True
+            if cancel_futures:
+                for customers in self._queues.values():
+                    for queue in customers.values():
+                        for task in queue:
+                            task.future.cancel()
+                self._queues.clear()
+                self._pending = 0
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _enqueue(
+        self,
+        customer: Hashable,
+        priority: int,
+        fn: Callable[..., Any],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> Future:
+        """Añade una tarea a la cola de su prioridad y cliente."""
+        future: Future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("No se pueden encolar tareas tras shutdown()")
+            customers = self._queues.setdefault(priority, {})
+            if customer not in customers:
+                customers[customer] = deque()
+                # Sin crédito acumulado por el tiempo que el cliente estuvo inactivo
+                key = (priority, customer)
+                self._passes[key] = max(
+                    self._passes.get(key, 0.0), self._virtual_time.get(priority, 0.0)
+                )
+            customers[customer].append(
+                _Task(
+                    future,
+                    fn,
+                    args,
+                    kwargs,
+                    contextvars.copy_context(),
+                    self.clock(),
+                    next(self._sequence),
+                )
+            )
+            self._pending += 1
+            # Las tareas en ejecución no liberan su hilo: se crea uno nuevo si no
+            # quedan hilos libres para todas las pendientes
+            if self._idle < self._pending and len(self._threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._work, name="datadis-scheduler", daemon=True
+                )
+                self._threads.append(thread)
+                self._idle += 1
+                thread.start()
+            self._condition.notify()
+        return future
+
+    def _select(self) -> Tuple[int, Hashable]:
+        """Cola de la que sale la siguiente tarea (con el cerrojo adquirido)."""
+        if self.max_wait is not None:
+            # La cabeza de cada cola es su tarea más antigua
+            _, priority, customer = min(
+                (queue[0].sequence, priority, customer)
+                for priority, customers in self._queues.items()
+                for customer, queue in customers.items()
+            )
+            waited = self.clock() - self._queues[priority][customer][0].enqueued
+            if waited >= self.max_wait:
+                emit(
+                    logger,
+                    logging.DEBUG,
+                    "scheduler.aged",
+                    "Tarea de %(customer)s atendida tras %(waited).1fs en cola",
+                    customer=customer,
+                    priority=priority,
+                    waited=waited,
+                )
+                return priority, customer
+        priority = min(self._queues)
+        customers = self._queues[priority]
+        return priority, min(
+            customers,
+            key=lambda name: (
+                self._passes[(priority, name)],
+                customers[name][0].sequence,
+            ),
+        )
+
+    def _next_task(self) -> Optional[_Task]:
+        """Espera y extrae la siguiente tarea; ``None`` tras :meth:`shutdown`."""
+        with self._condition:
+            while not self._pending:
+                if self._shutdown:
+                    self._idle -= 1
+                    return None
+                self._condition.wait()
+            priority, customer = self._select()
+            customers = self._queues[priority]
+            task = customers[customer].popleft()
+            if not customers[customer]:
+                del customers[customer]
+                if not customers:
+                    del self._queues[priority]
+            self._pending -= 1
+            self._idle -= 1
+            key = (priority, customer)
+            self._virtual_time[priority] = self._passes[key]
+            self._passes[key] += 1.0 / self._weights.get(customer, 1.0)
+            return task
+
+    def _work(self) -> None:
+        """Bucle de cada hilo del planificador."""
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            if task.future.set_running_or_notify_cancel():
+                try:
+                    result = task.context.run(task.fn, *task.args, **task.kwargs)
+                except BaseException as e:
+                    task.future.set_exception(e)
+                else:
+                    task.future.set_result(result)
+            with self._condition:
+                self._idle += 1
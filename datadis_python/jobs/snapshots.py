@@ -0,0 +1,265 @@
+"""
+Instantáneas de suministros y detección de cambios entre ejecuciones.
+
+Los suministros cambian poco: algún CUPS nuevo, un ``validDateTo`` que se
+actualiza o un cambio de distribuidora. En lugar de volver a pedir contratos y
+curvas de toda la cartera cada día, se guarda una instantánea del último
+``SuppliesResponse`` (:class:`MemorySnapshotStore`, :class:`JsonSnapshotStore`)
+y :func:`diff_supplies` informa de los suministros añadidos, eliminados y
+modificados en :data:`SUPPLY_DIFF_FIELDS`.
+
+Los suministros de una distribuidora que devuelve ``distributorError`` en la
+consulta actual no se dan por eliminados: se informan en
+:attr:`SuppliesDiff.unavailable` y se conservan en la siguiente instantánea.
+
+Example:
+    Pedir contratos solo de lo que ha cambiado::
+
+        store = JsonSnapshotStore("supplies.json")
+        current = client.get_supplies()
+        diff = diff_supplies(store.load(""), current)
+        for item in client.get_contract_detail_many(diff.refetch()):
+            ...
+        store.save("", diff.snapshot())
+
+    :func:`~datadis_python.jobs.crawl_portfolio` lo hace automáticamente con
+    ``snapshots=store``.
+
+:author: TacoronteRiveroCristian
+"""
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+#: Campos de un suministro cuyo cambio obliga a volver a pedir contratos y curvas.
+SUPPLY_DIFF_FIELDS = (
+    "distributor_code",
+    "distributor",
+    "point_type",
+    "valid_date_from",
+    "valid_date_to",
+)
+
+
+class SupplyChange(NamedTuple):
+    """
+    Suministro modificado entre dos instantáneas.
+
+    :param previous: Suministro en la instantánea anterior
+    :param current: Suministro en la consulta actual
+    :param fields: Campos de :data:`SUPPLY_DIFF_FIELDS` que cambiaron
+    """
+
+    previous: Any
+    current: Any
+    fields: Tuple[str, ...]
+
+
+@dataclass
+class SuppliesDiff:
+    """
+    Diferencias entre una instantánea y la consulta actual.
+
+    :param current: Suministros de la consulta actual
+    :param added: Suministros nuevos
+    :param removed: Suministros que ya no aparecen
+    :param changed: Suministros modificados
+    :param unavailable: Suministros anteriores de distribuidoras que ahora
+                       devuelven ``distributorError`` (ni eliminados ni revisados)
+    :param unchanged: Número de suministros sin cambios
+    """
+
+    current: List[Any]
+    added: List[Any]
+    removed: List[Any]
+    changed: List[SupplyChange]
+    unavailable: List[Any]
+    unchanged: int
+
+    @property
+    def has_changes(self) -> bool:
+        """``True`` si hay suministros añadidos, eliminados o modificados."""
+        return bool(self.added or self.removed or self.changed)
+
+    def refetch(self) -> List[Any]:
+        """
+        Suministros cuyos contratos y curvas deben pedirse de nuevo.
+
+        :return: Añadidos y modificados (en su versión actual)
+        :rtype: List[SupplyData]
+        """
+        return self.added + [change.current for change in self.changed]
+
+    def snapshot(self, failed: Iterable[str] = ()) -> Any:
+        """
+        Instantánea a guardar tras procesar los cambios.
+
+        Los suministros de ``failed`` (CUPS cuyo contrato o curvas no se pudieron
+        obtener) conservan su versión anterior, o se omiten si eran nuevos, para
+        que la siguiente ejecución los vuelva a detectar como cambios.
+
+        :param failed: CUPS cuyo procesamiento falló
+        :type failed: Iterable[str]
+        :rtype: SuppliesResponse
+        """
+        from ..models.responses import SuppliesResponse
+
+        failed = set(failed)
+        previous = {change.current.cups: change.previous for change in self.changed}
+        supplies = []
+        for supply in self.current:
+            if supply.cups not in failed:
+                supplies.append(supply)
+            elif supply.cups in previous:
+                supplies.append(previous[supply.cups])
+        return SuppliesResponse(supplies=supplies + self.unavailable)
+
+
+def _supplies(response: Any) -> List[Any]:
+    """Suministros de un ``SuppliesResponse`` o de un iterable de ``SupplyData``."""
+    if response is None:
+        return []
+    return list(getattr(response, "supplies", response))
+
+
+def diff_supplies(
+    previous: Any, current: Any, fields: Sequence[str] = SUPPLY_DIFF_FIELDS
+) -> SuppliesDiff:
+    """
+    Compara una instantánea con la consulta actual por CUPS.
+
+    :param previous: Instantánea anterior (``SuppliesResponse``, iterable de
+                    ``SupplyData`` o ``None`` si no existe)
+    :param current: Consulta actual (``SuppliesResponse`` o iterable de
+                   ``SupplyData``)
+    :param fields: Campos que se comparan en los suministros presentes en ambas
+    :type fields: Sequence[str]
+    :return: Suministros añadidos, eliminados, modificados y no disponibles
+    :rtype: SuppliesDiff
+    """
+    before = {supply.cups: supply for supply in _supplies(previous)}
+    now = _supplies(current)
+    failed_distributors = {
+        error.distributor_code for error in getattr(current, "distributor_error", [])
+    }
+    added, changed = [], []
+    unchanged = 0
+    for supply in now:
+        old = before.pop(supply.cups, None)
+        if old is None:
+            added.append(supply)
+            continue
+        differences = tuple(
+            name for name in fields if getattr(old, name) != getattr(supply, name)
+        )
+        if differences:
+            changed.append(SupplyChange(old, supply, differences))
+        else:
+            unchanged += 1
+    removed, unavailable = [], []
+    for supply in before.values():
+        if supply.distributor_code in failed_distributors:
+            unavailable.append(supply)
+        else:
+            removed.append(supply)
+    return SuppliesDiff(now, added, removed, changed, unavailable, unchanged)
+
+
+class SupplySnapshotStore(ABC):
+    """
+    Almacén de instantáneas de suministros.
+
+    Cada instantánea tiene un nombre, por ejemplo el NIF autorizado o la cadena
+    vacía para la propia cuenta. Las subclases implementan :meth:`load` y
+    :meth:`save`.
+    """
+
+    @abstractmethod
+    def load(self, name: str) -> Any:
+        """
+        Devuelve una instantánea.
+
+        :param name: Nombre de la instantánea
+        :type name: str
+        :return: ``SuppliesResponse`` o ``None`` si no existe
+        """
+        pass
+
+    @abstractmethod
+    def save(self, name: str, response: Any) -> None:
+        """
+        Guarda una instantánea.
+
+        :param name: Nombre de la instantánea
+        :type name: str
+        :param response: Suministros (``SuppliesResponse``)
+        """
+        pass
+
+
+class MemorySnapshotStore(SupplySnapshotStore):
+    """Almacén en memoria, útil para pruebas o procesos de larga duración."""
+
+    def __init__(self) -> None:
+        """Inicializa el almacén vacío."""
+        self._snapshots: Dict[str, Any] = {}
+
+    def load(self, name: str) -> Any:
+        """Devuelve una instantánea o ``None``."""
+        return self._snapshots.get(name)
+
+    def save(self, name: str, response: Any) -> None:
+        """Guarda una instantánea."""
+        self._snapshots[name] = response
+
+
+class JsonSnapshotStore(SupplySnapshotStore):
+    """
+    Almacén persistente en un fichero JSON.
+
+    Los suministros se guardan con los nombres de la API. Cada :meth:`save`
+    reescribe el fichero de forma atómica (fichero temporal y ``os.replace``).
+
+    :param path: Ruta del fichero; se crea en la primera escritura
+    :type path: str
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Carga las instantáneas existentes.
+
+        :param path: Ruta del fichero JSON
+        :type path: str
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, List[Dict[str, Any]]] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                self._snapshots = json.load(handle)
+
+    def load(self, name: str) -> Any:
+        """Devuelve una instantánea o ``None``."""
+        from ..models.responses import SuppliesResponse
+
+        supplies: Optional[List[Dict[str, Any]]] = self._snapshots.get(name)
+        if supplies is None:
+            return None
+        return SuppliesResponse.model_validate({"supplies": supplies})
+
+    def save(self, name: str, response: Any) -> None:
+        """Guarda una instantánea y persiste el fichero."""
+        supplies = [
+            supply.model_dump(by_alias=True, exclude_none=True)
+            for supply in _supplies(response)
+        ]
+        with self._lock:
+            self._snapshots[name] = supplies
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as handle:
+                json.dump(self._snapshots, handle, indent=2, sort_keys=True)
+            os.replace(temporary, self.path)
@@ -0,0 +1,464 @@
+"""
+Sincronización incremental con marcas de agua por suministro.
+
+En lugar de volver a descargar rangos completos en cada ejecución, la
+sincronización incremental guarda una **marca de agua** por
+``(CUPS, tipo de medida, conjunto de datos)``: la última fecha completa recibida.
+Cada ejecución pide solo los meses a partir de la marca, más una ventana de
+revisión configurable (``recheck_months``) para recoger las correcciones tardías.
+
+En el consumo, la marca no avanza más allá del día anterior al primer registro
+estimado (``obtainMethod`` distinto de ``"Real"``) ni incluye un último día
+incompleto, de modo que los datos estimados se vuelven a pedir hasta que la
+distribuidora publica los reales. Tampoco supera el día anterior al primer
+registro descartado por la validación (``rejected_records``), que se vuelve a
+pedir en la siguiente ejecución.
+
+Example:
+    Sincronización nocturna de toda la cartera::
+
+        from datadis_python.jobs import IncrementalSync, JsonWatermarkStore
+
+        sync = IncrementalSync(client, JsonWatermarkStore("watermarks.json"))
+        for supply in client.get_supplies().supplies:
+            sync.sync_consumption(
+                supply.cups, supply.distributor_code, on_data=store_rows
+            )
+
+:author: TacoronteRiveroCristian
+"""
+
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from ..exceptions import ValidationError
+from ..utils.chunking import month_index, month_text
+from ..utils.events import emit
+
+logger = logging.getLogger(__name__)
+
+#: Meses hacia atrás que admite Datadis respecto al mes actual (límite de 2 años).
+MAX_HISTORY_MONTHS = 23
+
+#: Hora del último registro de un día completo en las curvas de consumo.
+LAST_HOUR_OF_DAY = "24:00"
+
+
+class WatermarkKey(NamedTuple):
+    """
+    Identifica una serie sincronizada.
+
+    :param cups: Código CUPS
+    :param measurement_type: Tipo de medida (``None`` si el conjunto no lo usa)
+    :param dataset: Conjunto de datos (``"consumption"`` o ``"max_power"``)
+    """
+
+    cups: str
+    measurement_type: Optional[int]
+    dataset: str
+
+    def as_text(self) -> str:
+        """Representación estable para almacenar la clave como texto."""
+        measurement = "-" if self.measurement_type is None else self.measurement_type
+        return f"{self.cups}|{measurement}|{self.dataset}"
+
+
+class WatermarkStore(ABC):
+    """
+    Almacén de marcas de agua.
+
+    Las subclases implementan :meth:`get` y :meth:`set`; las marcas son fechas
+    ``YYYY/MM/DD``.
+    """
+
+    @abstractmethod
+    def get(self, key: WatermarkKey) -> Optional[str]:
+        """
+        Devuelve la marca de agua de una serie.
+
+        :param key: Serie
+        :type key: WatermarkKey
+        :return: Última fecha completa o ``None`` si la serie no se ha sincronizado
+        :rtype: Optional[str]
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: WatermarkKey, watermark: str) -> None:
+        """
+        Guarda la marca de agua de una serie.
+
+        :param key: Serie
+        :type key: WatermarkKey
+        :param watermark: Última fecha completa ``YYYY/MM/DD``
+        :type watermark: str
+        """
+        pass
+
+
+class MemoryWatermarkStore(WatermarkStore):
+    """Almacén en memoria, útil para pruebas o ejecuciones únicas."""
+
+    def __init__(self) -> None:
+        """Inicializa el almacén vacío."""
+        self._marks: Dict[str, str] = {}
+
+    def get(self, key: WatermarkKey) -> Optional[str]:
+        """Devuelve la marca de agua de una serie."""
+        return self._marks.get(key.as_text())
+
+    def set(self, key: WatermarkKey, watermark: str) -> None:
+        """Guarda la marca de agua de una serie."""
+        self._marks[key.as_text()] = watermark
+
+
+class JsonWatermarkStore(WatermarkStore):
+    """
+    Almacén persistente en un fichero JSON.
+
+    Cada :meth:`set` reescribe el fichero de forma atómica (fichero temporal y
+    ``os.replace``), por lo que una interrupción nunca deja el fichero a medias.
+
+    :param path: Ruta del fichero; se crea en la primera escritura
+    :type path: str
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Carga las marcas existentes.
+
+        :param path: Ruta del fichero JSON
+        :type path: str
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._marks: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                self._marks = json.load(handle)
+
+    def get(self, key: WatermarkKey) -> Optional[str]:
+        """Devuelve la marca de agua de una serie."""
+        return self._marks.get(key.as_text())
+
+    def set(self, key: WatermarkKey, watermark: str) -> None:
+        """Guarda la marca de agua de una serie y persiste el fichero."""
+        with self._lock:
+            self._marks[key.as_text()] = watermark
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as handle:
+                json.dump(self._marks, handle, indent=2, sort_keys=True)
+            os.replace(temporary, self.path)
+
+
+@dataclass
+class SyncResult:
+    """
+    Resultado de sincronizar una serie.
+
+    :param key: Serie sincronizada
+    :param date_from: Primer mes pedido (``YYYY/MM``)
+    :param date_to: Último mes pedido (``YYYY/MM``)
+    :param response: Respuesta del cliente (``ConsumptionResponse``...)
+    :param previous_watermark: Marca de agua antes de la sincronización
+    :param watermark: Marca de agua guardada tras la sincronización
+    """
+
+    key: WatermarkKey
+    date_from: str
+    date_to: str
+    response: Any
+    previous_watermark: Optional[str]
+    watermark: Optional[str]
+
+    @property
+    def records(self) -> List[Any]:
+        """Registros recibidos (``time_curve`` o ``max_power``)."""
+        for field in ("time_curve", "max_power"):
+            records = getattr(self.response, field, None)
+            if records is not None:
+                return records
+        return []
+
+
+def _previous_day(day: str) -> str:
+    """Día anterior a una fecha ``YYYY/MM/DD``."""
+    return (datetime.strptime(day, "%Y/%m/%d") - timedelta(days=1)).strftime("%Y/%m/%d")
+
+
+def consumption_watermark(records: List[Any]) -> Optional[str]:
+    """
+    Última fecha completa y definitiva de una curva de consumo.
+
+    Es el último día con la hora ``24:00`` recibida, limitado al día anterior al
+    primer registro estimado.
+
+    :param records: Registros ``ConsumptionData``
+    :type records: List[Any]
+    :return: Fecha ``YYYY/MM/DD`` o ``None`` si no hay registros
+    :rtype: Optional[str]
+    """
+    if not records:
+        return None
+    last_day = max(record.date for record in records)
+    if not any(
+        record.date == last_day and record.time == LAST_HOUR_OF_DAY
+        for record in records
+    ):
+        last_day = _previous_day(last_day)
+    estimated = [
+        record.date
+        for record in records
+        if getattr(record, "obtain_method", "Real") != "Real"
+    ]
+    if estimated:
+        last_day = min(last_day, _previous_day(min(estimated)))
+    return last_day
+
+
+def max_power_watermark(records: List[Any], current_month: str) -> Optional[str]:
+    """
+    Último día del último mes cerrado con datos de potencia máxima.
+
+    La potencia máxima del mes en curso puede cambiar hasta que termina, por lo que
+    nunca se da por completa.
+
+    :param records: Registros ``MaxPowerData``
+    :type records: List[Any]
+    :param current_month: Mes en curso ``YYYY/MM``
+    :type current_month: str
+    :return: Fecha ``YYYY/MM/DD`` o ``None`` si no hay meses cerrados
+    :rtype: Optional[str]
+    """
+    closed = [record.date[:7] for record in records if record.date[:7] < current_month]
+    if not closed:
+        return None
+    next_month = month_text(month_index(max(closed)) + 1)
+    return _previous_day(f"{next_month}/01")
+
+
+def rejected_watermark(rejected_records: List[Any], date_from: str) -> Optional[str]:
+    """
+    Límite de la marca de agua impuesto por los registros descartados.
+
+    Los registros que no superan la validación (modo de rescate) no se entregan,
+    así que la marca no puede superar el día anterior al primero de ellos. Un
+    registro sin fecha ``YYYY/MM/DD`` legible se supone al inicio del rango pedido.
+
+    :param rejected_records: ``rejected_records`` de la respuesta
+    :type rejected_records: List[RejectedRecord]
+    :param date_from: Primer mes pedido (``YYYY/MM``)
+    :type date_from: str
+    :return: Fecha ``YYYY/MM/DD`` o ``None`` si no hay registros descartados
+    :rtype: Optional[str]
+    """
+    if not rejected_records:
+        return None
+    days = []
+    for rejected in rejected_records:
+        record = getattr(rejected, "record", None)
+        day = str(record.get("date")) if isinstance(record, dict) else ""
+        try:
+            datetime.strptime(day, "%Y/%m/%d")
+        except ValueError:
+            day = f"{date_from}/01"
+        days.append(day)
+    return _previous_day(min(days))
+
+
+class IncrementalSync:
+    """
+    Sincroniza series de Datadis pidiendo solo los meses posteriores a su marca.
+
+    :param client: Cliente V2 (``SimpleDatadisClientV2`` o ``DatadisClientV2``)
+    :param store: Almacén de marcas de agua
+    :type store: WatermarkStore
+    :param recheck_months: Meses anteriores a la marca que se vuelven a pedir para
+                          recoger correcciones tardías
+    :type recheck_months: int
+    :param initial_months: Meses pedidos en la primera sincronización de una serie
+                          (limitado a los 2 años que conserva Datadis)
+    :type initial_months: int
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        store: WatermarkStore,
+        recheck_months: int = 1,
+        initial_months: int = MAX_HISTORY_MONTHS + 1,
+    ) -> None:
+        """
+        Inicializa la sincronización.
+
+        :raises ValidationError: Si ``recheck_months`` es negativo o
+                                ``initial_months`` no es positivo
+        """
+        if recheck_months < 0:
+            raise ValidationError(
+                f"recheck_months no puede ser negativo. Recibido: {recheck_months}"
+            )
+        if initial_months < 1:
+            raise ValidationError(
+                f"initial_months debe ser positivo. Recibido: {initial_months}"
+            )
+        self.client = client
+        self.store = store
+        self.recheck_months = recheck_months
+        self.initial_months = initial_months
+
+    def plan_range(
+        self, key: WatermarkKey, now: Optional[datetime] = None
+    ) -> Tuple[str, str]:
+        """
+        Calcula el rango de meses a pedir para una serie.
+
+        :param key: Serie
+        :type key: WatermarkKey
+        :param now: Instante actual (por defecto ``datetime.now()``)
+        :type now: Optional[datetime]
+        :return: Rango ``(desde, hasta)`` en formato ``YYYY/MM``
+        :rtype: Tuple[str, str]
+        """
+        now = now or datetime.now()
+        current = now.year * 12 + now.month - 1
+        watermark = self.store.get(key)
+        if watermark is None:
+            start = current - self.initial_months + 1
+        else:
+            start = month_index(watermark[:7]) - self.recheck_months
+        start = min(max(start, current - MAX_HISTORY_MONTHS), current)
+        return month_text(start), month_text(current)
+
+    def sync_consumption(
+        self,
+        cups: str,
+        distributor_code: str,
+        measurement_type: int = 0,
+        point_type: Optional[int] = None,
+        authorized_nif: Optional[str] = None,
+        on_data: Optional[Callable[[SyncResult], None]] = None,
+        now: Optional[datetime] = None,
+    ) -> SyncResult:
+        """
+        Sincroniza la curva de consumo de un suministro.
+
+        :param cups: Código CUPS
+        :param distributor_code: Código de la distribuidora
+        :param measurement_type: Tipo de medida (0 horario, 1 cuarto-horario)
+        :param point_type: Tipo de punto de medida
+        :param authorized_nif: NIF autorizado
+        :param on_data: Función que persiste los datos; se llama **antes** de
+                       guardar la nueva marca, de modo que si falla la marca no avanza
+        :type on_data: Optional[Callable[[SyncResult], None]]
+        :param now: Instante actual (por defecto ``datetime.now()``)
+        :return: Resultado con el rango pedido, la respuesta y la nueva marca
+        :rtype: SyncResult
+        """
+        key = WatermarkKey(cups, int(measurement_type), "consumption")
+
+        def fetch(date_from: str, date_to: str) -> Any:
+            return self.client.get_consumption(
+                cups,
+                distributor_code,
+                date_from,
+                date_to,
+                measurement_type=measurement_type,
+                point_type=point_type,
+                authorized_nif=authorized_nif,
+            )
+
+        return self._sync(
+            key,
+            fetch,
+            lambda response, _: consumption_watermark(response.time_curve),
+            on_data,
+            now,
+        )
+
+    def sync_max_power(
+        self,
+        cups: str,
+        distributor_code: str,
+        authorized_nif: Optional[str] = None,
+        on_data: Optional[Callable[[SyncResult], None]] = None,
+        now: Optional[datetime] = None,
+    ) -> SyncResult:
+        """
+        Sincroniza la potencia máxima de un suministro.
+
+        Acepta las mismas opciones que :meth:`sync_consumption`.
+
+        :return: Resultado con el rango pedido, la respuesta y la nueva marca
+        :rtype: SyncResult
+        """
+        key = WatermarkKey(cups, None, "max_power")
+
+        def fetch(date_from: str, date_to: str) -> Any:
+            return self.client.get_max_power(
+                cups,
+                distributor_code,
+                date_from,
+                date_to,
+                authorized_nif=authorized_nif,
+            )
+
+        return self._sync(
+            key,
+            fetch,
+            lambda response, current: max_power_watermark(response.max_power, current),
+            on_data,
+            now,
+        )
+
+    def _sync(
+        self,
+        key: WatermarkKey,
+        fetch: Callable[[str, str], Any],
+        watermark_of: Callable[[Any, str], Optional[str]],
+        on_data: Optional[Callable[[SyncResult], None]],
+        now: Optional[datetime],
+    ) -> SyncResult:
+        """Pide el rango pendiente, entrega los datos y avanza la marca."""
+        previous = self.store.get(key)
+        date_from, date_to = self.plan_range(key, now)
+        emit(
+            logger,
+            logging.INFO,
+            "sync.plan",
+            "Sincronizando %(cups)s (%(dataset)s): %(date_from)s - %(date_to)s",
+            cups=key.cups,
+            dataset=key.dataset,
+            date_from=date_from,
+            date_to=date_to,
+            watermark=previous,
+        )
+
+        response = fetch(date_from, date_to)
+        watermark = watermark_of(response, date_to) or previous
+        limit = rejected_watermark(getattr(response, "rejected_records", []), date_from)
+        if watermark is not None and limit is not None:
+            watermark = min(watermark, limit)
+        result = SyncResult(key, date_from, date_to, response, previous, watermark)
+
+        if on_data is not None:
+            on_data(result)
+        if watermark is not None and watermark != previous:
+            self.store.set(key, watermark)
+            emit(
+                logger,
+                logging.INFO,
+                "sync.watermark",
+                "Marca de %(cups)s (%(dataset)s): %(previous)s -> %(watermark)s",
+                cups=key.cups,
+                dataset=key.dataset,
+                previous=previous,
+                watermark=watermark,
+            )
+        return result
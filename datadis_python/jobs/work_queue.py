@@ -0,0 +1,725 @@
+"""
+Colas de trabajo compartidas para repartir una descarga entre varias máquinas.
+
+Una sola máquina no siempre cubre toda la cartera en la ventana nocturna. En modo
+coordinador/trabajador, el coordinador publica las tareas (CUPS × conjunto de
+datos × rango de meses) en una :class:`WorkQueue` y cada :class:`QueueWorker`, en
+la máquina que sea, las toma en **concesión** (*lease*):
+
+- Una tarea concedida no se entrega a otro trabajador mientras la concesión esté
+  vigente; el trabajador la renueva periódicamente mientras la procesa.
+- Si el trabajador muere, la concesión caduca y la tarea vuelve a entregarse,
+  hasta ``max_attempts`` concesiones; después queda como ``failed``.
+
+Se incluyen dos implementaciones:
+
+- :class:`SQLiteWorkQueue`: un fichero SQLite local, para varios procesos de una
+  misma máquina o un sistema de ficheros compartido con bloqueos fiables.
+- :class:`RedisWorkQueue`: sobre cualquier cliente compatible con ``redis-py``
+  (dependencia opcional, no se importa). Las concesiones son claves con caducidad
+  (``SET NX PX``), de modo que caducan aunque el trabajador desaparezca.
+
+Example:
+    Coordinador y trabajadores de un backfill::
+
+        queue = RedisWorkQueue(redis.Redis(host="cola"), "backfill-2023")
+
+        # Coordinador
+        enqueue_plan(queue, plan_backfill(index, supplies, "2023/01", "2023/12"))
+
+        # En cada máquina
+        handler = crawl_task_handler(client, on_data=store)
+        QueueWorker(queue, handler, max_workers=8).run()
+
+:author: TacoronteRiveroCristian
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from ..exceptions import ValidationError
+from ..utils.chunking import is_retryable
+from ..utils.events import emit
+from .journal import TASK_DONE, TASK_FAILED, TASK_PENDING
+
+logger = logging.getLogger(__name__)
+
+#: Estado de una tarea concedida a un trabajador.
+TASK_LEASED = "leased"
+#: Estados que informa :meth:`WorkQueue.counts`.
+QUEUE_STATES = (TASK_PENDING, TASK_LEASED, TASK_DONE, TASK_FAILED)
+
+
+@dataclass
+class LeasedTask:
+    """
+    Tarea concedida a un trabajador.
+
+    :param task_id: Identificador de la tarea
+    :param payload: Datos de la tarea (serializables en JSON)
+    :param attempts: Concesiones recibidas, incluida esta
+    :param token: Identificador de la concesión; solo su titular puede confirmarla
+    :param worker: Trabajador que tiene la concesión
+    """
+
+    task_id: str
+    payload: Any
+    attempts: int
+    token: str
+    worker: str
+
+
+class WorkQueue(ABC):
+    """
+    Interfaz de las colas de trabajo con concesiones.
+
+    :param name: Nombre de la cola (varias colas pueden compartir almacenamiento)
+    :type name: str
+    :param max_attempts: Concesiones máximas por tarea
+    :type max_attempts: int
+    """
+
+    def __init__(self, name: str, max_attempts: int = 3) -> None:
+        """
+        Inicializa las opciones comunes.
+
+        :raises ValidationError: Si ``max_attempts`` no es positivo
+        """
+        if max_attempts < 1:
+            raise ValidationError(
+                f"max_attempts debe ser un entero positivo. Recibido: {max_attempts}"
+            )
+        self.name = name
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def put(self, tasks: Mapping[str, Any]) -> int:
+        """
+        Publica tareas nuevas; las ya publicadas no se tocan.
+
+        :param tasks: Diccionario ``{id_tarea: payload}``
+        :type tasks: Mapping[str, Any]
+        :return: Número de tareas nuevas
+        :rtype: int
+        """
+        pass
+
+    @abstractmethod
+    def lease(
+        self, worker: str, limit: int = 1, lease_seconds: float = 300.0
+    ) -> List[LeasedTask]:
+        """
+        Concede hasta ``limit`` tareas disponibles a un trabajador.
+
+        Son disponibles las pendientes y aquellas cuya concesión ha caducado.
+
+        :param worker: Identificador del trabajador
+        :type worker: str
+        :param limit: Número máximo de tareas
+        :type limit: int
+        :param lease_seconds: Duración de la concesión
+        :type lease_seconds: float
+        :rtype: List[LeasedTask]
+        """
+        pass
+
+    @abstractmethod
+    def extend(self, task: LeasedTask, lease_seconds: float) -> bool:
+        """
+        Renueva una concesión vigente.
+
+        :return: ``False`` si la concesión ya no pertenece a ``task.token``
+        :rtype: bool
+        """
+        pass
+
+    @abstractmethod
+    def ack(self, task: LeasedTask) -> bool:
+        """
+        Marca una tarea concedida como completada.
+
+        :return: ``False`` si la concesión ya no pertenece a ``task.token``
+        :rtype: bool
+        """
+        pass
+
+    @abstractmethod
+    def nack(self, task: LeasedTask, error: str, retry: bool = True) -> None:
+        """
+        Libera una tarea concedida que ha fallado.
+
+        :param task: Tarea concedida
+        :type task: LeasedTask
+        :param error: Descripción del error
+        :type error: str
+        :param retry: Devolverla a la cola si le quedan intentos (``False``: la marca
+                     como ``failed``)
+        :type retry: bool
+        """
+        pass
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        """
+        Número de tareas en cada estado.
+
+        :return: Diccionario con todos los :data:`QUEUE_STATES`
+        :rtype: Dict[str, int]
+        """
+        pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_queue (
+    queue TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    token TEXT,
+    lease_expires REAL,
+    error TEXT,
+    PRIMARY KEY (queue, task_id)
+);
+CREATE INDEX IF NOT EXISTS work_queue_by_state ON work_queue (queue, state);
+"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Cola de trabajo en un fichero SQLite.
+
+    Las concesiones se guardan con su caducidad y cada operación es una transacción
+    ``BEGIN IMMEDIATE``, de modo que varios procesos pueden compartir el fichero.
+
+    :param path: Ruta del fichero SQLite (``":memory:"`` para pruebas)
+    :type path: str
+    :param name: Nombre de la cola
+    :type name: str
+    :param max_attempts: Concesiones máximas por tarea
+    :type max_attempts: int
+    :param clock: Reloj de pared (configurable para tests)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        name: str,
+        max_attempts: int = 3,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Abre (o crea) la cola."""
+        super().__init__(name, max_attempts)
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False, timeout=30
+        )
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def _execute(self, sql: str, parameters: Any = ()) -> int:
+        """Ejecuta una sentencia de modificación y devuelve las filas afectadas."""
+        with self._lock:
+            return self._connection.execute(sql, parameters).rowcount
+
+    def put(self, tasks: Mapping[str, Any]) -> int:
+        """Publica tareas nuevas en una sola transacción."""
+        rows = [
+            (self.name, str(task_id), json.dumps(payload), TASK_PENDING)
+            for task_id, payload in tasks.items()
+        ]
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO work_queue (queue, task_id, payload, state) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            return self._connection.total_changes - before
+
+    def lease(
+        self, worker: str, limit: int = 1, lease_seconds: float = 300.0
+    ) -> List[LeasedTask]:
+        """Concede tareas pendientes o con la concesión caducada."""
+        now = self.clock()
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            # Tareas cuyo trabajador murió con la última concesión disponible
+            self._connection.execute(
+                "UPDATE work_queue SET state = ?, token = NULL, error = ? "
+                "WHERE queue = ? AND state = ? AND lease_expires <= ? "
+                "AND attempts >= ?",
+                (
+                    TASK_FAILED,
+                    "Concesión caducada tras agotar los intentos",
+                    self.name,
+                    TASK_LEASED,
+                    now,
+                    self.max_attempts,
+                ),
+            )
+            rows = self._connection.execute(
+                "SELECT task_id, payload, attempts FROM work_queue "
+                "WHERE queue = ? AND (state = ? OR (state = ? AND lease_expires <= ?)) "
+                "ORDER BY rowid LIMIT ?",
+                (self.name, TASK_PENDING, TASK_LEASED, now, limit),
+            ).fetchall()
+            tasks = [
+                LeasedTask(task_id, json.loads(payload), attempts + 1, token, worker)
+                for (task_id, payload, attempts), token in zip(
+                    rows, (uuid.uuid4().hex for _ in rows)
+                )
+            ]
+            self._connection.executemany(
+                "UPDATE work_queue SET state = ?, attempts = ?, worker = ?, token = ?, "
+                "lease_expires = ? WHERE queue = ? AND task_id = ?",
+                [
+                    (
+                        TASK_LEASED,
+                        task.attempts,
+                        worker,
+                        task.token,
+                        now + lease_seconds,
+                        self.name,
+                        task.task_id,
+                    )
+                    for task in tasks
+                ],
+            )
+        return tasks
+
+    def extend(self, task: LeasedTask, lease_seconds: float) -> bool:
+        """Renueva la concesión si sigue perteneciendo a ``task.token``."""
+        return (
+            self._execute(
+                "UPDATE work_queue SET lease_expires = ? "
+                "WHERE queue = ? AND task_id = ? AND token = ? AND state = ?",
+                (
+                    self.clock() + lease_seconds,
+                    self.name,
+                    task.task_id,
+                    task.token,
+                    TASK_LEASED,
+                ),
+            )
+            == 1
+        )
+
+    def ack(self, task: LeasedTask) -> bool:
+        """Marca la tarea como completada si la concesión sigue siendo suya."""
+        return (
+            self._execute(
+                "UPDATE work_queue SET state = ?, token = NULL, error = NULL "
+                "WHERE queue = ? AND task_id = ? AND token = ? AND state = ?",
+                (TASK_DONE, self.name, task.task_id, task.token, TASK_LEASED),
+            )
+            == 1
+        )
+
+    def nack(self, task: LeasedTask, error: str, retry: bool = True) -> None:
+        """Devuelve la tarea a la cola o la marca como fallida."""
+        retry = retry and task.attempts < self.max_attempts
+        self._execute(
+            "UPDATE work_queue SET state = ?, token = NULL, error = ? "
+            "WHERE queue = ? AND task_id = ? AND token = ? AND state = ?",
+            (
+                TASK_PENDING if retry else TASK_FAILED,
+                error,
+                self.name,
+                task.task_id,
+                task.token,
+                TASK_LEASED,
+            ),
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """Número de tareas en cada estado."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT state, COUNT(*) FROM work_queue WHERE queue = ? "
+                "GROUP BY state",
+                (self.name,),
+            ).fetchall()
+        counts = dict.fromkeys(QUEUE_STATES, 0)
+        counts.update(rows)
+        return counts
+
+    def close(self) -> None:
+        """Cierra la conexión con el fichero."""
+        self._connection.close()
+
+
+def _text(value: Any) -> Optional[str]:
+    """Convierte una respuesta de Redis (``bytes`` o ``str``) en texto."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+class RedisWorkQueue(WorkQueue):
+    """
+    Cola de trabajo sobre Redis (o un servidor compatible).
+
+    Estructuras usadas, con prefijo ``{prefix}:{name}``:
+
+    - ``:queue``: conjunto ordenado de tareas no terminadas. La puntuación es el
+      instante a partir del cual la tarea puede concederse (el de publicación o el
+      fin de la concesión en curso).
+    - ``:lease:{id}``: concesión de una tarea; caduca sola (``PX``).
+    - ``:payloads``, ``:attempts`` y ``:failed``: hashes con los datos, las
+      concesiones recibidas y el error de cada tarea fallida.
+    - ``:done``: conjunto de tareas completadas.
+    - ``:tasks``: conjunto de todas las tareas publicadas; ``SADD`` decide de forma
+      atómica qué tareas son nuevas, incluso si ya terminaron.
+
+    Solo se usan comandos básicos (sin scripts Lua), por lo que sirve cualquier
+    cliente con la interfaz de ``redis-py``. Las operaciones que exigen seguir
+    siendo el titular de la concesión (``extend``, ``ack`` y ``nack``) se ejecutan
+    con ``transaction()``: ``WATCH`` sobre la clave de concesión y ``MULTI``/``EXEC``,
+    que se descarta si la concesión cambia o caduca entre la comprobación y la
+    escritura.
+
+    :param client: Cliente Redis (por ejemplo ``redis.Redis(...)``)
+    :param name: Nombre de la cola
+    :type name: str
+    :param max_attempts: Concesiones máximas por tarea
+    :type max_attempts: int
+    :param prefix: Prefijo de las claves
+    :type prefix: str
+    :param clock: Reloj de pared (configurable para tests)
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        name: str,
+        max_attempts: int = 3,
+        prefix: str = "datadis",
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Inicializa la cola sin contactar con el servidor."""
+        super().__init__(name, max_attempts)
+        self.client = client
+        self.clock = clock
+        self._prefix = f"{prefix}:{name}"
+
+    def _key(self, suffix: str) -> str:
+        """Clave Redis de una estructura de la cola."""
+        return f"{self._prefix}:{suffix}"
+
+    def _if_owner(self, task: LeasedTask, commands: Callable[[Any], None]) -> bool:
+        """
+        Ejecuta ``commands`` en una transacción si la concesión sigue siendo suya.
+
+        La clave de concesión se vigila con ``WATCH``: si otro trabajador la
+        adquiere o caduca antes del ``EXEC``, ``transaction()`` repite la
+        comprobación, que entonces falla sin escribir nada.
+
+        :param task: Tarea concedida
+        :type task: LeasedTask
+        :param commands: Función que encola los comandos en el pipeline
+        :type commands: Callable[[Any], None]
+        :return: ``False`` si la concesión ya no pertenece a ``task.token``
+        :rtype: bool
+        """
+        lease_key = self._key(f"lease:{task.task_id}")
+
+        def transaction(pipe: Any) -> bool:
+            if _text(pipe.get(lease_key)) != task.token:
+                return False
+            pipe.multi()
+            commands(pipe)
+            return True
+
+        return bool(
+            self.client.transaction(transaction, lease_key, value_from_callable=True)
+        )
+
+    def _fail(self, target: Any, task_id: str, error: str) -> None:
+        """Retira una tarea de la cola y registra su error (en cliente o pipeline)."""
+        target.zrem(self._key("queue"), task_id)
+        target.hset(self._key("failed"), task_id, error)
+
+    def put(self, tasks: Mapping[str, Any]) -> int:
+        """Publica tareas nuevas."""
+        now = self.clock()
+        added = 0
+        for task_id, payload in tasks.items():
+            task_id = str(task_id)
+            # El conjunto de tareas publicadas conserva las ya terminadas, cuyo
+            # payload borra ack: así no vuelven a la cola
+            if self.client.sadd(self._key("tasks"), task_id):
+                self.client.hset(self._key("payloads"), task_id, json.dumps(payload))
+                self.client.zadd(self._key("queue"), {task_id: now})
+                added += 1
+        return added
+
+    def lease(
+        self, worker: str, limit: int = 1, lease_seconds: float = 300.0
+    ) -> List[LeasedTask]:
+        """Concede tareas disponibles adquiriendo su clave de concesión."""
+        now = self.clock()
+        leased: List[LeasedTask] = []
+        candidates = self.client.zrangebyscore(
+            self._key("queue"), "-inf", now, start=0, num=limit * 4
+        )
+        for raw_id in candidates:
+            task_id = str(_text(raw_id))
+            token = uuid.uuid4().hex
+            lease_key = self._key(f"lease:{task_id}")
+            # SET NX es atómico: solo un trabajador obtiene la concesión
+            if not self.client.set(
+                lease_key, token, nx=True, px=int(lease_seconds * 1000)
+            ):
+                continue
+            attempts = int(self.client.hincrby(self._key("attempts"), task_id, 1))
+            payload = self.client.hget(self._key("payloads"), task_id)
+            if payload is None or attempts > self.max_attempts:
+                if payload is not None:
+                    self._fail(
+                        self.client,
+                        task_id,
+                        "Concesión caducada tras agotar los intentos",
+                    )
+                self.client.delete(lease_key)
+                continue
+            self.client.zadd(self._key("queue"), {task_id: now + lease_seconds})
+            leased.append(
+                LeasedTask(task_id, json.loads(payload), attempts, token, worker)
+            )
+            if len(leased) >= limit:
+                break
+        return leased
+
+    def extend(self, task: LeasedTask, lease_seconds: float) -> bool:
+        """Renueva la concesión si sigue perteneciendo a ``task.token``."""
+        expires = self.clock() + lease_seconds
+
+        def commands(pipe: Any) -> None:
+            pipe.set(
+                self._key(f"lease:{task.task_id}"),
+                task.token,
+                xx=True,
+                px=int(lease_seconds * 1000),
+            )
+            pipe.zadd(self._key("queue"), {task.task_id: expires})
+
+        return self._if_owner(task, commands)
+
+    def ack(self, task: LeasedTask) -> bool:
+        """Marca la tarea como completada si la concesión sigue siendo suya."""
+
+        def commands(pipe: Any) -> None:
+            pipe.zrem(self._key("queue"), task.task_id)
+            pipe.sadd(self._key("done"), task.task_id)
+            pipe.hdel(self._key("payloads"), task.task_id)
+            pipe.hdel(self._key("attempts"), task.task_id)
+            pipe.delete(self._key(f"lease:{task.task_id}"))
+
+        return self._if_owner(task, commands)
+
+    def nack(self, task: LeasedTask, error: str, retry: bool = True) -> None:
+        """Devuelve la tarea a la cola o la marca como fallida."""
+        now = self.clock()
+
+        def commands(pipe: Any) -> None:
+            if retry and task.attempts < self.max_attempts:
+                pipe.zadd(self._key("queue"), {task.task_id: now})
+            else:
+                self._fail(pipe, task.task_id, error)
+            pipe.delete(self._key(f"lease:{task.task_id}"))
+
+        self._if_owner(task, commands)
+
+    def counts(self) -> Dict[str, int]:
+        """Número de tareas en cada estado (las concedidas, por su puntuación)."""
+        now = self.clock()
+        return {
+            TASK_PENDING: int(self.client.zcount(self._key("queue"), "-inf", now)),
+            TASK_LEASED: int(self.client.zcount(self._key("queue"), f"({now}", "+inf")),
+            TASK_DONE: int(self.client.scard(self._key("done"))),
+            TASK_FAILED: int(self.client.hlen(self._key("failed"))),
+        }
+
+
+class QueueWorker:
+    """
+    Trabajador que procesa tareas de una :class:`WorkQueue` en concesión.
+
+    Mientras procesa, renueva las concesiones cada tercio de ``lease_seconds``. Los
+    fallos de red o timeout devuelven la tarea a la cola hasta agotar los intentos;
+    el resto de errores la marcan como ``failed``.
+
+    :param queue: Cola de trabajo
+    :type queue: WorkQueue
+    :param handler: Función que ejecuta una tarea a partir de su payload
+    :type handler: Callable[[Any], Any]
+    :param worker_id: Identificador del trabajador (por defecto ``host-pid``)
+    :type worker_id: Optional[str]
+    :param max_workers: Tareas ejecutadas a la vez
+    :type max_workers: int
+    :param lease_seconds: Duración de cada concesión
+    :type lease_seconds: float
+    """
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        handler: Callable[[Any], Any],
+        worker_id: Optional[str] = None,
+        max_workers: int = 4,
+        lease_seconds: float = 300.0,
+    ) -> None:
+        """
+        Inicializa el trabajador.
+
+        :raises ValidationError: Si ``max_workers`` o ``lease_seconds`` no son
+                                positivos
+        """
+        if max_workers < 1 or lease_seconds <= 0:
+            raise ValidationError("max_workers y lease_seconds deben ser positivos")
+        self.queue = queue
+        self.handler = handler
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.max_workers = max_workers
+        self.lease_seconds = lease_seconds
+
+    def _finish(self, future: Future, task: LeasedTask, stats: Counter) -> None:
+        """Confirma o libera una tarea terminada."""
+        try:
+            future.result()
+        except Exception as e:
+            retry = is_retryable(e)
+            self.queue.nack(task, str(e), retry=retry)
+            stats["retried" if retry else "failed"] += 1
+            emit(
+                logger,
+                logging.WARNING,
+                "queue.task_failed",
+                "Tarea %(task_id)s falló (intento %(attempt)d): %(error)s",
+                queue=self.queue.name,
+                task_id=task.task_id,
+                attempt=task.attempts,
+                error=str(e),
+                retry=retry,
+            )
+            return
+        if self.queue.ack(task):
+            stats["done"] += 1
+        else:
+            # La concesión caducó y la tarea ya se entregó a otro trabajador
+            stats["lost"] += 1
+
+    def run(self, stop_when_empty: bool = True, poll_interval: float = 5.0) -> Counter:
+        """
+        Procesa tareas hasta que la cola se vacía.
+
+        :param stop_when_empty: Terminar cuando no queden tareas pendientes ni
+                               concedidas (``False``: esperar tareas nuevas
+                               indefinidamente)
+        :type stop_when_empty: bool
+        :param poll_interval: Segundos de espera cuando no hay tareas disponibles
+        :type poll_interval: float
+        :return: Tareas ``done``, ``retried``, ``failed`` y ``lost`` (confirmadas
+                tras caducar su concesión)
+        :rtype: Counter
+        """
+        stats: Counter = Counter()
+        heartbeat = self.lease_seconds / 3
+        running: Dict[Future, LeasedTask] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            last_extend = time.monotonic()
+            while True:
+                if len(running) < self.max_workers:
+                    for task in self.queue.lease(
+                        self.worker_id,
+                        self.max_workers - len(running),
+                        self.lease_seconds,
+                    ):
+                        running[pool.submit(self.handler, task.payload)] = task
+                if not running:
+                    counts = self.queue.counts()
+                    if stop_when_empty and not (
+                        counts[TASK_PENDING] or counts[TASK_LEASED]
+                    ):
+                        return stats
+                    # Tareas de otros trabajadores: vuelven si su concesión caduca
+                    time.sleep(poll_interval)
+                    continue
+                done, _ = wait(running, timeout=heartbeat, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._finish(future, running.pop(future), stats)
+                if time.monotonic() - last_extend >= heartbeat:
+                    for task in running.values():
+                        self.queue.extend(task, self.lease_seconds)
+                    last_extend = time.monotonic()
+
+
+#: Métodos del cliente que ejecutan cada conjunto de datos de una tarea.
+CRAWL_METHODS = {
+    "consumption": "get_consumption",
+    "max_power": "get_max_power",
+    "reactive_data": "get_reactive_data",
+}
+
+
+def enqueue_plan(queue: WorkQueue, plan: Iterable[Any]) -> int:
+    """
+    Publica un plan de :func:`~datadis_python.jobs.plan_backfill` como tareas.
+
+    :param queue: Cola de trabajo
+    :type queue: WorkQueue
+    :param plan: Objetos :class:`~datadis_python.jobs.BackfillRequest`
+    :type plan: Iterable[BackfillRequest]
+    :return: Número de tareas nuevas
+    :rtype: int
+    """
+    return queue.put(
+        {
+            request.task_id: {"dataset": request.dataset, **request.as_kwargs()}
+            for request in plan
+        }
+    )
+
+
+def crawl_task_handler(
+    client: Any, on_data: Optional[Callable[[Dict[str, Any], Any], None]] = None
+) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Crea el ``handler`` de :class:`QueueWorker` para tareas de :func:`enqueue_plan`.
+
+    :param client: Cliente V2
+    :param on_data: Función ``on_data(payload, respuesta)`` que almacena el
+                   resultado; si falla, la tarea se reintenta o falla con ella
+    :type on_data: Optional[Callable[[Dict[str, Any], Any], None]]
+    :return: Función que ejecuta una tarea
+    :rtype: Callable[[Dict[str, Any]], Any]
+    """
+
+    def handler(payload: Dict[str, Any]) -> Any:
+        kwargs = dict(payload)
+        dataset = kwargs.pop("dataset")
+        if dataset not in CRAWL_METHODS:
+            raise ValidationError(f"Conjunto de datos no soportado: {dataset!r}")
+        response = getattr(client, CRAWL_METHODS[dataset])(**kwargs)
+        if on_data is not None:
+            on_data(payload, response)
+        return response
+
+    return handler
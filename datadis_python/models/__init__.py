@@ -4,6 +4,7 @@ Modelos de datos utilizados en el SDK de Datadis.
 :author: TacoronteRiveroCristian
 """
 
+from .authorization import AuthorizationData, AuthorizationsResponse
 from .consumption import ConsumptionData
 from .contract import ContractData, DateOwner
 from .distributor import DistributorData
@@ -20,6 +21,7 @@ from .responses import (
     DistributorError,
     DistributorsResponse,
     MaxPowerResponse,
+    RejectedRecord,
     SuppliesResponse,
 )
 from .supply import SupplyData
@@ -41,4 +43,7 @@ __all__ = [
     "MaxPowerResponse",
     "DistributorsResponse",
     "DistributorError",
+    "RejectedRecord",
+    "AuthorizationData",
+    "AuthorizationsResponse",
 ]
@@ -0,0 +1,109 @@
+"""
+Modelos de datos para las autorizaciones entre usuarios de Datadis.
+
+Un usuario (por ejemplo un gestor energético) puede consultar los suministros de
+otro NIF si este le ha autorizado. Los endpoints de
+:data:`~datadis_python.utils.constants.AUTHORIZATION_ENDPOINTS` crean, cancelan y
+listan esas autorizaciones.
+
+:author: TacoronteRiveroCristian
+"""
+
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+class AuthorizationData(BaseModel):
+    """
+    Autorización de un NIF para consultar sus suministros.
+
+    Una autorización sin CUPS cubre todos los suministros del NIF. Los campos que
+    la API añada y no estén modelados se conservan (``model_extra``).
+
+    Example:
+        Comprobar qué cubre una autorización::
+
+            authorization = client.list_authorizations().authorizations[0]
+            if authorization.covers("ES0031607515707001RC0F"):
+                print(f"Autorizado por {authorization.nif}")
+
+    :param nif: NIF que concede la autorización
+    :type nif: str
+    :param name: Nombre o razón social del titular
+    :type name: Optional[str]
+    :param cups: CUPS autorizados (vacío: todos los del NIF)
+    :type cups: List[str]
+    :param start_date: Inicio de la autorización (``YYYY/MM/DD``)
+    :type start_date: Optional[str]
+    :param end_date: Fin de la autorización (``YYYY/MM/DD``; ``None``: indefinida)
+    :type end_date: Optional[str]
+    :param state: Estado de la autorización según la API
+    :type state: Optional[str]
+    """
+
+    nif: str = Field(description="NIF que concede la autorización")
+    name: Optional[str] = Field(default=None, description="Nombre del titular")
+    cups: List[str] = Field(
+        default_factory=list, description="CUPS autorizados (vacío: todos)"
+    )
+    start_date: Optional[str] = Field(
+        default=None, alias="startDate", description="Inicio (YYYY/MM/DD)"
+    )
+    end_date: Optional[str] = Field(
+        default=None, alias="endDate", description="Fin (YYYY/MM/DD)"
+    )
+    state: Optional[str] = Field(default=None, description="Estado")
+
+    model_config = ConfigDict(populate_by_name=True, extra="allow")
+
+    @field_validator("cups")
+    @classmethod
+    def _normalize_cups(cls, value: List[str]) -> List[str]:
+        """Normaliza los CUPS a mayúsculas y sin espacios para compararlos."""
+        return [code.strip().upper() for code in value]
+
+    def covers(self, cups: Optional[str] = None) -> bool:
+        """
+        Indica si la autorización cubre un CUPS.
+
+        :param cups: Código CUPS (``None``: cualquier suministro del NIF)
+        :type cups: Optional[str]
+        :rtype: bool
+        """
+        return not self.cups or cups is None or cups.strip().upper() in self.cups
+
+
+class AuthorizationsResponse(BaseModel):
+    """
+    Respuesta del endpoint ``list-authorization``.
+
+    :param authorizations: Autorizaciones vigentes
+    :type authorizations: List[AuthorizationData]
+    """
+
+    authorizations: List[AuthorizationData] = Field(default_factory=list)
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @classmethod
+    def from_api(cls, response: Any) -> "AuthorizationsResponse":
+        """
+        Construye la respuesta a partir del JSON de la API.
+
+        Acepta una lista de autorizaciones o un objeto que la contenga en
+        ``authorizations``, ``authorizationList`` o ``data``.
+
+        :param response: JSON decodificado
+        :rtype: AuthorizationsResponse
+        """
+        if isinstance(response, dict):
+            for name in ("authorizations", "authorizationList", "data"):
+                if isinstance(response.get(name), list):
+                    response = response[name]
+                    break
+            else:
+                response = []
+        if not isinstance(response, list):
+            response = []
+        return cls(authorizations=response)
@@ -4,11 +4,12 @@ Modelos de datos para energía reactiva.
 Este módulo define los modelos de datos para información de energía reactiva.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from .responses import DistributorError
+from .responses import DistributorError, RejectedRecord, salvage_records
+from .tabular import TabularExportMixin
 
 
 class ReactiveEnergyPeriod(BaseModel):
@@ -315,7 +316,7 @@ class ReactiveEnergyData(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
 
-class ReactiveData(BaseModel):
+class ReactiveData(TabularExportMixin, BaseModel):
     """
     Modelo Pydantic simplificado para respuesta de energía reactiva.
 
@@ -359,9 +360,17 @@ class ReactiveData(BaseModel):
             else:
                 print(f"Error: {reactive_wrapper.reactive_energy.code_desc}")
 
+    Exportación tabular:
+        Los períodos de ``reactive_energy.energy`` (junto con el CUPS) pueden
+        exportarse con ``to_columns()``, ``to_arrow()``, ``to_pandas()`` y
+        ``to_polars()`` (dependencias opcionales).
+
     :param reactive_energy: Objeto ReactiveEnergyData que contiene toda la información
                            de energía reactiva para el punto de suministro consultado
     :type reactive_energy: ReactiveEnergyData
+    :param rejected_records: Períodos de ``reactive_energy.energy`` descartados en modo
+                            de rescate (vacío si todos los períodos son válidos)
+    :type rejected_records: List[RejectedRecord]
 
     :raises ValidationError: Si el objeto ReactiveEnergyData no es válido
 
@@ -377,9 +386,50 @@ class ReactiveData(BaseModel):
     reactive_energy: ReactiveEnergyData = Field(
         alias="reactiveEnergy", description="Datos de energía reactiva"
     )
+    rejected_records: List[RejectedRecord] = Field(
+        default_factory=list,
+        alias="rejectedRecords",
+        description="Períodos de energía descartados en modo de rescate",
+    )
 
     model_config = ConfigDict(populate_by_name=True)
 
+    def _tabular_records(self):
+        """Períodos exportados por ``to_arrow()``/``to_pandas()``/``to_polars()``."""
+        return (
+            self.reactive_energy.energy,
+            ReactiveEnergyPeriod,
+            {"cups": self.reactive_energy.cups},
+        )
+
+
+def salvage_reactive_data(data: Dict[str, Any]) -> ReactiveData:
+    """
+    Construye un ``ReactiveData`` conservando solo los períodos de energía válidos.
+
+    Los períodos de ``reactiveEnergy.energy`` que no superan la validación se
+    excluyen y se informan en ``rejected_records``.
+
+    :param data: Respuesta de la API con la clave ``reactiveEnergy``
+    :type data: Dict[str, Any]
+    :return: Datos de energía reactiva con los períodos rescatados
+    :rtype: ReactiveData
+    :raises pydantic.ValidationError: Si fallan campos ajenos a los períodos (por
+                                      ejemplo el CUPS)
+    """
+    reactive_energy = data.get("reactiveEnergy")
+    if not isinstance(reactive_energy, dict):
+        reactive_energy = {}
+    valid, rejected = salvage_records(
+        reactive_energy.get("energy"), ReactiveEnergyPeriod
+    )
+    return ReactiveData.model_validate(
+        {
+            "reactiveEnergy": {**reactive_energy, "energy": valid},
+            "rejectedRecords": rejected,
+        }
+    )
+
 
 class ReactiveResponse(BaseModel):
     r"""
@@ -5,9 +5,15 @@ Este módulo define los modelos de respuesta para las diferentes versiones de la
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field
+from pydantic import ValidationError as PydanticValidationError
+
+from .tabular import TabularExportMixin
+
+#: Modelo de respuesta devuelto por :func:`salvage_response`.
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
 
 
 class DistributorError(BaseModel):
@@ -81,6 +87,8 @@ class DistributorError(BaseModel):
         distributor_name: Nombre comercial completo del distribuidor.
         error_code: Código específico del error para categorización técnica.
         error_description: Descripción detallada y legible del problema.
+        source_nif: NIF autorizado de la consulta que devolvió el error (solo en
+            las consultas sobre varios NIF).
 
     Note:
         - Los errores por distribuidor no impiden respuestas parcialmente exitosas
@@ -99,11 +107,137 @@ class DistributorError(BaseModel):
     error_description: str = Field(
         alias="errorDescription", description="Descripción del error"
     )
+    source_nif: Optional[str] = Field(
+        default=None,
+        alias="sourceNif",
+        description="NIF autorizado de la consulta (consultas multi-NIF)",
+    )
 
     model_config = ConfigDict(populate_by_name=True)
 
 
-class SuppliesResponse(BaseModel):
+class RejectedRecord(BaseModel):
+    """
+    Registro descartado durante la validación parcial (modo de rescate).
+
+    Cuando una respuesta contiene algún registro que no supera la validación Pydantic,
+    el cliente conserva los registros válidos y describe cada registro descartado con
+    este modelo, en lugar de devolver una respuesta vacía.
+
+    Example:
+        Revisar los registros descartados de una curva de carga::
+
+            response = client.get_consumption(cups, "2", "2024/01", "2024/12")
+
+            for rejected in response.rejected_records:
+                print(f"Fila {rejected.index} descartada: {rejected.reason}")
+
+    :param index: Posición del registro en la lista original de la respuesta
+    :type index: int
+    :param record: Registro original tal y como lo devolvió la API
+    :type record: Any
+    :param reason: Motivo del descarte (errores de validación por campo)
+    :type reason: str
+    """
+
+    index: int = Field(description="Posición del registro en la respuesta original")
+    record: Any = Field(description="Registro original devuelto por la API")
+    reason: str = Field(description="Motivo del descarte")
+
+
+def _format_validation_error(error: PydanticValidationError) -> str:
+    """
+    Resume un error de validación Pydantic en una línea legible.
+
+    :param error: Error de validación
+    :type error: pydantic.ValidationError
+    :return: Errores por campo separados por ``;``
+    :rtype: str
+    """
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in err['loc']) or 'registro'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+
+def salvage_records(
+    raw_records: Any, model: Type[BaseModel]
+) -> Tuple[List[BaseModel], List[RejectedRecord]]:
+    """
+    Valida una lista de registros uno a uno, separando válidos y descartados.
+
+    :param raw_records: Lista de registros sin validar (diccionarios de la API)
+    :type raw_records: Any
+    :param model: Modelo Pydantic de cada registro (por ejemplo ``ConsumptionData``)
+    :type model: Type[BaseModel]
+    :return: Tupla ``(registros_validos, registros_descartados)``
+    :rtype: Tuple[List[BaseModel], List[RejectedRecord]]
+    """
+    if raw_records is None:
+        return [], []
+    if not isinstance(raw_records, list):
+        return [], [
+            RejectedRecord(
+                index=0,
+                record=raw_records,
+                reason=f"Se esperaba una lista, se recibió {type(raw_records).__name__}",
+            )
+        ]
+
+    valid: List[BaseModel] = []
+    rejected: List[RejectedRecord] = []
+    for index, raw_record in enumerate(raw_records):
+        try:
+            valid.append(model.model_validate(raw_record))
+        except PydanticValidationError as e:
+            rejected.append(
+                RejectedRecord(
+                    index=index,
+                    record=raw_record,
+                    reason=_format_validation_error(e),
+                )
+            )
+    return valid, rejected
+
+
+def salvage_response(
+    response_model: Type[ResponseModel],
+    data: Dict[str, Any],
+    records_field: str,
+    record_model: Type[BaseModel],
+) -> ResponseModel:
+    """
+    Construye una respuesta conservando los registros válidos de ``records_field``.
+
+    Los registros que no superan la validación se excluyen de la lista y se
+    devuelven en el campo ``rejected_records`` de la respuesta. El resto de campos
+    (por ejemplo ``distributorError``) se validan normalmente.
+
+    :param response_model: Modelo de respuesta (por ejemplo ``ConsumptionResponse``)
+    :type response_model: Type[BaseModel]
+    :param data: Respuesta de la API ya normalizada
+    :type data: Dict[str, Any]
+    :param records_field: Nombre Python del campo con la lista de registros
+                         (por ejemplo ``"time_curve"``)
+    :type records_field: str
+    :param record_model: Modelo de cada registro (por ejemplo ``ConsumptionData``)
+    :type record_model: Type[BaseModel]
+    :return: Respuesta validada con los registros rescatados, del tipo
+             ``response_model``
+    :rtype: ResponseModel
+    :raises pydantic.ValidationError: Si fallan campos ajenos a la lista de registros
+    """
+    field = response_model.model_fields[records_field]
+    key = field.alias if field.alias in data else records_field
+    valid, rejected = salvage_records(data.get(key), record_model)
+
+    payload = {k: v for k, v in data.items() if k not in (records_field, field.alias)}
+    payload[records_field] = valid
+    payload["rejected_records"] = rejected
+    return response_model.model_validate(payload)
+
+
+class SuppliesResponse(TabularExportMixin, BaseModel):
     r"""
     Modelo Pydantic para respuesta estructurada del endpoint get-supplies V2.
 
@@ -238,6 +372,11 @@ class SuppliesResponse(BaseModel):
             print(f"- V2: Datos + errores ({len(response_v2.distributor_error)} errores)")
             print(f"- V2: Información diagnóstica disponible")
 
+    Exportación tabular:
+        Los registros de ``supplies`` pueden exportarse a columnas con ``to_columns()``
+        o directamente a ``to_arrow()``, ``to_pandas()`` y ``to_polars()`` (estas
+        librerías son dependencias opcionales que solo se importan al usarse).
+
     :param supplies: Lista de objetos SupplyData validados con Pydantic. Contiene
                     todos los puntos de suministro obtenidos exitosamente de los
                     distribuidores que respondieron correctamente
@@ -246,6 +385,15 @@ class SuppliesResponse(BaseModel):
                              información detallada sobre distribuidores que experimentaron
                              problemas durante la consulta
     :type distributor_error: List[DistributorError]
+    :param rejected_records: Registros descartados en modo de rescate (vacío si todos
+                            los registros son válidos)
+    :type rejected_records: List[RejectedRecord]
+    :param nif_errors: Error de cada NIF autorizado cuya consulta falló (solo
+                      ``get_supplies_for_nifs``; vacío en el resto)
+    :type nif_errors: Dict[str, str]
+    :param nifs_by_cups: NIF autorizados que devolvieron cada CUPS, en el orden de
+                        la consulta (solo ``get_supplies_for_nifs``)
+    :type nifs_by_cups: Dict[str, List[str]]
 
     :raises ValidationError: Si la estructura de la respuesta no es válida
 
@@ -270,9 +418,26 @@ class SuppliesResponse(BaseModel):
     distributor_error: List[DistributorError] = Field(
         default_factory=list, alias="distributorError"
     )
+    rejected_records: List[RejectedRecord] = Field(
+        default_factory=list, alias="rejectedRecords"
+    )
+    nif_errors: Dict[str, str] = Field(
+        default_factory=dict,
+        alias="nifErrors",
+        description="Error de cada NIF que falló en una consulta multi-NIF",
+    )
+    nifs_by_cups: Dict[str, List[str]] = Field(
+        default_factory=dict,
+        alias="nifsByCups",
+        description="NIF que devolvieron cada CUPS en una consulta multi-NIF",
+    )
 
     model_config = ConfigDict(populate_by_name=True)
 
+    def _tabular_records(self):
+        """Registros exportados por ``to_arrow()``/``to_pandas()``/``to_polars()``."""
+        return self.supplies, SupplyData, None
+
 
 class ContractResponse(BaseModel):
     """
@@ -313,17 +478,23 @@ class ContractResponse(BaseModel):
     :type contract: List[ContractData]
     :param distributor_error: Lista de errores específicos por distribuidor
     :type distributor_error: List[DistributorError]
+    :param rejected_records: Registros descartados en modo de rescate (vacío si todos
+                            los registros son válidos)
+    :type rejected_records: List[RejectedRecord]
     """
 
     contract: List["ContractData"] = Field(default_factory=list)
     distributor_error: List[DistributorError] = Field(
         default_factory=list, alias="distributorError"
     )
+    rejected_records: List[RejectedRecord] = Field(
+        default_factory=list, alias="rejectedRecords"
+    )
 
     model_config = ConfigDict(populate_by_name=True)
 
 
-class ConsumptionResponse(BaseModel):
+class ConsumptionResponse(TabularExportMixin, BaseModel):
     """
     Modelo Pydantic para respuesta estructurada del endpoint get-consumption-data V2.
 
@@ -357,21 +528,36 @@ class ConsumptionResponse(BaseModel):
             if response.distributor_error:
                 print("Advertencias de distribuidor detectadas")
 
+    Exportación tabular:
+        Los registros de ``time_curve`` pueden exportarse a columnas con ``to_columns()``
+        o directamente a ``to_arrow()``, ``to_pandas()`` y ``to_polars()`` (estas
+        librerías son dependencias opcionales que solo se importan al usarse).
+
     :param time_curve: Lista de objetos ConsumptionData con mediciones energéticas temporales
     :type time_curve: List[ConsumptionData]
     :param distributor_error: Lista de errores específicos por distribuidor
     :type distributor_error: List[DistributorError]
+    :param rejected_records: Registros descartados en modo de rescate (vacío si todos
+                            los registros son válidos)
+    :type rejected_records: List[RejectedRecord]
     """
 
     time_curve: List["ConsumptionData"] = Field(default_factory=list, alias="timeCurve")
     distributor_error: List[DistributorError] = Field(
         default_factory=list, alias="distributorError"
     )
+    rejected_records: List[RejectedRecord] = Field(
+        default_factory=list, alias="rejectedRecords"
+    )
 
     model_config = ConfigDict(populate_by_name=True)
 
+    def _tabular_records(self):
+        """Registros exportados por ``to_arrow()``/``to_pandas()``/``to_polars()``."""
+        return self.time_curve, ConsumptionData, None
+
 
-class MaxPowerResponse(BaseModel):
+class MaxPowerResponse(TabularExportMixin, BaseModel):
     """
     Modelo Pydantic para respuesta estructurada del endpoint get-max-power V2.
 
@@ -403,19 +589,34 @@ class MaxPowerResponse(BaseModel):
                 recommended_power = max_peak * 1.1  # 10% de margen
                 print(f"Potencia recomendada: {recommended_power/1000:.2f} kW")
 
+    Exportación tabular:
+        Los registros de ``max_power`` pueden exportarse a columnas con ``to_columns()``
+        o directamente a ``to_arrow()``, ``to_pandas()`` y ``to_polars()`` (estas
+        librerías son dependencias opcionales que solo se importan al usarse).
+
     :param max_power: Lista de objetos MaxPowerData con registros de potencia máxima
     :type max_power: List[MaxPowerData]
     :param distributor_error: Lista de errores específicos por distribuidor
     :type distributor_error: List[DistributorError]
+    :param rejected_records: Registros descartados en modo de rescate (vacío si todos
+                            los registros son válidos)
+    :type rejected_records: List[RejectedRecord]
     """
 
     max_power: List["MaxPowerData"] = Field(default_factory=list, alias="maxPower")
     distributor_error: List[DistributorError] = Field(
         default_factory=list, alias="distributorError"
     )
+    rejected_records: List[RejectedRecord] = Field(
+        default_factory=list, alias="rejectedRecords"
+    )
 
     model_config = ConfigDict(populate_by_name=True)
 
+    def _tabular_records(self):
+        """Registros exportados por ``to_arrow()``/``to_pandas()``/``to_polars()``."""
+        return self.max_power, MaxPowerData, None
+
 
 class DistributorsResponse(BaseModel):
     """
@@ -455,12 +656,28 @@ class DistributorsResponse(BaseModel):
     :type dist_existence_user: dict
     :param distributor_error: Lista de errores específicos por distribuidor
     :type distributor_error: List[DistributorError]
+    :param distributor_codes_by_nif: Códigos de distribuidora de cada NIF
+                                    autorizado (solo ``get_distributors_for_nifs``)
+    :type distributor_codes_by_nif: Dict[str, List[str]]
+    :param nif_errors: Error de cada NIF cuya consulta falló (solo
+                      ``get_distributors_for_nifs``)
+    :type nif_errors: Dict[str, str]
     """
 
     dist_existence_user: dict = Field(alias="distExistenceUser")
     distributor_error: List[DistributorError] = Field(
         default_factory=list, alias="distributorError"
     )
+    distributor_codes_by_nif: Dict[str, List[str]] = Field(
+        default_factory=dict,
+        alias="distributorCodesByNif",
+        description="Códigos de distribuidora de cada NIF en una consulta multi-NIF",
+    )
+    nif_errors: Dict[str, str] = Field(
+        default_factory=dict,
+        alias="nifErrors",
+        description="Error de cada NIF que falló en una consulta multi-NIF",
+    )
 
     model_config = ConfigDict(populate_by_name=True)
 
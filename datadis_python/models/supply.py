@@ -211,6 +211,10 @@ class SupplyData(BaseModel):
     :param distributor_code: Código numérico del distribuidor (1-8). Identificador
                            único usado en las consultas API para el distribuidor específico
     :type distributor_code: str
+    :param source_nif: NIF autorizado con el que se obtuvo el suministro. Solo lo
+                      rellenan las consultas sobre varios NIF
+                      (``get_supplies_for_nifs``); ``None`` en el resto
+    :type source_nif: Optional[str]
 
     :raises ValidationError: Si algún campo obligatorio falta o tiene formato incorrecto
 
@@ -252,5 +256,10 @@ class SupplyData(BaseModel):
     distributor_code: str = Field(
         alias="distributorCode", description="Código de distribuidora"
     )
+    source_nif: Optional[str] = Field(
+        default=None,
+        alias="sourceNif",
+        description="NIF autorizado con el que se obtuvo (consultas multi-NIF)",
+    )
 
     model_config = ConfigDict(populate_by_name=True)
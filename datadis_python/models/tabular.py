@@ -0,0 +1,219 @@
+"""
+Exportación tabular (Apache Arrow, pandas y polars) de las respuestas de Datadis.
+
+Este módulo define el mixin :class:`TabularExportMixin`, que añade los métodos
+``to_columns()``, ``to_arrow()``, ``to_pandas()`` y ``to_polars()`` a los modelos de
+respuesta con series de registros (curvas de consumo, potencias máximas, suministros
+y energía reactiva).
+
+Las tablas se construyen directamente a partir de columnas (una lista por campo)
+leídas de los modelos ya validados, sin pasar por ``model_dump()`` fila a fila ni por
+una lista intermedia de diccionarios. Cada columna reutiliza los mismos objetos que
+contienen los modelos, por lo que las cadenas internadas durante la normalización
+se comparten también en la tabla resultante.
+
+Las librerías tabulares son dependencias **opcionales**: solo se importan al llamar
+al método correspondiente, de modo que el paquete base sigue siendo ligero.
+
+Example:
+    Exportar una curva de carga a pandas::
+
+        response = client.get_consumption(
+            cups="ES0031607515707001RC0F",
+            distributor_code="2",
+            date_from="2024/01",
+            date_to="2024/12",
+        )
+
+        df = response.to_pandas()          # Requiere: pip install pandas
+        table = response.to_arrow()        # Requiere: pip install pyarrow
+        lazy = response.to_polars().lazy() # Requiere: pip install polars
+
+:author: TacoronteRiveroCristian
+"""
+
+import importlib
+import typing
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+#: Nombre del paquete pip que proporciona cada módulo opcional.
+_OPTIONAL_PACKAGES = {"pyarrow": "pyarrow", "pandas": "pandas", "polars": "polars"}
+
+
+def _import_optional(module_name: str, method_name: str) -> Any:
+    """
+    Importa una dependencia opcional o lanza un ``ImportError`` descriptivo.
+
+    :param module_name: Nombre del módulo a importar (``pyarrow``, ``pandas``...)
+    :type module_name: str
+    :param method_name: Método que necesita la dependencia, para el mensaje de error
+    :type method_name: str
+    :return: Módulo importado
+    :raises ImportError: Si la dependencia no está instalada
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        package = _OPTIONAL_PACKAGES.get(module_name, module_name)
+        raise ImportError(
+            f"{method_name}() requiere la dependencia opcional '{package}'. "
+            f"Instálela con: pip install {package}"
+        ) from e
+
+
+def _scalar_type(annotation: Any) -> Any:
+    """
+    Obtiene el tipo escalar de una anotación, eliminando ``Optional[...]``.
+
+    :param annotation: Anotación del campo Pydantic
+    :return: Tipo escalar (``str``, ``float``, ``int``...) o la anotación original
+    """
+    if typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def records_to_columns(
+    records: Sequence[BaseModel],
+    model: Type[BaseModel],
+    constants: Optional[Dict[str, Any]] = None,
+) -> Dict[str, List[Any]]:
+    """
+    Convierte una secuencia de modelos en un diccionario de columnas.
+
+    Las columnas siguen el orden de declaración de los campos del modelo y usan los
+    nombres Python (snake_case), igual que ``model_dump()``.
+
+    :param records: Registros validados (por ejemplo ``ConsumptionData``)
+    :type records: Sequence[BaseModel]
+    :param model: Clase de los registros, usada para conocer las columnas incluso
+                 cuando no hay registros
+    :type model: Type[BaseModel]
+    :param constants: Columnas constantes que se anteponen a las del modelo (por
+                     ejemplo el CUPS común a todos los períodos de energía reactiva)
+    :type constants: Optional[Dict[str, Any]]
+    :return: Diccionario ``{nombre_columna: valores}``
+    :rtype: Dict[str, List[Any]]
+    """
+    columns: Dict[str, List[Any]] = {}
+    if constants:
+        for name, value in constants.items():
+            columns[name] = [value] * len(records)
+    for name in model.model_fields:
+        columns[name] = [getattr(record, name) for record in records]
+    return columns
+
+
+class TabularExportMixin:
+    """
+    Mixin que añade exportación a Apache Arrow, pandas y polars.
+
+    Las clases que lo usan deben implementar :meth:`_tabular_records`, que devuelve
+    los registros a exportar, la clase de dichos registros y, opcionalmente, columnas
+    constantes. El resto de métodos se construyen a partir de :meth:`to_columns`.
+
+    .. seealso::
+       - :class:`datadis_python.models.responses.ConsumptionResponse`
+       - :class:`datadis_python.models.responses.MaxPowerResponse`
+       - :class:`datadis_python.models.responses.SuppliesResponse`
+       - :class:`datadis_python.models.reactive.ReactiveData`
+    """
+
+    def _tabular_records(self):
+        """
+        Registros a exportar.
+
+        :return: Tupla ``(registros, clase_del_registro, columnas_constantes)``
+        """
+        raise NotImplementedError
+
+    def _tabular_schema(self) -> Dict[str, Any]:
+        """
+        Tipos escalares de cada columna exportada.
+
+        :return: Diccionario ``{nombre_columna: tipo_python}``
+        :rtype: Dict[str, Any]
+        """
+        _, model, constants = self._tabular_records()
+        schema: Dict[str, Any] = {name: str for name in (constants or {})}
+        for name, field in model.model_fields.items():
+            schema[name] = _scalar_type(field.annotation)
+        return schema
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        """
+        Devuelve los registros de la respuesta como columnas.
+
+        :return: Diccionario ``{nombre_columna: valores}`` con una entrada por campo
+        :rtype: Dict[str, List[Any]]
+
+        Example:
+            Columnas de una curva de consumo::
+
+                columns = response.to_columns()
+                total = sum(columns["consumption_kwh"])
+        """
+        records, model, constants = self._tabular_records()
+        return records_to_columns(records, model, constants)
+
+    def to_arrow(self) -> Any:
+        """
+        Exporta los registros a una tabla de Apache Arrow.
+
+        El esquema se deriva de los tipos de los campos del modelo, de modo que una
+        respuesta vacía produce una tabla vacía con las columnas correctamente tipadas.
+
+        :return: Tabla con una columna por campo
+        :rtype: pyarrow.Table
+        :raises ImportError: Si ``pyarrow`` no está instalado
+        """
+        pa = _import_optional("pyarrow", "to_arrow")
+        arrow_types = {
+            str: pa.string(),
+            float: pa.float64(),
+            int: pa.int64(),
+            bool: pa.bool_(),
+        }
+        schema = pa.schema(
+            [
+                (name, arrow_types.get(python_type, pa.string()))
+                for name, python_type in self._tabular_schema().items()
+            ]
+        )
+        return pa.table(self.to_columns(), schema=schema)
+
+    def to_pandas(self) -> Any:
+        """
+        Exporta los registros a un ``DataFrame`` de pandas.
+
+        :return: DataFrame con una columna por campo
+        :rtype: pandas.DataFrame
+        :raises ImportError: Si ``pandas`` no está instalado
+        """
+        pd = _import_optional("pandas", "to_pandas")
+        return pd.DataFrame(self.to_columns())
+
+    def to_polars(self) -> Any:
+        """
+        Exporta los registros a un ``DataFrame`` de polars.
+
+        :return: DataFrame con una columna por campo
+        :rtype: polars.DataFrame
+        :raises ImportError: Si ``polars`` no está instalado
+        """
+        pl = _import_optional("polars", "to_polars")
+        polars_types = {
+            str: pl.Utf8,
+            float: pl.Float64,
+            int: pl.Int64,
+            bool: pl.Boolean,
+        }
+        schema = {
+            name: polars_types.get(python_type, pl.Utf8)
+            for name, python_type in self._tabular_schema().items()
+        }
+        return pl.DataFrame(self.to_columns(), schema=schema)
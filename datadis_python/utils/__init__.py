@@ -6,6 +6,8 @@ Este módulo proporciona funciones y constantes comunes utilizadas en el SDK de
 :author: TacoronteRiveroCristian
 """
 
+from .chunking import is_retryable, month_index, month_text, split_month_range
+from .concurrency import AdaptiveConcurrency, BulkResult, bulk_request_kwargs, run_bulk
 from .constants import API_ENDPOINTS  # Compatibilidad hacia atrás
 from .constants import (
     API_V1_ENDPOINTS,
@@ -16,8 +18,16 @@ from .constants import (
     DEFAULT_TIMEOUT,
     MAX_RETRIES,
 )
+from .events import add_event_listener, remove_event_listener
 from .http import HTTPClient
-from .text_utils import normalize_api_response, normalize_text
+from .json_backend import get_json_backend, set_json_backend
+from .rate_limit import RateLimiter
+from .text_utils import (
+    intern_text,
+    normalize_api_response,
+    normalize_text,
+    text_fields_for_endpoint,
+)
 from .type_converters import (
     convert_cups_parameter,
     convert_date_range_to_api_format,
@@ -26,12 +36,21 @@ from .type_converters import (
     convert_number_to_string,
     convert_optional_number_to_string,
 )
-from .validators import validate_date_range, validate_distributor_code
+from .validators import (
+    CupsBatchResult,
+    validate_cups_batch,
+    validate_date_range,
+    validate_distributor_code,
+    validation_now,
+)
 
 __all__ = [
     # Validadores
+    "CupsBatchResult",
+    "validate_cups_batch",
     "validate_date_range",
     "validate_distributor_code",
+    "validation_now",
     # Conversores de tipos
     "convert_cups_parameter",
     "convert_date_range_to_api_format",
@@ -49,9 +68,27 @@ __all__ = [
     # Configuración
     "DEFAULT_TIMEOUT",
     "MAX_RETRIES",
+    # Registro y eventos
+    "add_event_listener",
+    "remove_event_listener",
+    # División de rangos largos
+    "is_retryable",
+    "month_index",
+    "month_text",
+    "split_month_range",
+    # Consultas masivas
+    "AdaptiveConcurrency",
+    "BulkResult",
+    "bulk_request_kwargs",
+    "run_bulk",
+    "RateLimiter",
     # Cliente HTTP
     "HTTPClient",
+    "get_json_backend",
+    "set_json_backend",
     # Utilidades de texto
     "normalize_text",
     "normalize_api_response",
+    "intern_text",
+    "text_fields_for_endpoint",
 ]
@@ -0,0 +1,451 @@
+"""
+División de rangos de fechas largos en bloques mensuales y fusión de sus respuestas.
+
+Las consultas de Datadis sobre rangos largos (por ejemplo 24 meses de curva horaria)
+son las más lentas y las que más fallan por timeout, y un timeout descarta el rango
+completo. Este módulo permite a los clientes:
+
+1. Dividir un rango ``YYYY/MM`` en bloques de N meses (:func:`split_month_range`).
+2. Descargar los bloques en paralelo, reintentando solo los que fallan
+   (:func:`fetch_chunks`), o consumirlos en orden según llegan con memoria acotada
+   (:func:`iter_chunks` y su adaptador asíncrono :func:`iterate_async`).
+3. Fusionar las respuestas en orden, eliminando los registros duplicados en los
+   límites entre bloques (:func:`merge_chunk_responses` y
+   :func:`merge_reactive_responses`).
+
+Example:
+    Bloques de 6 meses para un rango de 2 años::
+
+        split_month_range("2023/01", "2024/12", 6)
+        # → [("2023/01", "2023/06"), ("2023/07", "2023/12"),
+        #    ("2024/01", "2024/06"), ("2024/07", "2024/12")]
+
+:author: TacoronteRiveroCristian
+"""
+
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from ..exceptions import APIError, AuthenticationError, DatadisError, ValidationError
+from .events import emit
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+#: Campos que identifican un registro de cada lista fusionable de la API V2.
+CHUNK_RECORD_KEYS: Dict[str, Tuple[str, ...]] = {
+    "timeCurve": ("cups", "date", "time"),
+    "maxPower": ("cups", "date", "time", "period"),
+    "energy": ("date",),
+}
+
+
+def month_index(date_text: str) -> int:
+    """
+    Convierte ``YYYY/MM`` en un número de mes absoluto.
+
+    Permite comparar meses y avanzar o retroceder con aritmética entera;
+    :func:`month_text` hace la conversión inversa.
+
+    :param date_text: Mes en formato ``YYYY/MM``
+    :type date_text: str
+    :return: ``año * 12 + mes - 1``
+    :rtype: int
+    """
+    year, month = date_text.split("/")
+    return int(year) * 12 + int(month) - 1
+
+
+def month_text(index: int) -> str:
+    """
+    Convierte un número de mes absoluto en ``YYYY/MM``.
+
+    :param index: Número de mes devuelto por :func:`month_index`
+    :type index: int
+    :return: Mes en formato ``YYYY/MM``
+    :rtype: str
+    """
+    return f"{index // 12:04d}/{index % 12 + 1:02d}"
+
+
+def split_month_range(
+    date_from: str, date_to: str, chunk_months: int
+) -> List[Tuple[str, str]]:
+    """
+    Divide un rango mensual en bloques consecutivos de como máximo ``chunk_months``.
+
+    :param date_from: Mes inicial en formato ``YYYY/MM`` (ya validado)
+    :type date_from: str
+    :param date_to: Mes final en formato ``YYYY/MM`` (ya validado)
+    :type date_to: str
+    :param chunk_months: Número máximo de meses por bloque
+    :type chunk_months: int
+    :return: Lista ordenada de rangos ``(desde, hasta)``, ambos inclusive
+    :rtype: List[Tuple[str, str]]
+    :raises ValidationError: Si ``chunk_months`` no es positivo
+    """
+    if chunk_months < 1:
+        raise ValidationError(
+            f"chunk_months debe ser un entero positivo. Recibido: {chunk_months}"
+        )
+
+    start = month_index(date_from)
+    end = month_index(date_to)
+    return [
+        (month_text(first), month_text(min(first + chunk_months - 1, end)))
+        for first in range(start, end + 1, chunk_months)
+    ]
+
+
+def _record_key(record: Any, key_fields: Sequence[str]) -> Any:
+    """Clave de deduplicación de un registro en bruto."""
+    if isinstance(record, dict):
+        return tuple(record.get(name) for name in key_fields)
+    return repr(record)
+
+
+def _merge_records(record_lists: Sequence[Any], key_fields: Sequence[str]) -> List[Any]:
+    """
+    Concatena listas de registros en orden descartando el solape entre bloques.
+
+    Un registro solo se descarta si su clave aparece en el bloque inmediatamente
+    anterior, de modo que los duplicados que la API devuelve dentro de un mismo
+    bloque se conservan igual que en una consulta sin trocear.
+    """
+    merged: List[Any] = []
+    previous: Set[Any] = set()
+    for records in record_lists:
+        current: Set[Any] = set()
+        for record in records or []:
+            key = _record_key(record, key_fields)
+            current.add(key)
+            if key not in previous:
+                merged.append(record)
+        previous = current
+    return merged
+
+
+def _merge_distributor_errors(responses: Sequence[Dict[str, Any]]) -> List[Any]:
+    """Une los errores de distribuidor de todos los bloques sin repetirlos."""
+    fields = ("distributorCode", "errorCode", "errorDescription")
+    merged: List[Any] = []
+    seen = set()
+    for response in responses:
+        for error in response.get("distributorError") or []:
+            key = _record_key(error, fields)
+            if key not in seen:
+                seen.add(key)
+                merged.append(error)
+    return merged
+
+
+def merge_chunk_responses(
+    responses: Sequence[Dict[str, Any]], records_key: str
+) -> Dict[str, Any]:
+    """
+    Fusiona las respuestas en bruto de varios bloques en una sola respuesta.
+
+    Los registros de ``records_key`` se concatenan en el orden de los bloques y los
+    registros del inicio de un bloque que repiten uno del bloque anterior (por
+    ejemplo la última hora de un mes) se eliminan según :data:`CHUNK_RECORD_KEYS`.
+
+    :param responses: Respuestas de la API de cada bloque, en orden cronológico
+    :type responses: Sequence[Dict[str, Any]]
+    :param records_key: Clave de la lista de registros (``"timeCurve"``, ``"maxPower"``)
+    :type records_key: str
+    :return: Respuesta fusionada con la misma estructura que la de un único bloque
+    :rtype: Dict[str, Any]
+    """
+    merged = _merge_records(
+        [response.get(records_key) for response in responses],
+        CHUNK_RECORD_KEYS.get(records_key, ()),
+    )
+    return {
+        records_key: merged,
+        "distributorError": _merge_distributor_errors(responses),
+    }
+
+
+def merge_reactive_responses(responses: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fusiona las respuestas de energía reactiva de varios bloques.
+
+    Los metadatos (CUPS, código...) se toman del primer bloque con datos y los
+    períodos de ``energy`` se concatenan en orden eliminando las fechas que repiten
+    las del bloque anterior.
+
+    :param responses: Respuestas de ``get-reactive-data-v2`` de cada bloque
+    :type responses: Sequence[Dict[str, Any]]
+    :return: Respuesta fusionada con la misma estructura que la de un único bloque
+    :rtype: Dict[str, Any]
+    """
+    reactive_blocks: List[Dict[str, Any]] = []
+    for response in responses:
+        block = response.get("reactiveEnergy")
+        if isinstance(block, dict) and block:
+            reactive_blocks.append(block)
+    reactive_energy: Dict[str, Any] = {}
+    if reactive_blocks:
+        reactive_energy = dict(reactive_blocks[0])
+        reactive_energy["energy"] = _merge_records(
+            [block.get("energy") for block in reactive_blocks],
+            CHUNK_RECORD_KEYS["energy"],
+        )
+    return {
+        "reactiveEnergy": reactive_energy,
+        "distributorError": _merge_distributor_errors(responses),
+    }
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Indica si un error merece otro intento.
+
+    Solo se reintentan los fallos de red y timeouts (:class:`DatadisError`), no los
+    errores de la API, de autenticación o de validación, que se repetirían igual.
+    Lo usan :func:`fetch_chunks` y los trabajos de :mod:`datadis_python.jobs`.
+
+    :param error: Excepción de una petición
+    :type error: BaseException
+    :rtype: bool
+    """
+    return isinstance(error, DatadisError) and not isinstance(
+        error, (APIError, AuthenticationError, ValidationError)
+    )
+
+
+def fetch_chunks(
+    fetch: Callable[[str, str], T],
+    ranges: Sequence[Tuple[str, str]],
+    max_workers: int = 4,
+    retry_rounds: int = 1,
+) -> List[T]:
+    """
+    Descarga varios bloques en paralelo reintentando solo los que fallan.
+
+    Los bloques que fallan por red o timeout (:class:`DatadisError`) se reintentan
+    hasta ``retry_rounds`` veces más, conservando los que ya se descargaron. Los
+    errores de la API (:class:`APIError`, :class:`AuthenticationError`) no se
+    reintentan y se propagan inmediatamente.
+
+    :param fetch: Función ``fetch(desde, hasta)`` que descarga un bloque
+    :type fetch: Callable[[str, str], T]
+    :param ranges: Rangos de cada bloque, de :func:`split_month_range`
+    :type ranges: Sequence[Tuple[str, str]]
+    :param max_workers: Número máximo de bloques descargados a la vez
+    :type max_workers: int
+    :param retry_rounds: Rondas adicionales para los bloques fallidos
+    :type retry_rounds: int
+    :return: Resultado de cada bloque, en el mismo orden que ``ranges``
+    :rtype: List[T]
+    :raises DatadisError: Si algún bloque sigue fallando tras los reintentos
+    """
+    results: List[Optional[T]] = [None] * len(ranges)
+    pending = list(range(len(ranges)))
+    errors: Dict[int, BaseException] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ranges)))) as pool:
+        for round_number in range(retry_rounds + 1):
+            if round_number:
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "chunks.retry",
+                    "Reintentando %(count)d bloques fallidos (ronda %(round)d)",
+                    count=len(pending),
+                    round=round_number,
+                    ranges=[ranges[index] for index in pending],
+                )
+            futures = {index: pool.submit(fetch, *ranges[index]) for index in pending}
+            errors = {}
+            for index, future in futures.items():
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    if not is_retryable(e):
+                        for other in futures.values():
+                            other.cancel()
+                        raise
+                    errors[index] = e
+            pending = sorted(errors)
+            if not pending:
+                return results  # type: ignore[return-value]
+
+    failed = ", ".join(f"{ranges[index][0]}-{ranges[index][1]}" for index in pending)
+    raise DatadisError(
+        f"No se pudieron obtener {len(pending)} de {len(ranges)} bloques ({failed}): "
+        f"{errors[pending[0]]}"
+    )
+
+
+def iter_chunks(
+    fetch: Callable[[str, str], T],
+    ranges: Sequence[Tuple[str, str]],
+    max_workers: int = 2,
+    retry_rounds: int = 1,
+) -> Iterator[T]:
+    """
+    Descarga bloques por adelantado y los devuelve en orden según van llegando.
+
+    A diferencia de :func:`fetch_chunks`, no espera a tener todos los bloques: cada
+    uno se entrega en cuanto está disponible y sus sucesores, hasta
+    ``max_workers``, se siguen descargando mientras el consumidor lo procesa. Nunca
+    hay más de ``max_workers`` bloques en memoria a la vez.
+
+    :param fetch: Función ``fetch(desde, hasta)`` que descarga un bloque
+    :type fetch: Callable[[str, str], T]
+    :param ranges: Rangos de cada bloque, de :func:`split_month_range`
+    :type ranges: Sequence[Tuple[str, str]]
+    :param max_workers: Número máximo de bloques descargados por adelantado
+    :type max_workers: int
+    :param retry_rounds: Reintentos de cada bloque que falle por red o timeout
+    :type retry_rounds: int
+    :return: Iterador con el resultado de cada bloque, en el orden de ``ranges``
+    :rtype: Iterator[T]
+    :raises DatadisError: Si un bloque sigue fallando tras los reintentos
+    """
+    if not ranges:
+        return
+    workers = max(1, min(max_workers, len(ranges)))
+    pending: Deque[Tuple[int, Future]] = deque()
+    position = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            while position < len(ranges) and len(pending) < workers:
+                pending.append((position, pool.submit(fetch, *ranges[position])))
+                position += 1
+
+            while pending:
+                index, future = pending.popleft()
+                attempt = 0
+                while True:
+                    try:
+                        result = future.result()
+                        break
+                    except Exception as e:
+                        if not is_retryable(e):
+                            raise
+                        if attempt >= retry_rounds:
+                            start, end = ranges[index]
+                            raise DatadisError(
+                                f"No se pudo obtener el bloque {start}-{end}: {e}"
+                            ) from e
+                        attempt += 1
+                        emit(
+                            logger,
+                            logging.WARNING,
+                            "chunks.retry",
+                            "Reintentando el bloque %(range)s (intento %(round)d)",
+                            count=1,
+                            round=attempt,
+                            range=ranges[index],
+                        )
+                        future = pool.submit(fetch, *ranges[index])
+
+                # Pedir el siguiente bloque antes de entregar este al consumidor
+                if position < len(ranges):
+                    pending.append((position, pool.submit(fetch, *ranges[position])))
+                    position += 1
+                yield result
+        finally:
+            for _, other in pending:
+                other.cancel()
+
+
+async def iterate_async(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """
+    Adapta un iterador bloqueante (como :func:`iter_chunks`) a ``async for``.
+
+    Cada paso del iterador se ejecuta en el executor por defecto del bucle de
+    eventos, de modo que la descarga de los bloques no bloquea el bucle.
+
+    :param iterator: Iterador síncrono
+    :type iterator: Iterator[T]
+    :return: Iterador asíncrono con los mismos elementos
+    :rtype: AsyncIterator[T]
+    """
+    loop = asyncio.get_running_loop()
+    done = object()
+    try:
+        while True:
+            item = await loop.run_in_executor(None, next, iterator, done)
+            if item is done:
+                return
+            yield item  # type: ignore[misc]
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await loop.run_in_executor(None, close)
+
+
+def request_month_range(
+    request: Callable[[Dict[str, Any]], Any],
+    params: Dict[str, Any],
+    merge: Callable[[Sequence[Dict[str, Any]]], Dict[str, Any]],
+    chunk_months: Optional[int],
+    max_workers: int = 4,
+    retry_rounds: int = 1,
+) -> Any:
+    """
+    Realiza una consulta por rango de meses, dividiéndola en bloques si es largo.
+
+    Si ``chunk_months`` es ``None`` o el rango cabe en un bloque, se hace una única
+    petición con ``params``. En caso contrario, cada bloque se pide con sus propias
+    ``startDate``/``endDate`` mediante :func:`fetch_chunks` y las respuestas se
+    fusionan con ``merge``.
+
+    :param request: Función que realiza la petición con unos parámetros de query
+    :type request: Callable[[Dict[str, Any]], Any]
+    :param params: Parámetros de la consulta, con ``startDate`` y ``endDate``
+    :type params: Dict[str, Any]
+    :param merge: Función de fusión (:func:`merge_chunk_responses` o
+                 :func:`merge_reactive_responses`)
+    :type merge: Callable[[Sequence[Dict[str, Any]]], Dict[str, Any]]
+    :param chunk_months: Meses por bloque o ``None`` para no dividir
+    :type chunk_months: Optional[int]
+    :param max_workers: Número máximo de bloques descargados a la vez
+    :type max_workers: int
+    :param retry_rounds: Rondas adicionales para los bloques fallidos
+    :type retry_rounds: int
+    :return: Respuesta de la API (fusionada si se dividió en bloques)
+    :raises DatadisError: Si algún bloque sigue fallando tras los reintentos
+    """
+    if not chunk_months:
+        return request(params)
+    ranges = split_month_range(params["startDate"], params["endDate"], chunk_months)
+    if len(ranges) == 1:
+        return request(params)
+
+    emit(
+        logger,
+        logging.INFO,
+        "chunks.split",
+        "Rango %(date_from)s - %(date_to)s dividido en %(count)d bloques",
+        date_from=params["startDate"],
+        date_to=params["endDate"],
+        count=len(ranges),
+    )
+
+    def fetch(start: str, end: str) -> Dict[str, Any]:
+        response = request({**params, "startDate": start, "endDate": end})
+        return response if isinstance(response, dict) else {}
+
+    return merge(fetch_chunks(fetch, ranges, max_workers, retry_rounds))
@@ -0,0 +1,517 @@
+"""
+Ejecución concurrente de lotes de peticiones con límites por distribuidora.
+
+Las carteras con miles de suministros necesitan una petición por CUPS. Este módulo
+reparte esas peticiones entre un pool de hilos y:
+
+- Limita las peticiones simultáneas a una misma distribuidora (``per_key_limit``),
+  sin bloquear hilos: las peticiones de una distribuidora saturada esperan en cola
+  mientras se atienden las de las demás.
+- Devuelve un flujo de :class:`BulkResult` en el orden de entrada o según se
+  completan, con el error de cada elemento en lugar de abortar el lote.
+- Mantiene la memoria acotada: solo se leen de la entrada los elementos necesarios
+  para llenar una ventana de ``max_workers * 4`` peticiones pendientes.
+- Opcionalmente ajusta el límite de cada distribuidora según su respuesta
+  (:class:`AdaptiveConcurrency`): aumento aditivo mientras responde bien y
+  reducción multiplicativa ante timeouts, HTTP 429/5xx o ``distributorError``.
+
+Example:
+    Consultar muchos suministros con un máximo de 2 peticiones por distribuidora::
+
+        for item in run_bulk(fetch, supplies, key=lambda s: s.distributor_code,
+                             max_workers=8, per_key_limit=2):
+            if item.ok:
+                store(item.result)
+            else:
+                log_failure(item.request, item.error)
+
+    Límites que se adaptan a cada distribuidora (y se conservan entre lotes)::
+
+        adaptive = AdaptiveConcurrency(initial=2, max_limit=8)
+        for item in run_bulk(fetch, supplies, key=lambda s: s.distributor_code,
+                             max_workers=16, per_key_limit=adaptive):
+            ...
+        print(adaptive.limits())  # {"2": 8, "5": 3, ...}
+
+:author: TacoronteRiveroCristian
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Mapping
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from ..exceptions import APIError, AuthenticationError, DatadisError, ValidationError
+from .events import emit
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+#: Elementos leídos por adelantado de la entrada por cada hilo del pool.
+BULK_WINDOW_PER_WORKER = 4
+
+
+@dataclass
+class BulkResult(Generic[T, R]):
+    """
+    Resultado de un elemento de un lote.
+
+    :param index: Posición del elemento en la entrada
+    :type index: int
+    :param request: Elemento de entrada tal como se recibió
+    :param result: Resultado de la petición (``None`` si falló)
+    :param error: Excepción de la petición (``None`` si tuvo éxito)
+    :type error: Optional[Exception]
+    """
+
+    index: int
+    request: T
+    result: Optional[R] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """``True`` si la petición terminó sin error."""
+        return self.error is None
+
+
+def _congestion_reason(error: Optional[BaseException], result: Any) -> Optional[str]:
+    """
+    Señal de sobrecarga de una respuesta, o ``None`` si no la hay.
+
+    Cuentan como sobrecarga los fallos de red y timeouts, las respuestas HTTP 429 y
+    5xx y las respuestas con ``distributor_error``. El resto de errores (validación,
+    autenticación, 4xx) no dependen de la carga y no modifican el límite.
+    """
+    if error is None:
+        if getattr(result, "distributor_error", None):
+            return "distributor_error"
+        return None
+    if isinstance(error, APIError):
+        if error.status_code == 429:
+            return "throttled"
+        if error.status_code is not None and error.status_code >= 500:
+            return "server_error"
+        return None
+    if isinstance(error, (AuthenticationError, ValidationError)):
+        return None
+    return "timeout" if isinstance(error, DatadisError) else None
+
+
+class AdaptiveConcurrency:
+    """
+    Límite de peticiones simultáneas por grupo ajustado con AIMD.
+
+    Cada grupo (normalmente una distribuidora) empieza con ``initial`` peticiones
+    simultáneas y su límite evoluciona con cada respuesta:
+
+    - **Aumento aditivo**: cada respuesta sana suma ``increase / límite``, es decir,
+      unas ``increase`` peticiones más por cada ronda completa de respuestas.
+    - **Reducción multiplicativa**: una respuesta con sobrecarga (timeout, HTTP
+      429/5xx, ``distributorError`` o latencia superior a ``latency_target``)
+      multiplica el límite por ``decrease``. Las respuestas de peticiones lanzadas
+      antes de la última reducción no vuelven a reducirlo, de modo que una ráfaga
+      de fallos simultáneos cuenta como una sola señal.
+
+    La misma instancia puede reutilizarse en varios lotes para conservar los límites
+    aprendidos. Es segura entre hilos.
+
+    :param initial: Límite inicial de cada grupo
+    :type initial: int
+    :param min_limit: Límite mínimo
+    :type min_limit: int
+    :param max_limit: Límite máximo
+    :type max_limit: int
+    :param increase: Peticiones añadidas por ronda de respuestas sanas
+    :type increase: float
+    :param decrease: Factor de reducción ante sobrecarga (entre 0 y 1)
+    :type decrease: float
+    :param latency_target: Latencia en segundos a partir de la cual una respuesta
+                          se considera sobrecarga (``None``: no se tiene en cuenta)
+    :type latency_target: Optional[float]
+    :param clock: Reloj monotónico (configurable para tests)
+    """
+
+    def __init__(
+        self,
+        initial: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_target: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Inicializa el controlador sin grupos conocidos.
+
+        :raises ValidationError: Si los parámetros no son coherentes
+        """
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValidationError(
+                "Se requiere 1 <= min_limit <= initial <= max_limit. Recibido: "
+                f"{min_limit}, {initial}, {max_limit}"
+            )
+        if increase <= 0:
+            raise ValidationError(f"increase debe ser positivo. Recibido: {increase}")
+        if not 0 < decrease < 1:
+            raise ValidationError(
+                f"decrease debe estar entre 0 y 1. Recibido: {decrease}"
+            )
+        self.initial = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._limits: Dict[Hashable, float] = {}
+        self._last_decrease: Dict[Hashable, float] = {}
+
+    def limit(self, group: Hashable) -> int:
+        """
+        Peticiones simultáneas permitidas para un grupo.
+
+        :param group: Grupo (distribuidora)
+        :rtype: int
+        """
+        with self._lock:
+            return int(self._limits.get(group, self.initial))
+
+    def limits(self) -> Dict[Hashable, int]:
+        """
+        Límite actual de cada grupo observado.
+
+        :rtype: Dict[Hashable, int]
+        """
+        with self._lock:
+            return {group: int(value) for group, value in self._limits.items()}
+
+    def observe(
+        self,
+        group: Hashable,
+        started: float,
+        error: Optional[BaseException] = None,
+        result: Any = None,
+    ) -> None:
+        """
+        Ajusta el límite de un grupo con el desenlace de una petición.
+
+        :param group: Grupo (distribuidora)
+        :param started: Instante de inicio de la petición según ``clock``
+        :type started: float
+        :param error: Excepción de la petición, si falló
+        :type error: Optional[BaseException]
+        :param result: Resultado de la petición, si tuvo éxito
+        """
+        now = self.clock()
+        reason = _congestion_reason(error, result)
+        if reason is None and error is not None:
+            return
+        if (
+            reason is None
+            and self.latency_target is not None
+            and now - started > self.latency_target
+        ):
+            reason = "latency"
+        with self._lock:
+            current = self._limits.get(group, float(self.initial))
+            if reason is None:
+                updated = min(self.max_limit, current + self.increase / current)
+            elif started >= self._last_decrease.get(group, float("-inf")):
+                updated = max(self.min_limit, current * self.decrease)
+                self._last_decrease[group] = now
+            else:
+                return
+            self._limits[group] = updated
+        if int(updated) != int(current):
+            emit(
+                logger,
+                logging.INFO if reason else logging.DEBUG,
+                "concurrency.limit",
+                "Límite de %(group)s: %(previous)d -> %(limit)d (%(reason)s)",
+                group=group,
+                previous=int(current),
+                limit=int(updated),
+                reason=reason or "healthy",
+            )
+
+
+#: Nombres de la API aceptados en las peticiones en forma de diccionario.
+_API_ALIASES = {
+    "distributorCode": "distributor_code",
+    "pointType": "point_type",
+    "sourceNif": "source_nif",
+}
+
+
+def bulk_request_kwargs(
+    item: Any,
+    with_range: bool,
+    date_from: Any = None,
+    date_to: Any = None,
+    with_point_type: bool = False,
+    authorized_nif: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Convierte una petición de un lote en los argumentos del método individual.
+
+    Admite los formatos de petición de los métodos ``*_many`` de los clientes V2:
+    objetos con ``cups`` y ``distributor_code`` (como ``SupplyData``), tuplas
+    ``(cups, distributor_code[, rango | desde, hasta])`` y diccionarios con los
+    argumentos del método individual o sus nombres en la API.
+
+    El ``source_nif`` de la petición (el NIF con el que ``get_supplies_for_nifs``
+    obtuvo el suministro) se envía como ``authorized_nif`` salvo que la petición o
+    la llamada indiquen uno explícitamente.
+
+    :param item: Petición (``SupplyData``, tupla o diccionario)
+    :param with_range: Si el método necesita ``date_from`` y ``date_to``
+    :type with_range: bool
+    :param date_from: Fecha inicial por defecto
+    :param date_to: Fecha final por defecto
+    :param with_point_type: Si el método acepta ``point_type``
+    :type with_point_type: bool
+    :param authorized_nif: NIF autorizado por defecto (prevalece sobre
+                          ``source_nif``)
+    :type authorized_nif: Optional[str]
+    :return: Argumentos con nombre para el método individual
+    :rtype: Dict[str, Any]
+    :raises ValidationError: Si la petición no tiene un formato reconocido o le
+                            faltan las fechas
+    """
+    kwargs: Dict[str, Any]
+    if isinstance(item, Mapping):
+        kwargs = {
+            _API_ALIASES.get(str(name), str(name)): value
+            for name, value in item.items()
+        }
+    elif isinstance(item, (tuple, list)):
+        if len(item) == 2:
+            kwargs = {"cups": item[0], "distributor_code": item[1]}
+        elif len(item) == 3 and isinstance(item[2], (tuple, list)):
+            kwargs = {"cups": item[0], "distributor_code": item[1]}
+            if len(item[2]) != 2:
+                raise ValidationError(
+                    "El rango de fechas debe ser (desde, hasta). "
+                    f"Recibido: {item[2]!r}"
+                )
+            kwargs["date_from"], kwargs["date_to"] = item[2]
+        elif len(item) == 4:
+            names = ("cups", "distributor_code", "date_from", "date_to")
+            kwargs = dict(zip(names, item))
+        else:
+            raise ValidationError(f"Formato de petición no reconocido: {item!r}")
+    elif hasattr(item, "cups") and hasattr(item, "distributor_code"):
+        kwargs = {"cups": item.cups, "distributor_code": item.distributor_code}
+        if getattr(item, "point_type", None) is not None:
+            kwargs["point_type"] = item.point_type
+        kwargs["source_nif"] = getattr(item, "source_nif", None)
+    else:
+        raise ValidationError(f"Formato de petición no reconocido: {item!r}")
+
+    source_nif = kwargs.pop("source_nif", None)
+    if kwargs.get("authorized_nif") is None:
+        nif = authorized_nif if authorized_nif is not None else source_nif
+        if nif is not None:
+            kwargs["authorized_nif"] = nif
+
+    if with_range:
+        kwargs.setdefault("date_from", date_from)
+        kwargs.setdefault("date_to", date_to)
+        if kwargs["date_from"] is None or kwargs["date_to"] is None:
+            raise ValidationError(
+                f"La petición del CUPS {kwargs.get('cups')} no indica el rango de "
+                "fechas y no se proporcionaron date_from/date_to por defecto"
+            )
+    else:
+        kwargs.pop("date_from", None)
+        kwargs.pop("date_to", None)
+    if not with_point_type:
+        kwargs.pop("point_type", None)
+    return kwargs
+
+
+def _safe_key(key: Optional[Callable[[T], Hashable]], item: T) -> Hashable:
+    """Clave de agrupación de un elemento; ``None`` si no se puede calcular."""
+    if key is None:
+        return None
+    try:
+        return key(item)
+    except Exception:
+        # El error real se informará al procesar el elemento
+        return None
+
+
+def run_bulk(
+    call: Callable[[T], R],
+    items: Iterable[T],
+    key: Optional[Callable[[T], Hashable]] = None,
+    max_workers: int = 8,
+    per_key_limit: Union[int, AdaptiveConcurrency, None] = None,
+    ordered: bool = True,
+    executor: Optional[Executor] = None,
+) -> Iterator[BulkResult[T, R]]:
+    """
+    Ejecuta ``call`` sobre cada elemento en paralelo y devuelve un flujo de resultados.
+
+    Cada llamada se ejecuta con una copia del contexto del llamante, por lo que
+    :func:`~datadis_python.utils.validators.validation_now` y otras variables de
+    contexto se respetan dentro de los hilos.
+
+    :param call: Función que procesa un elemento
+    :type call: Callable[[T], R]
+    :param items: Elementos a procesar (puede ser un generador)
+    :type items: Iterable[T]
+    :param key: Función que agrupa los elementos (por ejemplo por distribuidora)
+    :type key: Optional[Callable[[T], Hashable]]
+    :param max_workers: Número máximo de peticiones simultáneas
+    :type max_workers: int
+    :param per_key_limit: Máximo de peticiones simultáneas por grupo, o un
+                         :class:`AdaptiveConcurrency` que lo ajusta según las
+                         respuestas (``None``: solo se aplica ``max_workers``)
+    :type per_key_limit: Union[int, AdaptiveConcurrency, None]
+    :param ordered: ``True`` para devolver los resultados en el orden de entrada,
+                   ``False`` para devolverlos según se completan
+    :type ordered: bool
+    :param executor: Ejecutor compartido donde lanzar las peticiones (por ejemplo
+                    un carril de :class:`~datadis_python.jobs.FairScheduler`). Si
+                    se indica, ``max_workers`` solo limita las peticiones en vuelo
+                    de este lote; ``None`` crea un pool propio
+    :type executor: Optional[Executor]
+    :return: Iterador de :class:`BulkResult`, uno por elemento
+    :rtype: Iterator[BulkResult]
+    :raises ValidationError: Si ``max_workers`` o ``per_key_limit`` no son positivos
+    """
+    if max_workers < 1:
+        raise ValidationError(
+            f"max_workers debe ser un entero positivo. Recibido: {max_workers}"
+        )
+    if isinstance(per_key_limit, int) and per_key_limit < 1:
+        raise ValidationError(
+            f"per_key_limit debe ser un entero positivo. Recibido: {per_key_limit}"
+        )
+    return _run_bulk(call, items, key, max_workers, per_key_limit, ordered, executor)
+
+
+def _run_bulk(
+    call: Callable[[T], R],
+    items: Iterable[T],
+    key: Optional[Callable[[T], Hashable]],
+    max_workers: int,
+    per_key_limit: Union[int, AdaptiveConcurrency, None],
+    ordered: bool,
+    executor: Optional[Executor],
+) -> Iterator[BulkResult[T, R]]:
+    """Implementación de :func:`run_bulk` (generador)."""
+    adaptive = per_key_limit if isinstance(per_key_limit, AdaptiveConcurrency) else None
+    fixed_limit = (
+        None if isinstance(per_key_limit, AdaptiveConcurrency) else per_key_limit
+    )
+    source = enumerate(items)
+    exhausted = False
+    window = max_workers * BULK_WINDOW_PER_WORKER
+    in_flight: Dict[Future, Tuple[int, T, Hashable]] = {}
+    started: Dict[Future, float] = {}
+    waiting: Deque[Tuple[int, T, Hashable]] = deque()
+    active: Counter = Counter()
+    finished: Dict[int, BulkResult[T, R]] = {}
+    next_index = 0
+
+    # Un ejecutor externo no se cierra al terminar el lote
+    pool_context = (
+        ThreadPoolExecutor(max_workers=max_workers)
+        if executor is None
+        else nullcontext(executor)
+    )
+    with pool_context as pool:
+
+        def has_capacity(group: Hashable) -> bool:
+            if adaptive is not None:
+                return active[group] < adaptive.limit(group)
+            return fixed_limit is None or active[group] < fixed_limit
+
+        def submit(entry: Tuple[int, T, Hashable]) -> None:
+            context = contextvars.copy_context()
+            future = pool.submit(context.run, call, entry[1])
+            in_flight[future] = entry
+            if adaptive is not None:
+                started[future] = adaptive.clock()
+            active[entry[2]] += 1
+
+        def fill() -> None:
+            nonlocal exhausted
+            # Primero los elementos que esperaban a que su grupo tuviera hueco
+            for _ in range(len(waiting)):
+                if len(in_flight) >= max_workers:
+                    return
+                entry = waiting.popleft()
+                if has_capacity(entry[2]):
+                    submit(entry)
+                else:
+                    waiting.append(entry)
+            while not exhausted and len(in_flight) < max_workers:
+                if len(in_flight) + len(waiting) + len(finished) >= window:
+                    return
+                try:
+                    index, item = next(source)
+                except StopIteration:
+                    exhausted = True
+                    return
+                entry = (index, item, _safe_key(key, item))
+                if has_capacity(entry[2]):
+                    submit(entry)
+                else:
+                    waiting.append(entry)
+
+        fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item, group = in_flight.pop(future)
+                active[group] -= 1
+                try:
+                    outcome = BulkResult(index, item, result=future.result())
+                except Exception as e:
+                    outcome = BulkResult(index, item, error=e)
+                if adaptive is not None:
+                    adaptive.observe(
+                        group, started.pop(future), outcome.error, outcome.result
+                    )
+                if ordered:
+                    finished[index] = outcome
+                else:
+                    yield outcome
+            if ordered:
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+            fill()
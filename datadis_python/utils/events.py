@@ -0,0 +1,127 @@
+"""
+Registro estructurado y eventos de los clientes de Datadis.
+
+Los clientes no escriben en la salida estándar: cada paso relevante (autenticación,
+peticiones, reintentos, validación...) se emite como un **evento** con un nombre
+estable (por ejemplo ``"request.success"``) y un diccionario de campos. Cada evento:
+
+- Se registra con :mod:`logging` en el logger del módulo que lo emite (jerarquía
+  ``datadis_python.*``). El mensaje se formatea de forma diferida, solo si el nivel
+  está habilitado, y los campos viajan en el ``LogRecord`` como ``record.event`` y
+  ``record.fields`` para los formateadores estructurados (JSON, etc.).
+- Se entrega a los *listeners* registrados con :func:`add_event_listener`.
+
+El registro está **desactivado por defecto**: el paquete instala un
+:class:`logging.NullHandler` y, mientras no haya listeners ni un nivel habilitado,
+:func:`emit` retorna sin formatear nada.
+
+Example:
+    Activar los mensajes del SDK o suscribirse a los eventos::
+
+        import logging
+        from datadis_python.utils.events import add_event_listener
+
+        logging.basicConfig()
+        logging.getLogger("datadis_python").setLevel(logging.DEBUG)
+
+        def on_event(event, fields):
+            if event == "request.success":
+                metrics.observe("datadis_bytes", fields["bytes"])
+
+        add_event_listener(on_event)
+
+:author: TacoronteRiveroCristian
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+#: Firma de los listeners: ``listener(nombre_evento, campos)``.
+EventListener = Callable[[str, Dict[str, Any]], None]
+
+_listeners: List[EventListener] = []
+
+_logger = logging.getLogger(__name__)
+
+
+def add_event_listener(listener: EventListener) -> None:
+    """
+    Registra una función que recibirá todos los eventos de los clientes.
+
+    Los listeners se ejecutan de forma síncrona en el hilo que emite el evento, por
+    lo que deben ser rápidos. Las excepciones que lancen se registran y se ignoran.
+
+    :param listener: Función ``listener(nombre_evento, campos)``
+    :type listener: Callable[[str, Dict[str, Any]], None]
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_event_listener(listener: EventListener) -> None:
+    """
+    Elimina un listener registrado con :func:`add_event_listener`.
+
+    :param listener: Función registrada previamente
+    :type listener: Callable[[str, Dict[str, Any]], None]
+    """
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def emit(
+    logger: logging.Logger, level: int, event: str, message: str, **fields: Any
+) -> None:
+    """
+    Emite un evento estructurado.
+
+    :param logger: Logger del módulo emisor
+    :type logger: logging.Logger
+    :param level: Nivel de logging (``logging.DEBUG``, ``logging.INFO``...)
+    :type level: int
+    :param event: Nombre estable del evento (``"request.success"``...)
+    :type event: str
+    :param message: Plantilla del mensaje con marcadores ``%(campo)s``; solo se
+                   formatea si el nivel está habilitado
+    :type message: str
+    :param fields: Campos del evento
+    """
+    if _listeners:
+        for listener in tuple(_listeners):
+            try:
+                listener(event, fields)
+            except Exception:
+                _logger.exception("Error en el listener de eventos %r", listener)
+    if logger.isEnabledFor(level):
+        # Un diccionario vacío no se trata como argumentos con nombre en logging
+        args = (fields,) if fields else ()
+        logger.log(
+            level,
+            message,
+            *args,
+            extra={"event": event, "fields": fields},
+            stacklevel=2,
+        )
+
+
+def response_size(response: Any) -> Optional[int]:
+    """
+    Tamaño en bytes del cuerpo de una respuesta HTTP, sin decodificarlo a texto.
+
+    Usa la cabecera ``Content-Length`` si está presente y, si no, la longitud de
+    ``response.content`` (que ``requests`` ya tiene en memoria).
+
+    :param response: Respuesta de ``requests``
+    :return: Número de bytes o ``None`` si no se puede determinar
+    :rtype: Optional[int]
+    """
+    length = getattr(response, "headers", {}).get("Content-Length")
+    if length is not None:
+        try:
+            return int(length)
+        except (TypeError, ValueError):
+            pass
+    content = getattr(response, "content", None)
+    if isinstance(content, (bytes, bytearray)):
+        return len(content)
+    return None
@@ -61,12 +61,51 @@ Warning:
 :author: TacoronteRiveroCristian
 """
 
+import logging
 import time
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
 
 import requests
 
 from ..exceptions import APIError, AuthenticationError, DatadisError
+from . import json_backend
+from .events import emit
+from .text_utils import repair_double_encoded_utf8
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def decode_json_body(response: requests.Response) -> Tuple[Any, bool]:
+    """
+    Decodifica el cuerpo JSON de una respuesta reparando antes la doble codificación.
+
+    La corrección de la doble codificación UTF-8 se aplica una sola vez sobre los
+    bytes del cuerpo (:func:`~datadis_python.utils.text_utils.repair_double_encoded_utf8`)
+    en lugar de cadena a cadena tras decodificar. Los bytes se decodifican con el
+    decodificador JSON más rápido instalado
+    (ver :mod:`datadis_python.utils.json_backend`). Si el cuerpo no está disponible
+    en bytes o el decodificador lo rechaza (por ejemplo por no ser UTF-8), se recurre
+    a ``response.json()``.
+
+    :param response: Respuesta HTTP con cuerpo JSON
+    :type response: requests.Response
+    :return: Tupla ``(json_decodificado, reparado_en_bytes)``. Si el segundo valor es
+            ``False`` la normalización posterior debe reparar cada cadena
+    :rtype: Tuple[Any, bool]
+    :raises ValueError: Si el cuerpo no es JSON válido
+    """
+    content = getattr(response, "content", None)
+    if not isinstance(content, (bytes, bytearray)):
+        return response.json(), False
+
+    try:
+        return json_backend.loads(repair_double_encoded_utf8(bytes(content))), True
+    except ValueError:
+        # Cuerpo en otra codificación o JSON inválido: delegar en requests, que
+        # detecta la codificación y lanza el error de decodificación habitual
+        return response.json(), False
 
 
 class HTTPClient:
@@ -192,6 +231,7 @@ class HTTPClient:
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
         use_form_data: bool = False,
+        retry: bool = True,
     ) -> Union[Dict[str, Any], str, list]:
         """
         Realiza una petición HTTP robusta con reintentos automáticos y manejo de errores.
@@ -232,6 +272,10 @@ class HTTPClient:
         :param use_form_data: Si ``True``, envía datos como application/x-www-form-urlencoded.
                              Si ``False`` (por defecto), envía como application/json
         :type use_form_data: bool
+        :param retry: Si ``False``, los errores de red/timeouts no se reintentan. Úselo
+                     en peticiones que no se pueden repetir sin efectos duplicados
+                     (por ejemplo altas y cancelaciones de autorizaciones)
+        :type retry: bool
 
         :return: Respuesta procesada del servidor. El tipo depende del endpoint:
 
@@ -280,13 +324,74 @@ class HTTPClient:
            - :meth:`_handle_response` para detalles del procesamiento de respuestas
            - La normalización de texto se realiza automáticamente en respuestas JSON
         """
+        return self._send(
+            method,
+            url,
+            data,
+            params,
+            headers,
+            use_form_data,
+            retry,
+            self._handle_response,
+        )
+
+    def make_raw_request(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        retry: bool = True,
+    ) -> bytes:
+        """
+        Realiza una petición como :meth:`make_request` sin decodificar la respuesta.
+
+        Los reintentos y los errores HTTP se tratan igual; el cuerpo de una respuesta
+        correcta se devuelve tal cual, por ejemplo para decodificarlo en otro proceso.
+
+        :param method: Método HTTP
+        :type method: str
+        :param url: URL completa del endpoint
+        :type url: str
+        :param data: Datos JSON del cuerpo de la petición
+        :type data: Optional[Dict[str, Any]]
+        :param params: Parámetros de query string
+        :type params: Optional[Dict[str, Any]]
+        :param headers: Headers HTTP adicionales
+        :type headers: Optional[Dict[str, str]]
+        :param retry: Reintentar los errores de red/timeouts
+        :type retry: bool
+        :return: Cuerpo de la respuesta sin decodificar
+        :rtype: bytes
+        :raises DatadisError: Si se agotan todos los reintentos por errores de red/timeouts
+        :raises AuthenticationError: Si hay errores de autenticación (401)
+        :raises APIError: Si la API devuelve errores HTTP (400, 403, 404, 500, etc.)
+        """
+        return self._send(
+            method, url, data, params, headers, False, retry, self._raw_body
+        )
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        use_form_data: bool,
+        retry: bool,
+        handle: Callable[[requests.Response, str], T],
+    ) -> T:
+        """Envía la petición con reintentos y procesa la respuesta con ``handle``."""
         # Rate limiting automático para evitar sobrecargar el servidor de Datadis
         # Excepción: endpoints de autenticación no necesitan delay
         if "/nikola-auth" not in url:
             time.sleep(0.1)  # Delay reducido pero efectivo
 
         # Intentar la petición con reintentos automáticos
-        for attempt in range(self.retries + 1):
+        attempts = self.retries + 1 if retry else 1
+        for attempt in range(attempts):
             try:
                 # Configurar headers específicos para esta petición
                 if headers:
@@ -316,20 +421,28 @@ class HTTPClient:
                     )
 
                 # Procesar respuesta y retornar resultado
-                return self._handle_response(response, url)
+                return handle(response, url)
 
             except requests.RequestException as e:
                 # Si es el último intento, propagar el error
-                if attempt == self.retries:
+                if attempt == attempts - 1:
                     raise DatadisError(
-                        f"Error de conexión después de {self.retries + 1} intentos: {str(e)}"
+                        f"Error de conexión después de {attempts} intentos: {str(e)}"
                     )
 
                 # Calcular tiempo de espera con backoff exponencial (máximo 10s)
                 wait_time = min(10, (2**attempt) * 2)
-                print(
-                    f"⚠️  Intento {attempt + 1}/{self.retries + 1} falló. "
-                    f"Reintentando en {wait_time}s... (Error: {str(e)})"
+                emit(
+                    logger,
+                    logging.WARNING,
+                    "request.retry",
+                    "Intento %(attempt)d/%(attempts)d falló. Reintentando en "
+                    "%(wait)ss... (Error: %(error)s)",
+                    url=url,
+                    attempt=attempt + 1,
+                    attempts=attempts,
+                    error=str(e),
+                    wait=wait_time,
                 )
                 time.sleep(wait_time)
 
@@ -339,6 +452,12 @@ class HTTPClient:
             "Error inesperado: se agotaron todos los reintentos sin lanzar excepción"
         )
 
+    def _raw_body(self, response: requests.Response, url: str) -> bytes:
+        """Cuerpo de una respuesta correcta; los errores HTTP se lanzan igual."""
+        if response.status_code != 200:
+            self._handle_response(response, url)
+        return response.content
+
     def _handle_response(
         self, response: requests.Response, url: str
     ) -> Union[Dict[str, Any], str, list]:
@@ -416,13 +535,21 @@ class HTTPClient:
 
             # Para otros endpoints, intentar parsear como JSON
             try:
-                json_response = response.json()
+                json_response, repaired = decode_json_body(response)
                 # Aplicar normalización automática de caracteres especiales
                 # Esta normalización es crucial para Datadis debido a problemas comunes
                 # con caracteres españoles (ñ, acentos, ç, etc.)
-                from ..utils.text_utils import normalize_api_response
+                from ..utils.text_utils import (
+                    normalize_api_response,
+                    text_fields_for_endpoint,
+                )
 
-                return normalize_api_response(json_response)
+                return normalize_api_response(
+                    json_response,
+                    text_fields_for_endpoint(url),
+                    in_place=True,
+                    repair_encoding=not repaired,
+                )
 
             except ValueError:
                 # Si no es JSON válido, retornar como texto plano
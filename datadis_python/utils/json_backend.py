@@ -0,0 +1,148 @@
+"""
+Decodificador JSON intercambiable para las respuestas de Datadis.
+
+Las curvas de carga de Datadis son cuerpos JSON de varios megabytes y su
+decodificación con el módulo estándar ``json`` supone una parte importante del
+tiempo de CPU de cada consulta. Este módulo selecciona automáticamente el
+decodificador más rápido disponible:
+
+1. ``orjson`` (``pip install orjson``)
+2. ``msgspec`` (``pip install msgspec``)
+3. ``json`` de la biblioteca estándar (siempre disponible)
+
+Ambas librerías son dependencias **opcionales**: si no están instaladas el SDK
+funciona igual con ``json``. Todos los decodificadores devuelven las mismas
+estructuras (``dict``, ``list``, ``str``, ``int``, ``float``...) y lanzan
+``ValueError`` ante un JSON inválido, por lo que son intercambiables.
+
+Example:
+    Consultar o forzar el decodificador::
+
+        from datadis_python.utils.json_backend import get_json_backend, set_json_backend
+
+        print(get_json_backend())   # "orjson", "msgspec" o "json"
+
+        set_json_backend("json")    # Forzar la biblioteca estándar
+        set_json_backend(None)      # Volver a la selección automática
+
+:author: TacoronteRiveroCristian
+"""
+
+import importlib
+import json
+from typing import Any, Callable, Dict, Optional, Union
+
+from ..exceptions import ValidationError
+
+#: Decodificadores soportados, por orden de preferencia.
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _orjson_loads() -> Callable[[Union[bytes, str]], Any]:
+    """Construye el decodificador basado en ``orjson``."""
+    orjson = importlib.import_module("orjson")
+    # orjson.JSONDecodeError hereda de json.JSONDecodeError (ValueError)
+    return orjson.loads
+
+
+def _msgspec_loads() -> Callable[[Union[bytes, str]], Any]:
+    """Construye el decodificador basado en ``msgspec``."""
+    msgspec = importlib.import_module("msgspec")
+    decode = msgspec.json.Decoder().decode
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return decode(data)
+        except msgspec.DecodeError as e:
+            # msgspec.DecodeError no hereda de ValueError
+            raise ValueError(str(e)) from e
+
+    return loads
+
+
+def _stdlib_loads() -> Callable[[Union[bytes, str]], Any]:
+    """Construye el decodificador de la biblioteca estándar."""
+    return json.loads
+
+
+_LOADERS: Dict[str, Callable[[], Callable[[Union[bytes, str]], Any]]] = {
+    "orjson": _orjson_loads,
+    "msgspec": _msgspec_loads,
+    "json": _stdlib_loads,
+}
+
+
+def _select_backend(name: Optional[str]):
+    """
+    Selecciona un decodificador por nombre o el mejor disponible.
+
+    :param name: Nombre del decodificador o ``None`` para selección automática
+    :return: Tupla ``(nombre, función_loads)``
+    :raises ValidationError: Si el nombre no es un decodificador soportado
+    :raises ImportError: Si el decodificador solicitado no está instalado
+    """
+    if name is not None:
+        if name not in _LOADERS:
+            raise ValidationError(
+                f"Decodificador JSON no soportado: {name}. "
+                f"Valores válidos: {', '.join(JSON_BACKENDS)}"
+            )
+        try:
+            return name, _LOADERS[name]()
+        except ImportError as e:
+            raise ImportError(
+                f"El decodificador JSON '{name}' requiere la dependencia opcional "
+                f"'{name}'. Instálela con: pip install {name}"
+            ) from e
+
+    for candidate in JSON_BACKENDS:
+        try:
+            return candidate, _LOADERS[candidate]()
+        except ImportError:
+            continue
+    return "json", json.loads  # pragma: no cover - json siempre está disponible
+
+
+_backend_name, _loads = _select_backend(None)
+
+
+def get_json_backend() -> str:
+    """
+    Devuelve el nombre del decodificador JSON en uso.
+
+    :return: ``"orjson"``, ``"msgspec"`` o ``"json"``
+    :rtype: str
+    """
+    return _backend_name
+
+
+def set_json_backend(name: Optional[str]) -> str:
+    """
+    Fuerza un decodificador JSON concreto o restablece la selección automática.
+
+    :param name: ``"orjson"``, ``"msgspec"``, ``"json"`` o ``None`` para volver a
+                elegir automáticamente el más rápido instalado
+    :type name: Optional[str]
+    :return: Nombre del decodificador activo
+    :rtype: str
+    :raises ValidationError: Si el nombre no es un decodificador soportado
+    :raises ImportError: Si el decodificador solicitado no está instalado
+    """
+    global _backend_name, _loads
+    _backend_name, _loads = _select_backend(name)
+    return _backend_name
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """
+    Decodifica un documento JSON con el decodificador activo.
+
+    :param data: Documento JSON en bytes (UTF-8) o como texto
+    :type data: Union[bytes, bytearray, str]
+    :return: Estructura decodificada
+    :rtype: Any
+    :raises ValueError: Si el documento no es JSON válido o no es UTF-8 válido
+    """
+    if isinstance(data, bytearray):
+        data = bytes(data)
+    return _loads(data)
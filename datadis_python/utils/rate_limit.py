@@ -0,0 +1,83 @@
+"""
+Limitación de la tasa de peticiones compartida entre hilos.
+
+Datadis penaliza las ráfagas de peticiones (HTTP 429). Cuando varios componentes
+del SDK trabajan en paralelo (consultas masivas, pipelines...) deben repartirse
+un mismo presupuesto de peticiones por segundo; :class:`RateLimiter` es un *token
+bucket* seguro entre hilos que cumple esa función.
+
+Example:
+    Como máximo 5 peticiones por segundo con ráfagas de hasta 10::
+
+        limiter = RateLimiter(rate=5, burst=10)
+        limiter.acquire()  # Bloquea hasta que haya un token disponible
+        client.get_consumption(...)
+
+:author: TacoronteRiveroCristian
+"""
+
+import threading
+import time
+from typing import Callable
+
+from ..exceptions import ValidationError
+
+
+class RateLimiter:
+    """
+    Token bucket seguro entre hilos.
+
+    Los tokens se reponen de forma continua a ``rate`` por segundo, hasta un
+    máximo de ``burst``. Cada :meth:`acquire` reserva su token bajo un cerrojo y
+    espera fuera de él, de modo que los hilos se atienden en orden de llegada.
+
+    :param rate: Peticiones por segundo
+    :type rate: float
+    :param burst: Tamaño máximo de ráfaga
+    :type burst: int
+    :param clock: Reloj monotónico (configurable para tests)
+    :param sleep: Función de espera (configurable para tests)
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Inicializa el limitador con el depósito lleno.
+
+        :raises ValidationError: Si ``rate`` o ``burst`` no son positivos
+        """
+        if rate <= 0:
+            raise ValidationError(f"rate debe ser positivo. Recibido: {rate}")
+        if burst < 1:
+            raise ValidationError(f"burst debe ser al menos 1. Recibido: {burst}")
+        self.rate = float(rate)
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def acquire(self) -> float:
+        """
+        Espera hasta disponer de un token y lo consume.
+
+        :return: Segundos esperados
+        :rtype: float
+        """
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+            # El token se reserva aunque el depósito quede en negativo
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            self._sleep(wait)
+        return wait
@@ -21,6 +21,9 @@ Funciones principales:
     - :func:`normalize_dict_strings`: Normaliza recursivamente todas las cadenas en diccionarios
     - :func:`normalize_list_strings`: Normaliza recursivamente todas las cadenas en listas
     - :func:`normalize_api_response`: Función principal para normalizar respuestas completas
+    - :func:`text_fields_for_endpoint`: Campos de texto libre que se normalizan por endpoint
+    - :func:`intern_text`: Deduplica valores repetidos mediante una tabla de internado acotada
+    - :func:`repair_double_encoded_utf8`: Corrige la doble codificación en el cuerpo en bytes
 
 Example:
     Uso típico para procesar respuestas de Datadis::
@@ -57,11 +60,245 @@ Warning:
 :author: TacoronteRiveroCristian
 """
 
+import re
 import unicodedata
-from typing import Any, Dict, List, Union
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Union
+
+from .constants import API_V1_ENDPOINTS, API_V2_ENDPOINTS
+
+#: Campos de baja cardinalidad cuyos valores se repiten miles de veces en una misma
+#: respuesta (un CUPS, su distribuidora, el método de obtención, las horas del día...).
+#: Sus valores se deduplican con :func:`intern_text` durante la normalización para que
+#: todas las filas compartan el mismo objeto ``str`` en lugar de una copia por fila.
+INTERNED_FIELDS = frozenset(
+    {
+        "cups",
+        "date",
+        "distributor",
+        "distributorCode",
+        "marketer",
+        "municipality",
+        "obtainMethod",
+        "period",
+        "postalCode",
+        "province",
+        "time",
+    }
+)
+
+#: Campos de texto libre de los errores por distribuidor (API V2).
+DISTRIBUTOR_ERROR_TEXT_FIELDS = frozenset({"distributorName", "errorDescription"})
+
+#: Campos de texto libre de un punto de suministro.
+SUPPLY_TEXT_FIELDS = frozenset({"address", "distributor", "municipality", "province"})
+
+#: Campos de texto libre de un contrato.
+CONTRACT_TEXT_FIELDS = frozenset(
+    {
+        "accessFare",
+        "distributor",
+        "marketer",
+        "modePowerControl",
+        "municipality",
+        "province",
+        "section",
+        "selfConsumptionTypeDesc",
+        "subsection",
+        "tension",
+        "timeDiscrimination",
+    }
+)
+
+#: Campos de texto libre de la respuesta de energía reactiva.
+REACTIVE_TEXT_FIELDS = frozenset({"code_desc", "codeDesc"})
+
+#: Campos que pueden contener acentos o problemas de codificación, por tipo de
+#: respuesta. El resto de valores (CUPS, fechas, horas, códigos, números...) nunca
+#: contienen texto libre y se dejan intactos. Las curvas de consumo y de potencia
+#: máxima solo tienen texto libre en los errores por distribuidor.
+RESPONSE_TEXT_FIELDS: Dict[str, FrozenSet[str]] = {
+    "supplies": SUPPLY_TEXT_FIELDS | DISTRIBUTOR_ERROR_TEXT_FIELDS,
+    "contracts": CONTRACT_TEXT_FIELDS | DISTRIBUTOR_ERROR_TEXT_FIELDS,
+    "consumption": DISTRIBUTOR_ERROR_TEXT_FIELDS,
+    "max_power": DISTRIBUTOR_ERROR_TEXT_FIELDS,
+    "distributors": DISTRIBUTOR_ERROR_TEXT_FIELDS,
+    "reactive_data": REACTIVE_TEXT_FIELDS | DISTRIBUTOR_ERROR_TEXT_FIELDS,
+}
+
+_TEXT_FIELDS_BY_ENDPOINT: Dict[str, FrozenSet[str]] = {
+    endpoint: RESPONSE_TEXT_FIELDS[name]
+    for endpoints in (API_V1_ENDPOINTS, API_V2_ENDPOINTS)
+    for name, endpoint in endpoints.items()
+}
+
+#: Número máximo de cadenas distintas que conserva la tabla de internado. Al alcanzarse
+#: el límite la tabla se vacía y vuelve a llenarse con los valores de las respuestas
+#: siguientes, de modo que la memoria ocupada por la propia tabla está acotada.
+MAX_INTERN_TABLE_SIZE = 8192
+
+_intern_table: Dict[str, str] = {}
+
+
+def intern_text(text: str) -> str:
+    """
+    Devuelve la instancia canónica de una cadena usando una tabla de internado acotada.
+
+    Tras el decodificado JSON cada aparición de un valor repetido (por ejemplo el CUPS
+    o ``"Real"`` en ``obtainMethod``) es un objeto ``str`` independiente. En una curva
+    de carga anual de un CUPS esto supone decenas de miles de copias idénticas. Esta
+    función sustituye cada valor por la primera instancia vista, reduciendo de forma
+    notable la memoria de ``SuppliesResponse`` y ``ConsumptionResponse`` grandes (los
+    modelos Pydantic conservan la instancia recibida, no la copian).
+
+    A diferencia de :func:`sys.intern`, la tabla tiene un tamaño máximo
+    (:data:`MAX_INTERN_TABLE_SIZE`) y se vacía al llenarse, por lo que un proceso que
+    recorre una cartera de miles de CUPS no acumula memoria indefinidamente.
+
+    :param text: Cadena a deduplicar. Los valores que no son ``str`` se devuelven tal cual
+    :type text: str
+    :return: Instancia canónica igual a ``text``
+    :rtype: str
+
+    Example:
+        Deduplicación de valores repetidos::
+
+            a = intern_text("".join(["Re", "al"]))
+            b = intern_text("".join(["Re", "al"]))
+            assert a is b
+
+    Note:
+        La tabla es compartida por todo el proceso. Las operaciones sobre ``dict`` son
+        atómicas en CPython, por lo que puede usarse desde varios hilos sin bloqueo.
+    """
+    if not isinstance(text, str):
+        return text
+
+    cached = _intern_table.get(text)
+    if cached is not None:
+        return cached
+
+    if len(_intern_table) >= MAX_INTERN_TABLE_SIZE:
+        # Tabla llena: empezar una nueva generación en lugar de crecer sin límite
+        _intern_table.clear()
+
+    return _intern_table.setdefault(text, text)
+
+
+def clear_intern_table() -> None:
+    """
+    Vacía la tabla de internado utilizada por :func:`intern_text`.
+
+    Útil en procesos de larga duración para liberar la memoria de la tabla tras
+    terminar un lote de trabajo, o en tests que necesitan un estado inicial limpio.
+    """
+    _intern_table.clear()
+
+
+#: Secuencia de un carácter UTF-8 de dos bytes (U+0080-U+07FF) que se decodificó como
+#: latin-1 y se volvió a codificar en UTF-8: cada byte original se convierte en un
+#: carácter de dos bytes (``C3 93`` → ``"Ã\x93"`` → ``C3 83 C2 93``). El primer byte
+#: original (``C2``-``DF``) queda como ``C3 82``-``C3 9F`` y el de continuación
+#: (``80``-``BF``) como ``C2 80``-``C2 BF``.
+_DOUBLE_ENCODED_UTF8 = re.compile(rb"\xc3([\x82-\x9f])\xc2([\x80-\xbf])")
+
 
+def _undo_double_encoding(match: "re.Match[bytes]") -> bytes:
+    """Recupera los dos bytes UTF-8 originales de una secuencia doblemente codificada."""
+    return bytes((match.group(1)[0] + 0x40, match.group(2)[0]))
 
-def normalize_text(text: str) -> str:
+
+def repair_double_encoded_utf8(data: bytes) -> bytes:
+    r"""
+    Corrige la doble codificación UTF-8 sobre el cuerpo completo de una respuesta.
+
+    Datadis devuelve a veces texto UTF-8 que se decodificó como latin-1 y se volvió a
+    codificar (``"EDISTRIBUCIÓN"`` llega como ``"EDISTRIBUCIÃN"``). En lugar de
+    buscar ``"Ã"`` en cada cadena tras decodificar el JSON, esta función repara todas
+    las secuencias afectadas en una sola pasada sobre los bytes, antes de decodificar.
+
+    :param data: Cuerpo de la respuesta en bytes (UTF-8)
+    :type data: bytes
+    :return: Cuerpo con las secuencias doblemente codificadas corregidas. Si no hay
+            ninguna se devuelve el mismo objeto
+    :rtype: bytes
+
+    Example:
+        Reparar un cuerpo JSON antes de decodificarlo::
+
+            body = '{"distributor": "EDISTRIBUCIÃN"}'.encode("utf-8")
+            json.loads(repair_double_encoded_utf8(body))
+            # → {"distributor": "EDISTRIBUCIÓN"}
+
+    Note:
+        Solo se reparan caracteres de dos bytes (U+0080-U+07FF), que incluyen todas las
+        letras acentuadas del español, el catalán y el gallego. Las secuencias que no
+        encajan exactamente en el patrón se dejan intactas.
+    """
+    if b"\xc3" not in data:
+        # Atajo: sin el byte inicial de "Ã" no puede haber doble codificación
+        return data
+    return _DOUBLE_ENCODED_UTF8.sub(_undo_double_encoding, data)
+
+
+#: Número máximo de cadenas no ASCII distintas que memoiza :func:`normalize_text`.
+NORMALIZE_CACHE_SIZE = 4096
+
+
+class _AsciiTranslationTable(dict):
+    """
+    Tabla de ``str.translate`` que elimina acentos y caracteres no ASCII.
+
+    Cada carácter se traduce a su descomposición NFD sin los caracteres no ASCII
+    (``"Á"`` → ``"A"``, ``"ñ"`` → ``"n"``, ``"€"`` → eliminado). Como la
+    descomposición NFD se aplica carácter a carácter y los signos combinantes que
+    reordena son siempre no ASCII, el resultado es idéntico a normalizar la cadena
+    completa. Los rangos Latin-1 y Latin Extended-A se precalculan; cualquier otro
+    carácter se calcula la primera vez que aparece y queda guardado en la tabla.
+    """
+
+    def __missing__(self, codepoint: int) -> Optional[str]:
+        decomposed = unicodedata.normalize("NFD", chr(codepoint))
+        ascii_text = decomposed.encode("ascii", "ignore").decode("ascii") or None
+        self[codepoint] = ascii_text
+        return ascii_text
+
+
+_ASCII_TRANSLATION = _AsciiTranslationTable()
+for _codepoint in range(0x80, 0x180):
+    _ASCII_TRANSLATION[_codepoint]  # Precalcular Latin-1 y Latin Extended-A
+del _codepoint
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_non_ascii(text: str, repair_encoding: bool = True) -> str:
+    """
+    Normaliza una cadena no ASCII (memoizada).
+
+    :param text: Cadena con al menos un carácter no ASCII
+    :type text: str
+    :param repair_encoding: Corregir la doble codificación UTF-8 de la cadena
+    :type repair_encoding: bool
+    :return: Texto normalizado a ASCII
+    :rtype: str
+    """
+    # Paso 1: Intentar corregir problemas de doble codificación UTF-8
+    # Este es un problema muy común en Datadis donde el texto se codifica
+    # incorrectamente como latin-1 cuando debería ser UTF-8
+    if repair_encoding and "Ã" in text:
+        try:
+            text = text.encode("latin-1").decode("utf-8")
+        except (UnicodeError, UnicodeDecodeError):
+            # Si hay error en la corrección, continuar con el texto original
+            # Es mejor procesar texto ligeramente incorrecto que fallar completamente
+            pass
+
+    # Paso 2: Eliminar acentos y caracteres no ASCII con la tabla precalculada
+    # (incluye Ñ → N y Ç → C, que se descomponen como letra base + signo)
+    return text.translate(_ASCII_TRANSLATION)
+
+
+def normalize_text(text: str, repair_encoding: bool = True) -> str:
     r"""
     Normaliza texto removiendo tildes, caracteres especiales y corrigiendo problemas de encoding.
 
@@ -85,6 +322,10 @@ def normalize_text(text: str) -> str:
     :param text: Texto a normalizar. Puede contener caracteres especiales, acentos,
                 o problemas de doble codificación típicos de Datadis
     :type text: str
+    :param repair_encoding: Corregir la doble codificación UTF-8 de la cadena. Los
+                           clientes lo desactivan porque la reparan antes sobre el
+                           cuerpo completo (ver :func:`repair_double_encoded_utf8`)
+    :type repair_encoding: bool
 
     :return: Texto normalizado sin tildes, acentos ni caracteres especiales.
             Convertido completamente a caracteres ASCII seguros
@@ -124,10 +365,16 @@ def normalize_text(text: str) -> str:
         con acentos, haga una copia antes de llamar esta función.
 
     Technical details:
-        - Usa ``unicodedata.normalize('NFD', text)`` para descomposición Unicode
-        - Aplica ``encode('ascii', 'ignore')`` para eliminar caracteres no-ASCII
+        - **Atajo ASCII**: si ``text.isascii()`` (la inmensa mayoría de las cadenas de
+          Datadis) se devuelve el mismo objeto sin ningún otro procesamiento
+        - **Memoización**: las cadenas no ASCII pasan por una caché LRU acotada
+          (:data:`NORMALIZE_CACHE_SIZE` entradas), de modo que los municipios,
+          provincias o distribuidoras repetidos solo se procesan una vez
+        - **Tabla de traducción**: la eliminación de acentos se hace con un único
+          ``str.translate`` sobre una tabla precalculada con la descomposición NFD de
+          cada carácter (equivalente a ``unicodedata.normalize('NFD', text)`` seguido de
+          ``encode('ascii', 'ignore')``)
         - Maneja específicamente problemas de doble codificación latin-1/UTF-8
-        - Incluye tabla de reemplazos para caracteres que ``unicodedata`` no maneja
 
     .. seealso::
        - :func:`normalize_dict_strings` para normalizar diccionarios completos
@@ -137,42 +384,16 @@ def normalize_text(text: str) -> str:
     if not isinstance(text, str):
         return text
 
-    # Paso 1: Intentar corregir problemas de doble codificación UTF-8
-    # Este es un problema muy común en Datadis donde el texto se codifica
-    # incorrectamente como latin-1 cuando debería ser UTF-8
-    try:
-        # Detectar secuencias sospechosas que indican doble codificación
-        if "Ã" in text:
-            # Codificar como latin-1 y decodificar como UTF-8 para corregir
-            corrected_text = text.encode("latin-1").decode("utf-8")
-            text = corrected_text
-    except (UnicodeError, UnicodeDecodeError):
-        # Si hay error en la corrección, continuar con el texto original
-        # Es mejor procesar texto ligeramente incorrecto que fallar completamente
-        pass
-
-    # Paso 2: Normalizar unicode y remover acentos usando descomposición NFD
-    # NFD (Canonical Decomposition) separa caracteres base de sus acentos
-    normalized = unicodedata.normalize("NFD", text)
-    # Convertir a ASCII ignorando caracteres no representables
-    ascii_text = normalized.encode("ascii", "ignore").decode("ascii")
-
-    # Paso 3: Conversiones específicas para caracteres que NFD no maneja
-    # Estos caracteres necesitan reemplazo manual
-    replacements = {
-        "Ñ": "N",
-        "ñ": "n",  # Eñe española
-        "Ç": "C",
-        "ç": "c",  # Cedilla francesa/catalana
-    }
-
-    for char, replacement in replacements.items():
-        ascii_text = ascii_text.replace(char, replacement)
+    # Atajo: el texto ASCII no tiene acentos ni problemas de codificación
+    if text.isascii():
+        return text
 
-    return ascii_text
+    return _normalize_non_ascii(text, repair_encoding)
 
 
-def normalize_dict_strings(data: Dict[str, Any]) -> Dict[str, Any]:
+def normalize_dict_strings(
+    data: Dict[str, Any], in_place: bool = False, repair_encoding: bool = True
+) -> Dict[str, Any]:
     r"""
     Normaliza recursivamente todas las cadenas de texto en un diccionario.
 
@@ -193,6 +414,13 @@ def normalize_dict_strings(data: Dict[str, Any]) -> Dict[str, Any]:
     :param data: Diccionario con datos a normalizar. Puede contener estructuras anidadas
                 complejas con strings que necesiten limpieza de caracteres especiales
     :type data: Dict[str, Any]
+    :param in_place: Si es ``True`` modifica ``data`` (y sus contenedores anidados) en
+                    lugar de crear copias, reescribiendo solo los valores que cambian.
+                    Pensado para el JSON recién decodificado, que no comparte nadie
+    :type in_place: bool
+    :param repair_encoding: Corregir la doble codificación UTF-8 en cada cadena
+                           (ver :func:`normalize_text`)
+    :type repair_encoding: bool
 
     :return: Nuevo diccionario con la misma estructura pero con todos los strings normalizados.
             Los valores no-string se mantienen exactamente igual
@@ -257,7 +485,10 @@ def normalize_dict_strings(data: Dict[str, Any]) -> Dict[str, Any]:
     Performance:
         La función crea un nuevo diccionario en lugar de modificar el original,
         lo que la hace segura para uso concurrente pero puede consumir más memoria
-        con estructuras muy grandes.
+        con estructuras muy grandes (use ``in_place=True`` para evitar las copias).
+        Los valores de los campos de :data:`INTERNED_FIELDS` se deduplican con
+        :func:`intern_text`, de modo que las filas de una misma respuesta comparten
+        sus cadenas repetidas.
 
     .. seealso::
        - :func:`normalize_text` para normalización de strings individuales
@@ -267,25 +498,33 @@ def normalize_dict_strings(data: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(data, dict):
         return data
 
-    normalized: Dict[str, Any] = {}
+    normalized: Dict[str, Any] = data if in_place else {}
     for key, value in data.items():
         if isinstance(value, str):
-            # Normalizar strings individuales
-            normalized[key] = normalize_text(value)
+            # Normalizar strings individuales, deduplicando los de baja cardinalidad
+            new_value: Any = normalize_text(value, repair_encoding)
+            if key in INTERNED_FIELDS:
+                new_value = intern_text(new_value)
         elif isinstance(value, dict):
             # Procesar diccionarios anidados recursivamente
-            normalized[key] = normalize_dict_strings(value)
+            new_value = normalize_dict_strings(value, in_place, repair_encoding)
         elif isinstance(value, list):
             # Procesar listas anidadas recursivamente
-            normalized[key] = normalize_list_strings(value)
+            new_value = normalize_list_strings(value, in_place, repair_encoding)
         else:
             # Mantener otros tipos sin modificar (int, float, bool, None, etc.)
-            normalized[key] = value
+            new_value = value
+
+        # En modo in-place solo se reescriben los valores que cambian
+        if not in_place or new_value is not value:
+            normalized[key] = new_value
 
     return normalized
 
 
-def normalize_list_strings(data: List[Any]) -> List[Any]:
+def normalize_list_strings(
+    data: List[Any], in_place: bool = False, repair_encoding: bool = True
+) -> List[Any]:
     r"""
     Normaliza recursivamente todas las cadenas de texto en una lista.
 
@@ -307,6 +546,12 @@ def normalize_list_strings(data: List[Any]) -> List[Any]:
     :param data: Lista con datos a normalizar. Puede contener elementos de cualquier tipo,
                 incluidas estructuras anidadas complejas
     :type data: List[Any]
+    :param in_place: Si es ``True`` modifica ``data`` en lugar de crear una lista nueva,
+                    reescribiendo solo los elementos que cambian
+    :type in_place: bool
+    :param repair_encoding: Corregir la doble codificación UTF-8 en cada cadena
+                           (ver :func:`normalize_text`)
+    :type repair_encoding: bool
 
     :return: Nueva lista con la misma estructura y orden, pero con todos los strings
             normalizados. Los elementos no-string se mantienen exactamente igual
@@ -378,7 +623,8 @@ def normalize_list_strings(data: List[Any]) -> List[Any]:
 
     Performance:
         Crea una nueva lista en lugar de modificar la original, garantizando inmutabilidad
-        pero puede consumir más memoria con listas muy grandes.
+        pero puede consumir más memoria con listas muy grandes. Use ``in_place=True``
+        para evitar las copias cuando la lista no se comparte.
 
     .. seealso::
        - :func:`normalize_text` para normalización de strings individuales
@@ -388,26 +634,127 @@ def normalize_list_strings(data: List[Any]) -> List[Any]:
     if not isinstance(data, list):
         return data
 
-    normalized: List[Any] = []
-    for item in data:
+    normalized: List[Any] = data if in_place else []
+    for index, item in enumerate(data):
         if isinstance(item, str):
             # Normalizar strings individuales
-            normalized.append(normalize_text(item))
+            new_item: Any = normalize_text(item, repair_encoding)
         elif isinstance(item, dict):
             # Procesar diccionarios anidados recursivamente
-            normalized.append(normalize_dict_strings(item))
+            new_item = normalize_dict_strings(item, in_place, repair_encoding)
         elif isinstance(item, list):
             # Procesar listas anidadas recursivamente
-            normalized.append(normalize_list_strings(item))
+            new_item = normalize_list_strings(item, in_place, repair_encoding)
         else:
             # Mantener otros tipos sin modificar (int, float, bool, None, etc.)
-            normalized.append(item)
+            new_item = item
+
+        if not in_place:
+            normalized.append(new_item)
+        elif new_item is not item:
+            # En modo in-place solo se reescriben los elementos que cambian
+            normalized[index] = new_item
 
     return normalized
 
 
+def text_fields_for_endpoint(endpoint: str) -> Optional[FrozenSet[str]]:
+    """
+    Devuelve los campos de texto libre que deben normalizarse para un endpoint.
+
+    :param endpoint: Ruta del endpoint (``"/get-consumption-data-v2"``) o URL completa,
+                    con o sin parámetros de query
+    :type endpoint: str
+    :return: Conjunto de campos a normalizar, o ``None`` si el endpoint no tiene un
+            esquema conocido (en cuyo caso se normalizan todas las cadenas)
+    :rtype: Optional[FrozenSet[str]]
+
+    Example:
+        Consultar el esquema de un endpoint::
+
+            text_fields_for_endpoint("/get-supplies-v2")
+            # → frozenset({"address", "distributor", "municipality", ...})
+
+            text_fields_for_endpoint("/endpoint-desconocido")  # → None
+    """
+    path = endpoint.split("?", 1)[0].rstrip("/")
+    return _TEXT_FIELDS_BY_ENDPOINT.get("/" + path.rsplit("/", 1)[-1])
+
+
+def _normalize_fields(
+    data: Any,
+    text_fields: FrozenSet[str],
+    in_place: bool = False,
+    repair_encoding: bool = True,
+) -> Any:
+    """
+    Normaliza solo los campos de ``text_fields``, copiando únicamente lo que cambia.
+
+    Los diccionarios y listas sin cambios se devuelven tal cual (mismo objeto). Cuando
+    algún valor cambia se crea una copia superficial del contenedor afectado y de sus
+    ancestros, nunca del resto del árbol. Con ``in_place`` no se copia nada: los
+    valores que cambian se reescriben directamente en ``data``.
+
+    :param data: Estructura JSON decodificada
+    :type data: Any
+    :param text_fields: Claves cuyos valores ``str`` se normalizan
+    :type text_fields: FrozenSet[str]
+    :param in_place: Modificar ``data`` en lugar de copiar los contenedores
+    :type in_place: bool
+    :param repair_encoding: Corregir la doble codificación UTF-8 en cada cadena
+    :type repair_encoding: bool
+    :return: Estructura normalizada
+    :rtype: Any
+    """
+    if isinstance(data, dict):
+        normalized = data
+        for key, value in data.items():
+            if isinstance(value, str):
+                new_value = value
+                if key in text_fields:
+                    new_value = normalize_text(value, repair_encoding)
+                if new_value == value:
+                    # Un valor igual solo se sustituye por su instancia interna en
+                    # modo in-place; al copiar obligaría a copiar el contenedor
+                    new_value = value
+                    if in_place and key in INTERNED_FIELDS:
+                        new_value = intern_text(value)
+                elif key in INTERNED_FIELDS:
+                    new_value = intern_text(new_value)
+            elif isinstance(value, (dict, list)):
+                new_value = _normalize_fields(
+                    value, text_fields, in_place, repair_encoding
+                )
+            else:
+                continue
+
+            if new_value is not value:
+                if normalized is data and not in_place:
+                    normalized = dict(data)
+                normalized[key] = new_value
+        return normalized
+
+    if isinstance(data, list):
+        normalized_list = data
+        for index, item in enumerate(data):
+            if isinstance(item, (dict, list)):
+                new_item = _normalize_fields(
+                    item, text_fields, in_place, repair_encoding
+                )
+                if new_item is not item:
+                    if normalized_list is data and not in_place:
+                        normalized_list = list(data)
+                    normalized_list[index] = new_item
+        return normalized_list
+
+    return data
+
+
 def normalize_api_response(
-    response: Union[Dict[str, Any], List[Any]]
+    response: Union[Dict[str, Any], List[Any]],
+    text_fields: Optional[Iterable[str]] = None,
+    in_place: bool = False,
+    repair_encoding: bool = True,
 ) -> Union[Dict[str, Any], List[Any]]:
     r"""
     Función principal para normalizar respuestas completas de la API de Datadis.
@@ -436,6 +783,20 @@ def normalize_api_response(
     :param response: Respuesta completa de la API de Datadis en formato JSON deserializado.
                     Puede ser un diccionario (respuesta de objeto) o lista (respuesta de array)
     :type response: Union[Dict[str, Any], List[Any]]
+    :param text_fields: Esquema de normalización: claves de texto libre cuyos valores se
+                       normalizan (ver :func:`text_fields_for_endpoint`). El resto de
+                       cadenas no se procesan y los contenedores sin cambios no se copian.
+                       Si es ``None`` se normalizan todas las cadenas de la respuesta
+    :type text_fields: Optional[Iterable[str]]
+    :param in_place: Si es ``True`` modifica ``response`` directamente en lugar de
+                    construir una copia, reescribiendo solo los valores que cambian. Es
+                    el modo que usan los clientes sobre el JSON recién decodificado;
+                    no lo use con datos que se compartan con otro código
+    :type in_place: bool
+    :param repair_encoding: Corregir la doble codificación UTF-8 cadena a cadena. Use
+                           ``False`` si el cuerpo ya se reparó en bytes con
+                           :func:`repair_double_encoded_utf8` antes de decodificarlo
+    :type repair_encoding: bool
 
     :return: Respuesta normalizada con la misma estructura pero con todos los strings
             limpios de problemas de encoding y caracteres especiales
@@ -484,7 +845,10 @@ def normalize_api_response(
     Performance:
         La función crea nuevas estructuras de datos en lugar de modificar las originales,
         lo que la hace segura para uso concurrente pero puede consumir más memoria
-        con respuestas muy grandes (miles de registros).
+        con respuestas muy grandes (miles de registros). Con ``text_fields`` solo se
+        normalizan los campos de texto libre y únicamente se copian los contenedores
+        que cambian: en una curva de consumo (CUPS, fechas, horas y números) esto
+        evita casi todo el trabajo posterior al decodificado.
 
     Integration:
         Esta función está integrada automáticamente en la cadena de procesamiento
@@ -503,10 +867,15 @@ def normalize_api_response(
     .. versionchanged:: 2.0
        Mejorada detección de problemas de doble codificación UTF-8
     """
+    if text_fields is not None:
+        return _normalize_fields(
+            response, frozenset(text_fields), in_place, repair_encoding
+        )
+
     if isinstance(response, dict):
-        return normalize_dict_strings(response)
+        return normalize_dict_strings(response, in_place, repair_encoding)
     elif isinstance(response, list):
-        return normalize_list_strings(response)
+        return normalize_list_strings(response, in_place, repair_encoding)
     else:
         # Para otros tipos (str, int, bool, None, etc.) retornar sin modificar
         # Esto garantiza compatibilidad futura si la API cambia formatos
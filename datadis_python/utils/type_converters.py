@@ -60,9 +60,90 @@ Warning:
 """
 
 from datetime import date, datetime
+from functools import lru_cache
 from typing import Optional, Union
 
 from ..exceptions import ValidationError
+from .validators import (
+    VALIDATION_CACHE_SIZE,
+    validate_cups,
+    validate_date_range,
+    validate_distributor_code,
+)
+
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _convert_date_string(date_value: str, format_type: str) -> str:
+    """
+    Convierte una fecha en texto al formato de la API (memoizado).
+
+    El resultado solo depende de la cadena y del tipo de formato (no de la fecha
+    actual), por lo que las conversiones repetidas se resuelven desde la caché.
+
+    :param date_value: Fecha en texto (YYYY/MM, YYYY-MM-DD, DD/MM/YYYY...)
+    :param format_type: ``"daily"`` o ``"monthly"``
+    :return: Fecha en formato API
+    :raises ValidationError: Si el formato no es válido o no es apropiado
+    """
+    # Paso 1: VALIDACIÓN CRÍTICA - Detectar fechas diarias en modo mensual
+    if format_type == "monthly" and "/" in date_value:
+        parts = date_value.split("/")
+        if len(parts) == 3:
+            # Formato YYYY/MM/DD detectado en modo mensual - RECHAZAR
+            raise ValidationError(
+                f"La API de Datadis solo acepta fechas mensuales en formato YYYY/MM. "
+                f"Recibido: '{date_value}' (contiene día específico). "
+                f"Use formato mensual como: '{parts[0]}/{parts[1]}'"
+            )
+
+    # Paso 2: Parsear y reformatear. Las fechas ya correctas (YYYY/MM) se
+    # devuelven sin cambios; los límites temporales se validan sobre el rango
+    # completo en convert_date_range_to_api_format
+    try:
+        # Intentar diferentes formatos comunes de fecha
+        formats_to_try = ["%Y-%m-%d", "%Y%m%d", "%d/%m/%Y", "%Y/%m/%d"]
+
+        # Manejo especial para formato YYYY/MM
+        if "/" in date_value:
+            parts = date_value.split("/")
+            if len(parts) == 2:
+                # Formato YYYY/MM válido
+                dt = datetime(int(parts[0]), int(parts[1]), 1)
+                # Formatear según el tipo requerido
+                if format_type == "daily":
+                    return dt.strftime("%Y/%m/%d")
+                else:
+                    return dt.strftime("%Y/%m")
+
+        # Intentar los formatos uno por uno
+        for fmt in formats_to_try:
+            try:
+                dt = datetime.strptime(date_value, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValidationError(
+                f"Formato de fecha no reconocido: {date_value}. "
+                f"Formatos soportados: YYYY/MM, YYYY-MM-DD, DD/MM/YYYY, YYYYMMDD"
+            )
+
+        # VALIDACIÓN CRÍTICA: Rechazar fechas específicas en modo mensual
+        if format_type == "monthly" and dt.day != 1:
+            raise ValidationError(
+                f"La API de Datadis solo acepta fechas mensuales. "
+                f"Fecha '{date_value}' contiene día específico ({dt.day}). "
+                f"Use formato mensual como: '{dt.strftime('%Y/%m')}'"
+            )
+
+        # Formatear según el tipo requerido
+        if format_type == "daily":
+            return dt.strftime("%Y/%m/%d")
+        else:
+            return dt.strftime("%Y/%m")
+
+    except (ValueError, IndexError) as e:
+        raise ValidationError(f"No se pudo parsear la fecha: {date_value}. Error: {e}")
 
 
 def convert_date_to_api_format(
@@ -165,76 +246,7 @@ def convert_date_to_api_format(
        Añadida validación estricta para fechas específicas en modo mensual
     """
     if isinstance(date_value, str):
-        # Paso 1: VALIDACIÓN CRÍTICA - Detectar fechas diarias en modo mensual
-        if format_type == "monthly" and "/" in date_value:
-            parts = date_value.split("/")
-            if len(parts) == 3:
-                # Formato YYYY/MM/DD detectado en modo mensual - RECHAZAR
-                raise ValidationError(
-                    f"La API de Datadis solo acepta fechas mensuales en formato YYYY/MM. "
-                    f"Recibido: '{date_value}' (contiene día específico). "
-                    f"Use formato mensual como: '{parts[0]}/{parts[1]}'"
-                )
-
-        # Paso 2: Si ya es string, validar que tenga el formato correcto
-        from .validators import validate_date_range
-
-        try:
-            # Usar el validador existente para verificar formato
-            if format_type == "daily":
-                validate_date_range(date_value, date_value, "daily")
-            else:
-                validate_date_range(date_value, date_value, "monthly")
-            return date_value
-        except ValidationError:
-            # Si falla la validación, intentar parsear y reformatear
-            try:
-                # Intentar diferentes formatos comunes de fecha
-                formats_to_try = ["%Y-%m-%d", "%Y%m%d", "%d/%m/%Y", "%Y/%m/%d"]
-
-                # Manejo especial para formato YYYY/MM
-                if "/" in date_value:
-                    parts = date_value.split("/")
-                    if len(parts) == 2:
-                        # Formato YYYY/MM válido
-                        dt = datetime(int(parts[0]), int(parts[1]), 1)
-                        # Formatear según el tipo requerido
-                        if format_type == "daily":
-                            return dt.strftime("%Y/%m/%d")
-                        else:
-                            return dt.strftime("%Y/%m")
-
-                # Intentar los formatos uno por uno
-                for fmt in formats_to_try:
-                    try:
-                        dt = datetime.strptime(date_value, fmt)
-                        break
-                    except ValueError:
-                        continue
-                else:
-                    raise ValidationError(
-                        f"Formato de fecha no reconocido: {date_value}. "
-                        f"Formatos soportados: YYYY/MM, YYYY-MM-DD, DD/MM/YYYY, YYYYMMDD"
-                    )
-
-                # VALIDACIÓN CRÍTICA: Rechazar fechas específicas en modo mensual
-                if format_type == "monthly" and dt.day != 1:
-                    raise ValidationError(
-                        f"La API de Datadis solo acepta fechas mensuales. "
-                        f"Fecha '{date_value}' contiene día específico ({dt.day}). "
-                        f"Use formato mensual como: '{dt.strftime('%Y/%m')}'"
-                    )
-
-                # Formatear según el tipo requerido
-                if format_type == "daily":
-                    return dt.strftime("%Y/%m/%d")
-                else:
-                    return dt.strftime("%Y/%m")
-
-            except (ValueError, IndexError) as e:
-                raise ValidationError(
-                    f"No se pudo parsear la fecha: {date_value}. Error: {e}"
-                )
+        return _convert_date_string(date_value, format_type)
 
     elif isinstance(date_value, (datetime, date)):
         # Paso 3: VALIDACIÓN CRÍTICA para objetos datetime/date en modo mensual
@@ -553,8 +565,6 @@ def convert_date_range_to_api_format(
     converted_to = convert_date_to_api_format(date_to, format_type)
 
     # Paso 2: Validar el rango completo (incluye validaciones de lógica de negocio)
-    from .validators import validate_date_range
-
     return validate_date_range(converted_from, converted_to, format_type)
 
 
@@ -647,8 +657,6 @@ def convert_cups_parameter(cups: str) -> str:
         raise ValidationError(f"CUPS debe ser string, recibido: {type(cups)}")
 
     # Delegar validación detallada al módulo de validadores
-    from .validators import validate_cups
-
     return validate_cups(cups)
 
 
@@ -758,6 +766,4 @@ def convert_distributor_code_parameter(distributor_code: Union[str, int]) -> str
         )
 
     # Paso 2: Delegar validación detallada al módulo de validadores
-    from .validators import validate_distributor_code
-
     return validate_distributor_code(distributor_code)
@@ -71,13 +71,112 @@ Warning:
 """
 
 import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from ..exceptions import ValidationError
 
+#: Tamaño de las cachés LRU de CUPS y fechas ya validados.
+VALIDATION_CACHE_SIZE = 4096
 
-def validate_cups(cups: str) -> str:
+# Patrones precompilados (se evalúan en cada parámetro de cada petición)
+_CUPS_PATTERN = re.compile(r"^ES[A-Z0-9]{20,22}$")
+_MONTHLY_DATE_PATTERN = re.compile(r"^\d{4}/\d{2}$")
+
+#: Letras de control del CUPS, indexadas por el resto módulo 23.
+CUPS_CONTROL_LETTERS = "TRWAGMYFPDXBNJZSQVHLCKE"
+
+# Par de letras de control para cada resto módulo 529 (= 23 * 23) de los 16 dígitos
+_CUPS_CONTROL_PAIRS = tuple(
+    first + second for first in CUPS_CONTROL_LETTERS for second in CUPS_CONTROL_LETTERS
+)
+
+# Límites temporales (hace 2 años, ahora) fijados por validation_now() para un lote
+_limits_snapshot: ContextVar[Optional[Tuple[datetime, datetime]]] = ContextVar(
+    "datadis_validation_limits", default=None
+)
+
+
+@contextmanager
+def validation_now(now: Optional[datetime] = None) -> Iterator[datetime]:
+    """
+    Fija el instante "actual" usado por las validaciones de fechas de un lote.
+
+    Dentro del bloque, :func:`validate_date_range` compara los límites de Datadis
+    (2 años hacia atrás, sin fechas futuras) contra una única instantánea en lugar
+    de llamar a ``datetime.now()`` en cada validación. Además, todas las peticiones
+    de un lote se validan contra el mismo instante, aunque el lote cruce un cambio
+    de mes. La instantánea es local al contexto (hilo o tarea ``asyncio``).
+
+    :param now: Instante a usar; por defecto ``datetime.now()`` al entrar al bloque
+    :type now: Optional[datetime]
+    :return: Instante fijado
+    :rtype: datetime
+
+    Example:
+        Preparar los parámetros de muchas peticiones::
+
+            with validation_now():
+                params = [
+                    convert_date_range_to_api_format(start, end, "monthly")
+                    for start, end in ranges
+                ]
+    """
+    snapshot = now if now is not None else datetime.now()
+    token = _limits_snapshot.set(_date_limits(snapshot))
+    try:
+        yield snapshot
+    finally:
+        _limits_snapshot.reset(token)
+
+
+def _date_limits(now: datetime) -> Tuple[datetime, datetime]:
+    """
+    Límites temporales de Datadis para un instante dado.
+
+    :return: Tupla ``(fecha_mínima, fecha_máxima)``: hace 2 años y el propio instante
+    """
+    return now.replace(year=now.year - 2), now
+
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _normalize_cups(cups: str) -> str:
+    """
+    Normaliza y valida el formato de un CUPS (memoizado).
+
+    :param cups: CUPS tal y como lo proporciona el usuario
+    :return: CUPS en mayúsculas y sin espacios
+    :raises ValidationError: Si el formato no es válido
+    """
+    # Normalización: mayúsculas y sin espacios
+    cups = cups.upper().strip()
+
+    # Validación de formato usando regex oficial
+    # Formato: ES + 20-22 caracteres alfanuméricos
+    if not _CUPS_PATTERN.match(cups):
+        raise ValidationError(
+            "Formato CUPS inválido. Debe ser: ES + 20-22 caracteres alfanuméricos. "
+            f"Ejemplo: ES0031607515707001RC0F. Recibido: {cups}"
+        )
+
+    return cups
+
+
+@lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def _parse_month(date_text: str) -> datetime:
+    """
+    Parsea una fecha mensual ``YYYY/MM`` ya validada con el patrón (memoizado).
+
+    :raises ValueError: Si no es una fecha real (por ejemplo, mes 13)
+    """
+    return datetime.strptime(date_text, "%Y/%m")
+
+
+def validate_cups(cups: str, check_control: bool = False) -> str:
     """
     Valida el formato del código CUPS (Código Universal del Punto de Suministro).
 
@@ -104,6 +203,9 @@ def validate_cups(cups: str) -> str:
 
     :param cups: Código CUPS a validar. Debe ser un string con formato válido
     :type cups: str
+    :param check_control: Si es ``True``, verifica además las dos letras de control
+                         (ver :func:`validate_cups_batch`)
+    :type check_control: bool
 
     :return: Código CUPS validado, normalizado (mayúsculas, sin espacios)
     :rtype: str
@@ -188,20 +290,130 @@ def validate_cups(cups: str) -> str:
     if not cups:
         raise ValidationError("CUPS no puede estar vacío")
 
-    # Normalización: mayúsculas y sin espacios
-    cups = cups.upper().strip()
+    cups = _normalize_cups(cups)
+    if check_control:
+        error = _cups_control_error(cups)
+        if error:
+            raise ValidationError(f"{error}. Recibido: {cups}")
+    return cups
 
-    # Validación de formato usando regex oficial
-    # Formato: ES + 20-22 caracteres alfanuméricos
-    cups_pattern = r"^ES[A-Z0-9]{20,22}$"
 
-    if not re.match(cups_pattern, cups):
-        raise ValidationError(
-            "Formato CUPS inválido. Debe ser: ES + 20-22 caracteres alfanuméricos. "
-            f"Ejemplo: ES0031607515707001RC0F. Recibido: {cups}"
+def _cups_control_error(cups: str) -> Optional[str]:
+    """
+    Verifica las letras de control de un CUPS ya normalizado.
+
+    Los 16 dígitos que siguen a "ES" (distribuidora + punto de suministro) módulo
+    529 determinan las dos letras de control: el cociente y el resto de dividir
+    entre 23 indexan :data:`CUPS_CONTROL_LETTERS`.
+
+    :param cups: CUPS normalizado con formato válido
+    :return: Descripción del error o ``None`` si las letras de control son correctas
+    """
+    digits = cups[2:18]
+    if not digits.isdigit():
+        return "Los 16 caracteres tras 'ES' deben ser dígitos"
+    expected = _CUPS_CONTROL_PAIRS[int(digits) % 529]
+    if cups[18:20] != expected:
+        return (
+            f"Letras de control incorrectas: se esperaba '{expected}', "
+            f"recibido '{cups[18:20]}'"
         )
+    return None
 
-    return cups
+
+@dataclass
+class CupsBatchResult:
+    """
+    Resultado de validar un lote de CUPS con :func:`validate_cups_batch`.
+
+    :param normalized: Un elemento por CUPS de entrada, en el mismo orden: el CUPS
+                      normalizado o ``None`` si no es válido
+    :type normalized: List[Optional[str]]
+    :param errors: Motivo del rechazo de cada CUPS inválido, por índice de entrada
+    :type errors: Dict[int, str]
+    """
+
+    normalized: List[Optional[str]] = field(default_factory=list)
+    errors: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def valid(self) -> List[str]:
+        """CUPS válidos normalizados, en el orden de entrada."""
+        return [cups for cups in self.normalized if cups is not None]
+
+    @property
+    def all_valid(self) -> bool:
+        """``True`` si ningún CUPS del lote es inválido."""
+        return not self.errors
+
+
+def validate_cups_batch(
+    cups_list: Iterable[Any], check_control: bool = True
+) -> CupsBatchResult:
+    """
+    Normaliza y valida un lote de CUPS de una sola vez.
+
+    Pensada para incorporar carteras de suministros: en lugar de lanzar una
+    excepción con el primer CUPS incorrecto, valida todo el lote y devuelve los
+    CUPS normalizados junto con los errores de cada entrada inválida, indexados por
+    su posición. Acepta cualquier iterable de cadenas (listas, tuplas, columnas de
+    pandas o arrays de NumPy).
+
+    Además del formato (igual que :func:`validate_cups`), verifica por defecto las
+    dos letras de control, de modo que un CUPS mal transcrito se rechaza localmente
+    sin llegar a consultar la API.
+
+    :param cups_list: CUPS a validar
+    :type cups_list: Iterable[Any]
+    :param check_control: Si es ``True`` (por defecto), verifica las letras de control
+    :type check_control: bool
+    :return: CUPS normalizados y errores por índice
+    :rtype: CupsBatchResult
+
+    Example:
+        Validar una cartera antes de consultar sus datos::
+
+            result = validate_cups_batch(portfolio["cups"])
+
+            for index, reason in result.errors.items():
+                print(f"Fila {index}: {reason}")
+
+            for cups in result.valid:
+                client.get_contract_detail(cups=cups, distributor_code="2")
+    """
+    normalized: List[Optional[str]] = []
+    errors: Dict[int, str] = {}
+    append = normalized.append
+    match = _CUPS_PATTERN.match
+
+    for index, cups in enumerate(cups_list):
+        if not isinstance(cups, str):
+            errors[index] = f"CUPS debe ser string, recibido: {type(cups).__name__}"
+            append(None)
+            continue
+
+        cups = cups.upper().strip()
+        if not cups:
+            errors[index] = "CUPS vacío"
+            append(None)
+            continue
+        if not match(cups):
+            errors[
+                index
+            ] = "Formato CUPS inválido. Debe ser: ES + 20-22 caracteres alfanuméricos"
+            append(None)
+            continue
+
+        if check_control:
+            error = _cups_control_error(cups)
+            if error:
+                errors[index] = error
+                append(None)
+                continue
+
+        append(cups)
+
+    return CupsBatchResult(normalized=normalized, errors=errors)
 
 
 def validate_date_range(
@@ -296,13 +508,15 @@ def validate_date_range(
         las políticas de la plataforma.
 
     Performance:
-        La validación incluye cálculos de fecha para verificar límites temporales.
-        Para uso intensivo, considere cachear los límites calculados.
+        Los patrones están precompilados y el parseo de cada fecha se memoiza.
+        Dentro de un bloque :func:`validation_now` los límites temporales se calculan
+        una sola vez y los rangos ya validados se resuelven desde una caché LRU.
 
     Technical Details:
         - **Regex patterns**: Específicos para cada formato (daily/monthly)
         - **Parsing**: Usa ``datetime.strptime()`` para validación completa
-        - **Límites dinámicos**: Calculados en tiempo real basados en ``datetime.now()``
+        - **Límites dinámicos**: Basados en ``datetime.now()`` o en la instantánea
+          fijada con :func:`validation_now`
         - **Timezone**: Usa timezone local del sistema
 
     .. seealso::
@@ -316,28 +530,51 @@ def validate_date_range(
     .. versionchanged:: 2.0
        Añadidas validaciones específicas para limitaciones de Datadis
     """
+    limits = _limits_snapshot.get()
+    if limits is not None:
+        # Dentro de un lote los límites son fijos: el resultado es memoizable
+        return _check_date_range_cached(date_from, date_to, format_type, limits)
+    return _check_date_range(
+        date_from, date_to, format_type, _date_limits(datetime.now())
+    )
+
+
+def _check_date_range(
+    date_from: str,
+    date_to: str,
+    format_type: str,
+    limits: Tuple[datetime, datetime],
+) -> Tuple[str, str]:
+    """
+    Aplica las validaciones de :func:`validate_date_range` con límites dados.
+
+    :param limits: Tupla ``(fecha_mínima, fecha_máxima)`` de :func:`_date_limits`
+    :raises ValidationError: Si cualquier validación falla
+    """
+    min_date, max_date = limits
+
     if format_type == "monthly":
-        date_pattern = r"^\d{4}/\d{2}$"
-        date_format = "%Y/%m"
+        date_pattern = _MONTHLY_DATE_PATTERN
+        parse_date = _parse_month
         example = "2024/01"
     else:
         raise ValidationError(f"Tipo de formato no soportado: {format_type}")
 
     # Paso 2: Validar formato de entrada con regex
-    if not re.match(date_pattern, date_from):
+    if not date_pattern.match(date_from):
         raise ValidationError(
             f"Formato de fecha_desde inválido: {date_from}. Use {example}"
         )
 
-    if not re.match(date_pattern, date_to):
+    if not date_pattern.match(date_to):
         raise ValidationError(
             f"Formato de fecha_hasta inválido: {date_to}. Use {example}"
         )
 
     # Paso 3: Parsear fechas y validar que sean fechas reales
     try:
-        start_date = datetime.strptime(date_from, date_format)
-        end_date = datetime.strptime(date_to, date_format)
+        start_date = parse_date(date_from)
+        end_date = parse_date(date_to)
     except ValueError as e:
         raise ValidationError(f"Fecha inválida: {e}")
 
@@ -347,14 +584,12 @@ def validate_date_range(
 
     # Paso 5: Validar límite histórico (limitación específica de Datadis)
     # Datadis solo proporciona datos de los últimos 2 años
-    min_date = datetime.now().replace(year=datetime.now().year - 2)
     if start_date < min_date:
         raise ValidationError(
             "fecha_desde no puede ser anterior a hace 2 años (limitación de Datadis)"
         )
 
     # Paso 6: Validar que no sea futura
-    max_date = datetime.now()
     if end_date > max_date:
         raise ValidationError("fecha_hasta no puede ser futura")
 
@@ -362,6 +597,9 @@ def validate_date_range(
     return date_from, date_to
 
 
+_check_date_range_cached = lru_cache(maxsize=VALIDATION_CACHE_SIZE)(_check_date_range)
+
+
 def validate_distributor_code(distributor_code: str) -> str:
     """
     Valida códigos de distribuidor eléctrico españoles oficiales.
@@ -514,6 +514,7 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "simple_client_v2: Simple V2 client tests")
     config.addinivalue_line("markers", "utils: Utility function tests")
     config.addinivalue_line("markers", "errors: Error handling tests")
+    config.addinivalue_line("markers", "jobs: Sync and batch job tests")
 
 
 # Helper functions para tests
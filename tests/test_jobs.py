@@ -0,0 +1,1022 @@
+"""
+Tests para los componentes de trabajos del SDK de Datadis (datadis_python.jobs).
+
+Estos tests validan:
+- Sincronización incremental con marcas de agua por serie
+- Pipeline de etapas concurrentes y rastreo de cartera
+- Diario SQLite de tareas reanudables
+- Planificación de backfills con índice de intervalos
+"""
+
+import json
+import pickle
+import threading
+from array import array
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from datadis_python.exceptions import APIError, DatadisError, ValidationError
+from datadis_python.jobs import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    TASK_DONE,
+    TASK_FAILED,
+    AuthorizationRegistry,
+    BackfillRequest,
+    CoverageIndex,
+    FairScheduler,
+    IncrementalSync,
+    JobJournal,
+    JobRunner,
+    JsonSnapshotStore,
+    JsonWatermarkStore,
+    MemorySnapshotStore,
+    MemoryWatermarkStore,
+    MonthIntervals,
+    Pipeline,
+    ProcessDecoder,
+    QueueWorker,
+    RedisWorkQueue,
+    SQLiteWorkQueue,
+    SupplySnapshotStore,
+    WatermarkKey,
+    WorkQueue,
+    crawl_portfolio,
+    crawl_task_handler,
+    decode_response,
+    diff_supplies,
+    enqueue_plan,
+    plan_backfill,
+)
+from datadis_python.jobs.decoding import ConsumptionRow
+from datadis_python.jobs.watermarks import (
+    WatermarkStore,
+    consumption_watermark,
+    max_power_watermark,
+)
+from datadis_python.models.authorization import AuthorizationsResponse
+from datadis_python.models.consumption import ConsumptionData
+from datadis_python.models.max_power import MaxPowerData
+from datadis_python.models.responses import ConsumptionResponse, SuppliesResponse
+from datadis_python.models.supply import SupplyData
+from datadis_python.utils.concurrency import run_bulk
+from datadis_python.utils.rate_limit import RateLimiter
+
+CUPS = "ES0031607515707001RC0F"
+NOW = datetime(2024, 1, 15, 12, 0)
+
+
+def consumption_record(day, time="24:00", method="Real"):
+    """Registro de consumo de ejemplo."""
+    return ConsumptionData(
+        cups=CUPS, date=day, time=time, consumptionKWh=0.5, obtainMethod=method
+    )
+
+
+class TestIncrementalSync:
+    """Tests para la sincronización incremental con marcas de agua."""
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_plan_range_uses_watermark_and_recheck_window(self):
+        """Test que solo se piden los meses desde la marca menos la ventana."""
+        store = MemoryWatermarkStore()
+        sync = IncrementalSync(Mock(), store, recheck_months=1)
+        key = WatermarkKey(CUPS, 0, "consumption")
+
+        # Sin marca: todo el histórico que conserva Datadis
+        assert sync.plan_range(key, NOW) == ("2022/02", "2024/01")
+
+        store.set(key, "2023/11/30")
+        assert sync.plan_range(key, NOW) == ("2023/10", "2024/01")
+
+        store.set(key, "2021/05/31")
+        assert sync.plan_range(key, NOW) == ("2022/02", "2024/01")
+
+        with pytest.raises(ValidationError):
+            IncrementalSync(Mock(), store, recheck_months=-1)
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_consumption_watermark_stops_before_estimated_data(self):
+        """Test que la marca no supera los días estimados ni un día incompleto."""
+        assert consumption_watermark([]) is None
+        assert (
+            consumption_watermark(
+                [consumption_record("2024/01/10"), consumption_record("2024/01/11")]
+            )
+            == "2024/01/11"
+        )
+        assert (
+            consumption_watermark(
+                [
+                    consumption_record("2024/01/10"),
+                    consumption_record("2024/01/11", time="13:00"),
+                ]
+            )
+            == "2024/01/10"
+        )
+        assert (
+            consumption_watermark(
+                [
+                    consumption_record("2024/01/08", method="Estimada"),
+                    consumption_record("2024/01/11"),
+                ]
+            )
+            == "2024/01/07"
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_max_power_watermark_ignores_current_month(self):
+        """Test que el mes en curso nunca se da por cerrado."""
+        records = [
+            MaxPowerData(cups=CUPS, date=day, time="12:00", maxPower=3.2, period="1")
+            for day in ("2023/11/20", "2023/12/05", "2024/01/10")
+        ]
+
+        assert max_power_watermark(records, "2024/01") == "2023/12/31"
+        assert max_power_watermark(records[2:], "2024/01") is None
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_sync_consumption_advances_watermark_after_on_data(self):
+        """Test que la marca solo avanza si los datos se guardaron."""
+        client = Mock()
+        client.get_consumption.return_value = ConsumptionResponse(
+            timeCurve=[consumption_record("2024/01/13")], distributorError=[]
+        )
+        store = MemoryWatermarkStore()
+        key = WatermarkKey(CUPS, 0, "consumption")
+        store.set(key, "2023/12/31")
+        sync = IncrementalSync(client, store, recheck_months=0)
+
+        failing_sink = Mock(side_effect=IOError("disco lleno"))
+        with pytest.raises(IOError):
+            sync.sync_consumption(CUPS, "2", on_data=failing_sink, now=NOW)
+        assert store.get(key) == "2023/12/31"
+
+        result = sync.sync_consumption(CUPS, "2", on_data=Mock(), now=NOW)
+
+        client.get_consumption.assert_called_with(
+            CUPS,
+            "2",
+            "2023/12",
+            "2024/01",
+            measurement_type=0,
+            point_type=None,
+            authorized_nif=None,
+        )
+        assert result.previous_watermark == "2023/12/31"
+        assert result.watermark == "2024/01/13"
+        assert len(result.records) == 1
+        assert store.get(key) == "2024/01/13"
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_sync_watermark_stops_before_rejected_records(self):
+        """Test que la marca no supera el primer registro descartado."""
+        client = Mock()
+        client.get_consumption.return_value = ConsumptionResponse(
+            timeCurve=[consumption_record("2024/01/13")],
+            distributorError=[],
+            rejectedRecords=[
+                {"index": 0, "record": {"date": "2024/01/05"}, "reason": "x"},
+                {"index": 1, "record": {"date": "2024/01/09"}, "reason": "x"},
+            ],
+        )
+        store = MemoryWatermarkStore()
+        key = WatermarkKey(CUPS, 0, "consumption")
+        sync = IncrementalSync(client, store, recheck_months=0)
+
+        result = sync.sync_consumption(CUPS, "2", now=NOW)
+        assert result.watermark == "2024/01/04"
+        assert store.get(key) == "2024/01/04"
+
+        # Sin fecha legible: el registro se supone al inicio del rango pedido
+        client.get_consumption.return_value = ConsumptionResponse(
+            timeCurve=[consumption_record("2024/01/13")],
+            distributorError=[],
+            rejectedRecords=[{"index": 0, "record": {"date": None}, "reason": "x"}],
+        )
+        result = sync.sync_consumption(CUPS, "2", now=NOW)
+        assert result.date_from == "2024/01"
+        assert result.watermark == "2023/12/31"
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_incomplete_watermark_store_cannot_be_created(self):
+        """Test que un almacén sin ``set`` falla al crearlo, no al usarlo."""
+
+        class ReadOnlyStore(WatermarkStore):
+            def get(self, key):
+                return None
+
+        with pytest.raises(TypeError):
+            ReadOnlyStore()
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_json_watermark_store_persists(self, tmp_path):
+        """Test que las marcas sobreviven a una nueva instancia del almacén."""
+        path = str(tmp_path / "watermarks.json")
+        key = WatermarkKey(CUPS, None, "max_power")
+
+        JsonWatermarkStore(path).set(key, "2023/12/31")
+
+        assert JsonWatermarkStore(path).get(key) == "2023/12/31"
+        assert JsonWatermarkStore(path).get(key._replace(dataset="other")) is None
+
+
+class TestPipeline:
+    """Tests para el pipeline de etapas concurrentes."""
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_pipeline_fans_out_and_isolates_errors(self):
+        """Test que las salidas llegan a todas las etapas y un error no para nada."""
+        results = []
+
+        def expand(n):
+            if n == 2:
+                raise ValueError("fallo")
+            return [n * 10, n * 10 + 1]
+
+        pipeline = Pipeline(sink=results.append, rate_limiter=Mock())
+        pipeline.add_stage("expand", expand, ["double", "negate"], workers=2)
+        pipeline.add_stage("double", lambda n: [n * 2], workers=2, queue_size=1)
+        pipeline.add_stage("negate", lambda n: [-n])
+
+        stats = pipeline.run(range(4), "expand")
+
+        assert stats["expand"] == {"processed": 3, "failed": 1, "outputs": 6}
+        doubled = sorted(r.output for r in results if r.stage == "double")
+        assert doubled == [0, 2, 20, 22, 60, 62]
+        assert [r.item for r in results if not r.ok] == [2]
+        assert pipeline.rate_limiter.acquire.call_count == 4 + 6 + 6
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_pipeline_rejects_cycles_and_unknown_stages(self):
+        """Test que el grafo debe ser un DAG de etapas conocidas."""
+        pipeline = Pipeline()
+        pipeline.add_stage("a", lambda x: [x], ["b"])
+        pipeline.add_stage("b", lambda x: [x], ["a"])
+        with pytest.raises(ValidationError):
+            pipeline.run([1], "a")
+
+        pipeline = Pipeline().add_stage("a", lambda x: [x], ["missing"])
+        with pytest.raises(ValidationError):
+            pipeline.run([1], "a")
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_crawl_portfolio_limits_curves_to_contract_period(self):
+        """Test del rastreo suministros -> contratos -> curvas."""
+        supply = SimpleNamespace(cups=CUPS, distributor_code="2", point_type=5)
+        client = Mock()
+        client.get_supplies.return_value = SimpleNamespace(supplies=[supply])
+        client.get_contract_detail.return_value = SimpleNamespace(
+            contract=[
+                SimpleNamespace(start_date="2023/03/15", end_date="2023/08/31"),
+                SimpleNamespace(start_date="2021/01/01", end_date="2022/01/31"),
+            ]
+        )
+        lock = threading.Lock()
+        curves = []
+
+        def sink(result):
+            assert lock.acquire(blocking=False), "el sink no debe ser concurrente"
+            if result.stage == "consumption":
+                curves.append(result.item[2])
+            lock.release()
+
+        stats = crawl_portfolio(
+            client, "2023/01", "2023/12", sink, datasets=["consumption", "max_power"]
+        )
+
+        assert curves == [("2023/03", "2023/08")]
+        client.get_consumption.assert_called_once_with(
+            CUPS, "2", "2023/03", "2023/08", measurement_type=0, point_type=5
+        )
+        client.get_max_power.assert_called_once_with(CUPS, "2", "2023/03", "2023/08")
+        assert not client.get_reactive_data.called
+        assert stats["contracts"]["outputs"] == 1
+
+        with pytest.raises(ValidationError):
+            crawl_portfolio(client, "2023/01", "2023/12", sink, datasets=["other"])
+
+
+class TestRateLimiter:
+    """Tests para el limitador de tasa compartido."""
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_rate_limiter_allows_burst_then_spaces_requests(self):
+        """Test que tras la ráfaga cada petición espera 1/rate segundos."""
+        clock = Mock(return_value=0.0)
+        sleep = Mock()
+        limiter = RateLimiter(rate=2, burst=2, clock=clock, sleep=sleep)
+
+        assert [limiter.acquire() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+        clock.return_value = 10.0
+        assert limiter.acquire() == 0.0
+
+        with pytest.raises(ValidationError):
+            RateLimiter(rate=0)
+
+
+class TestJobJournal:
+    """Tests para el diario de tareas reanudables."""
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_resume_after_crash_skips_completed_tasks(self, tmp_path):
+        """Test que tras una caída solo se ejecutan las tareas no completadas."""
+        path = str(tmp_path / "journal.sqlite")
+        tasks = {f"cups-{n}": {"n": n} for n in range(5)}
+
+        # Primera ejecución: dos tareas terminan y una queda a medias
+        journal = JobJournal(path)
+        journal.add_tasks("backfill", tasks)
+        first, second, interrupted = journal.claim("backfill", 3)
+        journal.mark_done("backfill", first.task_id)
+        journal.mark_done("backfill", second.task_id)
+        journal.close()
+
+        handled = []
+        journal = JobJournal(path)
+        runner = JobRunner(journal, "backfill", lambda p: handled.append(p["n"]))
+        counts = runner.run(tasks)
+
+        assert sorted(handled) == [2, 3, 4]
+        assert counts[TASK_DONE] == 5
+        assert journal.tasks("backfill")[2].attempts == 2
+        assert journal.add_tasks("backfill", tasks) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_runner_retries_only_network_errors(self):
+        """Test que los timeouts se reintentan y los errores de la API no."""
+        journal = JobJournal(":memory:")
+        calls = []
+
+        def handler(payload):
+            calls.append(payload)
+            if payload == "timeout":
+                raise DatadisError("Timeout")
+            if payload == "api":
+                raise APIError("Error HTTP 400", 400)
+
+        counts = JobRunner(journal, "job", handler, max_attempts=3).run(
+            {"a": "timeout", "b": "api", "c": "ok"}
+        )
+
+        assert counts[TASK_DONE] == 1
+        assert counts[TASK_FAILED] == 2
+        assert calls.count("timeout") == 3
+        assert calls.count("api") == 1
+        failed = {task.task_id: task for task in journal.tasks("job", TASK_FAILED)}
+        assert failed["b"].error == "Error HTTP 400"
+
+        assert journal.retry_failed("job") == 2
+
+
+class TestBackfillPlanner:
+    """Tests para la planificación de backfills según la cobertura."""
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_month_intervals_merge_and_gaps(self):
+        """Test que los intervalos adyacentes se fusionan y los huecos son exactos."""
+        intervals = MonthIntervals()
+        for start, end in [(10, 12), (1, 3), (4, 5), (20, 20), (11, 15)]:
+            intervals.add(start, end)
+
+        assert intervals.intervals() == [(1, 5), (10, 15), (20, 20)]
+        assert intervals.contains(5) and not intervals.contains(6)
+        assert intervals.gaps(0, 25) == [(0, 0), (6, 9), (16, 19), (21, 25)]
+        assert intervals.gaps(2, 4) == []
+        assert intervals.gaps(12, 18) == [(16, 18)]
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_plan_backfill_requests_only_missing_months(self):
+        """Test que solo se piden los huecos, agrupados hasta max_months."""
+        index = CoverageIndex()
+        index.add(CUPS, "consumption", "2023/03", "2023/04")
+        index.add_records(CUPS, "consumption", [consumption_record("2023/09/02")])
+
+        plan = plan_backfill(
+            index,
+            [(CUPS, "2")],
+            "2023/01",
+            "2023/12",
+            datasets=["consumption"],
+            max_months=2,
+        )
+
+        assert [(r.date_from, r.date_to) for r in plan] == [
+            ("2023/01", "2023/02"),
+            ("2023/05", "2023/06"),
+            ("2023/07", "2023/08"),
+            ("2023/10", "2023/11"),
+            ("2023/12", "2023/12"),
+        ]
+        assert not any(
+            index.is_covered(CUPS, "consumption", month)
+            for request in plan
+            for month in (request.date_from, request.date_to)
+        )
+        assert plan[0].as_kwargs() == {
+            "cups": CUPS,
+            "distributor_code": "2",
+            "date_from": "2023/01",
+            "date_to": "2023/02",
+        }
+        assert plan[0].task_id == f"consumption:{CUPS}:2023/01-2023/02"
+
+        supplies = [{"cups": CUPS, "distributorCode": "2"}]
+        full = plan_backfill(CoverageIndex(), supplies, "2023/01", "2023/03")
+        assert full == [
+            BackfillRequest(CUPS, "2", "consumption", "2023/01", "2023/03"),
+            BackfillRequest(CUPS, "2", "max_power", "2023/01", "2023/03"),
+        ]
+
+
+def run_blocked(scheduler, enqueue):
+    """Encola tareas mientras el único hilo está ocupado y devuelve el orden."""
+    started = threading.Event()
+    release = threading.Event()
+    order = []
+
+    def blocker():
+        started.set()
+        release.wait(5)
+
+    scheduler.submit(blocker)
+    started.wait(5)
+    futures = enqueue(order.append)
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+    scheduler.shutdown()
+    return order
+
+
+class TestFairScheduler:
+    """Tests para el planificador con prioridades y reparto justo."""
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_priority_and_weighted_fair_share(self):
+        """Test que lo interactivo va primero y los clientes se turnan por peso."""
+        scheduler = FairScheduler(max_workers=1, weights={"acme": 2})
+
+        def enqueue(record):
+            batch_acme = scheduler.lane("acme", PRIORITY_BATCH)
+            batch_beta = scheduler.lane("beta", PRIORITY_BATCH)
+            urgent = scheduler.lane("gamma", PRIORITY_INTERACTIVE)
+            futures = [batch_acme.submit(record, f"a{n}") for n in range(4)]
+            futures += [batch_beta.submit(record, f"b{n}") for n in range(2)]
+            futures.append(urgent.submit(record, "urgent"))
+            return futures
+
+        order = run_blocked(scheduler, enqueue)
+
+        assert order == ["urgent", "a0", "b0", "a1", "a2", "b1", "a3"]
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_aged_task_is_not_starved(self):
+        """Test que una tarea que supera max_wait se atiende antes que las urgentes."""
+        clock = Mock(return_value=0.0)
+        scheduler = FairScheduler(max_workers=1, max_wait=30.0, clock=clock)
+
+        def enqueue(record):
+            futures = [scheduler.lane("acme", PRIORITY_BATCH).submit(record, "old")]
+            clock.return_value = 31.0
+            urgent = scheduler.lane("beta", PRIORITY_INTERACTIVE)
+            return futures + [urgent.submit(record, n) for n in range(2)]
+
+        assert run_blocked(scheduler, enqueue) == ["old", 0, 1]
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_running_task_does_not_hold_back_new_tasks(self):
+        """Test que una tarea larga no retrasa las nuevas si quedan hilos libres."""
+        scheduler = FairScheduler(max_workers=2)
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocker():
+            started.set()
+            release.wait(5)
+
+        blocked = scheduler.lane("acme", PRIORITY_BATCH).submit(blocker)
+        started.wait(5)
+        urgent = scheduler.lane("beta", PRIORITY_INTERACTIVE).submit(lambda: "ok")
+
+        try:
+            assert urgent.result(timeout=5) == "ok"
+            assert not blocked.done()
+        finally:
+            release.set()
+            scheduler.shutdown()
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_run_bulk_on_scheduler_lane(self):
+        """Test que un lote se ejecuta en un carril del planificador compartido."""
+        scheduler = FairScheduler(max_workers=2)
+        lane = scheduler.lane("acme", PRIORITY_BATCH)
+
+        results = list(run_bulk(lambda n: n * 2, range(5), executor=lane))
+
+        assert [r.result for r in results] == [0, 2, 4, 6, 8]
+        assert scheduler.pending() == 0
+        scheduler.shutdown()
+        with pytest.raises(RuntimeError):
+            lane.submit(print)
+        with pytest.raises(ValidationError):
+            FairScheduler(weights={"acme": 0})
+
+
+def consumption_body(*values):
+    """Cuerpo JSON de get-consumption-data-v2 con un registro por valor."""
+    curve = [
+        {
+            "cups": CUPS,
+            "date": "2023/10/01",
+            "time": f"{hour:02d}:00",
+            "consumptionKWh": value,
+            "obtainMethod": "Real",
+        }
+        for hour, value in enumerate(values, start=1)
+    ]
+    return json.dumps({"timeCurve": curve, "distributorError": []}).encode()
+
+
+class TestProcessDecoder:
+    """Tests para la decodificación de respuestas en un pool de procesos."""
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_decode_response_columns_and_records(self):
+        """Test de los formatos compactos y del descarte de registros inválidos."""
+        body = consumption_body(0.5, 1.25, "no-numérico")
+
+        columns = decode_response(body, "consumption")
+        records = decode_response(body, "consumption", output="records")
+
+        assert columns.data["consumption_kwh"] == array("d", [0.5, 1.25])
+        assert columns.data["time"] == ["01:00", "02:00"]
+        assert columns.num_records == 2 and columns.rejected_records == 1
+        assert records.data[1] == ConsumptionRow(
+            CUPS, "2023/10/01", "02:00", 1.25, "Real", None, None, None
+        )
+        assert pickle.loads(pickle.dumps(records)) == records
+        with pytest.raises(ValidationError):
+            decode_response(body, "contracts")
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_fetch_many_decodes_in_worker_processes(self, frozen_time):
+        """Test que fetch_many descarga en hilos y decodifica en procesos."""
+        client = Mock()
+        client._request_raw.side_effect = lambda endpoint, params: consumption_body(
+            float(params["startDate"][-2:])
+        )
+        months = [("2023/10", "2023/10"), ("2023/11", "2023/11")]
+
+        with ProcessDecoder(max_workers=1) as decoder:
+            requests = [(CUPS, "2", month_range) for month_range in months]
+            results = list(decoder.fetch_many(client, "consumption", requests))
+
+        assert [r.result.data["consumption_kwh"][0] for r in results] == [10.0, 11.0]
+        endpoint, params = client._request_raw.call_args_list[0].args
+        assert endpoint == "/get-consumption-data-v2"
+        assert params["distributorCode"] == "2"
+        assert params["measurementType"] == "0"
+        client._authenticate_once.assert_called_once()
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_fetch_many_request_options_override_common_ones(self, frozen_time):
+        """Test que las opciones de cada petición prevalecen sobre las comunes."""
+        client = Mock()
+        client._request_raw.return_value = consumption_body(1.0)
+        requests = [
+            {
+                "cups": CUPS,
+                "distributorCode": "2",
+                "date_from": "2023/10",
+                "date_to": "2023/10",
+                "measurement_type": 1,
+            }
+        ]
+
+        with ProcessDecoder(max_workers=1) as decoder:
+            results = list(
+                decoder.fetch_many(client, "consumption", requests, measurement_type=0)
+            )
+
+        assert results[0].ok
+        params = client._request_raw.call_args.args[1]
+        assert params["measurementType"] == "1"
+
+
+class FakeRedis:
+    """Sustituto local de Redis con los comandos que usa RedisWorkQueue."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.data = {}
+        self.expiry = {}
+
+    @staticmethod
+    def _in_range(score, low, high):
+        def bound(value, default):
+            text = str(value)
+            if text in ("-inf", "+inf"):
+                return float(text), False
+            exclusive = text.startswith("(")
+            return float(text.lstrip("(")), exclusive
+
+        (low, low_open), (high, high_open) = bound(low, 0), bound(high, 0)
+        above = score > low if low_open else score >= low
+        below = score < high if high_open else score <= high
+        return above and below
+
+    def get(self, key):
+        if key in self.expiry and self.expiry[key] <= self.clock():
+            del self.expiry[key]
+            self.data.pop(key, None)
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, xx=False, px=None):
+        exists = self.get(key) is not None
+        if (nx and exists) or (xx and not exists):
+            return None
+        self.data[key] = value.encode()
+        self.expiry[key] = self.clock() + px / 1000
+        return True
+
+    def delete(self, key):
+        self.expiry.pop(key, None)
+        return int(self.data.pop(key, None) is not None)
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = str(value).encode()
+        return 1
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hdel(self, key, field):
+        return int(self.data.get(key, {}).pop(field, None) is not None)
+
+    def hincrby(self, key, field, amount):
+        fields = self.data.setdefault(key, {})
+        fields[field] = str(int(fields.get(field, b"0")) + amount).encode()
+        return int(fields[field])
+
+    def hlen(self, key):
+        return len(self.data.get(key, {}))
+
+    def sadd(self, key, member):
+        members = self.data.setdefault(key, set())
+        added = member not in members
+        members.add(member)
+        return int(added)
+
+    def scard(self, key):
+        return len(self.data.get(key, set()))
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    def zrem(self, key, member):
+        return int(self.data.get(key, {}).pop(member, None) is not None)
+
+    def zrangebyscore(self, key, low, high, start=0, num=None):
+        members = sorted(
+            (score, member)
+            for member, score in self.data.get(key, {}).items()
+            if self._in_range(score, low, high)
+        )
+        return [member.encode() for _, member in members][start : start + num]
+
+    def zcount(self, key, low, high):
+        scores = self.data.get(key, {}).values()
+        return sum(1 for score in scores if self._in_range(score, low, high))
+
+    def transaction(self, func, *watches, value_from_callable=False):
+        """Como redis-py: repite ``func`` si cambia una clave vigilada."""
+        while True:
+            watched = [(key, self.get(key)) for key in watches]
+            pipe = FakePipeline(self)
+            value = func(pipe)
+            if all(self.get(key) == before for key, before in watched):
+                results = pipe.execute()
+                return value if value_from_callable else results
+
+
+class FakePipeline:
+    """Pipeline de FakeRedis: ejecuta al momento hasta ``multi()``, luego encola."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = None
+
+    def multi(self):
+        self.commands = []
+
+    def execute(self):
+        return [command() for command in self.commands or []]
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+        if self.commands is None:
+            return method
+        return lambda *args, **kwargs: self.commands.append(
+            lambda: method(*args, **kwargs)
+        )
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def work_queue(request):
+    """Cola de trabajo de cada implementación con un reloj controlado."""
+    clock = Mock(return_value=1000.0)
+    if request.param == "sqlite":
+        queue = SQLiteWorkQueue(":memory:", "crawl", max_attempts=2, clock=clock)
+    else:
+        queue = RedisWorkQueue(FakeRedis(clock), "crawl", max_attempts=2, clock=clock)
+    return queue, clock
+
+
+class TestWorkQueue:
+    """Tests para las colas de trabajo con concesiones."""
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_leases_expire_and_are_redelivered(self, work_queue):
+        """Test que una concesión caducada se entrega a otro trabajador."""
+        queue, clock = work_queue
+        assert queue.put({"t1": {"n": 1}, "t2": {"n": 2}, "t3": {"n": 3}}) == 3
+        assert queue.put({"t1": {"n": 1}}) == 0
+
+        first = queue.lease("w1", limit=2)
+        second = queue.lease("w2", limit=5)
+        assert [task.task_id for task in first] == ["t1", "t2"]
+        assert [(task.task_id, task.payload) for task in second] == [("t3", {"n": 3})]
+        assert queue.counts() == {"pending": 0, "leased": 3, "done": 0, "failed": 0}
+
+        assert queue.ack(first[0])
+        assert queue.extend(first[1], 300)
+        clock.return_value = 1301.0
+        redelivered = queue.lease("w2", limit=5)
+        assert [(task.task_id, task.attempts) for task in redelivered] == [
+            ("t2", 2),
+            ("t3", 2),
+        ]
+        # El trabajador original perdió la concesión
+        assert not queue.ack(first[1])
+        assert not queue.extend(first[1], 300)
+
+        queue.nack(redelivered[1], "Timeout", retry=True)
+        clock.return_value = 1602.0
+        assert queue.lease("w3", limit=5) == []
+        assert queue.counts() == {"pending": 0, "leased": 0, "done": 1, "failed": 2}
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_finished_tasks_are_not_published_again(self, work_queue):
+        """Test que volver a publicar tareas terminadas no las devuelve a la cola."""
+        queue, _ = work_queue
+        queue.put({"t1": {"n": 1}, "t2": {"n": 2}})
+        done, failed = queue.lease("w1", limit=2)
+        assert queue.ack(done)
+        queue.nack(failed, "HTTP 400", retry=False)
+
+        assert queue.put({"t1": {"n": 1}, "t2": {"n": 2}}) == 0
+        assert queue.lease("w2", limit=5) == []
+        assert queue.counts() == {"pending": 0, "leased": 0, "done": 1, "failed": 1}
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_incomplete_work_queue_cannot_be_created(self):
+        """Test que una cola sin todas las operaciones falla al crearla."""
+
+        class PublishOnlyQueue(WorkQueue):
+            def put(self, tasks):
+                return len(tasks)
+
+        with pytest.raises(TypeError):
+            PublishOnlyQueue("crawl")
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_queue_worker_runs_backfill_plan(self, frozen_time, tmp_path):
+        """Test que el trabajador reintenta los fallos de red y confirma el resto."""
+        queue = SQLiteWorkQueue(str(tmp_path / "queue.sqlite"), "backfill")
+        plan = plan_backfill(
+            CoverageIndex(),
+            [(CUPS, "2")],
+            "2023/10",
+            "2023/11",
+            datasets=["consumption", "max_power"],
+        )
+        assert enqueue_plan(queue, plan) == 2
+
+        client = Mock()
+        client.get_consumption.side_effect = [DatadisError("Timeout"), "curva"]
+        client.get_max_power.side_effect = APIError("Error HTTP 400", 400)
+        stored = []
+        handler = crawl_task_handler(
+            client, on_data=lambda task, data: stored.append(data)
+        )
+
+        stats = QueueWorker(queue, handler, worker_id="w1", max_workers=2).run()
+
+        assert stats == {"done": 1, "retried": 1, "failed": 1}
+        assert stored == ["curva"]
+        client.get_consumption.assert_called_with(
+            cups=CUPS, distributor_code="2", date_from="2023/10", date_to="2023/11"
+        )
+        assert queue.counts()["failed"] == 1
+        queue.close()
+
+
+class TestAuthorizationRegistry:
+    """Tests para el registro de autorizaciones en caché."""
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_registry_caches_refreshes_and_filters(self):
+        """Test que el listado se reutiliza durante el TTL y filtra los pares."""
+        other = "ES0031607515707002RC0F"
+        client = Mock()
+        client.list_authorizations.side_effect = [
+            AuthorizationsResponse.from_api(
+                [{"nif": "11111111A", "cups": [CUPS]}, {"nif": "22222222B"}]
+            ),
+            DatadisError("Timeout"),
+            AuthorizationsResponse.from_api({"data": [{"nif": "22222222B"}]}),
+        ]
+        clock = Mock(return_value=0.0)
+        registry = AuthorizationRegistry(client, ttl=60, clock=clock)
+
+        assert registry.nifs() == ["11111111A", "22222222B"]
+        assert registry.is_authorized("11111111a", CUPS)
+        assert not registry.is_authorized("11111111A", other)
+        assert registry.is_authorized(None, other)
+        supplies = [
+            SimpleNamespace(cups=CUPS, source_nif="11111111A"),
+            SimpleNamespace(cups=other, source_nif="11111111A"),
+            {"cups": other, "sourceNif": "22222222B"},
+            {"cups": other, "sourceNif": "22222222B", "authorized_nif": "11111111A"},
+        ]
+        assert registry.filter(supplies) == [supplies[0], supplies[2]]
+        assert registry.filter(supplies[3:], nif="22222222B") == []
+        assert registry.filter([(other, "2")], nif="33333333C") == []
+        assert client.list_authorizations.call_count == 1
+
+        # Una renovación fallida conserva el listado anterior
+        clock.return_value = 60.0
+        assert registry.is_authorized("11111111A", CUPS)
+        registry.invalidate()
+        assert not registry.is_authorized("11111111A", CUPS)
+        assert client.list_authorizations.call_count == 3
+
+
+def make_supply(cups, **fields):
+    """Suministro validado con los campos indicados."""
+    data = {
+        "address": "CALLE EJEMPLO 123",
+        "cups": cups,
+        "postalCode": "28001",
+        "province": "MADRID",
+        "municipality": "MADRID",
+        "distributor": "E-DISTRIBUCION",
+        "validDateFrom": "2023/01/01",
+        "pointType": 5,
+        "distributorCode": "2",
+    }
+    return SupplyData.model_validate({**data, **fields})
+
+
+class TestSupplySnapshots:
+    """Tests para las instantáneas y diferencias de suministros."""
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_incomplete_snapshot_store_cannot_be_created(self):
+        """Test que un almacén sin ``save`` falla al crearlo, no al usarlo."""
+
+        class ReadOnlyStore(SupplySnapshotStore):
+            def load(self, name):
+                return None
+
+        with pytest.raises(TypeError):
+            ReadOnlyStore()
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_diff_supplies_and_snapshot(self, tmp_path):
+        """Test de suministros añadidos, eliminados, modificados y no disponibles."""
+        kept, moved, gone = (f"ES00316075157070{n}1RC0F" for n in (11, 22, 33))
+        other, new = "ES0031607515707044RC0F", "ES0031607515707055RC0F"
+        previous = SuppliesResponse(
+            supplies=[
+                make_supply(kept),
+                make_supply(moved),
+                make_supply(gone),
+                make_supply(other, distributorCode="5"),
+            ]
+        )
+        current = SuppliesResponse(
+            supplies=[
+                make_supply(kept, address="OTRA CALLE 1"),
+                make_supply(moved, validDateTo="2024/06/30"),
+                make_supply(new),
+            ],
+            distributorError=[
+                {
+                    "distributorCode": "5",
+                    "distributorName": "UFD",
+                    "errorCode": "500",
+                    "errorDescription": "Timeout",
+                }
+            ],
+        )
+
+        diff = diff_supplies(previous, current)
+
+        assert [s.cups for s in diff.added] == [new]
+        assert [s.cups for s in diff.removed] == [gone]
+        assert [(c.current.cups, c.fields) for c in diff.changed] == [
+            (moved, ("valid_date_to",))
+        ]
+        assert [s.cups for s in diff.unavailable] == [other]
+        assert diff.unchanged == 1 and diff.has_changes
+        assert [s.cups for s in diff.refetch()] == [new, moved]
+        assert not diff_supplies(current, current).has_changes
+
+        snapshot = diff.snapshot(failed=[moved, new])
+        assert [(s.cups, s.valid_date_to) for s in snapshot.supplies] == [
+            (kept, None),
+            (moved, None),
+            (other, None),
+        ]
+        store = JsonSnapshotStore(str(tmp_path / "supplies.json"))
+        store.save("11111111A", snapshot)
+        reloaded = JsonSnapshotStore(store.path).load("11111111A")
+        assert reloaded.supplies == snapshot.supplies
+        assert store.load("") is None
+
+    @pytest.mark.unit
+    @pytest.mark.jobs
+    def test_crawl_portfolio_refetches_only_changes(self):
+        """Test que las ejecuciones siguientes solo rastrean los cambios."""
+        first, second = CUPS, "ES0031607515707002RC0F"
+        client = Mock()
+        client.get_supplies.return_value = SuppliesResponse(
+            supplies=[make_supply(first), make_supply(second)]
+        )
+
+        def contract_detail(cups, distributor_code):
+            if cups == second and client.get_contract_detail.call_count == 2:
+                raise DatadisError("Timeout")
+            return SimpleNamespace(contract=[SimpleNamespace(start_date="2023/01/01")])
+
+        client.get_contract_detail.side_effect = contract_detail
+        store = MemorySnapshotStore()
+
+        def crawled():
+            client.get_contract_detail.reset_mock()
+            crawl_portfolio(
+                client,
+                "2023/01",
+                "2023/02",
+                Mock(),
+                datasets=["max_power"],
+                snapshots=store,
+                workers=1,
+            )
+            return [call.args[0] for call in client.get_contract_detail.call_args_list]
+
+        assert crawled() == [first, second]
+        # El contrato fallido se reintenta; el resto no cambió
+        assert crawled() == [second]
+        assert crawled() == []
+        client.get_supplies.return_value = SuppliesResponse(
+            supplies=[make_supply(first, pointType=3), make_supply(second)]
+        )
+        assert crawled() == [first]
+        assert [s.point_type for s in store.load("").supplies] == [3, 5]
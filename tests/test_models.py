@@ -10,6 +10,7 @@ Estos tests validan:
 """
 
 import json
+from unittest.mock import patch
 
 import pytest
 from pydantic import ValidationError
@@ -18,6 +19,13 @@ from datadis_python.models.consumption import ConsumptionData
 from datadis_python.models.contract import ContractData
 from datadis_python.models.distributor import DistributorData
 from datadis_python.models.max_power import MaxPowerData
+from datadis_python.models.reactive import ReactiveData
+from datadis_python.models.responses import (
+    ConsumptionResponse,
+    MaxPowerResponse,
+    SuppliesResponse,
+    salvage_response,
+)
 from datadis_python.models.supply import SupplyData
 
 
@@ -555,3 +563,125 @@ class TestModelValidation:
 
         # Debe incluir información sobre el modelo
         assert "ConsumptionData" in repr_str
+
+
+class TestTabularExport:
+    """Tests para la exportación tabular de las respuestas."""
+
+    @pytest.mark.unit
+    @pytest.mark.models
+    def test_to_columns_reuses_model_values(self, sample_consumption_data):
+        """Test que las columnas contienen los mismos objetos que los modelos."""
+        response = ConsumptionResponse(
+            timeCurve=[sample_consumption_data, sample_consumption_data]
+        )
+
+        columns = response.to_columns()
+
+        assert list(columns) == list(ConsumptionData.model_fields)
+        assert columns["consumption_kwh"] == [0.125, 0.125]
+        assert columns["cups"][0] is response.time_curve[0].cups
+
+    @pytest.mark.unit
+    @pytest.mark.models
+    def test_reactive_columns_include_cups(self):
+        """Test que la energía reactiva añade el CUPS como columna constante."""
+        reactive = ReactiveData(
+            reactiveEnergy={
+                "cups": "ES0031607515707001RC0F",
+                "energy": [
+                    {"date": "2024/01", "energy_p1": 1.5},
+                    {"date": "2024/02", "energy_p1": 2.5},
+                ],
+            }
+        )
+
+        columns = reactive.to_columns()
+
+        assert columns["cups"] == ["ES0031607515707001RC0F"] * 2
+        assert columns["energy_p1"] == [1.5, 2.5]
+
+    @pytest.mark.unit
+    @pytest.mark.models
+    def test_to_arrow_typed_schema_when_empty(self):
+        """Test que una respuesta vacía produce una tabla Arrow tipada."""
+        pa = pytest.importorskip("pyarrow")
+
+        table = ConsumptionResponse().to_arrow()
+
+        assert table.num_rows == 0
+        assert table.schema.field("consumption_kwh").type == pa.float64()
+        assert table.schema.field("cups").type == pa.string()
+
+    @pytest.mark.unit
+    @pytest.mark.models
+    def test_to_pandas(self, sample_max_power_data):
+        """Test exportación a pandas."""
+        pytest.importorskip("pandas")
+
+        df = MaxPowerResponse(maxPower=[sample_max_power_data]).to_pandas()
+
+        assert len(df) == 1
+        assert df["max_power"].iloc[0] == 2.15
+
+    @pytest.mark.unit
+    @pytest.mark.models
+    def test_to_polars(self, sample_supply_data):
+        """Test exportación a polars con esquema tipado."""
+        pl = pytest.importorskip("polars")
+
+        df = SuppliesResponse(supplies=[sample_supply_data]).to_polars()
+
+        assert df.height == 1
+        assert df.schema["point_type"] == pl.Int64
+        assert df["cups"][0] == sample_supply_data["cups"]
+
+    @pytest.mark.unit
+    @pytest.mark.models
+    def test_missing_optional_dependency(self):
+        """Test mensaje descriptivo cuando falta la dependencia opcional."""
+        with patch(
+            "datadis_python.models.tabular.importlib.import_module",
+            side_effect=ImportError("No module named 'pyarrow'"),
+        ):
+            with pytest.raises(ImportError, match="pip install pyarrow"):
+                ConsumptionResponse().to_arrow()
+
+
+class TestSalvageValidation:
+    """Tests para la validación parcial (modo de rescate)."""
+
+    @pytest.mark.unit
+    @pytest.mark.models
+    def test_salvage_response_keeps_valid_records(self, sample_max_power_data):
+        """Test que los registros válidos se conservan y los inválidos se informan."""
+        invalid = dict(sample_max_power_data, maxPower="sin dato")
+        data = {
+            "maxPower": [sample_max_power_data, invalid, sample_max_power_data],
+            "distributorError": [],
+        }
+
+        response = salvage_response(MaxPowerResponse, data, "max_power", MaxPowerData)
+
+        assert len(response.max_power) == 2
+        assert [r.index for r in response.rejected_records] == [1]
+        assert response.rejected_records[0].record is invalid
+        assert "maxPower" in response.rejected_records[0].reason
+
+    @pytest.mark.unit
+    @pytest.mark.models
+    def test_reactive_salvage_keeps_valid_periods(self):
+        """Test rescate de períodos de energía reactiva."""
+        from datadis_python.models.reactive import salvage_reactive_data
+
+        reactive = salvage_reactive_data(
+            {
+                "reactiveEnergy": {
+                    "cups": "ES0031607515707001RC0F",
+                    "energy": [{"date": "2024/01", "energy_p1": 1.0}, {"date": None}],
+                }
+            }
+        )
+
+        assert len(reactive.reactive_energy.energy) == 1
+        assert reactive.rejected_records[0].index == 1
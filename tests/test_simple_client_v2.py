@@ -11,6 +11,9 @@ Estos tests validan:
 - Tolerancia a fallos y casos extremos
 """
 
+import asyncio
+import json
+import logging
 import time
 from unittest.mock import MagicMock, patch
 
@@ -26,6 +29,7 @@ from datadis_python.exceptions import (
     DatadisError,
     ValidationError,
 )
+from datadis_python.jobs import AuthorizationRegistry
 from datadis_python.models.consumption import ConsumptionData
 from datadis_python.models.contract import ContractData
 from datadis_python.models.max_power import MaxPowerData
@@ -42,6 +46,7 @@ from datadis_python.models.supply import SupplyData
 from datadis_python.utils.constants import (
     API_V2_ENDPOINTS,
     AUTH_ENDPOINTS,
+    AUTHORIZATION_ENDPOINTS,
     DATADIS_API_BASE,
     DATADIS_BASE_URL,
 )
@@ -291,6 +296,27 @@ class TestSimpleClientV2RobustnessFeatures:
 
                 assert "timeout después de" in str(exc_info.value).lower()
 
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_post_timeout_is_not_retried(self, simple_v2_client, caplog):
+        """Test que un POST que agota el tiempo no se repite."""
+        with patch.object(
+            simple_v2_client.session, "request", side_effect=Timeout("Timeout")
+        ) as mock_request:
+            simple_v2_client.token = "test-token"
+
+            with patch("time.sleep") as mock_sleep:
+                with caplog.at_level(logging.DEBUG, logger="datadis_python"):
+                    with pytest.raises(DatadisError):
+                        simple_v2_client.new_authorization("11111111A")
+
+        assert mock_request.call_count == 1
+        mock_sleep.assert_not_called()
+        starts = [
+            r for r in caplog.records if getattr(r, "event", None) == "request.start"
+        ]
+        assert [(r.fields["attempt"], r.fields["attempts"]) for r in starts] == [(1, 1)]
+
     @pytest.mark.unit
     @pytest.mark.simple_client_v2
     def test_exponential_backoff(self, simple_v2_client):
@@ -795,6 +821,550 @@ class TestSimpleClientV2ConsumptionAPI:
             assert f"pointType={point_type}" in request.url
             assert f"authorizedNif={authorized_nif}" in request.url
 
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_get_consumption_salvages_valid_records(
+        self,
+        authenticated_simple_v2_client,
+        sample_v2_consumption_response,
+        cups_code,
+        distributor_code,
+        frozen_time,
+    ):
+        """Test que un registro inválido no descarta el resto de la curva."""
+        sample_v2_consumption_response["timeCurve"][5]["consumptionKWh"] = "N/A"
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET,
+                f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['consumption']}",
+                json=sample_v2_consumption_response,
+                status=200,
+            )
+
+            result = authenticated_simple_v2_client.get_consumption(
+                cups=cups_code,
+                distributor_code=distributor_code,
+                date_from="2024/01",
+                date_to="2024/01",
+            )
+
+            assert len(result.time_curve) == 23
+            assert len(result.rejected_records) == 1
+            rejected = result.rejected_records[0]
+            assert rejected.index == 5
+            assert rejected.record["consumptionKWh"] == "N/A"
+            assert "consumptionKWh" in rejected.reason
+
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_get_consumption_salvage_disabled(
+        self,
+        simple_v2_client,
+        mock_auth_success,
+        sample_v2_consumption_response,
+        cups_code,
+        distributor_code,
+        frozen_time,
+    ):
+        """Test que sin modo rescate se devuelve una respuesta vacía."""
+        simple_v2_client.salvage_invalid_records = False
+        simple_v2_client.authenticate()
+        sample_v2_consumption_response["timeCurve"][5]["consumptionKWh"] = "N/A"
+
+        mock_auth_success.add(
+            responses.GET,
+            f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['consumption']}",
+            json=sample_v2_consumption_response,
+            status=200,
+        )
+
+        result = simple_v2_client.get_consumption(
+            cups=cups_code,
+            distributor_code=distributor_code,
+            date_from="2024/01",
+            date_to="2024/01",
+        )
+
+        assert len(result.time_curve) == 0
+        assert len(result.rejected_records) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_get_consumption_chunked_range(
+        self,
+        authenticated_simple_v2_client,
+        mock_auth_success,
+        sample_consumption_data,
+        cups_code,
+        distributor_code,
+        frozen_time,
+    ):
+        """Test que un rango largo se divide en bloques y se fusiona sin duplicados."""
+        authenticated_simple_v2_client.chunk_months = 6
+        requested = []
+
+        def consumption_callback(request):
+            start = request.params["startDate"]
+            requested.append((start, request.params["endDate"]))
+            first = dict(sample_consumption_data, date=f"{start}/01", time="01:00")
+            # Cada bloque repite la última hora del bloque anterior
+            boundary = dict(sample_consumption_data, date="2023/06/30", time="24:00")
+            return 200, {}, json.dumps({"timeCurve": [boundary, first]})
+
+        mock_auth_success.add_callback(
+            responses.GET,
+            f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['consumption']}",
+            callback=consumption_callback,
+            content_type="application/json",
+        )
+
+        result = authenticated_simple_v2_client.get_consumption(
+            cups=cups_code,
+            distributor_code=distributor_code,
+            date_from="2023/01",
+            date_to="2023/12",
+        )
+
+        assert sorted(requested) == [("2023/01", "2023/06"), ("2023/07", "2023/12")]
+        assert [(r.date, r.time) for r in result.time_curve] == [
+            ("2023/06/30", "24:00"),
+            ("2023/01/01", "01:00"),
+            ("2023/07/01", "01:00"),
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_get_consumption_many(
+        self,
+        authenticated_simple_v2_client,
+        mock_auth_success,
+        sample_supply_data,
+        sample_consumption_data,
+        cups_code,
+        frozen_time,
+    ):
+        """Test del lote de consumos con suministros, tuplas y errores por elemento."""
+        requested = {}
+
+        def consumption_callback(request):
+            cups = request.params["cups"]
+            requested[cups] = (request.params["startDate"], request.params["endDate"])
+            record = dict(sample_consumption_data, cups=cups)
+            return 200, {}, json.dumps({"timeCurve": [record]})
+
+        mock_auth_success.add_callback(
+            responses.GET,
+            f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['consumption']}",
+            callback=consumption_callback,
+            content_type="application/json",
+        )
+        other_cups = "ES0031607515707002RC0F"
+        requests_batch = [
+            SupplyData.model_validate(sample_supply_data),
+            (other_cups, "2", ("2023/06", "2023/07")),
+            {"cups": other_cups, "distributorCode": "2", "date_from": "2024-13"},
+        ]
+
+        results = list(
+            authenticated_simple_v2_client.get_consumption_many(
+                requests_batch, date_from="2023/01", date_to="2023/03", max_workers=2
+            )
+        )
+
+        assert [r.index for r in results] == [0, 1, 2]
+        assert results[0].ok and results[1].ok
+        assert isinstance(results[0].result, ConsumptionResponse)
+        assert results[1].result.time_curve[0].cups == other_cups
+        assert isinstance(results[2].error, ValidationError)
+        assert requested == {
+            cups_code: ("2023/01", "2023/03"),
+            other_cups: ("2023/06", "2023/07"),
+        }
+
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_get_consumption_many_request_overrides_common_arguments(
+        self,
+        authenticated_simple_v2_client,
+        mock_auth_success,
+        sample_consumption_data,
+        cups_code,
+        frozen_time,
+    ):
+        """Test que los argumentos de una petición prevalecen sobre los comunes."""
+        requested = []
+
+        def consumption_callback(request):
+            requested.append(
+                (request.params.get("authorizedNif"), request.params["measurementType"])
+            )
+            return 200, {}, json.dumps({"timeCurve": [sample_consumption_data]})
+
+        mock_auth_success.add_callback(
+            responses.GET,
+            f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['consumption']}",
+            callback=consumption_callback,
+            content_type="application/json",
+        )
+        requests_batch = [
+            {
+                "cups": cups_code,
+                "distributorCode": "2",
+                "authorized_nif": "87654321B",
+                "measurement_type": 1,
+            },
+            (cups_code, "2"),
+        ]
+
+        results = list(
+            authenticated_simple_v2_client.get_consumption_many(
+                requests_batch,
+                date_from="2023/01",
+                date_to="2023/03",
+                authorized_nif="12345678A",
+            )
+        )
+
+        assert all(r.ok for r in results), [r.error for r in results]
+        assert sorted(requested) == [("12345678A", "0"), ("87654321B", "1")]
+
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_get_supplies_for_nifs(
+        self, authenticated_simple_v2_client, mock_auth_success, sample_supply_data
+    ):
+        """Test que las consultas por NIF se fusionan indicando el NIF de origen."""
+        other = dict(sample_supply_data, cups="ES0031607515707002RC0F")
+        error = {
+            "distributorCode": "5",
+            "distributorName": "UFD",
+            "errorCode": "500",
+            "errorDescription": "Timeout",
+        }
+        bodies = {
+            "11111111A": {
+                "supplies": [sample_supply_data],
+                "distributorError": [error],
+            },
+            "22222222B": {"supplies": [sample_supply_data, other]},
+        }
+
+        def supplies_callback(request):
+            nif = request.params["authorizedNif"]
+            if nif not in bodies:
+                return 403, {}, "NIF no autorizado"
+            return 200, {}, json.dumps(bodies[nif])
+
+        mock_auth_success.add_callback(
+            responses.GET,
+            f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['supplies']}",
+            callback=supplies_callback,
+            content_type="application/json",
+        )
+
+        result = authenticated_simple_v2_client.get_supplies_for_nifs(
+            ["11111111A", "22222222B", "33333333C", "11111111A"], max_workers=3
+        )
+
+        assert isinstance(result, SuppliesResponse)
+        assert [(s.cups, s.source_nif) for s in result.supplies] == [
+            (sample_supply_data["cups"], "11111111A"),
+            (other["cups"], "22222222B"),
+        ]
+        errors = result.distributor_error
+        assert [(e.distributor_code, e.source_nif) for e in errors] == [
+            ("5", "11111111A")
+        ]
+        assert list(result.nif_errors) == ["33333333C"]
+        assert result.nifs_by_cups == {
+            sample_supply_data["cups"]: ["11111111A", "22222222B"],
+            other["cups"]: ["22222222B"],
+        }
+        assert result.to_columns()["source_nif"] == ["11111111A", "22222222B"]
+
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_supplies_for_nifs_feed_consumption_many_with_their_nif(
+        self,
+        authenticated_simple_v2_client,
+        mock_auth_success,
+        sample_supply_data,
+        sample_consumption_data,
+        frozen_time,
+    ):
+        """Test que cada suministro se consulta con el NIF que lo devolvió."""
+        other = dict(sample_supply_data, cups="ES0031607515707002RC0F")
+        bodies = {
+            "11111111A": {"supplies": [sample_supply_data]},
+            "22222222B": {"supplies": [other]},
+        }
+        requested = []
+
+        def supplies_callback(request):
+            return 200, {}, json.dumps(bodies[request.params["authorizedNif"]])
+
+        def consumption_callback(request):
+            requested.append(
+                (request.params["cups"], request.params.get("authorizedNif"))
+            )
+            return 200, {}, json.dumps({"timeCurve": [sample_consumption_data]})
+
+        mock_auth_success.add_callback(
+            responses.GET,
+            f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['supplies']}",
+            callback=supplies_callback,
+            content_type="application/json",
+        )
+        mock_auth_success.add_callback(
+            responses.GET,
+            f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['consumption']}",
+            callback=consumption_callback,
+            content_type="application/json",
+        )
+        client = authenticated_simple_v2_client
+        inventory = client.get_supplies_for_nifs(bodies)
+
+        results = list(
+            client.get_consumption_many(
+                inventory.supplies, date_from="2023/01", date_to="2023/03"
+            )
+        )
+        assert all(r.ok for r in results), [r.error for r in results]
+        assert dict(requested) == {
+            sample_supply_data["cups"]: "11111111A",
+            other["cups"]: "22222222B",
+        }
+
+        # Un NIF indicado explícitamente prevalece sobre el de origen
+        requested.clear()
+        list(
+            client.get_consumption_many(
+                inventory.supplies[:1],
+                date_from="2023/01",
+                date_to="2023/03",
+                authorized_nif="99999999Z",
+            )
+        )
+        assert requested == [(sample_supply_data["cups"], "99999999Z")]
+
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_get_distributors_for_nifs(
+        self, authenticated_simple_v2_client, mock_auth_success
+    ):
+        """Test que se unen los códigos de distribuidora de todos los NIF."""
+        codes = {"11111111A": ["2", "5"], "22222222B": ["5", "8"]}
+
+        def distributors_callback(request):
+            nif_codes = codes[request.params["authorizedNif"]]
+            body = {"distExistenceUser": {"distributorCodes": nif_codes}}
+            return 200, {}, json.dumps(body)
+
+        mock_auth_success.add_callback(
+            responses.GET,
+            f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['distributors']}",
+            callback=distributors_callback,
+            content_type="application/json",
+        )
+        limiter = MagicMock()
+
+        result = authenticated_simple_v2_client.get_distributors_for_nifs(
+            codes, rate_limiter=limiter
+        )
+
+        assert result.dist_existence_user["distributorCodes"] == ["2", "5", "8"]
+        assert result.distributor_codes_by_nif == codes
+        assert result.nif_errors == {}
+        assert limiter.acquire.call_count == 2
+
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_authorization_endpoints(
+        self, authenticated_simple_v2_client, mock_auth_success, cups_code
+    ):
+        """Test del listado, alta y cancelación de autorizaciones."""
+        mock_auth_success.add(
+            responses.GET,
+            f"{DATADIS_API_BASE}{AUTHORIZATION_ENDPOINTS['list_authorization']}",
+            json=[
+                {
+                    "nif": "11111111A",
+                    "cups": [cups_code.lower()],
+                    "startDate": "2024/01/01",
+                },
+                {"nif": "22222222B", "name": "ACME SL", "channel": "web"},
+            ],
+            status=200,
+        )
+        for name in ("new_authorization", "cancel_authorization"):
+            mock_auth_success.add(
+                responses.POST,
+                f"{DATADIS_API_BASE}{AUTHORIZATION_ENDPOINTS[name]}",
+                json={"response": "OK"},
+                status=200,
+            )
+
+        listing = authenticated_simple_v2_client.list_authorizations()
+        created = authenticated_simple_v2_client.new_authorization(
+            " 11111111a ", cups=[cups_code.lower()], end_date="2025/12/31"
+        )
+        authenticated_simple_v2_client.cancel_authorization("22222222B")
+
+        first, second = listing.authorizations
+        assert first.covers(cups_code) and not first.covers("ES0031607515707002RC0F")
+        assert second.covers(cups_code) and second.model_extra == {"channel": "web"}
+        assert created == {"response": "OK"}
+        posts = mock_auth_success.calls[-2:]
+        bodies = [json.loads(call.request.body) for call in posts]
+        assert bodies == [
+            {"nif": "11111111A", "cups": [cups_code], "endDate": "2025/12/31"},
+            {"nif": "22222222B"},
+        ]
+        with pytest.raises(ValidationError):
+            authenticated_simple_v2_client.cancel_authorization("11111111A", ["XX"])
+
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_authorized_supplies_feed_consumption_many(
+        self,
+        authenticated_simple_v2_client,
+        mock_auth_success,
+        sample_supply_data,
+        sample_consumption_data,
+        frozen_time,
+    ):
+        """Test del flujo inventario → filtro de autorizaciones → lote de curvas."""
+        other = dict(sample_supply_data, cups="ES0031607515707002RC0F")
+        third = dict(sample_supply_data, cups="ES0031607515707003RC0F")
+        bodies = {
+            "11111111A": {"supplies": [sample_supply_data, other]},
+            "22222222B": {"supplies": [third]},
+        }
+        requested = []
+
+        def supplies_callback(request):
+            return 200, {}, json.dumps(bodies[request.params["authorizedNif"]])
+
+        def consumption_callback(request):
+            requested.append(
+                (request.params["cups"], request.params.get("authorizedNif"))
+            )
+            return 200, {}, json.dumps({"timeCurve": [sample_consumption_data]})
+
+        mock_auth_success.add(
+            responses.GET,
+            f"{DATADIS_API_BASE}{AUTHORIZATION_ENDPOINTS['list_authorization']}",
+            json=[
+                {"nif": "11111111A", "cups": [sample_supply_data["cups"]]},
+                {"nif": "22222222B"},
+            ],
+            status=200,
+        )
+        mock_auth_success.add_callback(
+            responses.GET,
+            f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['supplies']}",
+            callback=supplies_callback,
+            content_type="application/json",
+        )
+        mock_auth_success.add_callback(
+            responses.GET,
+            f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['consumption']}",
+            callback=consumption_callback,
+            content_type="application/json",
+        )
+        client = authenticated_simple_v2_client
+        registry = AuthorizationRegistry(client)
+
+        inventory = client.get_supplies_for_nifs(registry.nifs())
+        supplies = registry.filter(inventory.supplies)
+        results = list(client.get_consumption_many(supplies, "2023/01", "2023/03"))
+
+        assert all(r.ok for r in results), [r.error for r in results]
+        assert dict(requested) == {
+            sample_supply_data["cups"]: "11111111A",
+            third["cups"]: "22222222B",
+        }
+
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_iter_consumption_streams_month_batches(
+        self,
+        authenticated_simple_v2_client,
+        mock_auth_success,
+        sample_consumption_data,
+        cups_code,
+        distributor_code,
+        frozen_time,
+    ):
+        """Test que la curva se entrega bloque a bloque sin duplicar los límites."""
+
+        def consumption_callback(request):
+            start = request.params["startDate"]
+            assert start == request.params["endDate"]
+            first = dict(sample_consumption_data, date=f"{start}/01", time="01:00")
+            # Cada bloque repite la última hora del mes anterior
+            previous = dict(sample_consumption_data, date="2023/09/30", time="24:00")
+            return 200, {}, json.dumps({"timeCurve": [previous, first]})
+
+        mock_auth_success.add_callback(
+            responses.GET,
+            f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['consumption']}",
+            callback=consumption_callback,
+            content_type="application/json",
+        )
+
+        batches = list(
+            authenticated_simple_v2_client.iter_consumption(
+                cups_code, distributor_code, "2023/10", "2023/12", batches=True
+            )
+        )
+
+        assert [[(r.date, r.time) for r in batch] for batch in batches] == [
+            [("2023/09/30", "24:00"), ("2023/10/01", "01:00")],
+            [("2023/11/01", "01:00")],
+            [("2023/12/01", "01:00")],
+        ]
+
+        async def collect():
+            return [
+                record.date
+                async for record in authenticated_simple_v2_client.aiter_consumption(
+                    cups_code, distributor_code, "2023/10", "2023/11"
+                )
+            ]
+
+        assert asyncio.run(collect()) == ["2023/09/30", "2023/10/01", "2023/11/01"]
+
+    @pytest.mark.unit
+    @pytest.mark.simple_client_v2
+    def test_request_logs_bytes_instead_of_printing(
+        self,
+        authenticated_simple_v2_client,
+        sample_v2_supplies_response,
+        caplog,
+        capsys,
+    ):
+        """Test que las peticiones se registran con logging y no en stdout."""
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET,
+                f"{DATADIS_API_BASE}{API_V2_ENDPOINTS['supplies']}",
+                json=sample_v2_supplies_response,
+                status=200,
+            )
+
+            with caplog.at_level(logging.DEBUG, logger="datadis_python"):
+                authenticated_simple_v2_client.get_supplies()
+
+        assert capsys.readouterr().out == ""
+        success = [
+            r for r in caplog.records if getattr(r, "event", None) == "request.success"
+        ]
+        assert len(success) == 1
+        assert success[0].fields["bytes"] > 0
+        assert "bytes" in success[0].getMessage()
+
     @pytest.mark.unit
     @pytest.mark.simple_client_v2
     def test_get_consumption_invalid_date_format(
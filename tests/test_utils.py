@@ -8,6 +8,10 @@ Estos tests validan:
 - Funciones de constantes y configuración
 """
 
+import asyncio
+import logging
+import threading
+import time
 from datetime import date, datetime, timedelta
 from unittest.mock import Mock, patch
 
@@ -21,24 +25,47 @@ from datadis_python.exceptions import (
     DatadisError,
     ValidationError,
 )
+from datadis_python.utils import events, json_backend, text_utils
+from datadis_python.utils.chunking import (
+    fetch_chunks,
+    is_retryable,
+    iter_chunks,
+    iterate_async,
+    merge_chunk_responses,
+    merge_reactive_responses,
+    split_month_range,
+)
+from datadis_python.utils.concurrency import AdaptiveConcurrency, run_bulk
 from datadis_python.utils.constants import (
     API_V1_ENDPOINTS,
     DISTRIBUTOR_CODES,
     MEASUREMENT_TYPES,
     POINT_TYPES,
 )
-from datadis_python.utils.http import HTTPClient
+from datadis_python.utils.http import HTTPClient, decode_json_body
 from datadis_python.utils.text_utils import (
+    clear_intern_table,
+    intern_text,
     normalize_api_response,
     normalize_dict_strings,
     normalize_list_strings,
     normalize_text,
+    repair_double_encoded_utf8,
+    text_fields_for_endpoint,
+)
+from datadis_python.utils.type_converters import (
+    convert_cups_parameter,
+    convert_date_to_api_format,
 )
 from datadis_python.utils.validators import (
+    CupsBatchResult,
+    validate_cups,
+    validate_cups_batch,
     validate_date_range,
     validate_distributor_code,
     validate_measurement_type,
     validate_point_type,
+    validation_now,
 )
 
 
@@ -130,6 +157,105 @@ class TestDateRangeValidator:
         assert "no puede ser futura" in str(exc_info.value)
 
 
+class TestValidationSnapshot:
+    """Tests para la instantánea de fecha y las cachés de validación."""
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_validation_now_fixes_limits(self):
+        """Test que los límites temporales usan la instantánea del lote."""
+        with validation_now(datetime(2024, 6, 15)):
+            assert validate_date_range("2022/07", "2024/06") == ("2022/07", "2024/06")
+            with pytest.raises(ValidationError, match="no puede ser futura"):
+                validate_date_range("2024/06", "2024/07")
+
+        with validation_now(datetime(2025, 6, 15)):
+            # La caché no reutiliza resultados de otra instantánea
+            with pytest.raises(ValidationError, match="hace 2 años"):
+                validate_date_range("2022/07", "2024/06")
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    @patch("datadis_python.utils.validators.datetime")
+    def test_validation_now_calls_now_once(self, mock_datetime):
+        """Test que un lote de validaciones consulta la fecha actual una sola vez."""
+        mock_datetime.now.return_value = datetime(2024, 6, 15)
+        mock_datetime.strptime.side_effect = datetime.strptime
+
+        with validation_now():
+            for month in range(1, 7):
+                validate_date_range("2024/01", f"2024/{month:02d}")
+
+        assert mock_datetime.now.call_count == 1
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_cached_conversions_raise_every_time(self):
+        """Test que los errores no se memoizan como resultados válidos."""
+        for _ in range(2):
+            with pytest.raises(ValidationError, match="Formato CUPS inválido"):
+                convert_cups_parameter("ES123")
+            with pytest.raises(ValidationError, match="día específico"):
+                convert_date_to_api_format("2024/01/15", "monthly")
+
+        assert convert_cups_parameter(" es0031607515707001rc0f ") == (
+            "ES0031607515707001RC0F"
+        )
+        assert convert_date_to_api_format("2024-01-01", "monthly") == "2024/01"
+
+
+class TestCupsBatchValidation:
+    """Tests para la validación de lotes de CUPS con letras de control."""
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_validate_cups_batch_reports_by_index(self):
+        """Test que los CUPS inválidos se informan por índice sin excepción."""
+        result = validate_cups_batch(
+            [
+                " es0031607515707001rc0f ",
+                "ES0031607515707001RD0F",
+                "ES123",
+                None,
+                "",
+                "ES1234000000000001JN0F",
+            ]
+        )
+
+        assert isinstance(result, CupsBatchResult)
+        assert result.normalized == [
+            "ES0031607515707001RC0F",
+            None,
+            None,
+            None,
+            None,
+            "ES1234000000000001JN0F",
+        ]
+        assert result.valid == ["ES0031607515707001RC0F", "ES1234000000000001JN0F"]
+        assert sorted(result.errors) == [1, 2, 3, 4]
+        assert "se esperaba 'RC'" in result.errors[1]
+        assert "Formato CUPS inválido" in result.errors[2]
+        assert not result.all_valid
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_validate_cups_batch_without_control_check(self):
+        """Test que la verificación de control es opcional."""
+        result = validate_cups_batch(("ES0031607515707001RD0F",), check_control=False)
+
+        assert result.all_valid
+        assert result.valid == ["ES0031607515707001RD0F"]
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_validate_cups_control_letters(self):
+        """Test que validate_cups solo verifica el control si se solicita."""
+        assert validate_cups("ES0031607515707001RD0F") == "ES0031607515707001RD0F"
+
+        with pytest.raises(ValidationError, match="Letras de control"):
+            validate_cups("ES0031607515707001RD0F", check_control=True)
+
+
 class TestDistributorCodeValidator:
     """Tests para validador de códigos de distribuidor."""
 
@@ -245,6 +371,56 @@ class TestTextNormalization:
         # Debería al menos normalizar lo que puede
         assert "A" not in result or "Ã" not in result
 
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_normalize_text_ascii_fast_path(self):
+        """Test que el texto ASCII se devuelve sin copiar."""
+        text = "".join(["CALLE ", "MAYOR 1"])
+
+        assert normalize_text(text) is text
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_normalize_text_matches_nfd_decomposition(self):
+        """Test que la tabla de traducción equivale a NFD + ASCII."""
+        import unicodedata
+
+        samples = ["ÀÉÎÕÜ àéîõü", "Ññ Çç", "Ŝŧřěēł", "½ € Ω ﬁ", "Ǆ ǅ ǆ"]
+
+        for sample in samples:
+            expected = (
+                unicodedata.normalize("NFD", sample)
+                .encode("ascii", "ignore")
+                .decode("ascii")
+            )
+            assert normalize_text(sample) == expected
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_repair_double_encoded_utf8(self):
+        """Test reparación de doble codificación UTF-8 sobre bytes."""
+        original = '{"distributor": "E-DISTRIBUCIÓN", "municipality": "A Coruña"}'
+        double_encoded = original.encode("utf-8").decode("latin-1").encode("utf-8")
+
+        assert repair_double_encoded_utf8(double_encoded) == original.encode("utf-8")
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_repair_double_encoded_utf8_leaves_clean_bodies(self):
+        """Test que un cuerpo correcto se devuelve sin cambios."""
+        clean = '{"municipality": "MÁLAGA", "amount": "½"}'.encode("utf-8")
+
+        assert repair_double_encoded_utf8(clean) == clean
+        ascii_body = b'{"cups": "ES0031607515707001RC0F"}'
+        assert repair_double_encoded_utf8(ascii_body) is ascii_body
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_normalize_text_without_repair(self):
+        """Test que repair_encoding=False omite la corrección por cadena."""
+        assert normalize_text("MÃ¡laga") == "Malaga"
+        assert normalize_text("MÃ¡laga", repair_encoding=False) == "MAlaga"
+
     @pytest.mark.unit
     @pytest.mark.utils
     def test_normalize_dict_strings(self):
@@ -319,6 +495,141 @@ class TestTextNormalization:
             result = normalize_api_response(response)
             assert result == response
 
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_normalize_api_response_with_text_fields(self):
+        """Test normalización guiada por esquema: solo campos de texto libre."""
+        clear_intern_table()
+        time_curve = [
+            {"cups": "ES0031607515707001RC0F", "time": "01:00", "note": "CÁDIZ"}
+        ]
+        api_response = {
+            "timeCurve": time_curve,
+            "distributorError": [
+                {"distributorName": "E-DISTRIBUCIÓN", "errorDescription": "Sin datos"}
+            ],
+        }
+
+        result = normalize_api_response(
+            api_response, text_fields_for_endpoint("/get-consumption-data-v2")
+        )
+
+        assert result["distributorError"][0]["distributorName"] == "E-DISTRIBUCION"
+        # Campos fuera del esquema: sin normalizar y sin copiar
+        assert result["timeCurve"] is time_curve
+        assert result["timeCurve"][0]["note"] == "CÁDIZ"
+        # La entrada original no se modifica
+        assert api_response["distributorError"][0]["distributorName"] == (
+            "E-DISTRIBUCIÓN"
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_normalize_api_response_with_text_fields_keeps_unchanged_rows(self):
+        """Test que el internado no obliga a copiar filas sin cambios."""
+        clear_intern_table()
+        time_curve = [
+            {"cups": "".join(["ES0031607515707001", "RC0F"]), "time": "01:00"}
+            for _ in range(3)
+        ]
+        api_response = {"timeCurve": time_curve, "distributorError": []}
+
+        result = normalize_api_response(
+            api_response, text_fields_for_endpoint("/get-consumption-data-v2")
+        )
+
+        assert result is api_response
+        assert all(a is b for a, b in zip(result["timeCurve"], time_curve))
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_normalize_api_response_in_place(self):
+        """Test normalización in-place: mismo árbol, solo cambian los valores tocados."""
+        row = {"address": "CALLE MAYOR", "province": "MÁLAGA", "pointType": 2}
+        supplies = [row, ["CORUÑA"]]
+        api_response = {"supplies": supplies}
+
+        result = normalize_api_response(api_response, in_place=True)
+
+        assert result is api_response
+        assert result["supplies"] is supplies
+        assert supplies[0] is row
+        assert row["province"] == "MALAGA"
+        assert supplies[1] == ["CORUNA"]
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_normalize_api_response_in_place_with_text_fields(self):
+        """Test modo in-place combinado con el esquema de campos de texto."""
+        error = {"distributorName": "E-DISTRIBUCIÓN", "errorCode": "Ñ1"}
+        api_response = {"timeCurve": [], "distributorError": [error]}
+
+        result = normalize_api_response(
+            api_response,
+            text_fields_for_endpoint("/get-consumption-data-v2"),
+            in_place=True,
+        )
+
+        assert result is api_response
+        assert result["distributorError"][0] is error
+        assert error["distributorName"] == "E-DISTRIBUCION"
+        assert error["errorCode"] == "Ñ1"  # Fuera del esquema
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_text_fields_for_endpoint(self):
+        """Test búsqueda del esquema de normalización por endpoint o URL."""
+        supplies_fields = text_fields_for_endpoint(
+            "https://datadis.es/api-private/api/get-supplies-v2?distributorCode=2"
+        )
+
+        assert "address" in supplies_fields
+        assert "cups" not in supplies_fields
+        assert text_fields_for_endpoint("/get-supplies") == supplies_fields
+        assert text_fields_for_endpoint("/endpoint-desconocido") is None
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_normalize_api_response_interns_repeated_fields(self):
+        """Test que los campos de baja cardinalidad comparten la misma instancia."""
+        clear_intern_table()
+        # Construir cadenas en tiempo de ejecución para que sean objetos distintos
+        api_response = {
+            "timeCurve": [
+                {
+                    "cups": "".join(["ES0031607515707001", "RC0F"]),
+                    "obtainMethod": "".join(["Re", "al"]),
+                    "address": "".join(["CALLE ", "MAYOR"]),
+                }
+                for _ in range(3)
+            ]
+        }
+        assert (
+            api_response["timeCurve"][0]["cups"]
+            is not api_response["timeCurve"][1]["cups"]
+        )
+
+        rows = normalize_api_response(api_response)["timeCurve"]
+
+        assert rows[0]["cups"] is rows[1]["cups"] is rows[2]["cups"]
+        assert rows[0]["obtainMethod"] is rows[2]["obtainMethod"]
+        # Los campos de texto libre no se internan
+        assert rows[0]["address"] is not rows[1]["address"]
+        assert rows[0]["address"] == "CALLE MAYOR"
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_intern_table_is_bounded(self):
+        """Test que la tabla de internado no supera su tamaño máximo."""
+        clear_intern_table()
+        with patch.object(text_utils, "MAX_INTERN_TABLE_SIZE", 10):
+            for i in range(50):
+                assert intern_text(f"valor-{i}") == f"valor-{i}"
+            assert len(text_utils._intern_table) <= 10
+
+        assert intern_text(123) == 123
+        clear_intern_table()
+
 
 class TestHTTPClient:
     """Tests para cliente HTTP base."""
@@ -365,6 +676,59 @@ class TestHTTPClient:
 
             assert result == {"success": True}
 
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_http_client_raw_request(self):
+        """Test que make_raw_request devuelve el cuerpo sin decodificar."""
+        client = HTTPClient(timeout=5, retries=1)
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET,
+                "https://example.com/api/test",
+                body=b'{"success": true}',
+                status=200,
+            )
+
+            result = client.make_raw_request("GET", "https://example.com/api/test")
+
+            assert result == b'{"success": true}'
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_http_client_repairs_double_encoding(self):
+        """Test que la doble codificación se repara antes de decodificar el JSON."""
+        client = HTTPClient(timeout=5, retries=1)
+        body = '{"supplies": [{"distributor": "EDISTRIBUCIÃ\x93N"}]}'
+
+        with responses.RequestsMock() as rsps:
+            rsps.add(
+                responses.GET,
+                "https://example.com/api/get-supplies-v2",
+                body=body.encode("utf-8"),
+                status=200,
+                content_type="application/json",
+            )
+
+            result = client.make_request(
+                "GET", "https://example.com/api/get-supplies-v2"
+            )
+
+            assert result["supplies"][0]["distributor"] == "EDISTRIBUCION"
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_decode_json_body_fallback(self):
+        """Test que sin cuerpo en bytes se usa response.json()."""
+        response = Mock()
+        response.content = None
+        response.json.return_value = {"distributor": "EDISTRIBUCIÃ\x93N"}
+
+        data, repaired = decode_json_body(response)
+
+        assert data == {"distributor": "EDISTRIBUCIÃ\x93N"}
+        assert repaired is False
+
     @pytest.mark.unit
     @pytest.mark.utils
     def test_http_client_auth_endpoint_response(self):
@@ -519,6 +883,28 @@ class TestHTTPClient:
 
             assert "Error de conexión" in str(exc_info.value)
 
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_http_client_without_retry(self):
+        """Test que retry=False no repite una petición que agota el tiempo."""
+        client = HTTPClient(retries=3)
+
+        with responses.RequestsMock() as rsps:
+
+            def timeout_callback(request):
+                raise requests.exceptions.Timeout("Timeout")
+
+            rsps.add_callback(
+                responses.POST,
+                "https://example.com/api/test",
+                callback=timeout_callback,
+            )
+
+            with pytest.raises(DatadisError):
+                client.make_request("POST", "https://example.com/api/test", retry=False)
+
+            assert len(rsps.calls) == 1
+
     @pytest.mark.unit
     @pytest.mark.utils
     def test_http_client_set_auth_header(self):
@@ -600,6 +986,394 @@ class TestHTTPClient:
             assert result == "not valid json"
 
 
+class TestJsonBackend:
+    """Tests para el decodificador JSON intercambiable."""
+
+    @pytest.fixture(autouse=True)
+    def restore_backend(self):
+        """Restablece la selección automática tras cada test."""
+        yield
+        json_backend.set_json_backend(None)
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    @pytest.mark.parametrize("backend", ["json", "orjson", "msgspec"])
+    def test_backends_decode_identically(self, backend):
+        """Test que todos los decodificadores producen las mismas estructuras."""
+        if backend != "json":
+            pytest.importorskip(backend)
+        body = '{"timeCurve": [{"cups": "ES1", "consumptionKWh": 0.125}], "n": 3}'
+
+        json_backend.set_json_backend(backend)
+
+        assert json_backend.get_json_backend() == backend
+        assert json_backend.loads(body.encode("utf-8")) == {
+            "timeCurve": [{"cups": "ES1", "consumptionKWh": 0.125}],
+            "n": 3,
+        }
+        with pytest.raises(ValueError):
+            json_backend.loads(b"{invalid")
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_unknown_backend(self):
+        """Test que un decodificador desconocido lanza ValidationError."""
+        with pytest.raises(ValidationError, match="no soportado"):
+            json_backend.set_json_backend("simplejson")
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_missing_optional_backend(self):
+        """Test mensaje descriptivo si el decodificador no está instalado."""
+        with patch(
+            "datadis_python.utils.json_backend.importlib.import_module",
+            side_effect=ImportError("No module named 'orjson'"),
+        ):
+            with pytest.raises(ImportError, match="pip install orjson"):
+                json_backend.set_json_backend("orjson")
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_decode_json_body_falls_back_on_invalid_utf8(self):
+        """Test que un cuerpo no UTF-8 se delega en response.json()."""
+        response = Mock()
+        response.content = '{"province": "MÁLAGA"}'.encode("latin-1")
+        response.json.return_value = {"province": "MÁLAGA"}
+
+        data, repaired = decode_json_body(response)
+
+        assert data == {"province": "MÁLAGA"}
+        assert repaired is False
+
+
+class TestEvents:
+    """Tests para el registro estructurado y los eventos."""
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_emit_logs_structured_record(self, caplog):
+        """Test que el evento se registra con sus campos en el LogRecord."""
+        logger = logging.getLogger("datadis_python.tests")
+
+        with caplog.at_level(logging.DEBUG, logger="datadis_python"):
+            events.emit(
+                logger,
+                logging.DEBUG,
+                "request.success",
+                "Respuesta de %(endpoint)s (%(bytes)s bytes)",
+                endpoint="/get-supplies-v2",
+                bytes=512,
+            )
+
+        record = caplog.records[-1]
+        assert record.getMessage() == "Respuesta de /get-supplies-v2 (512 bytes)"
+        assert record.event == "request.success"
+        assert record.fields == {"endpoint": "/get-supplies-v2", "bytes": 512}
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_emit_disabled_does_not_format(self):
+        """Test que con el nivel deshabilitado no se formatea el mensaje."""
+        logger = Mock()
+        logger.isEnabledFor.return_value = False
+
+        events.emit(logger, logging.DEBUG, "auth.start", "Autenticando...")
+
+        logger.log.assert_not_called()
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_event_listener(self):
+        """Test que los listeners reciben los eventos y sus fallos se ignoran."""
+        received = []
+
+        def failing_listener(event, fields):
+            raise RuntimeError("fallo")
+
+        events.add_event_listener(failing_listener)
+        events.add_event_listener(lambda event, fields: received.append(event))
+        try:
+            events.emit(
+                logging.getLogger("datadis_python.tests"),
+                logging.INFO,
+                "supplies.validated",
+                "%(count)d suministros validados",
+                count=3,
+            )
+        finally:
+            events._listeners.clear()
+
+        assert received == ["supplies.validated"]
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_response_size_without_decoding(self):
+        """Test que el tamaño se obtiene de la cabecera o de los bytes."""
+        response = Mock()
+        response.headers = {"Content-Length": "2048"}
+        assert events.response_size(response) == 2048
+
+        response.headers = {}
+        response.content = b'{"supplies": []}'
+        assert events.response_size(response) == 16
+
+
+class TestChunking:
+    """Tests para la división de rangos en bloques mensuales."""
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_split_month_range(self):
+        """Test que los bloques cubren el rango sin solaparse."""
+        assert split_month_range("2023/11", "2024/12", 6) == [
+            ("2023/11", "2024/04"),
+            ("2024/05", "2024/10"),
+            ("2024/11", "2024/12"),
+        ]
+        assert split_month_range("2024/03", "2024/03", 12) == [("2024/03", "2024/03")]
+
+        with pytest.raises(ValidationError):
+            split_month_range("2024/01", "2024/12", 0)
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_merge_reactive_responses(self):
+        """Test que los períodos de energía reactiva se fusionan sin repetir fechas."""
+        merged = merge_reactive_responses(
+            [
+                {
+                    "reactiveEnergy": {
+                        "cups": "ES0031607515707001RC0F",
+                        "energy": [{"date": "2024/01"}, {"date": "2024/02"}],
+                    },
+                    "distributorError": [],
+                },
+                {
+                    "reactiveEnergy": {
+                        "cups": "ES0031607515707001RC0F",
+                        "energy": [{"date": "2024/02"}, {"date": "2024/03"}],
+                    },
+                    "distributorError": [],
+                },
+            ]
+        )
+
+        assert merged["reactiveEnergy"]["cups"] == "ES0031607515707001RC0F"
+        assert [e["date"] for e in merged["reactiveEnergy"]["energy"]] == [
+            "2024/01",
+            "2024/02",
+            "2024/03",
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_merge_chunk_responses_only_drops_boundary_overlap(self):
+        """Test que solo se descarta el solape con el bloque anterior."""
+        first = {
+            "cups": "ES0031607515707001RC0F",
+            "date": "2024/01/31",
+            "time": "24:00",
+        }
+        repeated = {
+            "cups": "ES0031607515707001RC0F",
+            "date": "2024/01/01",
+            "time": "01:00",
+        }
+        merged = merge_chunk_responses(
+            [
+                {"timeCurve": [repeated, repeated, first], "distributorError": []},
+                {"timeCurve": [first, {"date": "2024/02/01"}], "distributorError": []},
+                {"timeCurve": [repeated], "distributorError": []},
+            ],
+            records_key="timeCurve",
+        )
+
+        assert merged["timeCurve"] == [
+            repeated,
+            repeated,
+            first,
+            {"date": "2024/02/01"},
+            repeated,
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_is_retryable(self):
+        """Test que solo los fallos de red y timeouts se reintentan."""
+        assert is_retryable(DatadisError("Timeout"))
+        assert not is_retryable(APIError("Error HTTP 500", 500))
+        assert not is_retryable(AuthenticationError("Token inválido"))
+        assert not is_retryable(ValidationError("CUPS inválido"))
+        assert not is_retryable(ValueError("otro"))
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_fetch_chunks_retries_only_failed(self):
+        """Test que solo se vuelven a pedir los bloques que fallaron."""
+        calls = []
+
+        def fetch(start, end):
+            calls.append(start)
+            if start == "2024/07" and calls.count(start) == 1:
+                raise DatadisError("Timeout")
+            return start
+
+        ranges = [("2024/01", "2024/06"), ("2024/07", "2024/12")]
+
+        assert fetch_chunks(fetch, ranges, max_workers=2) == ["2024/01", "2024/07"]
+        assert sorted(calls) == ["2024/01", "2024/07", "2024/07"]
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_fetch_chunks_does_not_retry_api_errors(self):
+        """Test que los errores de la API se propagan sin reintentos."""
+        fetch = Mock(side_effect=APIError("Error HTTP 400", 400))
+
+        with pytest.raises(APIError):
+            fetch_chunks(fetch, [("2024/01", "2024/06")])
+
+        assert fetch.call_count == 1
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_iter_chunks_yields_in_order_with_bounded_prefetch(self):
+        """Test que los bloques llegan en orden sin descargar más de lo permitido."""
+        started = []
+        ranges = [(f"2024/{m:02d}", f"2024/{m:02d}") for m in range(1, 7)]
+
+        def fetch(start, end):
+            started.append(start)
+            if start == "2024/03" and started.count(start) == 1:
+                raise DatadisError("Timeout")
+            return start
+
+        iterator = iter_chunks(fetch, ranges, max_workers=2)
+        assert next(iterator) == "2024/01"
+        # Solo el bloque entregado y los descargados por adelantado
+        assert len(set(started)) <= 3
+
+        assert list(iterator) == [start for start, _ in ranges[1:]]
+        assert started.count("2024/03") == 2
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_iterate_async(self):
+        """Test que el adaptador asíncrono entrega los mismos elementos."""
+
+        async def collect():
+            return [item async for item in iterate_async(iter(range(3)))]
+
+        assert asyncio.run(collect()) == [0, 1, 2]
+
+
+class TestBulk:
+    """Tests para la ejecución concurrente de lotes."""
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_run_bulk_ordered_with_item_errors(self):
+        """Test que los resultados llegan en orden y los errores no cortan el lote."""
+
+        def call(value):
+            if value == 3:
+                raise APIError("Error HTTP 400", 400)
+            return value * 10
+
+        results = list(run_bulk(call, iter(range(6)), max_workers=3))
+
+        assert [r.index for r in results] == list(range(6))
+        assert [r.result for r in results if r.ok] == [0, 10, 20, 40, 50]
+        assert isinstance(results[3].error, APIError)
+        assert results[3].request == 3
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_run_bulk_respects_per_key_limit(self):
+        """Test que nunca hay más peticiones simultáneas por grupo que el límite."""
+        lock = threading.Lock()
+        active = {}
+        peak = {}
+
+        def call(item):
+            group = item[0]
+            with lock:
+                active[group] = active.get(group, 0) + 1
+                peak[group] = max(peak.get(group, 0), active[group])
+            time.sleep(0.01)
+            with lock:
+                active[group] -= 1
+            return item
+
+        items = [("2", n) for n in range(8)] + [("8", n) for n in range(4)]
+        results = list(
+            run_bulk(
+                call,
+                items,
+                key=lambda item: item[0],
+                max_workers=6,
+                per_key_limit=2,
+                ordered=False,
+            )
+        )
+
+        assert sorted(r.result for r in results) == sorted(items)
+        assert peak == {"2": 2, "8": 2}
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_run_bulk_invalid_limits(self):
+        """Test que se rechazan límites no positivos."""
+        with pytest.raises(ValidationError):
+            run_bulk(lambda x: x, [1], max_workers=0)
+        with pytest.raises(ValidationError):
+            run_bulk(lambda x: x, [1], per_key_limit=0)
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_adaptive_concurrency_aimd(self):
+        """Test del aumento aditivo y la reducción multiplicativa por grupo."""
+        clock = Mock(return_value=0.0)
+        adaptive = AdaptiveConcurrency(initial=2, max_limit=4, clock=clock)
+
+        for _ in range(4):
+            adaptive.observe("2", 0.0, result=[1])
+        assert adaptive.limit("2") == 3
+
+        # Una ráfaga de fallos simultáneos reduce el límite una sola vez
+        clock.return_value = 5.0
+        adaptive.observe("2", 1.0, APIError("Límite de peticiones excedido", 429))
+        adaptive.observe("2", 1.0, DatadisError("Error de conexión"))
+        assert adaptive.limit("2") == 1
+
+        # Los errores que no dependen de la carga no modifican el límite
+        adaptive.observe("2", 6.0, APIError("Error HTTP 400", 400))
+        assert adaptive.limits() == {"2": 1}
+        assert adaptive.limit("5") == 2
+
+        with pytest.raises(ValidationError):
+            AdaptiveConcurrency(initial=0)
+
+    @pytest.mark.unit
+    @pytest.mark.utils
+    def test_run_bulk_adaptive_per_key_limit(self):
+        """Test que run_bulk reduce el límite de la distribuidora que se satura."""
+        adaptive = AdaptiveConcurrency(initial=2, max_limit=4)
+        response = Mock(distributor_error=[])
+
+        def call(item):
+            if item[0] == "2":
+                raise APIError("Límite de peticiones excedido", 429)
+            return response
+
+        items = [("2", n) for n in range(3)] + [("8", n) for n in range(12)]
+        results = list(
+            run_bulk(call, items, key=lambda item: item[0], per_key_limit=adaptive)
+        )
+
+        assert [r.ok for r in results] == [False] * 3 + [True] * 12
+        assert adaptive.limits() == {"2": 1, "8": 4}
+
+
 class TestConstants:
     """Tests para constantes y configuración."""
 